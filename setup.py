@@ -46,7 +46,8 @@ setup(name                          = name,
       package_dir                   = {"" : "src"},
       platforms                     = ['Unix','Windows'],
       install_requires              = ["numpy","matplotlib","h5py","jupyterlab","ipywidgets","ipympl"],
+      extras_require                = {"codecs" : ["lz4","bitshuffle"]},
       cmdclass                      = cmdclass,
       command_options               = command_options,
-      scripts                       = ["scripts/run_hdfviewer"]
+      scripts                       = ["scripts/run_hdfviewer","scripts/benchmark_import","scripts/replay_trace","scripts/hdf_report"]
 )
@@ -0,0 +1,254 @@
+"""Parallel block by block processing of datasets which may not fit in memory.
+"""
+
+import concurrent.futures
+import itertools
+import math
+import os
+import threading
+
+
+def iterChunkSlices(shape, chunks=None, itemSize=1, targetBytes=2**23, region=None):
+    """Yield the selections covering a dataset (or a region of it) block by block.
+
+    The blocks are aligned on the chunks of the dataset so that each chunk is read (and decompressed) only once. Consecutive chunks are grouped
+    along the fastest varying axes first until the block size reaches the target size. For contiguous datasets, the blocks are made of
+    consecutive rows. When a region is given, the blocks stay aligned on the chunk grid of the dataset and are clipped to the region.
+
+    :param shape: the shape of the dataset
+    :type shape: tuple
+    :param chunks: the chunk shape of the dataset or None for contiguous datasets
+    :type chunks: tuple or None
+    :param itemSize: the size in bytes of one element of the dataset
+    :type itemSize: int
+    :param targetBytes: the target size in bytes of a block
+    :type targetBytes: int
+    :param region: if not None, the region of the dataset to cover given as one slice (with a step of 1) per axis
+    :type region: tuple of slice or None
+
+    :return: the selections
+    :rtype: generator of tuple of slice
+    """
+
+    if region is None:
+        bounds = [(0, s) for s in shape]
+    else:
+        bounds = [sl.indices(s)[:2] for sl, s in zip(region, shape)]
+
+    block = list(chunks) if chunks else [1]*len(shape)
+
+    # Grow the block along the fastest varying axes first so that the blocks are as contiguous as possible
+    blockBytes = itemSize*math.prod(block)
+    for axis in reversed(range(len(shape))):
+        first, last = bounds[axis]
+        nChunks = max(1, -(-last//block[axis]) - first//block[axis])
+        factor = max(1, min(nChunks, targetBytes//blockBytes))
+        block[axis] *= factor
+        blockBytes *= factor
+        if factor < nChunks:
+            break
+
+    starts = [range((first//b)*b, last, b) for (first, last), b in zip(bounds, block)]
+    for start in itertools.product(*starts):
+        yield tuple(slice(max(s, first), min(s+b, last)) for s, b, (first, last) in zip(start, block, bounds))
+
+
+class ChunkStreamer(object):
+    """This class allows to apply a function to a dataset block by block in a thread pool and to merge the partial results.
+
+    The dataset is never loaded as a whole: only a bounded number of blocks (twice the number of workers) are in flight at a given time.
+    The partial results are merged in the order the blocks complete, hence the merge function must be associative and commutative.
+
+    .. code-block:: python
+       :caption: Example
+
+        streamer = ChunkStreamer(hdf["/data/fake_data3D"], lambda data, selection: data.sum(), lambda a, b: a + b)
+
+        total = streamer.run()
+
+    :param dataset: the dataset to process. Any object with a shape, a dtype and supporting slicing can be used. If the object has a chunks attribute, the blocks are aligned on the chunks.
+    :type dataset: :class:`h5py.Dataset` or :class:`numpy.ndarray`
+    :param function: the function applied to each block. It is called with the block data and the block selection and returns a partial result.
+    :type function: callable
+    :param merge: the function used for merging two partial results
+    :type merge: callable
+    :param finalize: if not None, the function applied to the merged result once all the blocks have been processed
+    :type finalize: callable or None
+    :param progress: if not None, the function called each time a block has been processed with the number of processed blocks and the total number of blocks
+    :type progress: callable or None
+    :param maxWorkers: the number of worker threads. If None, the :class:`concurrent.futures.ThreadPoolExecutor` default is used.
+    :type maxWorkers: int or None
+    :param targetBytes: the target size in bytes of a block
+    :type targetBytes: int
+    :param region: if not None, only this region of the dataset (one slice per axis) is processed
+    :type region: tuple of slice or None
+    """
+
+    def __init__(self, dataset, function, merge, finalize=None, progress=None, maxWorkers=None, targetBytes=2**23, region=None):
+
+        self._dataset = dataset
+
+        self._function = function
+
+        self._merge = merge
+
+        self._finalize = finalize
+
+        self._progress = progress
+
+        self._maxWorkers = maxWorkers
+
+        self._selections = list(iterChunkSlices(dataset.shape, getattr(dataset, "chunks", None), dataset.dtype.itemsize, targetBytes, region))
+
+        self._cancelEvent = threading.Event()
+
+        self._thread = None
+
+        self._result = None
+
+        self._error = None
+
+    @property
+    def cancelled(self):
+        """Getter for the cancellation state of the streamer.
+
+        :return: True if the streamer has been cancelled
+        :rtype: bool
+        """
+
+        return self._cancelEvent.is_set()
+
+    @property
+    def error(self):
+        """Getter for the exception raised while running the streamer in the background.
+
+        :return: the exception or None if no exception was raised
+        :rtype: Exception or None
+        """
+
+        return self._error
+
+    @property
+    def nBlocks(self):
+        """Getter for the number of blocks to be processed.
+
+        :return: the number of blocks
+        :rtype: int
+        """
+
+        return len(self._selections)
+
+    @property
+    def result(self):
+        """Getter for the result of the streamer.
+
+        :return: the result or None if the streamer has not completed
+        :rtype: object
+        """
+
+        return self._result
+
+    @property
+    def running(self):
+        """Getter for the running state of a streamer started in the background.
+
+        :return: True if the streamer is running in the background
+        :rtype: bool
+        """
+
+        return self._thread is not None and self._thread.is_alive()
+
+    def _process(self, selection):
+        """Process a block.
+
+        :param selection: the block selection
+        :type selection: tuple of slice
+
+        :return: the partial result or None if the streamer has been cancelled
+        :rtype: object
+        """
+
+        if self.cancelled:
+            return None
+
+        return self._function(self._dataset[selection], selection)
+
+    def cancel(self):
+        """Cancel the streamer.
+
+        The blocks being processed are completed but their results are discarded.
+        """
+
+        self._cancelEvent.set()
+
+    def run(self):
+        """Process all the blocks and merge their results.
+
+        :return: the (finalized) merged result or None if the streamer has been cancelled
+        :rtype: object
+        """
+
+        result = None
+        nProcessed = 0
+
+        selections = iter(self._selections)
+
+        maxWorkers = self._maxWorkers if self._maxWorkers else min(32, (os.cpu_count() or 1) + 4)
+
+        with concurrent.futures.ThreadPoolExecutor(maxWorkers) as executor:
+
+            maxPending = 2*maxWorkers
+
+            pending = set()
+            while True:
+                # Keep a bounded number of blocks in flight
+                while not self.cancelled and len(pending) < maxPending:
+                    selection = next(selections, None)
+                    if selection is None:
+                        break
+                    pending.add(executor.submit(self._process, selection))
+
+                if not pending:
+                    break
+
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        partial = future.result()
+                    except Exception:
+                        self.cancel()
+                        raise
+                    nProcessed += 1
+                    if partial is None:
+                        continue
+                    result = partial if result is None else self._merge(result, partial)
+                    if self._progress is not None:
+                        self._progress(nProcessed, self.nBlocks)
+
+        if self.cancelled:
+            return None
+
+        if self._finalize is not None:
+            result = self._finalize(result)
+
+        self._result = result
+
+        return result
+
+    def start(self, callback=None):
+        """Run the streamer in a background thread.
+
+        :param callback: if not None, the function called with the streamer once it has completed, has been cancelled or has failed
+        :type callback: callable or None
+        """
+
+        def target():
+            try:
+                self.run()
+            except Exception as e:
+                self._error = e
+            if callback is not None:
+                callback(self)
+
+        self._thread = threading.Thread(target=target, daemon=True)
+        self._thread.start()
@@ -0,0 +1,180 @@
+"""Fast read paths for HDF datasets: memory maps of contiguous datasets and chunk caches matching the frame access pattern.
+"""
+
+import os
+
+import numpy as np
+
+import h5py
+
+from hdfviewer.utils.DatasetCache import DatasetCache
+from hdfviewer.utils.MemoryBudget import defaultMemoryBudget
+from hdfviewer.utils.ParallelChunkReader import ParallelChunkReader, filterPipeline
+
+_cache = DatasetCache()
+
+#: The size in bytes of the chunk cache of the datasets of the files opened by the viewer
+fileChunkCacheBytes = 2**26
+
+#: The number of slots of the chunk cache hash table of the datasets of the files opened by the viewer
+fileChunkCacheSlots = 6421
+
+
+def memoryMap(dataset):
+    """Return a read-only memory map of a contiguous and unfiltered HDF dataset.
+
+    The dataset is mapped directly from its storage offset in the file so that indexing the map returns views of the file pages, without going
+    through the HDF5 selection machinery and without any copy. The maps are cached per dataset.
+
+    :param dataset: the dataset
+    :type dataset: :class:`h5py.Dataset` or :class:`numpy.ndarray`
+
+    :return: the memory map or None if the dataset can not be mapped (chunked, filtered, external, not allocated, in-memory file or non numeric type)
+    :rtype: :class:`numpy.memmap` or None
+    """
+
+    if not isinstance(dataset, h5py.Dataset):
+        return None
+
+    if dataset.chunks is not None or dataset.external is not None or dataset.dtype.kind not in "biuf":
+        return None
+
+    # Only the files stored as a single file on disk can be mapped
+    hdf = dataset.file
+    if hdf.driver not in ("sec2", "stdio") or not os.path.isfile(hdf.filename):
+        return None
+
+    memmap = _cache.get(dataset, "memmap")
+    if memmap is not None:
+        return memmap
+
+    # The data of a dataset which has never been written is not allocated
+    nBytes = dataset.size*dataset.dtype.itemsize
+    offset = dataset.id.get_offset()
+    if offset is None or nBytes == 0 or dataset.id.get_storage_size() < nBytes:
+        return None
+
+    memmap = np.memmap(hdf.filename, dtype=dataset.dtype, mode="r", offset=offset, shape=dataset.shape)
+
+    _cache.set(dataset, memmap, "memmap")
+
+    return memmap
+
+
+def _nextPrime(n):
+    """Return the smallest prime number larger than or equal to a number.
+
+    :param n: the number
+    :type n: int
+
+    :return: the prime number
+    :rtype: int
+    """
+
+    n = max(2, n)
+    while any(n % d == 0 for d in range(2, int(n**0.5) + 1)):
+        n += 1
+
+    return n
+
+
+def frameChunkCache(shape, chunks, itemSize, maxBytes=None):
+    """Compute the chunk cache settings which keep all the chunks crossed by a frame of a 3D dataset.
+
+    The frames are indexed along the last axis. As a chunk spans several frames, reading the next frames only hits the cache.
+
+    :param shape: the shape of the dataset
+    :type shape: tuple
+    :param chunks: the chunk shape of the dataset
+    :type chunks: tuple
+    :param itemSize: the size of the dataset elements in bytes
+    :type itemSize: int
+    :param maxBytes: the maximum size of the cache in bytes. If None, :data:`hdfviewer.utils.MemoryBudget.defaultMemoryBudget` is used.
+    :type maxBytes: int or None
+
+    :return: the number of slots of the cache hash table and the size of the cache in bytes
+    :rtype: tuple of int
+    """
+
+    maxBytes = defaultMemoryBudget if maxBytes is None else maxBytes
+
+    chunkBytes = int(np.prod(chunks))*itemSize
+    nChunks = int(np.prod([-(-s//c) for s, c in zip(shape[:-1], chunks[:-1])]))
+
+    nBytes = min(max(nChunks*chunkBytes, 2**20), maxBytes)
+
+    # A prime number of slots about 100 times larger than the number of cached chunks limits the hash collisions
+    return _nextPrime(100*max(1, nBytes//chunkBytes)), nBytes
+
+
+def withChunkCache(dataset, nSlots, nBytes, w0=0.75):
+    """Open a HDF dataset again with a given chunk cache.
+
+    HDF5 shares the datasets which are already open in the same file. In that case the chunk cache of the shared dataset can not be changed
+    and the returned dataset keeps the chunk cache of the file (see :data:`fileChunkCacheBytes`).
+
+    :param dataset: the dataset
+    :type dataset: :class:`h5py.Dataset`
+    :param nSlots: the number of slots of the cache hash table
+    :type nSlots: int
+    :param nBytes: the size of the cache in bytes
+    :type nBytes: int
+    :param w0: the preemption policy of the fully read chunks (see H5Pset_chunk_cache)
+    :type w0: float
+
+    :return: the dataset opened with the chunk cache
+    :rtype: :class:`h5py.Dataset`
+    """
+
+    dapl = h5py.h5p.create(h5py.h5p.DATASET_ACCESS)
+    dapl.set_chunk_cache(nSlots, nBytes, w0)
+
+    return h5py.Dataset(h5py.h5d.open(dataset.file.id, dataset.name.encode(), dapl=dapl))
+
+
+def datasetReader(dataset, axes=None):
+    """Return the fastest object for reading a HDF dataset by indexing.
+
+    - contiguous and unfiltered datasets are read through a memory map (see :func:`memoryMap`)
+    - compressed datasets whose filters can be decoded in Python are read by decoding their chunks in parallel (see
+      :class:`hdfviewer.utils.ParallelChunkReader.ParallelChunkReader`). When read frame by frame, the decoded chunks crossed by a frame are
+      cached.
+    - the other chunked datasets read frame by frame are opened again with a chunk cache holding all the chunks crossed by a frame (see
+      :func:`frameChunkCache`)
+    - the other datasets (and NumPy arrays) are returned as is
+
+    :param dataset: the dataset
+    :type dataset: :class:`h5py.Dataset` or :class:`numpy.ndarray`
+    :param axes: the (rows,columns,frames) axes of the dataset when it is read frame by frame. If None, the chunk cache is left unchanged.
+    :type axes: tuple or None
+
+    :return: the object to index
+    :rtype: :class:`numpy.memmap` or :class:`hdfviewer.utils.ParallelChunkReader.ParallelChunkReader` or :class:`h5py.Dataset` or
+        :class:`numpy.ndarray`
+    """
+
+    memmap = memoryMap(dataset)
+    if memmap is not None:
+        return memmap
+
+    if not isinstance(dataset, h5py.Dataset) or dataset.chunks is None:
+        return dataset
+
+    # The chunk cache only helps when a chunk spans several frames
+    spanning = axes is not None and dataset.chunks[axes[-1]] > 1
+    if spanning:
+        nSlots, nBytes = frameChunkCache([dataset.shape[a] for a in axes], [dataset.chunks[a] for a in axes], dataset.dtype.itemsize)
+
+    if filterPipeline(dataset):
+        return ParallelChunkReader(dataset, nBytes if spanning else 0)
+
+    if not spanning:
+        return dataset
+
+    reader = withChunkCache(dataset, nSlots, nBytes)
+
+    # The dataset is shared with an open one whose chunk cache can not be changed
+    if reader.id.get_access_plist().get_chunk_cache()[1] != nBytes:
+        return dataset
+
+    return reader
@@ -0,0 +1,115 @@
+"""Cache for the results computed on HDF datasets (statistics, histograms ...).
+"""
+
+import collections
+import os
+import threading
+
+
+def fileKey(hdf):
+    """Return a key identifying a HDF file.
+
+    For files stored on disk, the key is built from the real path, the size and the modification time of the file so that
+    the key changes whenever the file is modified. For in-memory files, the key is built from the HDF file number.
+
+    :param hdf: the HDF file
+    :type hdf: :class:`h5py.File`
+
+    :return: the key
+    :rtype: tuple
+    """
+
+    filename = hdf.filename
+    if os.path.isfile(filename):
+        stat = os.stat(filename)
+        return (os.path.realpath(filename), stat.st_size, stat.st_mtime_ns)
+    else:
+        return ("fileno", hdf.id.fileno)
+
+
+def datasetKey(dataset):
+    """Return a key identifying a HDF dataset.
+
+    Views of a dataset (see :class:`hdfviewer.utils.DatasetView.DatasetView`) are identified by their underlying dataset and by the field
+    they view.
+
+    :param dataset: the dataset
+    :type dataset: :class:`h5py.Dataset`
+
+    :return: the key or None if the dataset is not a HDF dataset (e.g. a NumPy array)
+    :rtype: tuple or None
+    """
+
+    field = getattr(dataset, "field", None)
+    dataset = getattr(dataset, "source", dataset)
+
+    try:
+        key = fileKey(dataset.file) + (dataset.name, dataset.shape)
+    except AttributeError:
+        return None
+
+    return key if field is None else key + (field,)
+
+
+class DatasetCache(object):
+    """This class implements a thread-safe cache of results computed on HDF datasets.
+
+    The results are keyed by :func:`datasetKey` and optional extra parameters. Results computed on objects which are not HDF datasets are not cached.
+    When the cache is full, the least recently used results are discarded.
+
+    :param maxSize: the maximum number of results stored in the cache
+    :type maxSize: int
+    """
+
+    def __init__(self, maxSize=128):
+
+        self._maxSize = maxSize
+
+        self._results = collections.OrderedDict()
+
+        self._lock = threading.Lock()
+
+    def get(self, dataset, *parameters):
+        """Return a cached result.
+
+        :param dataset: the dataset
+        :type dataset: :class:`h5py.Dataset`
+        :param `*parameters`: the extra parameters the result depends on
+        :type `*parameters`: tuple
+
+        :return: the cached result or None if there is no such result
+        :rtype: object
+        """
+
+        key = datasetKey(dataset)
+        if key is None:
+            return None
+
+        key = key + parameters
+        with self._lock:
+            if key not in self._results:
+                return None
+            self._results.move_to_end(key)
+            return self._results[key]
+
+    def set(self, dataset, result, *parameters):
+        """Cache a result.
+
+        :param dataset: the dataset
+        :type dataset: :class:`h5py.Dataset`
+        :param result: the result to cache
+        :type result: object
+        :param `*parameters`: the extra parameters the result depends on
+        :type `*parameters`: tuple
+        """
+
+        key = datasetKey(dataset)
+        if key is None:
+            return
+
+        key = key + parameters
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self._maxSize:
+                self._results.popitem(last=False)
@@ -0,0 +1,419 @@
+"""Chunk-wise comparison of the datasets of two HDF files.
+"""
+
+import hashlib
+
+import numpy as np
+
+import h5py
+
+from hdfviewer.utils.ChunkStreamer import ChunkStreamer
+
+
+class DatasetComparisonError(Exception):
+    """Error handler for :mod:`DatasetComparison` related exceptions.
+    """
+
+    pass
+
+
+def _isNumeric(dtype):
+    """Return True if a type can be compared with a tolerance.
+
+    :param dtype: the type
+    :type dtype: :class:`numpy.dtype`
+
+    :return: True if the type is numeric or boolean
+    :rtype: bool
+    """
+
+    return np.issubdtype(dtype, np.number) or np.issubdtype(dtype, np.bool_)
+
+
+def _checksum(data):
+    """Compute the checksum of an array.
+
+    :param data: the array
+    :type data: :class:`numpy.ndarray`
+
+    :return: the checksum or None if the array has no buffer (e.g. variable-length strings)
+    :rtype: bytes or None
+    """
+
+    if data.dtype.hasobject:
+        return None
+
+    # hashlib releases the GIL for large buffers so that the blocks are hashed in parallel
+    return hashlib.blake2b(np.ascontiguousarray(data).data).digest()
+
+
+def datasetPaths(hdf):
+    """Return the paths of all the datasets of a HDF file.
+
+    :param hdf: the HDF file or group
+    :type hdf: :class:`h5py.File` or :class:`h5py.Group`
+
+    :return: the sorted absolute paths of the datasets
+    :rtype: list[str]
+    """
+
+    paths = []
+
+    def visitor(name, obj):
+        if isinstance(obj, h5py.Dataset):
+            paths.append(obj.name)
+
+    hdf.visititems(visitor)
+
+    return sorted(paths)
+
+
+class DifferenceDataset(object):
+    """This class implements a lazy view of the element-wise difference between two datasets.
+
+    The difference is only computed for the indexed selection, so that it can be displayed with :class:`hdfviewer.viewers.MplDataViewer.MplDataViewer`
+    or streamed block by block without loading the datasets. Unsigned and boolean types are promoted to signed types so that negative differences
+    are not wrapped around.
+
+    :param first: the first dataset
+    :type first: :class:`h5py.Dataset` or :class:`numpy.ndarray`
+    :param second: the second dataset
+    :type second: :class:`h5py.Dataset` or :class:`numpy.ndarray`
+
+    :raises: :class:`DatasetComparisonError`: if the datasets do not have the same shape or are not numeric
+    """
+
+    def __init__(self, first, second):
+
+        if first.shape != second.shape:
+            raise DatasetComparisonError("The datasets shapes ({first} and {second}) differ".format(first=first.shape, second=second.shape))
+
+        if not _isNumeric(first.dtype) or not _isNumeric(second.dtype):
+            raise DatasetComparisonError("The datasets types ({first} and {second}) are not numeric".format(first=first.dtype, second=second.dtype))
+
+        self._first = first
+
+        self._second = second
+
+        dtype = np.result_type(first.dtype, second.dtype)
+        if dtype.kind in "ub":
+            dtype = np.result_type(dtype, np.int8)
+        self._dtype = dtype
+
+    def __getitem__(self, key):
+
+        return np.subtract(np.asarray(self._first[key]), np.asarray(self._second[key]), dtype=self._dtype)
+
+    def __len__(self):
+
+        return self.shape[0]
+
+    @property
+    def chunks(self):
+        """Getter for the chunk shape of the difference.
+
+        :return: the chunk shape of the first dataset or None if it is not chunked
+        :rtype: tuple or None
+        """
+
+        return getattr(self._first, "chunks", None)
+
+    @property
+    def dtype(self):
+        """Getter for the type of the difference.
+
+        :return: the type
+        :rtype: :class:`numpy.dtype`
+        """
+
+        return self._dtype
+
+    @property
+    def ndim(self):
+        """Getter for the dimension of the difference.
+
+        :return: the dimension
+        :rtype: int
+        """
+
+        return len(self.shape)
+
+    @property
+    def shape(self):
+        """Getter for the shape of the difference.
+
+        :return: the shape
+        :rtype: tuple
+        """
+
+        return self._first.shape
+
+    @property
+    def size(self):
+        """Getter for the number of elements of the difference.
+
+        :return: the number of elements
+        :rtype: int
+        """
+
+        return int(np.prod(self.shape))
+
+
+class _DatasetPair(object):
+    """This class allows to read the same selection of two datasets so that they can be streamed together.
+
+    :param first: the first dataset
+    :type first: :class:`h5py.Dataset` or :class:`numpy.ndarray`
+    :param second: the second dataset
+    :type second: :class:`h5py.Dataset` or :class:`numpy.ndarray`
+    """
+
+    def __init__(self, first, second):
+
+        self._first = first
+
+        self._second = second
+
+    def __getitem__(self, key):
+
+        return np.asarray(self._first[key]), np.asarray(self._second[key])
+
+    @property
+    def chunks(self):
+
+        return getattr(self._first, "chunks", None)
+
+    @property
+    def dtype(self):
+
+        return self._first.dtype
+
+    @property
+    def shape(self):
+
+        return self._first.shape
+
+
+class DatasetDiff(object):
+    """This class implements the summary of the comparison of two datasets.
+
+    The blocks of the datasets are first compared through their checksums and only the blocks whose checksums differ are compared
+    element-wise. Hence, two datasets can be *different* at the binary level while being *within tolerance*.
+
+    :param path: the path of the datasets
+    :type path: str
+    :param status: the comparison status (one of the class constants)
+    :type status: str
+    """
+
+    IDENTICAL = "identical"
+
+    WITHIN_TOLERANCE = "within tolerance"
+
+    DIFFERENT = "different"
+
+    SHAPE_MISMATCH = "shape mismatch"
+
+    TYPE_MISMATCH = "type mismatch"
+
+    ONLY_IN_FIRST = "only in first file"
+
+    ONLY_IN_SECOND = "only in second file"
+
+    def __init__(self, path, status=None):
+
+        self.path = path
+
+        self.status = status
+
+        self.size = 0
+
+        self.nBlocks = 0
+
+        self.nDifferentBlocks = 0
+
+        self.nDifferentElements = 0
+
+        self.maxAbsDifference = None
+
+        self.differentBlocks = []
+
+    @classmethod
+    def fromArrays(cls, first, second, selection, rtol=1e-05, atol=1e-08):
+        """Build the summary of the comparison of two blocks.
+
+        :param first: the block of the first dataset
+        :type first: :class:`numpy.ndarray`
+        :param second: the block of the second dataset
+        :type second: :class:`numpy.ndarray`
+        :param selection: the block selection
+        :type selection: tuple of slice
+        :param rtol: the relative tolerance (see :func:`numpy.isclose`)
+        :type rtol: float
+        :param atol: the absolute tolerance (see :func:`numpy.isclose`)
+        :type atol: float
+
+        :return: the summary
+        :rtype: :class:`DatasetDiff`
+        """
+
+        diff = cls(None)
+        diff.size = first.size
+        diff.nBlocks = 1
+
+        checksum = _checksum(first)
+        if checksum is not None and first.dtype == second.dtype and checksum == _checksum(second):
+            return diff
+
+        if _isNumeric(first.dtype) and _isNumeric(second.dtype):
+            close = np.isclose(first, second, rtol=rtol, atol=atol, equal_nan=True)
+            diff.nDifferentElements = first.size - int(np.count_nonzero(close))
+            differences = np.abs(np.subtract(first, second, dtype=np.result_type(first.dtype, second.dtype, np.float64)))
+            differences = differences[~np.isnan(differences)]
+            if differences.size:
+                diff.maxAbsDifference = float(differences.max())
+        else:
+            diff.nDifferentElements = int(np.count_nonzero(first != second))
+
+        # Blocks which are only different at the binary level (e.g. NaN payloads, -0.0) are not reported
+        if diff.nDifferentElements > 0 or diff.maxAbsDifference:
+            diff.nDifferentBlocks = 1
+            diff.differentBlocks.append(selection)
+
+        return diff
+
+    def merge(self, other):
+        """Merge the summary of another block into this one.
+
+        :param other: the other summary
+        :type other: :class:`DatasetDiff`
+
+        :return: this summary
+        :rtype: :class:`DatasetDiff`
+        """
+
+        self.size += other.size
+        self.nBlocks += other.nBlocks
+        self.nDifferentBlocks += other.nDifferentBlocks
+        self.nDifferentElements += other.nDifferentElements
+        if other.maxAbsDifference is not None:
+            self.maxAbsDifference = other.maxAbsDifference if self.maxAbsDifference is None else max(self.maxAbsDifference, other.maxAbsDifference)
+        self.differentBlocks.extend(other.differentBlocks)
+
+        return self
+
+    def toHTML(self):
+        """Format the summary as a HTML table row.
+
+        :return: the HTML string
+        :rtype: str
+        """
+
+        cells = [self.path, self.status]
+        if self.status in (self.IDENTICAL, self.WITHIN_TOLERANCE, self.DIFFERENT):
+            cells.append("%d/%d" % (self.nDifferentElements, self.size))
+            cells.append("%d/%d" % (self.nDifferentBlocks, self.nBlocks))
+            cells.append("" if self.maxAbsDifference is None else "%.6g" % self.maxAbsDifference)
+        else:
+            cells.extend([""]*3)
+
+        return "<tr>%s</tr>" % "".join("<td>%s</td>" % cell for cell in cells)
+
+
+def compareDatasets(first, second, path=None, rtol=1e-05, atol=1e-08, progress=None, maxWorkers=None):
+    """Compare two datasets block by block in a thread pool.
+
+    The blocks are aligned on the chunks of the first dataset (see :class:`hdfviewer.utils.ChunkStreamer.ChunkStreamer`). Each block is compared
+    through checksums first and element-wise with a tolerance only if the checksums differ.
+
+    :param first: the first dataset
+    :type first: :class:`h5py.Dataset` or :class:`numpy.ndarray`
+    :param second: the second dataset
+    :type second: :class:`h5py.Dataset` or :class:`numpy.ndarray`
+    :param path: the path reported in the summary. If None, the name of the first dataset is used.
+    :type path: str or None
+    :param rtol: the relative tolerance (see :func:`numpy.isclose`)
+    :type rtol: float
+    :param atol: the absolute tolerance (see :func:`numpy.isclose`)
+    :type atol: float
+    :param progress: if not None, the function called each time a block has been compared with the number of compared blocks and the total number of blocks
+    :type progress: callable or None
+    :param maxWorkers: the number of worker threads
+    :type maxWorkers: int or None
+
+    :return: the summary of the comparison
+    :rtype: :class:`DatasetDiff`
+    """
+
+    path = getattr(first, "name", None) if path is None else path
+
+    # The datasets with a null dataspace (h5py.Empty) have no element to stream
+    if first.shape is None or second.shape is None:
+        return DatasetDiff(path, DatasetDiff.IDENTICAL if first.shape == second.shape else DatasetDiff.SHAPE_MISMATCH)
+
+    if first.shape != second.shape:
+        return DatasetDiff(path, DatasetDiff.SHAPE_MISMATCH)
+
+    if first.dtype != second.dtype and not (_isNumeric(first.dtype) and _isNumeric(second.dtype)):
+        return DatasetDiff(path, DatasetDiff.TYPE_MISMATCH)
+
+    streamer = ChunkStreamer(_DatasetPair(first, second),
+                             lambda data, selection: DatasetDiff.fromArrays(data[0], data[1], selection, rtol, atol),
+                             lambda a, b: a.merge(b),
+                             progress=progress,
+                             maxWorkers=maxWorkers)
+
+    diff = streamer.run() or DatasetDiff(None)
+    diff.path = path
+
+    if diff.nDifferentElements > 0:
+        diff.status = DatasetDiff.DIFFERENT
+    elif diff.nDifferentBlocks > 0:
+        diff.status = DatasetDiff.WITHIN_TOLERANCE
+    else:
+        diff.status = DatasetDiff.IDENTICAL
+
+    return diff
+
+
+def compareFiles(first, second, rtol=1e-05, atol=1e-08, progress=None, maxWorkers=None):
+    """Compare the datasets of two HDF files.
+
+    The datasets are matched by path and compared one after the other (see :func:`compareDatasets`). The datasets found in only one file
+    are reported as such.
+
+    :param first: the first file
+    :type first: :class:`h5py.File` or :class:`h5py.Group`
+    :param second: the second file
+    :type second: :class:`h5py.File` or :class:`h5py.Group`
+    :param rtol: the relative tolerance (see :func:`numpy.isclose`)
+    :type rtol: float
+    :param atol: the absolute tolerance (see :func:`numpy.isclose`)
+    :type atol: float
+    :param progress: if not None, the function called each time a dataset has been compared with the number of compared datasets and the total number of datasets
+    :type progress: callable or None
+    :param maxWorkers: the number of worker threads used for comparing each dataset
+    :type maxWorkers: int or None
+
+    :return: the summaries of the comparison of each dataset sorted by path
+    :rtype: list[:class:`DatasetDiff`]
+    """
+
+    firstPaths = set(datasetPaths(first))
+    secondPaths = set(datasetPaths(second))
+
+    paths = sorted(firstPaths | secondPaths)
+
+    diffs = []
+    for idx, path in enumerate(paths):
+        if path not in secondPaths:
+            diffs.append(DatasetDiff(path, DatasetDiff.ONLY_IN_FIRST))
+        elif path not in firstPaths:
+            diffs.append(DatasetDiff(path, DatasetDiff.ONLY_IN_SECOND))
+        else:
+            diffs.append(compareDatasets(first[path], second[path], path, rtol, atol, maxWorkers=maxWorkers))
+
+        if progress is not None:
+            progress(idx + 1, len(paths))
+
+    return diffs
@@ -0,0 +1,150 @@
+"""Out-of-core histograms of datasets.
+"""
+
+import numpy as np
+
+from hdfviewer.utils.ChunkStreamer import ChunkStreamer
+from hdfviewer.utils.DatasetCache import DatasetCache
+from hdfviewer.utils.DatasetStatistics import datasetStatistics
+
+_cache = DatasetCache()
+
+
+class DatasetHistogramError(Exception):
+    """:mod:`DatasetHistogram` specific exception"""
+
+    pass
+
+
+def histogramEdges(dataset, bins=256, log=False, progress=None, maxWorkers=None, statistics=None):
+    """Compute the bin edges of the histogram of a dataset.
+
+    The edges span the range of the finite values of the dataset which is taken from the given or cached statistics of the dataset or
+    computed in a first pass over the dataset (see :func:`hdfviewer.utils.DatasetStatistics.datasetStatistics`).
+
+    :param dataset: the dataset
+    :type dataset: :class:`h5py.Dataset` or :class:`numpy.ndarray`
+    :param bins: the number of bins
+    :type bins: int
+    :param log: if True the bins are logarithmically spaced and span the positive values of the dataset otherwise they are evenly spaced
+    :type log: bool
+    :param progress: see :class:`hdfviewer.utils.ChunkStreamer.ChunkStreamer`
+    :type progress: callable or None
+    :param maxWorkers: see :class:`hdfviewer.utils.ChunkStreamer.ChunkStreamer`
+    :type maxWorkers: int or None
+    :param statistics: the statistics of the dataset. If None, they are computed.
+    :type statistics: :class:`hdfviewer.utils.DatasetStatistics.StatisticsAccumulator` or None
+
+    :return: the bin edges
+    :rtype: :class:`numpy.ndarray`
+
+    :raises: :class:`DatasetHistogramError`: if the dataset has no finite value (or no finite positive value for logarithmic bins)
+    """
+
+    if statistics is None:
+        statistics = datasetStatistics(dataset, progress, maxWorkers)
+
+    if log:
+        if not np.isfinite(statistics.minPositive):
+            raise DatasetHistogramError("The dataset has no positive value")
+        vmin, vmax = float(statistics.minPositive), float(statistics.finiteMax)
+        if vmin == vmax:
+            vmin, vmax = vmin/2.0, vmax*2.0
+        return np.geomspace(vmin, vmax, bins+1)
+    else:
+        if not np.isfinite(statistics.finiteMin):
+            raise DatasetHistogramError("The dataset has no finite value")
+        vmin, vmax = float(statistics.finiteMin), float(statistics.finiteMax)
+        if vmin == vmax:
+            vmin, vmax = vmin - 0.5, vmax + 0.5
+        return np.linspace(vmin, vmax, bins+1)
+
+
+def cachedHistogram(dataset, bins=256, log=False):
+    """Return the histogram of a dataset if it has already been computed.
+
+    :param dataset: the dataset
+    :type dataset: :class:`h5py.Dataset`
+    :param bins: the number of bins
+    :type bins: int
+    :param log: if True the bins are logarithmically spaced otherwise they are evenly spaced
+    :type log: bool
+
+    :return: the histogram counts and bin edges or None if the histogram has not been computed yet
+    :rtype: tuple of :class:`numpy.ndarray` or None
+    """
+
+    return _cache.get(dataset, bins, log)
+
+
+def histogramStreamer(dataset, edges, progress=None, maxWorkers=None, log=None):
+    """Return a streamer computing the histogram of a dataset block by block for a given set of bin edges.
+
+    :param dataset: the dataset
+    :type dataset: :class:`h5py.Dataset` or :class:`numpy.ndarray`
+    :param edges: the bin edges
+    :type edges: :class:`numpy.ndarray`
+    :param progress: see :class:`hdfviewer.utils.ChunkStreamer.ChunkStreamer`
+    :type progress: callable or None
+    :param maxWorkers: see :class:`hdfviewer.utils.ChunkStreamer.ChunkStreamer`
+    :type maxWorkers: int or None
+    :param log: if not None, the bin spacing of the edges (see :func:`histogramEdges`): once the streamer has completed, the histogram is
+        cached and can be retrieved with :func:`cachedHistogram`
+    :type log: bool or None
+
+    :return: the streamer. Its result is the histogram counts.
+    :rtype: :class:`hdfviewer.utils.ChunkStreamer.ChunkStreamer`
+    """
+
+    # Evenly spaced bins are passed as a range to benefit from the fast path of numpy.histogram
+    uniform = np.allclose(np.diff(edges), edges[1] - edges[0])
+    bins = len(edges) - 1 if uniform else edges
+    histogramRange = (edges[0], edges[-1]) if uniform else None
+
+    def blockHistogram(data, selection):
+        data = np.asarray(data).ravel()
+        if np.issubdtype(data.dtype, np.inexact):
+            data = data[np.isfinite(data)]
+        return np.histogram(data, bins=bins, range=histogramRange)[0]
+
+    def finalize(counts):
+        counts = counts if counts is not None else np.zeros(len(edges)-1, dtype=np.int64)
+        if log is not None:
+            _cache.set(dataset, (counts, edges), len(edges)-1, log)
+        return counts
+
+    return ChunkStreamer(dataset,
+                         blockHistogram,
+                         np.add,
+                         finalize=finalize,
+                         progress=progress,
+                         maxWorkers=maxWorkers)
+
+
+def datasetHistogram(dataset, bins=256, log=False, progress=None, maxWorkers=None):
+    """Compute the histogram of a dataset without loading it in memory.
+
+    The histogram is cached per dataset, number of bins and bin spacing.
+
+    :param dataset: the dataset
+    :type dataset: :class:`h5py.Dataset` or :class:`numpy.ndarray`
+    :param bins: the number of bins
+    :type bins: int
+    :param log: if True the bins are logarithmically spaced otherwise they are evenly spaced
+    :type log: bool
+    :param progress: see :class:`hdfviewer.utils.ChunkStreamer.ChunkStreamer`
+    :type progress: callable or None
+    :param maxWorkers: see :class:`hdfviewer.utils.ChunkStreamer.ChunkStreamer`
+    :type maxWorkers: int or None
+
+    :return: the histogram counts and bin edges
+    :rtype: tuple of :class:`numpy.ndarray`
+    """
+
+    histogram = cachedHistogram(dataset, bins, log)
+    if histogram is None:
+        edges = histogramEdges(dataset, bins, log, progress, maxWorkers)
+        counts = histogramStreamer(dataset, edges, progress, maxWorkers, log).run()
+        histogram = (counts, edges)
+
+    return histogram
@@ -0,0 +1,217 @@
+"""Out-of-core statistics of datasets.
+"""
+
+import math
+
+import numpy as np
+
+from hdfviewer.utils.ChunkStreamer import ChunkStreamer
+from hdfviewer.utils.DatasetCache import DatasetCache
+
+_cache = DatasetCache()
+
+
+class StatisticsAccumulator(object):
+    """This class implements a mergeable accumulator of the statistics of a dataset.
+
+    Each block of the dataset is reduced to an accumulator and the accumulators are merged pairwise. The mean and the variance are
+    merged using the parallel algorithm of Chan et al. so that the result does not depend on the order in which the blocks are merged.
+    NaN values are counted but excluded from the other statistics. The smallest positive value and the extrema of the finite values are also
+    tracked for setting up logarithmic scales and histogram bins.
+    """
+
+    def __init__(self):
+
+        self.size = 0
+
+        self.count = 0
+
+        self.nanCount = 0
+
+        self.nonZeroCount = 0
+
+        self.min = math.inf
+
+        self.max = -math.inf
+
+        self.minPositive = math.inf
+
+        self.finiteMin = math.inf
+
+        self.finiteMax = -math.inf
+
+        self.mean = 0.0
+
+        self.m2 = 0.0
+
+    @classmethod
+    def fromArray(cls, data):
+        """Build an accumulator from an array.
+
+        :param data: the array
+        :type data: :class:`numpy.ndarray`
+
+        :return: the accumulator
+        :rtype: :class:`StatisticsAccumulator`
+        """
+
+        data = np.asarray(data).ravel()
+
+        accumulator = cls()
+        accumulator.size = data.size
+
+        if np.issubdtype(data.dtype, np.inexact):
+            nanMask = np.isnan(data)
+            accumulator.nanCount = int(np.count_nonzero(nanMask))
+            if accumulator.nanCount:
+                data = data[~nanMask]
+
+        accumulator.count = data.size
+        if accumulator.count == 0:
+            return accumulator
+
+        accumulator.nonZeroCount = int(np.count_nonzero(data))
+        accumulator.min = data.min()
+        accumulator.max = data.max()
+        if not np.iscomplexobj(data):
+            positive = data[data > 0]
+            if positive.size:
+                accumulator.minPositive = positive.min()
+            if np.isfinite(accumulator.min) and np.isfinite(accumulator.max):
+                accumulator.finiteMin, accumulator.finiteMax = accumulator.min, accumulator.max
+            else:
+                finite = data[np.isfinite(data)]
+                if finite.size:
+                    accumulator.finiteMin, accumulator.finiteMax = finite.min(), finite.max()
+        accumulator.mean = data.mean(dtype=np.complex128 if np.iscomplexobj(data) else np.float64)
+        accumulator.m2 = float(np.sum(np.abs(data - accumulator.mean)**2))
+
+        return accumulator
+
+    @property
+    def std(self):
+        """Getter for the standard deviation.
+
+        :return: the standard deviation
+        :rtype: float
+        """
+
+        return math.sqrt(self.m2/self.count) if self.count else math.nan
+
+    @property
+    def nonZeroFraction(self):
+        """Getter for the fraction of non-zero values.
+
+        :return: the fraction of non-zero values among the non-NaN values
+        :rtype: float
+        """
+
+        return self.nonZeroCount/self.count if self.count else math.nan
+
+    def merge(self, other):
+        """Merge another accumulator into this one.
+
+        :param other: the accumulator to merge
+        :type other: :class:`StatisticsAccumulator`
+
+        :return: this accumulator
+        :rtype: :class:`StatisticsAccumulator`
+        """
+
+        count = self.count + other.count
+        if other.count:
+            delta = other.mean - self.mean
+            self.mean = self.mean + delta*other.count/count
+            self.m2 = self.m2 + other.m2 + abs(delta)**2*self.count*other.count/count
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self.minPositive = min(self.minPositive, other.minPositive)
+            self.finiteMin = min(self.finiteMin, other.finiteMin)
+            self.finiteMax = max(self.finiteMax, other.finiteMax)
+
+        self.size += other.size
+        self.count = count
+        self.nanCount += other.nanCount
+        self.nonZeroCount += other.nonZeroCount
+
+        return self
+
+    def toHTML(self):
+        """Format the statistics in HTML.
+
+        :return: the HTML string
+        :rtype: str
+        """
+
+        statistics = []
+        statistics.append("<i>Minimum: %s</i>" % self.min)
+        statistics.append("<i>Maximum: %s</i>" % self.max)
+        statistics.append("<i>Mean: %s</i>" % self.mean)
+        statistics.append("<i>Standard deviation: %s</i>" % self.std)
+        statistics.append("<i>NaN count: %d</i>" % self.nanCount)
+        statistics.append("<i>Non-zero fraction: %.6g</i>" % self.nonZeroFraction)
+
+        return "<br>".join(statistics)
+
+
+def cachedStatistics(dataset):
+    """Return the statistics of a dataset if they have already been computed.
+
+    :param dataset: the dataset
+    :type dataset: :class:`h5py.Dataset`
+
+    :return: the statistics or None if they have not been computed yet
+    :rtype: :class:`StatisticsAccumulator` or None
+    """
+
+    return _cache.get(dataset)
+
+
+def statisticsStreamer(dataset, progress=None, maxWorkers=None):
+    """Return a streamer computing the statistics of a dataset block by block.
+
+    Once the streamer has completed, the statistics are cached and can be retrieved with :func:`cachedStatistics`.
+
+    :param dataset: the dataset
+    :type dataset: :class:`h5py.Dataset` or :class:`numpy.ndarray`
+    :param progress: see :class:`hdfviewer.utils.ChunkStreamer.ChunkStreamer`
+    :type progress: callable or None
+    :param maxWorkers: see :class:`hdfviewer.utils.ChunkStreamer.ChunkStreamer`
+    :type maxWorkers: int or None
+
+    :return: the streamer
+    :rtype: :class:`hdfviewer.utils.ChunkStreamer.ChunkStreamer`
+    """
+
+    def finalize(accumulator):
+        accumulator = accumulator if accumulator is not None else StatisticsAccumulator()
+        _cache.set(dataset, accumulator)
+        return accumulator
+
+    return ChunkStreamer(dataset,
+                         lambda data, selection: StatisticsAccumulator.fromArray(data),
+                         StatisticsAccumulator.merge,
+                         finalize=finalize,
+                         progress=progress,
+                         maxWorkers=maxWorkers)
+
+
+def datasetStatistics(dataset, progress=None, maxWorkers=None):
+    """Compute the statistics of a dataset without loading it in memory.
+
+    :param dataset: the dataset
+    :type dataset: :class:`h5py.Dataset` or :class:`numpy.ndarray`
+    :param progress: see :class:`hdfviewer.utils.ChunkStreamer.ChunkStreamer`
+    :type progress: callable or None
+    :param maxWorkers: see :class:`hdfviewer.utils.ChunkStreamer.ChunkStreamer`
+    :type maxWorkers: int or None
+
+    :return: the statistics
+    :rtype: :class:`StatisticsAccumulator`
+    """
+
+    statistics = cachedStatistics(dataset)
+    if statistics is None:
+        statistics = statisticsStreamer(dataset, progress, maxWorkers).run()
+
+    return statistics
@@ -0,0 +1,211 @@
+"""Lazy squeezed view of HDF datasets and NumPy arrays.
+"""
+
+import functools
+import time
+
+import numpy as np
+
+from hdfviewer.utils.DatasetAccess import datasetReader
+from hdfviewer.utils.IOAccounting import ioAccounting
+
+
+class DatasetView(object):
+    """This class implements a view of a dataset from which the dimensions equal to 1 have been removed.
+
+    Contrary to :func:`numpy.squeeze` which loads a HDF dataset as a whole, the view does not read anything until it is indexed, and then
+    only reads the indexed selection. Indexing the view always returns a :class:`numpy.ndarray`. The selections are read through the fastest
+    path available for the dataset (see :func:`hdfviewer.utils.DatasetAccess.datasetReader`): contiguous and unfiltered HDF datasets are
+    sliced from a read-only memory map without any copy, the chunks of compressed datasets are decoded in parallel and 3D chunked datasets use
+    a chunk cache holding the chunks crossed by a frame. With a shared cache, the large selections are shared with the other kernels of the
+    node (see :class:`hdfviewer.utils.SharedFrameCache.SharedFrameCache`).
+
+    .. code-block:: python
+       :caption: Example
+
+        view = DatasetView(hdf["/entry/data"]) # shape (1,1024,1024,100) --> (1024,1024,100)
+
+        frame = view[:,:,10] # only reads the frame 10
+
+    :param dataset: the dataset
+    :type dataset: :class:`h5py.Dataset` or :class:`numpy.ndarray`
+    :param sharedCache: the node-local cache of the selections shared by the kernels. If None, the selections are always read.
+    :type sharedCache: :class:`hdfviewer.utils.SharedFrameCache.SharedFrameCache` or None
+    :param field: for compound datasets, the field viewed. Only that field is read from the dataset (see h5py field selection). If None, the
+        whole elements are viewed.
+    :type field: str or None
+    """
+
+    def __init__(self, dataset, sharedCache=None, field=None):
+
+        self._dataset = dataset
+
+        self._sharedCache = sharedCache
+
+        self._field = field
+
+        self._axes = tuple(axis for axis, size in enumerate(dataset.shape) if size != 1)
+
+        # The frames of 3D views are read along their last axis
+        self._reader = datasetReader(dataset, self._axes if len(self._axes) == 3 else None)
+
+    def __array__(self, dtype=None, copy=None):
+
+        data = self[...]
+
+        return data if dtype is None else data.astype(dtype)
+
+    def __getitem__(self, key):
+
+        if not isinstance(key, tuple):
+            key = (key,)
+
+        if any(k is Ellipsis for k in key):
+            idx = [k is Ellipsis for k in key].index(True)
+            key = key[:idx] + (slice(None),)*(self.ndim - len(key) + 1) + key[idx+1:]
+
+        if len(key) > self.ndim:
+            raise IndexError("too many indices for the dataset view")
+
+        key = key + (slice(None),)*(self.ndim - len(key))
+
+        # The squeezed axes are indexed by 0 in the underlying dataset
+        fullKey = [0]*self._dataset.ndim
+        for axis, k in zip(self._axes, key):
+            fullKey[axis] = k
+
+        fullKey = tuple(fullKey)
+
+        # The memory maps are already shared by the kernels through the page cache
+        if self._sharedCache is not None and not isinstance(self._reader, np.memmap):
+            return self._sharedCache.get(self._dataset, fullKey, functools.partial(self._read, fullKey), self._field)
+
+        return self._read(fullKey)
+
+    def _read(self, key):
+        """Read a selection of the underlying dataset and account for the read (see :mod:`hdfviewer.utils.IOAccounting`).
+
+        :param key: the key, one index per axis of the underlying dataset
+        :type key: tuple
+
+        :return: the selection
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        reader = self._reader
+        if self._field is not None:
+            reader = reader[self._field] if isinstance(reader, np.ndarray) else reader.fields(self._field)
+
+        start = time.perf_counter()
+        data = np.asarray(reader[key])
+        seconds = time.perf_counter() - start
+
+        ioAccounting.record(self._dataset, key, data, seconds, getattr(self._reader, "lastRead", None))
+
+        return data
+
+    def __len__(self):
+
+        return self.shape[0]
+
+    @property
+    def chunks(self):
+        """Getter for the chunk shape of the view.
+
+        :return: the chunk shape or None if the underlying dataset is not chunked
+        :rtype: tuple or None
+        """
+
+        chunks = getattr(self._dataset, "chunks", None)
+        if chunks is None:
+            return None
+
+        return tuple(chunks[axis] for axis in self._axes)
+
+    @property
+    def dtype(self):
+        """Getter for the type of the view.
+
+        :return: the type
+        :rtype: :class:`numpy.dtype`
+        """
+
+        return self._dataset.dtype if self._field is None else self._dataset.dtype[self._field]
+
+    @property
+    def field(self):
+        """Getter for the field viewed.
+
+        :return: the field or None if the whole elements are viewed
+        :rtype: str or None
+        """
+
+        return self._field
+
+    @property
+    def ndim(self):
+        """Getter for the dimension of the view.
+
+        :return: the dimension
+        :rtype: int
+        """
+
+        return len(self._axes)
+
+    @property
+    def shape(self):
+        """Getter for the shape of the view.
+
+        :return: the shape
+        :rtype: tuple
+        """
+
+        return tuple(self._dataset.shape[axis] for axis in self._axes)
+
+    def refresh(self):
+        """Refresh the metadata of the underlying dataset.
+
+        For HDF datasets of a file opened in SWMR read mode, this updates the shape of the view with the data appended by the writer. The
+        squeezed axes are the ones of the view creation: an axis of dimension 1 which grows remains indexed by 0.
+
+        :return: the shape of the view
+        :rtype: tuple
+        """
+
+        for dataset in {id(d): d for d in (self._dataset, self._reader)}.values():
+            refresh = getattr(dataset, "refresh", None)
+            if refresh is not None:
+                refresh()
+
+        return self.shape
+
+    @property
+    def reader(self):
+        """Getter for the object the selections are read from.
+
+        :return: the memory map, the parallel chunk reader, the dataset opened with a chunk cache or the underlying dataset
+        :rtype: :class:`numpy.memmap` or :class:`hdfviewer.utils.ParallelChunkReader.ParallelChunkReader` or :class:`h5py.Dataset` or
+            :class:`numpy.ndarray`
+        """
+
+        return self._reader
+
+    @property
+    def size(self):
+        """Getter for the number of elements of the view.
+
+        :return: the number of elements
+        :rtype: int
+        """
+
+        return int(np.prod(self.shape))
+
+    @property
+    def source(self):
+        """Getter for the underlying dataset.
+
+        :return: the underlying dataset
+        :rtype: :class:`h5py.Dataset` or :class:`numpy.ndarray`
+        """
+
+        return self._dataset
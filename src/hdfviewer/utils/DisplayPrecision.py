@@ -0,0 +1,188 @@
+"""Reduction of the precision of the frames kept in memory for display.
+"""
+
+import numpy as np
+
+#: The supported display precisions
+displayPrecisions = ("full", "float32", "uint16")
+
+# The quantized value of NaN
+_nanCode = np.iinfo(np.uint16).max
+
+
+class DisplayPrecisionError(Exception):
+    """Error handler for :mod:`DisplayPrecision` related exceptions.
+    """
+
+    pass
+
+
+class QuantizedFrame(object):
+    """This class implements a frame quantized to 16 bits with a scale and an offset.
+
+    The finite values are mapped linearly onto [0,65534], 65535 standing for NaN. The infinite values are clipped to the extrema of the
+    finite values.
+
+    :param data: the quantized values
+    :type data: :class:`numpy.ndarray`
+    :param scale: the scale of the quantization
+    :type scale: float
+    :param offset: the offset of the quantization (i.e. the minimum of the finite values)
+    :type offset: float
+    """
+
+    def __init__(self, data, scale, offset):
+
+        self.data = data
+
+        self.scale = scale
+
+        self.offset = offset
+
+    @classmethod
+    def fromArray(cls, data):
+        """Quantize an array.
+
+        :param data: the array
+        :type data: :class:`numpy.ndarray`
+
+        :return: the quantized frame
+        :rtype: :class:`QuantizedFrame`
+        """
+
+        # The extrema of the integers are computed in floating point like the ones of the finite values
+        if not np.issubdtype(data.dtype, np.floating):
+            data = data.astype(np.float64)
+
+        finite = np.isfinite(data)
+        if not finite.any():
+            return cls(np.full(data.shape, _nanCode, dtype=np.uint16), 1.0, 0.0)
+
+        vmin, vmax = float(np.min(data, where=finite, initial=np.inf)), float(np.max(data, where=finite, initial=-np.inf))
+
+        scale = (vmax - vmin)/(_nanCode - 1) if vmax > vmin else 1.0
+
+        with np.errstate(invalid="ignore"):
+            quantized = np.rint((np.clip(data, vmin, vmax) - vmin)/scale)
+
+        return cls(np.where(np.isnan(data), _nanCode, quantized).astype(np.uint16), scale, vmin)
+
+    def __array__(self, dtype=None, copy=None):
+
+        data = self.toArray()
+
+        return data if dtype is None else data.astype(dtype)
+
+    @property
+    def nbytes(self):
+        """Getter for the size of the quantized values.
+
+        :return: the size in bytes
+        :rtype: int
+        """
+
+        return self.data.nbytes
+
+    @property
+    def shape(self):
+        """Getter for the shape of the frame.
+
+        :return: the shape
+        :rtype: tuple
+        """
+
+        return self.data.shape
+
+    def toArray(self):
+        """Restore the values of the frame.
+
+        :return: the values, within half the scale of the original ones (up to the float32 rounding)
+        :rtype: :class:`numpy.ndarray` of float32
+        """
+
+        data = (self.offset + self.scale*self.data.astype(np.float32)).astype(np.float32)
+        data[self.data == _nanCode] = np.nan
+
+        return data
+
+
+def displayType(dtype, precision):
+    """Return the type in which the values of a given type are reduced for display.
+
+    Only the types larger than the display precision are reduced: small integers are always kept as is.
+
+    :param dtype: the type of the values
+    :type dtype: :class:`numpy.dtype`
+    :param precision: the display precision (one of *full*, *float32* or *uint16*)
+    :type precision: str
+
+    :return: the reduced type or None if the values are kept as is
+    :rtype: :class:`numpy.dtype` or None
+    """
+
+    dtype = np.dtype(dtype)
+
+    if precision == "float32" and dtype.itemsize > 4:
+        return np.dtype(np.float32)
+    elif precision == "uint16" and dtype.itemsize > 2:
+        return np.dtype(np.uint16)
+
+    return None
+
+
+def reduceFrame(data, precision):
+    """Reduce the precision of a frame to be kept in memory.
+
+    :param data: the frame
+    :type data: :class:`numpy.ndarray`
+    :param precision: the display precision (one of *full*, *float32* or *uint16*)
+    :type precision: str
+
+    :return: the frame as is, converted to float32 or quantized to 16 bits
+    :rtype: :class:`numpy.ndarray` or :class:`QuantizedFrame`
+
+    :raises: :class:`DisplayPrecisionError`: if the display precision is unknown
+    """
+
+    if precision not in displayPrecisions:
+        raise DisplayPrecisionError("Unknown display precision ({precision}). Valid display precisions are: {precisions}".format(precision=precision, precisions=", ".join(displayPrecisions)))
+
+    dtype = displayType(data.dtype, precision)
+    if dtype is None:
+        return data
+    elif dtype == np.uint16:
+        return QuantizedFrame.fromArray(data)
+
+    return data.astype(dtype)
+
+
+def restoreFrame(frame):
+    """Return the values of a frame reduced by :func:`reduceFrame`.
+
+    :param frame: the frame
+    :type frame: :class:`numpy.ndarray` or :class:`QuantizedFrame`
+
+    :return: the values. The quantized frames are restored as float32.
+    :rtype: :class:`numpy.ndarray`
+    """
+
+    return frame.toArray() if isinstance(frame, QuantizedFrame) else frame
+
+
+def displayFrame(data, precision):
+    """Convert a frame read from a dataset into the array displayed by the viewers.
+
+    The displayed frame is never quantized: with the *uint16* display precision, it is converted to float32 like with the *float32* one.
+
+    :param data: the frame
+    :type data: :class:`numpy.ndarray`
+    :param precision: the display precision (one of *full*, *float32* or *uint16*)
+    :type precision: str
+
+    :return: the frame as is or as float32
+    :rtype: :class:`numpy.ndarray`
+
+    :raises: :class:`DisplayPrecisionError`: if the display precision is unknown
+    """
+
+    return reduceFrame(data, "float32" if precision == "uint16" else precision)
@@ -0,0 +1,269 @@
+"""Pool of the HDF files opened when resolving external links and virtual datasets.
+"""
+
+import collections
+import concurrent.futures
+import os
+import posixpath
+import threading
+
+import h5py
+
+from hdfviewer.utils.DatasetAccess import fileChunkCacheBytes, fileChunkCacheSlots
+
+#: The signature at the start of the HDF5 files (possibly after a user block)
+_signature = b"\x89HDF\r\n\x1a\n"
+
+
+class FileHandlePoolError(Exception):
+    """:class:`FileHandlePool` specific exception"""
+
+    pass
+
+
+def _checkFile(filename):
+    """Check that a file can be read: it exists and its first bytes can be read.
+
+    :param filename: the name of the file
+    :type filename: str
+
+    :raises: OSError: if the file can not be read
+    """
+
+    with open(filename, "rb") as f:
+        f.read(len(_signature))
+
+
+def linkTargetFilename(hdf, filename):
+    """Return the candidate paths of the target file of an external link or of the source file of a virtual dataset.
+
+    A relative file name is looked up, like HDF5 does, relative to the directory of the file holding the link, then relative to the current
+    working directory. The file name "." stands for the file holding the link.
+
+    :param hdf: the file holding the link
+    :type hdf: :class:`h5py.File`
+    :param filename: the file name stored in the link
+    :type filename: str
+
+    :return: the candidate paths
+    :rtype: list[str]
+    """
+
+    if filename == ".":
+        return [hdf.filename]
+
+    if os.path.isabs(filename):
+        return [filename]
+
+    return [os.path.join(os.path.dirname(os.path.abspath(hdf.filename)), filename), os.path.abspath(filename)]
+
+
+class FileHandlePool(object):
+    """This class implements a pool of HDF files opened with a timeout.
+
+    The files targeted by external links and the source files of virtual datasets may be missing or stored on slow or unreachable
+    filesystems. A file is first checked to be readable in a worker thread, without holding the HDF5 library lock, so that a stalled
+    filesystem only makes the check time out instead of blocking the kernel. The readable files are then opened by HDF5 and kept open, the least
+    recently used ones being released when the pool is full.
+
+    A check which timed out keeps running in the background: the file is reported as unreachable until the check completes.
+
+    .. code-block:: python
+       :caption: Example
+
+        pool = FileHandlePool(timeout=2.0)
+
+        target = pool.resolveExternalLink(hdf, "/entry/data")
+
+    :param maxOpen: the maximum number of files kept open
+    :type maxOpen: int
+    :param timeout: the maximum time in seconds for checking that a file is readable
+    :type timeout: float
+    :param `**kwargs`: the keyword arguments used for opening the files (see :class:`h5py.File`)
+    :type `**kwargs`: dict
+    """
+
+    def __init__(self, maxOpen=16, timeout=5.0, **kwargs):
+
+        self._maxOpen = maxOpen
+
+        self._timeout = timeout
+
+        self._kwargs = kwargs
+
+        self._files = collections.OrderedDict()
+
+        # The checks which timed out and are still running, per file
+        self._pendingChecks = {}
+
+        self._lock = threading.Lock()
+
+        self._executor = concurrent.futures.ThreadPoolExecutor(thread_name_prefix="file-check")
+
+    @property
+    def timeout(self):
+        """Getter for the maximum time for checking that a file is readable.
+
+        :return: the timeout in seconds
+        :rtype: float
+        """
+
+        return self._timeout
+
+    def check(self, filename):
+        """Check with the timeout of the pool that a file is readable.
+
+        :param filename: the name of the file
+        :type filename: str
+
+        :return: None if the file is readable or the reason why it is not
+        :rtype: str or None
+        """
+
+        filename = os.path.abspath(filename)
+
+        with self._lock:
+            if filename in self._files:
+                return None
+            future = self._pendingChecks.get(filename)
+            if future is None:
+                future = self._executor.submit(_checkFile, filename)
+
+        try:
+            future.result(timeout=self._timeout)
+        except concurrent.futures.TimeoutError:
+            with self._lock:
+                self._pendingChecks[filename] = future
+            future.add_done_callback(lambda f: self._pendingChecks.pop(filename, None))
+            return "the file could not be read within {:g} s".format(self._timeout)
+        except OSError as error:
+            return error.strerror or str(error)
+
+        return None
+
+    def open(self, filename):
+        """Open a HDF file or return it if it is already open.
+
+        :param filename: the name of the file
+        :type filename: str
+
+        :return: the file
+        :rtype: :class:`h5py.File`
+
+        :raises: :class:`FileHandlePoolError`: if the file is not readable within the timeout or is not a HDF file
+        """
+
+        filename = os.path.abspath(filename)
+
+        with self._lock:
+            hdf = self._files.get(filename)
+            if hdf is not None and hdf.id.valid:
+                self._files.move_to_end(filename)
+                return hdf
+
+        reason = self.check(filename)
+        if reason is not None:
+            raise FileHandlePoolError("Can not open {!r}: {}".format(filename, reason))
+
+        try:
+            hdf = h5py.File(filename, "r", **self._kwargs)
+        except OSError as error:
+            raise FileHandlePoolError("Can not open {!r}: {}".format(filename, error))
+
+        with self._lock:
+            self._files[filename] = hdf
+            # The evicted files are closed once their objects still displayed have been released
+            while len(self._files) > self._maxOpen:
+                self._files.popitem(last=False)
+
+        return hdf
+
+    def resolveExternalLink(self, group, name):
+        """Resolve an external link through the pool.
+
+        :param group: the group holding the link
+        :type group: :class:`h5py.Group`
+        :param name: the name of the link in the group
+        :type name: str
+
+        :return: the target object
+        :rtype: :class:`h5py.Group` or :class:`h5py.Dataset`
+
+        :raises: :class:`FileHandlePoolError`: if the link is not an external link, if the target file can not be opened or if the target
+            object does not exist
+        """
+
+        link = group.get(name, getlink=True)
+        if not isinstance(link, h5py.ExternalLink):
+            raise FileHandlePoolError("{!r} is not an external link".format(posixpath.join(group.name, name)))
+
+        reasons = []
+        for filename in linkTargetFilename(group.file, link.filename):
+            try:
+                hdf = self.open(filename)
+            except FileHandlePoolError as error:
+                reasons.append(str(error))
+                continue
+            if link.path not in hdf:
+                raise FileHandlePoolError("The object {!r} does not exist in {!r}".format(link.path, filename))
+            return hdf[link.path]
+
+        raise FileHandlePoolError("; ".join(reasons))
+
+    def virtualSources(self, dataset):
+        """Resolve the source files of a virtual dataset.
+
+        Only the files are checked: the source datasets are read by HDF5 itself when the virtual dataset is read.
+
+        :param dataset: the virtual dataset
+        :type dataset: :class:`h5py.Dataset`
+
+        :return: the source dataset path, the source file path and None if the file is readable or the reason why it is not, per source
+        :rtype: list of tuple
+        """
+
+        # The sources are often many blocks of a few files
+        resolved = {}
+
+        sources = []
+        for source in dataset.virtual_sources():
+            if source.file_name not in resolved:
+                reason = None
+                for filename in linkTargetFilename(dataset.file, source.file_name):
+                    reason = self.check(filename)
+                    if reason is None:
+                        break
+                resolved[source.file_name] = (filename, reason)
+            sources.append((source.dset_name,) + resolved[source.file_name])
+
+        return sources
+
+    def close(self):
+        """Close all the files of the pool.
+        """
+
+        with self._lock:
+            for hdf in self._files.values():
+                hdf.close()
+            self._files.clear()
+
+
+_defaultPool = None
+
+_defaultPoolLock = threading.Lock()
+
+
+def defaultPool():
+    """Return the pool shared by the viewers.
+
+    :return: the pool
+    :rtype: :class:`FileHandlePool`
+    """
+
+    global _defaultPool
+
+    with _defaultPoolLock:
+        if _defaultPool is None:
+            _defaultPool = FileHandlePool(rdcc_nbytes=fileChunkCacheBytes, rdcc_nslots=fileChunkCacheSlots)
+
+    return _defaultPool
@@ -0,0 +1,109 @@
+"""Background reading of the frames of 3D datasets.
+"""
+
+import concurrent.futures
+import threading
+
+
+class FramePrefetcher(object):
+    """This class allows to read the frames of a 3D dataset ahead of time in a background thread pool.
+
+    The frames are indexed along the last axis of the dataset. Only the frames of the current prefetch window are kept: the frames which
+    fall out of the window are discarded (or cancelled if they have not been read yet) so that the memory used by the prefetcher is bounded.
+
+    :param dataset: the 3D dataset
+    :type dataset: :class:`hdfviewer.utils.DatasetView.DatasetView` or :class:`numpy.ndarray`
+    :param maxWorkers: the number of reading threads
+    :type maxWorkers: int
+    :param region: the (rows,columns) slices of the frames to read, possibly strided. If None, the whole frames are read.
+    :type region: tuple of slice or None
+    :param convert: the callable applied to the frames when they are read (e.g. :func:`hdfviewer.utils.DisplayPrecision.reduceFrame`). If
+        None, the frames are kept as read.
+    :type convert: callable or None
+    """
+
+    def __init__(self, dataset, maxWorkers=2, region=None, convert=None):
+
+        self._dataset = dataset
+
+        self._convert = convert
+
+        self._region = region if region is not None else (slice(None), slice(None))
+
+        self._executor = concurrent.futures.ThreadPoolExecutor(maxWorkers)
+
+        self._frames = {}
+
+        self._lock = threading.Lock()
+
+    def _read(self, frame):
+        """Read a frame.
+
+        :param frame: the frame index
+        :type frame: int
+
+        :return: the frame
+        :rtype: :class:`numpy.ndarray` (or the result of *convert*)
+        """
+
+        data = self._dataset[self._region + (frame,)]
+
+        return data if self._convert is None else self._convert(data)
+
+    @property
+    def region(self):
+        """Getter for the region of the frames which are read.
+
+        :return: the (rows,columns) slices
+        :rtype: tuple of slice
+        """
+
+        return self._region
+
+    def get(self, frame):
+        """Return a frame.
+
+        If the frame has been prefetched, its (possibly pending) read is used otherwise the frame is read synchronously.
+
+        :param frame: the frame index
+        :type frame: int
+
+        :return: the frame
+        :rtype: :class:`numpy.ndarray` (or the result of *convert*)
+        """
+
+        with self._lock:
+            future = self._frames.get(frame)
+
+        if future is None or future.cancelled():
+            return self._read(frame)
+
+        return future.result()
+
+    def prefetch(self, frames):
+        """Set the prefetch window.
+
+        The frames of the window which are not already read or being read are submitted to the thread pool.
+
+        :param frames: the indexes of the frames to prefetch
+        :type frames: iterable of int
+        """
+
+        frames = set(frames)
+
+        with self._lock:
+            for frame in list(self._frames):
+                if frame not in frames:
+                    self._frames.pop(frame).cancel()
+
+            for frame in sorted(frames):
+                if frame not in self._frames:
+                    self._frames[frame] = self._executor.submit(self._read, frame)
+
+    def shutdown(self):
+        """Discard the prefetched frames and stop the thread pool.
+        """
+
+        self.prefetch([])
+
+        self._executor.shutdown(wait=False)
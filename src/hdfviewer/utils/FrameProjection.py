@@ -0,0 +1,216 @@
+"""Out-of-core projections of 3D datasets along their frame axis.
+"""
+
+import numpy as np
+
+from hdfviewer.utils.ChunkStreamer import ChunkStreamer
+from hdfviewer.utils.DatasetCache import DatasetCache
+
+_cache = DatasetCache()
+
+#: The supported projections
+projections = ("sum", "max", "mean")
+
+
+class FrameProjectionError(Exception):
+    """Error handler for :mod:`FrameProjection` related exceptions.
+    """
+
+    pass
+
+
+class ProjectionAccumulator(object):
+    """This class implements a mergeable accumulator of the projections of a 3D dataset along its frame (i.e. last) axis.
+
+    Each block of the dataset is reduced to an accumulator covering only the rows and columns of the block. Merging two accumulators
+    results in an accumulator covering the whole frame, in which the sums and the frame counts are added and the maxima are combined.
+    NaN values are ignored by the maximum.
+
+    :param shape: the (rows,columns) shape of a frame
+    :type shape: tuple
+    :param region: the (rows,columns) slices of the frame covered by the accumulator. If None, the whole frame is covered.
+    :type region: tuple of slice or None
+    :param dtype: the type of the sums and maxima. With float32 (display precision), the accumulator takes half the memory.
+    :type dtype: :class:`numpy.dtype`
+    """
+
+    def __init__(self, shape, region=None, dtype=np.float64):
+
+        self.shape = tuple(shape)
+
+        self.region = region if region is not None else (slice(0, self.shape[0]), slice(0, self.shape[1]))
+
+        regionShape = tuple(s.stop - s.start for s in self.region)
+
+        self.sum = np.zeros(regionShape, dtype=dtype)
+
+        self.max = np.full(regionShape, -np.inf, dtype=dtype)
+
+        self.count = np.zeros(regionShape, dtype=np.int64 if np.dtype(dtype).itemsize > 4 else np.int32)
+
+    @classmethod
+    def fromArray(cls, data, selection, shape, dtype=np.float64):
+        """Build an accumulator from a block of a 3D dataset.
+
+        :param data: the block data
+        :type data: :class:`numpy.ndarray`
+        :param selection: the block selection
+        :type selection: tuple of slice
+        :param shape: the (rows,columns) shape of a frame
+        :type shape: tuple
+        :param dtype: the type of the sums and maxima
+        :type dtype: :class:`numpy.dtype`
+
+        :return: the accumulator
+        :rtype: :class:`ProjectionAccumulator`
+        """
+
+        accumulator = cls(shape, selection[:2], dtype)
+        if data.shape[2] == 0:
+            return accumulator
+
+        accumulator.sum = data.sum(axis=2, dtype=dtype)
+        accumulator.max = np.fmax.reduce(data, axis=2).astype(dtype)
+        accumulator.count[...] = data.shape[2]
+
+        return accumulator
+
+    @property
+    def mean(self):
+        """Getter for the mean projection.
+
+        :return: the mean projection
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > 0, self.sum/self.count, np.nan).astype(self.sum.dtype, copy=False)
+
+    def _add(self, other):
+        """Add an accumulator to this one in place.
+
+        :param other: the accumulator to add. Its region must be contained in the region of this accumulator.
+        :type other: :class:`ProjectionAccumulator`
+        """
+
+        region = tuple(slice(o.start - s.start, o.stop - s.start) for o, s in zip(other.region, self.region))
+
+        self.sum[region] += other.sum
+        np.fmax(self.max[region], other.max, out=self.max[region])
+        self.count[region] += other.count
+
+    def merge(self, other):
+        """Merge another accumulator with this one.
+
+        :param other: the other accumulator
+        :type other: :class:`ProjectionAccumulator`
+
+        :return: the merged accumulator covering the whole frame
+        :rtype: :class:`ProjectionAccumulator`
+        """
+
+        merged = self
+        if self.sum.shape != self.shape:
+            merged = ProjectionAccumulator(self.shape, dtype=self.sum.dtype)
+            merged._add(self)
+
+        merged._add(other)
+
+        return merged
+
+    def projection(self, name):
+        """Return a projection.
+
+        :param name: the projection (one of *sum*, *max* or *mean*)
+        :type name: str
+
+        :return: the projection
+        :rtype: :class:`numpy.ndarray`
+
+        :raises: :class:`FrameProjectionError`: if the projection is unknown
+        """
+
+        if name == "sum":
+            return self.sum
+        elif name == "max":
+            return np.where(self.count > 0, self.max, np.nan)
+        elif name == "mean":
+            return self.mean
+        else:
+            raise FrameProjectionError("Unknown projection ({name}). Valid projections are: {projections}".format(name=name, projections=", ".join(projections)))
+
+
+def cachedProjection(dataset, dtype=np.float64):
+    """Return the projections of a 3D dataset if they have already been computed.
+
+    :param dataset: the 3D dataset
+    :type dataset: :class:`hdfviewer.utils.DatasetView.DatasetView` or :class:`h5py.Dataset`
+    :param dtype: the type of the sums and maxima of the projections
+    :type dtype: :class:`numpy.dtype`
+
+    :return: the projections or None if they have not been computed yet
+    :rtype: :class:`ProjectionAccumulator` or None
+    """
+
+    return _cache.get(dataset, "projection", np.dtype(dtype).str)
+
+
+def projectionStreamer(dataset, progress=None, maxWorkers=None, dtype=np.float64):
+    """Return a streamer computing the sum, maximum and mean projections of a 3D dataset along its frame axis block by block.
+
+    The three projections are computed in a single pass. Once the streamer has completed, the projections are cached and can be retrieved
+    with :func:`cachedProjection`.
+
+    :param dataset: the 3D dataset
+    :type dataset: :class:`hdfviewer.utils.DatasetView.DatasetView` or :class:`h5py.Dataset` or :class:`numpy.ndarray`
+    :param progress: see :class:`hdfviewer.utils.ChunkStreamer.ChunkStreamer`
+    :type progress: callable or None
+    :param maxWorkers: see :class:`hdfviewer.utils.ChunkStreamer.ChunkStreamer`
+    :type maxWorkers: int or None
+    :param dtype: the type of the sums and maxima of the projections
+    :type dtype: :class:`numpy.dtype`
+
+    :return: the streamer
+    :rtype: :class:`hdfviewer.utils.ChunkStreamer.ChunkStreamer`
+    """
+
+    shape = dataset.shape[:2]
+
+    def finalize(accumulator):
+        # A single block (or no block at all) does not cover the whole frame
+        if accumulator is None:
+            accumulator = ProjectionAccumulator(shape, dtype=dtype)
+        elif accumulator.sum.shape != accumulator.shape:
+            accumulator = ProjectionAccumulator(shape, dtype=dtype).merge(accumulator)
+        _cache.set(dataset, accumulator, "projection", np.dtype(dtype).str)
+        return accumulator
+
+    return ChunkStreamer(dataset,
+                         lambda data, selection: ProjectionAccumulator.fromArray(data, selection, shape, dtype),
+                         ProjectionAccumulator.merge,
+                         finalize=finalize,
+                         progress=progress,
+                         maxWorkers=maxWorkers)
+
+
+def frameProjection(dataset, name, progress=None, maxWorkers=None):
+    """Compute a projection of a 3D dataset along its frame axis without loading it in memory.
+
+    :param dataset: the 3D dataset
+    :type dataset: :class:`hdfviewer.utils.DatasetView.DatasetView` or :class:`h5py.Dataset` or :class:`numpy.ndarray`
+    :param name: the projection (one of *sum*, *max* or *mean*)
+    :type name: str
+    :param progress: see :class:`hdfviewer.utils.ChunkStreamer.ChunkStreamer`
+    :type progress: callable or None
+    :param maxWorkers: see :class:`hdfviewer.utils.ChunkStreamer.ChunkStreamer`
+    :type maxWorkers: int or None
+
+    :return: the projection
+    :rtype: :class:`numpy.ndarray`
+    """
+
+    accumulator = cachedProjection(dataset)
+    if accumulator is None:
+        accumulator = projectionStreamer(dataset, progress, maxWorkers).run()
+
+    return accumulator.projection(name)
@@ -0,0 +1,355 @@
+"""Static HTML report of the content of a HDF file.
+"""
+
+import base64
+import collections
+import concurrent.futures
+import functools
+import html
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+import h5py
+
+from hdfviewer import __version__
+from hdfviewer.utils.ChunkStreamer import ChunkStreamer
+from hdfviewer.utils.DatasetStatistics import StatisticsAccumulator
+from hdfviewer.utils.DatasetView import DatasetView
+from hdfviewer.utils.IOAccounting import datasetFilters
+from hdfviewer.utils.MemoryBudget import previewSlices
+
+_style = """
+body { font-family: sans-serif; font-size: 14px; margin: 2em; }
+ul.tree { list-style: none; padding-left: 1.2em; }
+details > summary { cursor: pointer; }
+section.dataset { border-top: 1px solid #ccc; padding: 0.5em 0; }
+table { border-collapse: collapse; }
+td, th { border: 1px solid #ddd; padding: 2px 6px; text-align: left; vertical-align: top; }
+.error { color: #b00; }
+.link { color: #666; font-style: italic; }
+"""
+
+
+class HDFReportError(Exception):
+    """:class:`HDFReport` specific exception"""
+
+    pass
+
+
+@functools.lru_cache(maxsize=4)
+def _renderer(colormap, previewSize):
+    """Return the renderer of the previews of a worker.
+
+    :param colormap: the name of the MatPlotLib colormap
+    :type colormap: str
+    :param previewSize: the maximum (rows,columns) size of the previews
+    :type previewSize: tuple
+
+    :return: the renderer
+    :rtype: :class:`hdfviewer.viewers.NpImageRenderer._NpImageRenderer`
+    """
+
+    from hdfviewer.viewers.NpImageRenderer import _NpImageRenderer
+
+    return _NpImageRenderer(colormap, previewSize)
+
+
+def _sparkline(values, width=400, height=80):
+    """Render a 1D array as an inline SVG line.
+
+    :param values: the values
+    :type values: :class:`numpy.ndarray`
+    :param width: the width of the line in pixels
+    :type width: int
+    :param height: the height of the line in pixels
+    :type height: int
+
+    :return: the SVG element
+    :rtype: str
+    """
+
+    values = np.asarray(values, dtype=np.float64)
+    finite = np.isfinite(values)
+    if values.size < 2 or not finite.any():
+        return ""
+
+    vmin, vmax = values[finite].min(), values[finite].max()
+    span = vmax - vmin if vmax > vmin else 1.0
+
+    x = np.linspace(0, width, values.size)
+    y = height - (np.where(finite, values, vmin) - vmin)/span*height
+
+    points = " ".join("%.1f,%.1f" % point for point in zip(x, y))
+
+    return "<svg width='{w}' height='{h}'><polyline fill='none' stroke='#1f77b4' points='{p}'/></svg>".format(w=width, h=height, p=points)
+
+
+def _previewFrame(view, memoryBudget):
+    """Read the frame of a dataset displayed as its preview.
+
+    The frame is the one displayed by the viewers: the whole image of 2D datasets and the middle frame of 3D datasets (the middle index of
+    the extra axes of higher dimensional datasets). It is read with a stride when it does not fit in the memory budget.
+
+    :param view: the squeezed view of the dataset
+    :type view: :class:`hdfviewer.utils.DatasetView.DatasetView`
+    :param memoryBudget: the maximum number of bytes to read
+    :type memoryBudget: int
+
+    :return: the frame, possibly strided
+    :rtype: :class:`numpy.ndarray`
+    """
+
+    sampling = previewSlices((slice(0, view.shape[0]), slice(0, view.shape[1])), view.dtype, memoryBudget)
+
+    return view[sampling + tuple(n//2 for n in view.shape[2:])]
+
+
+def _datasetStatistics(view, memoryBudget):
+    """Compute the statistics of a dataset block by block in the calling process.
+
+    :param view: the squeezed view of the dataset
+    :type view: :class:`hdfviewer.utils.DatasetView.DatasetView`
+    :param memoryBudget: the maximum number of bytes read at once
+    :type memoryBudget: int
+
+    :return: the statistics
+    :rtype: :class:`hdfviewer.utils.DatasetStatistics.StatisticsAccumulator`
+    """
+
+    streamer = ChunkStreamer(view,
+                             lambda data, selection: StatisticsAccumulator.fromArray(data),
+                             StatisticsAccumulator.merge,
+                             maxWorkers=1,
+                             targetBytes=memoryBudget)
+
+    return streamer.run() or StatisticsAccumulator()
+
+
+def _summarizeDataset(filename, path, memoryBudget, previewSize, colormap, statistics):
+    """Build the HTML summary of a dataset. This is the task run by the worker processes.
+
+    The file is opened by the worker itself as the HDF objects can not be sent to another process. Only the HTML fragment is sent back.
+
+    :param filename: the name of the file
+    :type filename: str
+    :param path: the path to the dataset
+    :type path: str
+    :param memoryBudget: the maximum number of bytes read at once
+    :type memoryBudget: int
+    :param previewSize: the maximum (rows,columns) size of the previews
+    :type previewSize: tuple
+    :param colormap: the name of the MatPlotLib colormap of the previews
+    :type colormap: str
+    :param statistics: if True the statistics of the numeric datasets are computed
+    :type statistics: bool
+
+    :return: the HTML summary
+    :rtype: str
+    """
+
+    try:
+        with h5py.File(filename, "r") as hdf:
+            dataset = hdf[path]
+
+            info = []
+            info.append("<i>Dimension: %s</i>" % str(dataset.shape))
+            info.append("<i>Type: %s</i>" % html.escape(str(dataset.dtype)))
+            info.append("<i>Chunks: %s</i>" % (str(dataset.chunks) if dataset.chunks is not None else "none (contiguous)"))
+            filters = datasetFilters(dataset)
+            info.append("<i>Filters: %s</i>" % (", ".join(filters) if filters else "none"))
+            info.append("<i>Storage size: %d bytes</i>" % dataset.id.get_storage_size())
+
+            parts = ["<br>".join(info)]
+
+            numeric = dataset.dtype.names is None and np.issubdtype(dataset.dtype, np.number)
+
+            # The datasets with a null dataspace (h5py.Empty) or without element have nothing to preview
+            if dataset.shape is None or dataset.size == 0:
+                return parts[0]
+
+            view = DatasetView(dataset)
+            if view.ndim == 0 or (dataset.size*dataset.dtype.itemsize <= 1024 and view.ndim <= 1):
+                value = dataset[()]
+                if isinstance(value, bytes):
+                    value = value.decode(errors="replace")
+                parts.append("<pre>%s</pre>" % html.escape(np.array2string(np.asarray(value), threshold=20, edgeitems=3)
+                                                           if isinstance(value, np.ndarray) else str(value)))
+            elif numeric and view.ndim == 1:
+                step = max(1, -(-view.shape[0]//(previewSize[1]*2)))
+                parts.append(_sparkline(view[::step]))
+            elif numeric:
+                frame = _previewFrame(view, memoryBudget)
+                png = _renderer(colormap, tuple(previewSize)).render(frame)
+                parts.append("<img alt='preview' src='data:image/png;base64,%s'>" % base64.b64encode(png).decode())
+
+            if numeric and statistics and view.ndim >= 1:
+                parts.append(_datasetStatistics(view, memoryBudget).toHTML())
+
+            return "<br>".join(part for part in parts if part)
+
+    except Exception as error:
+        return "<span class='error'>Error when summarizing the dataset: %s</span>" % html.escape(str(error))
+
+
+def _attributesTable(hdfObject):
+    """Build the HTML table of the attributes of a HDF object.
+
+    :param hdfObject: the HDF object
+    :type hdfObject: :class:`h5py.Group` or :class:`h5py.Dataset`
+
+    :return: the table or an empty string if the object has no attribute
+    :rtype: str
+    """
+
+    # The widgets are only needed for the size-limited previews of the attributes
+    from hdfviewer.widgets.AttributesTable import attributePreview
+
+    rows = []
+    for name in hdfObject.attrs:
+        try:
+            preview = attributePreview(hdfObject, name)
+        except Exception as error:
+            preview = "<error: %s>" % error
+        rows.append("<tr><td><b>%s</b></td><td><pre style='margin:0'>%s</pre></td></tr>" % (html.escape(name), html.escape(preview)))
+
+    return "<table>%s</table>" % "".join(rows) if rows else ""
+
+
+def _walk(group, datasets, visited):
+    """Build the HTML tree of a group without following the soft and external links.
+
+    :param group: the group
+    :type group: :class:`h5py.Group`
+    :param datasets: the list the (path,attributes table) of the datasets met for the first time are appended to
+    :type datasets: list
+    :param visited: the paths of the objects already met, per object
+    :type visited: dict
+
+    :return: the HTML list of the members of the group
+    :rtype: str
+    """
+
+    items = []
+    for name in group:
+        link = group.get(name, getlink=True)
+        path = group.name.rstrip("/") + "/" + name
+        label = html.escape(name)
+
+        if isinstance(link, h5py.SoftLink):
+            items.append("<li><span class='link'>%s &rarr; %s (soft link)</span></li>" % (label, html.escape(link.path)))
+            continue
+        elif isinstance(link, h5py.ExternalLink):
+            items.append("<li><span class='link'>%s &rarr; %s:%s (external link)</span></li>" % (label, html.escape(link.filename), html.escape(link.path)))
+            continue
+
+        try:
+            obj = group[name]
+        except Exception as error:
+            items.append("<li><span class='error'>%s: %s</span></li>" % (label, html.escape(str(error))))
+            continue
+
+        # The objects reachable through several hard links are described once
+        if obj.id in visited:
+            items.append("<li><span class='link'>%s &rarr; <a href='#%s'>%s</a> (hard link)</span></li>" % (label, html.escape(visited[obj.id]), html.escape(visited[obj.id])))
+            continue
+        visited[obj.id] = path
+
+        if isinstance(obj, h5py.Dataset):
+            datasets.append((path, _attributesTable(obj)))
+            items.append("<li><a href='#%s'>%s</a> <small>%s %s</small></li>" % (html.escape(path), label, str(obj.shape), html.escape(str(obj.dtype))))
+        elif isinstance(obj, h5py.Group):
+            items.append("<li><details><summary id='%s'>%s/</summary>%s%s</details></li>" % (html.escape(path), label, _attributesTable(obj), _walk(obj, datasets, visited)))
+        else:
+            items.append("<li>%s (named type)</li>" % label)
+
+    return "<ul class='tree'>%s</ul>" % "".join(items)
+
+
+def writeReport(filename, output, maxWorkers=None, memoryBudget=2**26, previewSize=(256, 256), colormap="viridis", statistics=True, progress=None):
+    """Write a self-contained static HTML report of the content of a HDF file.
+
+    The report is made of the tree of the groups with their attributes, and of a section per dataset with its attributes, its layout, a
+    downsampled preview (an image for 2D and higher dimensional datasets, a line for 1D datasets) and its statistics. The soft and external
+    links are listed without being followed.
+
+    The tree is built in the calling process. The dataset sections are computed in a pool of processes, each worker opening the file by
+    itself. The memory used is bounded: each worker reads at most *memoryBudget* bytes at once (strided previews, statistics computed block by
+    block) and at most twice as many sections as workers are pending, the sections being written to the report in order as soon as they are
+    available.
+
+    .. code-block:: python
+       :caption: Example
+
+        writeReport("scan.h5", "scan.html", maxWorkers=8)
+
+    :param filename: the name of the HDF file
+    :type filename: str
+    :param output: the name of the HTML file to write
+    :type output: str
+    :param maxWorkers: the number of worker processes. If None, the number of CPUs is used. If 0, the sections are computed in the calling process.
+    :type maxWorkers: int or None
+    :param memoryBudget: the maximum number of bytes read at once by a worker
+    :type memoryBudget: int
+    :param previewSize: the maximum (rows,columns) size of the previews
+    :type previewSize: tuple
+    :param colormap: the name of the MatPlotLib colormap of the previews
+    :type colormap: str
+    :param statistics: if True the statistics of the numeric datasets are computed (which reads them entirely)
+    :type statistics: bool
+    :param progress: the callable called with the number of sections written and the number of datasets
+    :type progress: callable or None
+
+    :return: the number of datasets of the report
+    :rtype: int
+
+    :raises: :class:`HDFReportError`: if the file does not exist
+    """
+
+    if not os.path.isfile(filename):
+        raise HDFReportError("The file {!r} does not exist".format(filename))
+
+    filename = os.path.abspath(filename)
+
+    datasets = []
+    with h5py.File(filename, "r") as hdf:
+        tree = "%s%s" % (_attributesTable(hdf), _walk(hdf, datasets, {}))
+
+    task = functools.partial(_summarizeDataset, filename, memoryBudget=memoryBudget, previewSize=tuple(previewSize), colormap=colormap, statistics=statistics)
+
+    with open(output, "w") as f:
+        f.write("<!DOCTYPE html>\n<html><head><meta charset='utf-8'><title>%s</title><style>%s</style></head><body>\n" % (html.escape(os.path.basename(filename)), _style))
+        f.write("<h1>%s</h1>\n" % html.escape(filename))
+        f.write("<p>Generated by hdfviewer %s on %s</p>\n" % (__version__, time.strftime("%Y-%m-%d %H:%M:%S")))
+        f.write("<h2>Tree</h2>\n%s\n<h2>Datasets</h2>\n" % tree)
+
+        def writeSection(index, summary):
+            path, attributes = datasets[index]
+            f.write("<section class='dataset' id='%s'><h3>%s</h3>%s%s</section>\n" % (html.escape(path), html.escape(path), attributes, summary))
+            if progress is not None:
+                progress(index + 1, len(datasets))
+
+        if maxWorkers == 0:
+            for index, (path, _) in enumerate(datasets):
+                writeSection(index, task(path))
+        else:
+            maxWorkers = maxWorkers or os.cpu_count() or 1
+            # The workers are spawned: forking a process which has opened HDF5 files is not safe
+            with concurrent.futures.ProcessPoolExecutor(maxWorkers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                pending = collections.deque()
+                nextIndex = 0
+                for index, (path, _) in enumerate(datasets):
+                    pending.append(executor.submit(task, path))
+                    # The sections are written in order, which bounds the number of summaries kept in memory
+                    while len(pending) >= 2*maxWorkers or (pending and pending[0].done()):
+                        writeSection(nextIndex, pending.popleft().result())
+                        nextIndex += 1
+                while pending:
+                    writeSection(nextIndex, pending.popleft().result())
+                    nextIndex += 1
+
+        f.write("</body></html>\n")
+
+    return len(datasets)
@@ -0,0 +1,395 @@
+"""Accounting of the reads of HDF datasets and estimates of the cost of reading their frames.
+"""
+
+import contextlib
+import threading
+
+import numpy as np
+
+import h5py
+
+from hdfviewer.utils.DatasetCache import DatasetCache
+
+_cache = DatasetCache()
+
+#: The names of the HDF5 filters (see https://portal.hdfgroup.org/display/support/Registered+Filter+Plugins)
+filterNames = {1: "gzip", 2: "shuffle", 3: "fletcher32", 4: "szip", 5: "nbit", 6: "scaleoffset",
+               307: "bzip2", 32000: "lzf", 32001: "blosc", 32004: "lz4", 32008: "bitshuffle", 32015: "zstd", 32017: "sz", 32026: "blosc2"}
+
+#: The interaction the reads made out of any interaction (e.g. by the background computations) are accounted to
+backgroundInteraction = "background"
+
+
+class IOStatistics(object):
+    """This class implements the counters of a set of reads.
+
+    :param reads: the number of reads
+    :type reads: int
+    :param bytesRead: the number of bytes read from the file (for the chunks which are not decoded by the viewer, estimated from the
+        compression ratio of the dataset)
+    :type bytesRead: int
+    :param bytesSelected: the number of bytes of the selections
+    :type bytesSelected: int
+    :param chunksTouched: the number of chunks crossed by the selections
+    :type chunksTouched: int
+    :param chunksDecompressed: the number of chunks decompressed (for the chunks which are not decoded by the viewer, the chunks touched
+        by the selections of filtered datasets, whether they are in the HDF5 chunk cache or not)
+    :type chunksDecompressed: int
+    :param seconds: the time spent in reading
+    :type seconds: float
+    """
+
+    fields = ("reads", "bytesRead", "bytesSelected", "chunksTouched", "chunksDecompressed", "seconds")
+
+    def __init__(self, reads=0, bytesRead=0, bytesSelected=0, chunksTouched=0, chunksDecompressed=0, seconds=0.0):
+
+        self.reads = reads
+
+        self.bytesRead = bytesRead
+
+        self.bytesSelected = bytesSelected
+
+        self.chunksTouched = chunksTouched
+
+        self.chunksDecompressed = chunksDecompressed
+
+        self.seconds = seconds
+
+    def __iadd__(self, other):
+
+        for field in self.fields:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+
+        return self
+
+    def __repr__(self):
+
+        return "IOStatistics({})".format(", ".join("{}={!r}".format(field, getattr(self, field)) for field in self.fields))
+
+    def asDict(self):
+        """Return the counters as a dictionary.
+
+        :return: the counters per name
+        :rtype: dict
+        """
+
+        return {field: getattr(self, field) for field in self.fields}
+
+    def toHTML(self):
+        """Format the counters in HTML.
+
+        :return: the HTML string
+        :rtype: str
+        """
+
+        statistics = []
+        statistics.append("<i>Reads: %d</i>" % self.reads)
+        statistics.append("<i>Bytes read: %.3g MiB</i>" % (self.bytesRead/2**20))
+        statistics.append("<i>Bytes selected: %.3g MiB</i>" % (self.bytesSelected/2**20))
+        statistics.append("<i>Read amplification: %.1f</i>" % (self.bytesRead/self.bytesSelected if self.bytesSelected else 1.0))
+        statistics.append("<i>Chunks touched: %d</i>" % self.chunksTouched)
+        statistics.append("<i>Chunks decompressed: %d</i>" % self.chunksDecompressed)
+        statistics.append("<i>Read time: %.3f s</i>" % self.seconds)
+
+        return "<br>".join(statistics)
+
+
+def datasetFilters(dataset):
+    """Return the names of the filters applied to the chunks of a HDF dataset.
+
+    :param dataset: the dataset
+    :type dataset: :class:`h5py.Dataset` or :class:`numpy.ndarray`
+
+    :return: the names of the filters in encoding order. The unknown filters are named after their identifier.
+    :rtype: list[str]
+    """
+
+    if not isinstance(dataset, h5py.Dataset) or dataset.chunks is None:
+        return []
+
+    plist = dataset.id.get_create_plist()
+
+    names = []
+    for index in range(plist.get_nfilters()):
+        code = plist.get_filter(index)[0]
+        names.append(filterNames.get(code, "filter {:d}".format(code)))
+
+    return names
+
+
+def compressionRatio(dataset):
+    """Return the ratio between the size of a HDF dataset in the file and its size in memory.
+
+    The storage size of a chunked dataset is computed by walking its whole chunk index, hence the ratio is cached per dataset.
+
+    :param dataset: the dataset
+    :type dataset: :class:`h5py.Dataset`
+
+    :return: the ratio, 1.0 if the dataset is not filtered or not allocated
+    :rtype: float
+    """
+
+    nBytes = dataset.size*dataset.dtype.itemsize
+    if not datasetFilters(dataset) or nBytes == 0:
+        return 1.0
+
+    ratio = _cache.get(dataset, "compressionRatio")
+    if ratio is not None:
+        return ratio
+
+    # The cached ratio is discarded when the file is modified (see hdfviewer.utils.DatasetCache.fileKey)
+    storageSize = dataset.id.get_storage_size()
+    ratio = storageSize/nBytes if storageSize != 0 else 1.0
+
+    _cache.set(dataset, ratio, "compressionRatio")
+
+    return ratio
+
+
+def _axisChunks(k, n, c):
+    """Return the number of chunks of an axis crossed by an index.
+
+    :param k: the index
+    :type k: int or slice
+    :param n: the size of the axis
+    :type n: int
+    :param c: the chunk size along the axis
+    :type c: int
+
+    :return: the number of chunks
+    :rtype: int
+    """
+
+    if not isinstance(k, slice):
+        return 1
+
+    indexes = range(*k.indices(n))
+    if len(indexes) == 0:
+        return 0
+
+    # The chunks of a strided selection are not necessarily all crossed
+    if abs(indexes.step) < c:
+        return abs(indexes[-1]//c - indexes[0]//c) + 1
+
+    return len(np.unique(np.asarray(indexes)//c))
+
+
+def chunksTouched(shape, chunks, key):
+    """Return the number of chunks crossed by a selection of a chunked dataset.
+
+    :param shape: the shape of the dataset
+    :type shape: tuple
+    :param chunks: the chunk shape of the dataset
+    :type chunks: tuple
+    :param key: the key, one integer or slice per axis
+    :type key: tuple
+
+    :return: the number of chunks or None if the key is not made of integers and slices
+    :rtype: int or None
+    """
+
+    if len(key) != len(shape) or not all(isinstance(k, (slice, int, np.integer)) for k in key):
+        return None
+
+    return int(np.prod([_axisChunks(k, n, c) for k, n, c in zip(key, shape, chunks)]))
+
+
+def frameReadCost(dataset, axis):
+    """Estimate the cost of reading one frame of a HDF dataset along a given axis (i.e. the selection indexed by an integer along the axis).
+
+    For a chunked dataset, all the chunks crossed by the frame are read and decompressed as a whole. For a contiguous dataset, the frame is
+    read as runs of contiguous elements, one per index of the axes before the given one.
+
+    :param dataset: the dataset
+    :type dataset: :class:`h5py.Dataset`
+    :param axis: the axis
+    :type axis: int
+
+    :return: the size in bytes of the frame, the number of chunks (or contiguous runs) read, the estimated number of bytes read from the file
+        and the read amplification (i.e. the ratio between the number of bytes decoded and the size of the frame)
+    :rtype: dict
+    """
+
+    shape = dataset.shape
+    itemSize = dataset.dtype.itemsize
+
+    frameBytes = int(np.prod([n for a, n in enumerate(shape) if a != axis]))*itemSize
+
+    if dataset.chunks is None:
+        return {"frameBytes": frameBytes,
+                "chunks": int(np.prod(shape[:axis])),
+                "bytesRead": frameBytes,
+                "amplification": 1.0}
+
+    key = tuple(0 if a == axis else slice(None) for a in range(len(shape)))
+    nChunks = chunksTouched(shape, dataset.chunks, key)
+    decodedBytes = nChunks*int(np.prod(dataset.chunks))*itemSize
+
+    return {"frameBytes": frameBytes,
+            "chunks": nChunks,
+            "bytesRead": int(decodedBytes*compressionRatio(dataset)),
+            "amplification": decodedBytes/frameBytes if frameBytes else 1.0}
+
+
+def _datasetKey(dataset):
+    """Return the key under which the reads of a dataset are accounted.
+
+    :param dataset: the dataset
+    :type dataset: :class:`h5py.Dataset`
+
+    :return: the file name and the path of the dataset
+    :rtype: tuple
+    """
+
+    return (dataset.file.filename, dataset.name)
+
+
+class IOAccounting(object):
+    """This class implements the accounting of the reads of HDF datasets per dataset and per interaction.
+
+    The reads are recorded by the dataset views (see :class:`hdfviewer.utils.DatasetView.DatasetView`). They are accounted to the dataset
+    and to the current interaction of the reading thread (see :meth:`interaction`), the reads made out of any interaction being accounted to
+    :data:`backgroundInteraction`.
+
+    .. code-block:: python
+       :caption: Example
+
+        with ioAccounting.interaction("frame"):
+            view[:,:,10]
+
+        ioAccounting.datasetStatistics(hdf["/entry/data"]).chunksDecompressed
+    """
+
+    def __init__(self):
+
+        self.enabled = True
+
+        self._datasets = {}
+
+        self._interactions = {}
+
+        self._lock = threading.Lock()
+
+        self._local = threading.local()
+
+    @contextlib.contextmanager
+    def interaction(self, name):
+        """Account the reads of the calling thread to an interaction.
+
+        :param name: the name of the interaction (e.g. "frame" or "limits")
+        :type name: str
+        """
+
+        previous = getattr(self._local, "interaction", None)
+        self._local.interaction = name
+        try:
+            yield
+        finally:
+            self._local.interaction = previous
+
+    def record(self, dataset, key, data, seconds, lastRead=None):
+        """Record a read of a HDF dataset.
+
+        :param dataset: the dataset
+        :type dataset: :class:`h5py.Dataset`
+        :param key: the key the dataset was indexed with
+        :type key: tuple
+        :param data: the selection read
+        :type data: :class:`numpy.ndarray`
+        :param seconds: the time spent in reading
+        :type seconds: float
+        :param lastRead: the number of chunks touched and decoded and the number of bytes read from the file when the chunks were decoded by
+            the viewer (see :attr:`hdfviewer.utils.ParallelChunkReader.ParallelChunkReader.lastRead`). If None, they are estimated.
+        :type lastRead: tuple or None
+        """
+
+        if not self.enabled or not isinstance(dataset, h5py.Dataset):
+            return
+
+        statistics = IOStatistics(reads=1, bytesSelected=int(np.asarray(data).nbytes), seconds=seconds)
+
+        if lastRead is not None:
+            statistics.chunksTouched, statistics.chunksDecompressed, statistics.bytesRead = lastRead
+        elif dataset.chunks is None:
+            statistics.bytesRead = statistics.bytesSelected
+        else:
+            nChunks = chunksTouched(dataset.shape, dataset.chunks, key)
+            if nChunks is not None:
+                statistics.chunksTouched = nChunks
+                statistics.chunksDecompressed = nChunks if datasetFilters(dataset) else 0
+                statistics.bytesRead = int(nChunks*int(np.prod(dataset.chunks))*dataset.dtype.itemsize*compressionRatio(dataset))
+            else:
+                statistics.bytesRead = statistics.bytesSelected
+
+        interaction = getattr(self._local, "interaction", None) or backgroundInteraction
+
+        with self._lock:
+            for counters, name in ((self._datasets, _datasetKey(dataset)), (self._interactions, interaction)):
+                counters.setdefault(name, IOStatistics())
+                counters[name] += statistics
+
+    def datasetStatistics(self, dataset):
+        """Return the statistics of the reads of a dataset.
+
+        :param dataset: the dataset
+        :type dataset: :class:`h5py.Dataset`
+
+        :return: the statistics
+        :rtype: :class:`IOStatistics`
+        """
+
+        with self._lock:
+            statistics = IOStatistics()
+            statistics += self._datasets.get(_datasetKey(dataset), IOStatistics())
+
+        return statistics
+
+    def interactionStatistics(self, name):
+        """Return the statistics of the reads of an interaction.
+
+        :param name: the name of the interaction
+        :type name: str
+
+        :return: the statistics
+        :rtype: :class:`IOStatistics`
+        """
+
+        with self._lock:
+            statistics = IOStatistics()
+            statistics += self._interactions.get(name, IOStatistics())
+
+        return statistics
+
+    @property
+    def datasets(self):
+        """Getter for the statistics of all the datasets read.
+
+        :return: the statistics per (file name,dataset path)
+        :rtype: dict
+        """
+
+        with self._lock:
+            return {name: IOStatistics(**statistics.asDict()) for name, statistics in self._datasets.items()}
+
+    @property
+    def interactions(self):
+        """Getter for the statistics of all the interactions.
+
+        :return: the statistics per interaction
+        :rtype: dict
+        """
+
+        with self._lock:
+            return {name: IOStatistics(**statistics.asDict()) for name, statistics in self._interactions.items()}
+
+    def reset(self):
+        """Reset all the statistics.
+        """
+
+        with self._lock:
+            self._datasets.clear()
+            self._interactions.clear()
+
+
+#: The accounting of the reads made by the viewers
+ioAccounting = IOAccounting()
@@ -0,0 +1,269 @@
+"""Vectorized line profiles of 2D frames and kymographs of 3D datasets.
+"""
+
+import threading
+
+import numpy as np
+
+
+def lineSamplingPoints(start, end, width=1):
+    """Return the sampling points of a line of a given width.
+
+    The points are spaced by one pixel along the line and, for widths larger than 1, along the normal of the line so that the profile can
+    be averaged over the width.
+
+    :param start: the (row,column) start point of the line
+    :type start: tuple
+    :param end: the (row,column) end point of the line
+    :type end: tuple
+    :param width: the width of the line in pixels
+    :type width: int
+
+    :return: the rows and the columns of the sampling points, both of shape (width,number of points along the line)
+    :rtype: tuple of :class:`numpy.ndarray`
+    """
+
+    start = np.asarray(start, dtype=np.float64)
+    end = np.asarray(end, dtype=np.float64)
+
+    length = np.hypot(*(end - start))
+    nPoints = max(2, int(np.ceil(length)) + 1)
+
+    t = np.linspace(0.0, 1.0, nPoints)
+    direction = (end - start)/length if length > 0 else np.array([0.0, 1.0])
+    normal = np.array([-direction[1], direction[0]])
+
+    offsets = np.arange(max(1, int(width)), dtype=np.float64)
+    offsets -= offsets.mean()
+
+    rows = start[0] + t[None, :]*(end[0] - start[0]) + offsets[:, None]*normal[0]
+    cols = start[1] + t[None, :]*(end[1] - start[1]) + offsets[:, None]*normal[1]
+
+    return rows, cols
+
+
+def bilinear(data, rows, cols):
+    """Interpolate bilinearly a frame or a stack of frames at given points.
+
+    The interpolation is vectorized over all the points (and all the frames). The points lying outside the frame are NaN.
+
+    :param data: the (rows,columns) frame or the (rows,columns,frames) stack
+    :type data: :class:`numpy.ndarray`
+    :param rows: the rows of the points
+    :type rows: :class:`numpy.ndarray`
+    :param cols: the columns of the points
+    :type cols: :class:`numpy.ndarray`
+
+    :return: the interpolated values of shape rows.shape for a frame or rows.shape + (frames,) for a stack
+    :rtype: :class:`numpy.ndarray`
+    """
+
+    nRows, nCols = data.shape[:2]
+
+    inside = (rows >= 0) & (rows <= nRows - 1) & (cols >= 0) & (cols <= nCols - 1)
+
+    rows = np.clip(rows, 0, nRows - 1)
+    cols = np.clip(cols, 0, nCols - 1)
+
+    r0 = np.minimum(np.floor(rows).astype(np.intp), max(nRows - 2, 0))
+    c0 = np.minimum(np.floor(cols).astype(np.intp), max(nCols - 2, 0))
+    r1 = np.minimum(r0 + 1, nRows - 1)
+    c1 = np.minimum(c0 + 1, nCols - 1)
+
+    dr = rows - r0
+    dc = cols - c0
+
+    # The weights are broadcast over the frames of a stack
+    extra = (np.newaxis,)*(data.ndim - 2)
+    dr = dr[(Ellipsis,) + extra]
+    dc = dc[(Ellipsis,) + extra]
+
+    values = (data[r0, c0]*(1 - dr)*(1 - dc) + data[r0, c1]*(1 - dr)*dc +
+              data[r1, c0]*dr*(1 - dc) + data[r1, c1]*dr*dc)
+
+    values[~inside] = np.nan
+
+    return values
+
+
+def lineProfile(frame, start, end, width=1):
+    """Compute the profile of a frame along a line.
+
+    :param frame: the 2D frame
+    :type frame: :class:`numpy.ndarray`
+    :param start: the (row,column) start point of the line
+    :type start: tuple
+    :param end: the (row,column) end point of the line
+    :type end: tuple
+    :param width: the width in pixels over which the profile is averaged
+    :type width: int
+
+    :return: the distances along the line and the profile
+    :rtype: tuple of :class:`numpy.ndarray`
+    """
+
+    rows, cols = lineSamplingPoints(start, end, width)
+
+    values = bilinear(np.asarray(frame, dtype=np.float64), rows, cols)
+
+    distances = np.linspace(0.0, np.hypot(end[0] - start[0], end[1] - start[1]), rows.shape[1])
+
+    with np.errstate(invalid="ignore"):
+        return distances, np.nanmean(values, axis=0) if width > 1 else values[0]
+
+
+class Kymograph(object):
+    """This class allows to compute the profiles of the frames of a 3D dataset along a line, i.e. a kymograph.
+
+    The frames are indexed along the last axis of the dataset. Only the bounding box of the line is read, a bounded number of frames at
+    a time, and each block of frames is interpolated at once (see :func:`bilinear`). The kymograph can be computed in a background thread
+    in which case it is filled progressively, the frames not computed yet being NaN.
+
+    :param dataset: the 3D dataset
+    :type dataset: :class:`hdfviewer.utils.DatasetView.DatasetView` or :class:`h5py.Dataset` or :class:`numpy.ndarray`
+    :param start: the (row,column) start point of the line
+    :type start: tuple
+    :param end: the (row,column) end point of the line
+    :type end: tuple
+    :param width: the width in pixels over which the profiles are averaged
+    :type width: int
+    :param frames: the frames of the kymograph. If None, all the frames are used.
+    :type frames: slice or None
+    :param targetBytes: the target size in bytes of the blocks of frames read at once
+    :type targetBytes: int
+    """
+
+    def __init__(self, dataset, start, end, width=1, frames=None, targetBytes=2**23):
+
+        self._dataset = dataset
+
+        self._width = max(1, int(width))
+
+        nRows, nCols, nFrames = dataset.shape
+
+        self._frames = range(*(frames if frames is not None else slice(None)).indices(nFrames))
+
+        rows, cols = lineSamplingPoints(start, end, self._width)
+
+        # Only the bounding box of the line is read
+        self._rowSlice = slice(max(0, int(np.floor(rows.min()))), min(nRows, int(np.floor(rows.max())) + 2))
+        self._colSlice = slice(max(0, int(np.floor(cols.min()))), min(nCols, int(np.floor(cols.max())) + 2))
+        self._rows = rows - self._rowSlice.start
+        self._cols = cols - self._colSlice.start
+
+        # Points outside of the frame are kept outside of the bounding box
+        self._rows[(rows < 0) | (rows > nRows - 1)] = -1
+        self._cols[(cols < 0) | (cols > nCols - 1)] = -1
+
+        self._distances = np.linspace(0.0, np.hypot(end[0] - start[0], end[1] - start[1]), rows.shape[1])
+
+        boxBytes = max(1, (self._rowSlice.stop - self._rowSlice.start)*(self._colSlice.stop - self._colSlice.start)*dataset.dtype.itemsize)
+        self._blockSize = max(1, targetBytes//boxBytes)
+
+        self._kymograph = np.full((rows.shape[1], len(self._frames)), np.nan)
+
+        self._lock = threading.Lock()
+
+        self._cancelEvent = threading.Event()
+
+        self._thread = None
+
+        self._error = None
+
+    @property
+    def distances(self):
+        """Getter for the distances along the line.
+
+        :return: the distances
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        return self._distances
+
+    @property
+    def error(self):
+        """Getter for the exception raised while computing the kymograph in the background.
+
+        :return: the exception or None if no exception was raised
+        :rtype: Exception or None
+        """
+
+        return self._error
+
+    @property
+    def frames(self):
+        """Getter for the frames of the kymograph.
+
+        :return: the frames
+        :rtype: range
+        """
+
+        return self._frames
+
+    @property
+    def kymograph(self):
+        """Getter for the (possibly partial) kymograph.
+
+        :return: the (points along the line,frames) kymograph
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        with self._lock:
+            return self._kymograph.copy()
+
+    @property
+    def running(self):
+        """Getter for the running state of a kymograph computed in the background.
+
+        :return: True if the kymograph is being computed in the background
+        :rtype: bool
+        """
+
+        return self._thread is not None and self._thread.is_alive()
+
+    def cancel(self):
+        """Cancel the computation.
+        """
+
+        self._cancelEvent.set()
+
+    def run(self):
+        """Compute the kymograph.
+
+        :return: the (points along the line,frames) kymograph
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        for first in range(0, len(self._frames), self._blockSize):
+            if self._cancelEvent.is_set():
+                break
+
+            frames = self._frames[first:first + self._blockSize]
+            stack = np.asarray(self._dataset[self._rowSlice, self._colSlice, frames.start:frames.stop:frames.step], dtype=np.float64)
+
+            values = bilinear(stack, self._rows, self._cols)
+            with np.errstate(invalid="ignore"):
+                profiles = np.nanmean(values, axis=0) if self._width > 1 else values[0]
+
+            with self._lock:
+                self._kymograph[:, first:first + len(frames)] = profiles
+
+        return self.kymograph
+
+    def start(self, callback=None):
+        """Compute the kymograph in a background thread.
+
+        :param callback: if not None, the function called with the kymograph once it has been computed, cancelled or has failed
+        :type callback: callable or None
+        """
+
+        def target():
+            try:
+                self.run()
+            except Exception as e:
+                self._error = e
+            if callback is not None:
+                callback(self)
+
+        self._thread = threading.Thread(target=target, daemon=True)
+        self._thread.start()
@@ -0,0 +1,150 @@
+"""Estimation of the memory needed for displaying datasets and strided preview fallback.
+"""
+
+import math
+
+import numpy as np
+
+#: The default maximum number of bytes read at once for displaying a frame
+defaultMemoryBudget = 2**28
+
+
+def estimateBytes(shape, dtype):
+    """Estimate the number of bytes needed for reading a selection.
+
+    :param shape: the shape of the selection
+    :type shape: tuple
+    :param dtype: the type of the dataset
+    :type dtype: :class:`numpy.dtype`
+
+    :return: the number of bytes
+    :rtype: int
+    """
+
+    return math.prod(shape)*np.dtype(dtype).itemsize
+
+
+def previewStride(shape, dtype, memoryBudget=None):
+    """Return the stride with which a selection must be read so that it fits in a memory budget.
+
+    The same stride is used along all the axes so that the aspect of the preview is preserved.
+
+    :param shape: the shape of the selection
+    :type shape: tuple
+    :param dtype: the type of the dataset
+    :type dtype: :class:`numpy.dtype`
+    :param memoryBudget: the maximum number of bytes to read. If None, :data:`defaultMemoryBudget` is used.
+    :type memoryBudget: int or None
+
+    :return: the stride (1 if the selection fits in the budget)
+    :rtype: int
+    """
+
+    memoryBudget = defaultMemoryBudget if memoryBudget is None else memoryBudget
+
+    nBytes = estimateBytes(shape, dtype)
+    if nBytes <= memoryBudget or not shape:
+        return 1
+
+    stride = max(1, int((nBytes/memoryBudget)**(1.0/len(shape))))
+    while estimateBytes([-(-s//stride) for s in shape], dtype) > memoryBudget:
+        stride += 1
+
+    return stride
+
+
+def previewSlices(region, dtype, memoryBudget=None):
+    """Return the strided slices with which a region must be read so that it fits in a memory budget.
+
+    :param region: the region given as one slice (with explicit start and stop) per axis
+    :type region: tuple of slice
+    :param dtype: the type of the dataset
+    :type dtype: :class:`numpy.dtype`
+    :param memoryBudget: the maximum number of bytes to read. If None, :data:`defaultMemoryBudget` is used.
+    :type memoryBudget: int or None
+
+    :return: the strided slices
+    :rtype: tuple of slice
+    """
+
+    stride = previewStride([max(0, s.stop - s.start) for s in region], dtype, memoryBudget)
+
+    return tuple(slice(s.start, s.stop, stride) for s in region)
+
+
+def frameSlice(region, sampling, length):
+    """Convert a full-resolution slice into a slice of a sampled array.
+
+    :param region: the full-resolution slice
+    :type region: slice
+    :param sampling: the slice with which the array has been read
+    :type sampling: slice
+    :param length: the length of the sampled array along the axis
+    :type length: int
+
+    :return: the slice of the sampled array covering the full-resolution slice. It contains at least one element.
+    :rtype: slice
+    """
+
+    step = sampling.step or 1
+
+    start = min(max(0, (region.start - sampling.start)//step), length - 1)
+    stop = min(length, max(start + 1, -(-(region.stop - sampling.start)//step)))
+
+    return slice(start, stop)
+
+
+def sampledCoordinates(sampledSlice, sampling):
+    """Return the full-resolution coordinates of a slice of a sampled array.
+
+    :param sampledSlice: the slice of the sampled array
+    :type sampledSlice: slice
+    :param sampling: the slice with which the array has been read
+    :type sampling: slice
+
+    :return: the coordinates
+    :rtype: :class:`numpy.ndarray`
+    """
+
+    return sampling.start + np.arange(sampledSlice.start, sampledSlice.stop)*(sampling.step or 1)
+
+
+def sampledIndex(index, sampling, length):
+    """Return the index of a full-resolution coordinate in a sampled array.
+
+    :param index: the full-resolution coordinate
+    :type index: int
+    :param sampling: the slice with which the array has been read
+    :type sampling: slice
+    :param length: the length of the sampled array along the axis
+    :type length: int
+
+    :return: the index in the sampled array or None if the coordinate has not been read
+    :rtype: int or None
+    """
+
+    step = sampling.step or 1
+
+    offset = index - sampling.start
+    if offset < 0 or offset % step:
+        return None
+
+    return offset//step if offset//step < length else None
+
+
+def sampledExtent(shape, sampling):
+    """Return the extent of a sampled 2D array to be used with :meth:`matplotlib.axes.Axes.imshow` (with *origin="lower"*).
+
+    :param shape: the shape of the sampled array
+    :type shape: tuple
+    :param sampling: the (rows,columns) slices with which the array has been read
+    :type sampling: tuple of slice
+
+    :return: the (left,right,bottom,top) extent in full-resolution coordinates
+    :rtype: tuple
+    """
+
+    rows, cols = sampling
+    rowStep, colStep = rows.step or 1, cols.step or 1
+
+    return (cols.start - 0.5*colStep, cols.start + (shape[1] - 0.5)*colStep, rows.start - 0.5*rowStep, rows.start + (shape[0] - 0.5)*rowStep)
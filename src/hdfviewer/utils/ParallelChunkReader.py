@@ -0,0 +1,461 @@
+"""Parallel reading of the chunks of compressed HDF datasets.
+"""
+
+import collections
+import concurrent.futures
+import itertools
+import threading
+import zlib
+
+import numpy as np
+
+import h5py
+
+try:
+    import lz4.block
+except ImportError:
+    lz4 = None
+
+try:
+    import bitshuffle
+except ImportError:
+    bitshuffle = None
+
+#: The identifier of the HDF5 LZ4 filter plugin
+filterLZ4 = 32004
+
+#: The identifier of the HDF5 bitshuffle filter plugin
+filterBitshuffle = 32008
+
+_executor = None
+
+_executorLock = threading.Lock()
+
+
+class ParallelChunkReaderError(Exception):
+    """:class:`ParallelChunkReader` specific exception"""
+
+    pass
+
+
+def _sharedExecutor():
+    """Return the thread pool shared by the readers for decoding the chunks.
+
+    :return: the thread pool
+    :rtype: :class:`concurrent.futures.ThreadPoolExecutor`
+    """
+
+    global _executor
+
+    with _executorLock:
+        if _executor is None:
+            _executor = concurrent.futures.ThreadPoolExecutor(thread_name_prefix="chunk-decoder")
+
+    return _executor
+
+
+def _inflate(data, itemSize, values):
+    """Decode a chunk compressed by the deflate (gzip) filter."""
+
+    return zlib.decompress(data)
+
+
+def _unshuffle(data, itemSize, values):
+    """Decode a chunk encoded by the byte shuffle filter.
+
+    The shuffled chunk stores the first bytes of all the elements, then their second bytes... The bytes which do not make a whole element are
+    stored as is at the end of the chunk.
+    """
+
+    itemSize = values[0] if values else itemSize
+
+    data = np.frombuffer(data, dtype=np.uint8)
+
+    n = data.size//itemSize
+    if itemSize == 1 or n <= 1:
+        return data
+
+    out = np.empty_like(data)
+    out[:n*itemSize].reshape(n, itemSize)[...] = data[:n*itemSize].reshape(itemSize, n).T
+    out[n*itemSize:] = data[n*itemSize:]
+
+    return out
+
+
+def _stripChecksum(data, itemSize, values):
+    """Decode a chunk encoded by the fletcher32 filter. The checksum is not verified."""
+
+    return memoryview(data)[:-4]
+
+
+def _lz4(data, itemSize, values):
+    """Decode a chunk compressed by the HDF5 LZ4 filter plugin.
+
+    The chunk starts with its decompressed size (8 bytes) and the block size (4 bytes), followed by the blocks, each one prefixed by its
+    compressed size (4 bytes). The blocks which do not compress are stored as is. All the sizes are big endian.
+    """
+
+    data = memoryview(data)
+
+    total = int.from_bytes(data[:8], "big")
+    blockSize = int.from_bytes(data[8:12], "big") or total
+
+    out = bytearray(total)
+
+    position, outPosition = 12, 0
+    while outPosition < total:
+        size = min(blockSize, total - outPosition)
+        compressed = int.from_bytes(data[position:position + 4], "big")
+        position += 4
+        block = data[position:position + compressed]
+        out[outPosition:outPosition + size] = block if compressed == size else lz4.block.decompress(block, uncompressed_size=size)
+        position += compressed
+        outPosition += size
+
+    return out
+
+
+def _bitunshuffle(data, itemSize, values):
+    """Decode a chunk encoded by the HDF5 bitshuffle filter plugin, optionally compressed with LZ4 or Zstandard.
+
+    The filter values are the version of the plugin (2 values), the element size, the block size and the compression (0: none, 2: LZ4,
+    3: Zstandard). The compressed chunks start with their decompressed size (8 bytes) and the block size in bytes (4 bytes), both big endian.
+    """
+
+    elementSize = values[2] if len(values) > 2 and values[2] else itemSize
+    compression = values[4] if len(values) > 4 else 0
+
+    dtype = np.dtype("u{:d}".format(elementSize)) if elementSize in (1, 2, 4, 8) else np.dtype((np.void, elementSize))
+
+    data = np.frombuffer(data, dtype=np.uint8)
+
+    if compression == 0:
+        n = data.size//elementSize
+        out = bitshuffle.bitunshuffle(data[:n*elementSize].view(dtype), values[3] if len(values) > 3 else 0)
+        return np.concatenate((out.view(np.uint8), data[n*elementSize:]))
+
+    total = int.from_bytes(data[:8].tobytes(), "big")
+    blockSize = int.from_bytes(data[8:12].tobytes(), "big")//elementSize
+
+    decompress = bitshuffle.decompress_lz4 if compression == 2 else bitshuffle.decompress_zstd
+
+    return decompress(data[12:], (total//elementSize,), dtype, blockSize).view(np.uint8)
+
+
+def _decoders():
+    """Return the chunk decoders per HDF5 filter identifier.
+
+    The LZ4 and bitshuffle filters are only decoded when the *lz4* and *bitshuffle* packages are installed.
+
+    :return: the decoders
+    :rtype: dict
+    """
+
+    decoders = {h5py.h5z.FILTER_DEFLATE: _inflate, h5py.h5z.FILTER_SHUFFLE: _unshuffle, h5py.h5z.FILTER_FLETCHER32: _stripChecksum}
+
+    if lz4 is not None:
+        decoders[filterLZ4] = _lz4
+
+    if bitshuffle is not None:
+        decoders[filterBitshuffle] = _bitunshuffle
+
+    return decoders
+
+
+def filterPipeline(dataset):
+    """Return the decoders of the filters applied to the chunks of a HDF dataset.
+
+    :param dataset: the dataset
+    :type dataset: :class:`h5py.Dataset`
+
+    :return: the (filter index,decoder,filter values) in decoding order (i.e. the reverse of the encoding order). None if the dataset is not
+        chunked, if its type is not numeric (the decoded chunks are read as arrays of the dataset type) or if one of its filters can not be decoded.
+    :rtype: list or None
+    """
+
+    if not isinstance(dataset, h5py.Dataset) or dataset.chunks is None or dataset.dtype.kind not in "biuf":
+        return None
+
+    decoders = _decoders()
+
+    plist = dataset.id.get_create_plist()
+
+    pipeline = []
+    for index in range(plist.get_nfilters()):
+        code, _, values, _ = plist.get_filter(index)
+        if code not in decoders:
+            return None
+        pipeline.append((index, decoders[code], values))
+
+    return pipeline[::-1]
+
+
+class ParallelChunkReader(object):
+    """This class allows to read the selections of a compressed HDF dataset by decoding its chunks in parallel.
+
+    When a compressed dataset is indexed through h5py, the chunks crossed by the selection are decoded one after another. The reader finds
+    these chunks, fetches them with :meth:`h5py.h5d.DatasetID.read_direct_chunk` and decodes them in a shared thread pool with codecs which
+    release the GIL (zlib, lz4, bitshuffle). Each decoded chunk is copied into its part of a single preallocated array. The last decoded
+    chunks are optionally kept in a cache so that the next frames of chunks spanning several frames are not decoded again.
+
+    .. code-block:: python
+       :caption: Example
+
+        reader = ParallelChunkReader(hdf["/entry/data"])
+
+        frame = reader[:,:,10]
+
+    :param dataset: the chunked dataset
+    :type dataset: :class:`h5py.Dataset`
+    :param cacheBytes: the size in bytes of the cache of decoded chunks
+    :type cacheBytes: int
+
+    :raises: :class:`ParallelChunkReaderError`: if the dataset is not chunked or if one of its filters can not be decoded
+    """
+
+    def __init__(self, dataset, cacheBytes=0):
+
+        self._pipeline = filterPipeline(dataset)
+        if self._pipeline is None:
+            raise ParallelChunkReaderError("The chunks of the dataset {name} can not be decoded".format(name=dataset.name))
+
+        self._dataset = dataset
+
+        self._cacheBytes = cacheBytes
+
+        self._cache = collections.OrderedDict()
+
+        self._cachedBytes = 0
+
+        self._lock = threading.Lock()
+
+        # The statistics of the last read of each thread (see lastRead)
+        self._local = threading.local()
+
+    def __getitem__(self, key):
+
+        selection = self._selection(key)
+
+        # Fancy indexing, field names and negative steps are left to h5py
+        if selection is None:
+            self._local.lastRead = None
+            return self._dataset[key]
+
+        chunks = self._dataset.chunks
+
+        out = np.empty(tuple(len(range(*s)) for s, _ in selection), dtype=self._dataset.dtype)
+
+        counts = []
+
+        if out.size > 0:
+            # For each axis, the chunks containing at least one selected element
+            chunkIndexes = [np.unique(np.arange(*s)//c) for (s, _), c in zip(selection, chunks)]
+
+            tasks = []
+            for index in itertools.product(*chunkIndexes):
+                offset = tuple(int(i)*c for i, c in zip(index, chunks))
+                source, destination = zip(*[self._intersection(s, o, c) for (s, _), o, c in zip(selection, offset, chunks)])
+                tasks.append((offset, source, destination))
+
+            if len(tasks) == 1:
+                counts.append(self._copyChunk(out, *tasks[0]))
+            else:
+                executor = _sharedExecutor()
+                for future in [executor.submit(self._copyChunk, out, *task) for task in tasks]:
+                    counts.append(future.result())
+
+        decoded = [nBytes for nBytes in counts if nBytes is not None]
+        self._local.lastRead = (len(counts), len(decoded), sum(decoded))
+
+        # The axes indexed by an integer are removed
+        return out[tuple(0 if isInteger else slice(None) for _, isInteger in selection)]
+
+    def _selection(self, key):
+        """Normalize a key made of integers and slices.
+
+        :param key: the key
+        :type key: tuple
+
+        :return: the (start,stop,step) and whether the axis is indexed by an integer, per axis. None if the key is not made of one integer or
+            slice with a positive step per axis.
+        :rtype: list or None
+
+        :raises: IndexError: if an integer index is out of range
+        """
+
+        key = key if isinstance(key, tuple) else (key,)
+
+        shape = self._dataset.shape
+        if len(key) != len(shape):
+            return None
+
+        selection = []
+        for k, n in zip(key, shape):
+            if isinstance(k, slice):
+                start, stop, step = k.indices(n)
+                if step < 1:
+                    return None
+                selection.append(((start, max(start, stop), step), False))
+            elif isinstance(k, (int, np.integer)):
+                k = int(k) + n if k < 0 else int(k)
+                if not 0 <= k < n:
+                    raise IndexError("Index ({index}) out of range (0-{n:d})".format(index=k, n=n - 1))
+                selection.append(((k, k + 1, 1), True))
+            else:
+                return None
+
+        return selection
+
+    @staticmethod
+    def _intersection(selection, offset, size):
+        """Return the part of a chunk selected along an axis.
+
+        :param selection: the (start,stop,step) of the selection along the axis
+        :type selection: tuple
+        :param offset: the offset of the chunk along the axis
+        :type offset: int
+        :param size: the size of the chunk along the axis
+        :type size: int
+
+        :return: the slice of the chunk and the slice of the selection
+        :rtype: tuple of slice
+        """
+
+        start, stop, step = selection
+
+        first = max(0, -(-(offset - start)//step))
+        last = -(-(min(stop, offset + size) - start)//step)
+
+        begin = start + first*step - offset
+
+        return slice(begin, begin + (last - first - 1)*step + 1, step), slice(first, last)
+
+    def _copyChunk(self, out, offset, source, destination):
+        """Copy the selected part of a chunk into the output array.
+
+        :param out: the output array
+        :type out: :class:`numpy.ndarray`
+        :param offset: the offset of the chunk
+        :type offset: tuple
+        :param source: the slices of the chunk
+        :type source: tuple of slice
+        :param destination: the slices of the output array
+        :type destination: tuple of slice
+
+        :return: the size in bytes of the chunk in the file or None if the chunk was cached
+        :rtype: int or None
+        """
+
+        chunk, nBytes = self._readChunk(offset)
+
+        out[destination] = chunk[source]
+
+        return nBytes
+
+    def _readChunk(self, offset):
+        """Read and decode a chunk.
+
+        :param offset: the offset of the chunk
+        :type offset: tuple
+
+        :return: the decoded chunk and its size in bytes in the file (0 if it is not allocated, None if it was cached)
+        :rtype: tuple
+        """
+
+        with self._lock:
+            chunk = self._cache.get(offset)
+            if chunk is not None:
+                self._cache.move_to_end(offset)
+                return chunk, None
+
+        dataset = self._dataset
+
+        try:
+            mask, data = dataset.id.read_direct_chunk(offset)
+        except RuntimeError:
+            # The chunks which have never been written are not allocated
+            if dataset.id.get_chunk_info_by_coord(offset).byte_offset is not None:
+                raise
+            chunk = np.full(dataset.chunks, dataset.fillvalue, dtype=dataset.dtype)
+            nBytes = 0
+        else:
+            nBytes = len(data)
+            for index, decoder, values in self._pipeline:
+                # The optional filters which did not reduce the size of the chunk have been skipped
+                if not mask & (1 << index):
+                    data = decoder(data, dataset.dtype.itemsize, values)
+            chunk = np.frombuffer(data, dtype=dataset.dtype, count=int(np.prod(dataset.chunks))).reshape(dataset.chunks)
+
+        if chunk.nbytes <= self._cacheBytes:
+            with self._lock:
+                if offset not in self._cache:
+                    self._cache[offset] = chunk
+                    self._cachedBytes += chunk.nbytes
+                while self._cachedBytes > self._cacheBytes:
+                    _, evicted = self._cache.popitem(last=False)
+                    self._cachedBytes -= evicted.nbytes
+
+        return chunk, nBytes
+
+    @property
+    def lastRead(self):
+        """Getter for the statistics of the last read made by the calling thread.
+
+        :return: the number of chunks touched, the number of chunks decoded and the number of bytes read from the file. None if the thread
+            has not read anything or if its last read was left to h5py.
+        :rtype: tuple or None
+        """
+
+        return getattr(self._local, "lastRead", None)
+
+    @property
+    def chunks(self):
+        """Getter for the chunk shape of the dataset.
+
+        :return: the chunk shape
+        :rtype: tuple
+        """
+
+        return self._dataset.chunks
+
+    @property
+    def dataset(self):
+        """Getter for the dataset.
+
+        :return: the dataset
+        :rtype: :class:`h5py.Dataset`
+        """
+
+        return self._dataset
+
+    @property
+    def dtype(self):
+        """Getter for the type of the dataset.
+
+        :return: the type
+        :rtype: :class:`numpy.dtype`
+        """
+
+        return self._dataset.dtype
+
+    @property
+    def shape(self):
+        """Getter for the shape of the dataset.
+
+        :return: the shape
+        :rtype: tuple
+        """
+
+        return self._dataset.shape
+
+    def refresh(self):
+        """Refresh the metadata of the dataset and clear the cache of decoded chunks.
+
+        The chunks at the edges of a dataset which grows (SWMR read mode) may have been rewritten by the writer.
+        """
+
+        self._dataset.refresh()
+
+        with self._lock:
+            self._cache.clear()
+            self._cachedBytes = 0
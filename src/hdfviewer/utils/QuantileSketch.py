@@ -0,0 +1,412 @@
+"""Mergeable streaming quantile sketches for robust colour scaling.
+"""
+
+import math
+
+import numpy as np
+
+from hdfviewer.utils.ChunkStreamer import ChunkStreamer
+from hdfviewer.utils.DatasetCache import DatasetCache
+
+_cache = DatasetCache()
+
+#: The supported colour scales
+colorScales = ("minmax", "percentile", "log")
+
+
+class QuantileSketchError(Exception):
+    """:mod:`QuantileSketch` specific exception"""
+
+    pass
+
+
+def _mergeStores(first, second):
+    """Merge two stores of bucket counts.
+
+    :param first: the (offset,counts) first store
+    :type first: tuple
+    :param second: the (offset,counts) second store
+    :type second: tuple
+
+    :return: the merged (offset,counts) store
+    :rtype: tuple
+    """
+
+    if not len(first[1]):
+        return second
+    if not len(second[1]):
+        return first
+
+    offset = min(first[0], second[0])
+    end = max(first[0] + len(first[1]), second[0] + len(second[1]))
+
+    counts = np.zeros(end - offset, dtype=np.int64)
+    for storeOffset, storeCounts in (first, second):
+        counts[storeOffset - offset:storeOffset - offset + len(storeCounts)] += storeCounts
+
+    return (offset, counts)
+
+
+def _trimStore(counts, offset):
+    """Build a store from bucket counts by removing the empty buckets at both ends.
+
+    :param counts: the bucket counts
+    :type counts: :class:`numpy.ndarray`
+    :param offset: the key of the first bucket
+    :type offset: int
+
+    :return: the (offset,counts) store
+    :rtype: tuple
+    """
+
+    nonEmpty = np.flatnonzero(counts)
+    if not len(nonEmpty):
+        return (0, np.zeros(0, dtype=np.int64))
+
+    return (offset + int(nonEmpty[0]), counts[nonEmpty[0]:nonEmpty[-1] + 1].astype(np.int64))
+
+
+class QuantileSketch(object):
+    """This class implements a mergeable sketch of the distribution of the values of a dataset from which quantiles can be estimated.
+
+    The absolute values are counted in logarithmically spaced buckets, so that any quantile is estimated with a bounded relative error
+    (as in the DDSketch algorithm). The buckets are the binary exponent and the *precision* leading bits of the mantissa of the values,
+    hence building a sketch only takes a bit shift and a :func:`numpy.bincount` over the values. Merging two sketches only adds their bucket
+    counts so that sketches can be computed block by block in parallel (see :func:`sketchStreamer`). The extrema are tracked exactly so
+    that the 0th and the 100th percentiles are exact. NaN and infinite values are ignored and subnormal values are counted as zeros.
+
+    :param precision: the number of leading mantissa bits of the buckets. The relative error of the quantiles is below 2**-(precision+1).
+    :type precision: int
+    """
+
+    def __init__(self, precision=6):
+
+        self.precision = precision
+
+        self.count = 0
+
+        self.zeroCount = 0
+
+        self.min = math.inf
+
+        self.max = -math.inf
+
+        # The smallest positive value is tracked for logarithmic scales
+        self.minPositive = math.inf
+
+        # The bucket counts of the positive and of the negative values as (offset,counts) stores keyed in the double precision bucket space
+        self.positive = (0, np.zeros(0, dtype=np.int64))
+
+        self.negative = (0, np.zeros(0, dtype=np.int64))
+
+    @classmethod
+    def fromArray(cls, data, precision=6, maxSamples=None):
+        """Build a sketch from an array.
+
+        :param data: the array
+        :type data: :class:`numpy.ndarray`
+        :param precision: see :class:`QuantileSketch`
+        :type precision: int
+        :param maxSamples: if not None, the values of larger arrays are sampled with a regular stride (each sample then counting for the
+            stride) so that the cost of the sketch is bounded. The extrema are always exact.
+        :type maxSamples: int or None
+
+        :return: the sketch
+        :rtype: :class:`QuantileSketch`
+        """
+
+        sketch = cls(precision)
+
+        data = np.asarray(data).ravel()
+        if not data.size:
+            return sketch
+
+        # NaN values are ignored by fmin and fmax
+        sketch.min, sketch.max = float(np.fmin.reduce(data)), float(np.fmax.reduce(data))
+        if not (np.isfinite(sketch.min) and np.isfinite(sketch.max)):
+            data = data[np.isfinite(data)]
+            if not data.size:
+                return cls(precision)
+            sketch.min, sketch.max = float(data.min()), float(data.max())
+
+        weights = None
+        stride = 1
+        if np.issubdtype(data.dtype, np.integer) and data.dtype.itemsize <= 2:
+            # Small integers (e.g. detector counts) are counted exactly first so that only the distinct values are bucketed
+            offset = int(sketch.min)
+            weights = np.bincount(data.astype(np.intp) - offset)
+            data = np.arange(offset, offset + len(weights), dtype=np.float64)
+        elif maxSamples is not None and data.size > maxSamples:
+            stride = -(-data.size//maxSamples)
+            data = data[::stride]
+
+        sketch._count(data, weights, stride)
+
+        return sketch
+
+    def _count(self, values, weights=None, stride=1):
+        """Count values in their buckets.
+
+        :param values: the values
+        :type values: :class:`numpy.ndarray`
+        :param weights: the number of occurrences of each value. If None, each value occurs once.
+        :type weights: :class:`numpy.ndarray` or None
+        :param stride: the number of values each value counts for
+        :type stride: int
+        """
+
+        # The bucket of a value is given by its sign, its exponent and the leading bits of its mantissa
+        if values.dtype == np.float32:
+            bits, mantissaBits, exponentBits = values.view(np.int32), 23, 8
+        else:
+            values = values.astype(np.float64, copy=False)
+            bits, mantissaBits, exponentBits = values.view(np.int64), 52, 11
+
+        shift = mantissaBits - self.precision
+        half = 1 << (exponentBits + self.precision)
+
+        # The negative values fall in the first half of the buckets and the positive values in the second half
+        keys = bits >> shift
+        keys += half
+        counts = np.bincount(keys, weights, minlength=2*half)
+        if weights is None:
+            counts *= stride
+        else:
+            counts = counts.round().astype(np.int64)
+
+        negative, positive = counts[:half], counts[half:]
+
+        # Zeros (and subnormals) have a null exponent, infinite and NaN values have a maximum exponent
+        first, last = 1 << self.precision, (half >> self.precision) - 1 << self.precision
+        self.zeroCount = int(negative[:first].sum() + positive[:first].sum())
+
+        # The single precision buckets are shifted to the double precision exponent bias
+        offset = first + ((1023 - ((1 << (exponentBits - 1)) - 1)) << self.precision)
+        self.positive = _trimStore(positive[first:last], offset)
+        self.negative = _trimStore(negative[first:last], offset)
+
+        self.count = self.zeroCount + int(self.positive[1].sum() + self.negative[1].sum())
+
+        # The smallest positive value is known up to the precision of the buckets
+        if len(self.positive[1]):
+            self.minPositive = float((np.int64(self.positive[0]) << (52 - self.precision)).view(np.float64))
+
+    def _bucketValues(self, store):
+        """Return the representative values (i.e. the middle) of the buckets of a store.
+
+        :param store: the (offset,counts) store
+        :type store: tuple
+
+        :return: the values
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        keys = store[0] + np.arange(len(store[1]) + 1, dtype=np.int64)
+        bounds = (keys << (52 - self.precision)).view(np.float64)
+
+        return 0.5*(bounds[:-1] + bounds[1:])
+
+    def merge(self, other):
+        """Merge another sketch with this one.
+
+        :param other: the other sketch
+        :type other: :class:`QuantileSketch`
+
+        :return: the merged sketch
+        :rtype: :class:`QuantileSketch`
+
+        :raises: :class:`QuantileSketchError`: if the sketches do not have the same precision
+        """
+
+        if other.precision != self.precision:
+            raise QuantileSketchError("Sketches with different precisions can not be merged")
+
+        merged = QuantileSketch(self.precision)
+        merged.count = self.count + other.count
+        merged.zeroCount = self.zeroCount + other.zeroCount
+        merged.min = min(self.min, other.min)
+        merged.max = max(self.max, other.max)
+        merged.minPositive = min(self.minPositive, other.minPositive)
+        merged.positive = _mergeStores(self.positive, other.positive)
+        merged.negative = _mergeStores(self.negative, other.negative)
+
+        return merged
+
+    def quantiles(self, qs, positive=False):
+        """Estimate quantiles.
+
+        :param qs: the quantiles in [0,1]
+        :type qs: list of float
+        :param positive: if True the quantiles of the positive values only are estimated (e.g. for logarithmic scales)
+        :type positive: bool
+
+        :return: the quantiles, NaN if the sketch has no (positive) value
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        qs = np.clip(np.asarray(qs, dtype=np.float64), 0.0, 1.0)
+
+        if positive:
+            values = self._bucketValues(self.positive)
+            counts = self.positive[1]
+            vmin, vmax = self.minPositive, self.max
+        else:
+            # The values are ordered from the most negative to the most positive
+            values = np.concatenate((-self._bucketValues(self.negative)[::-1], [0.0], self._bucketValues(self.positive)))
+            counts = np.concatenate((self.negative[1][::-1], [self.zeroCount], self.positive[1]))
+            vmin, vmax = self.min, self.max
+
+        cumulative = np.cumsum(counts)
+        if not len(cumulative) or cumulative[-1] == 0:
+            return np.full(qs.shape, np.nan)
+
+        indexes = np.searchsorted(cumulative, qs*(cumulative[-1] - 1), side="right")
+
+        # The extrema are exact
+        return np.where(qs == 0.0, vmin, np.where(qs == 1.0, vmax, np.clip(values[indexes], vmin, vmax)))
+
+    def percentiles(self, lower, upper, positive=False):
+        """Estimate a lower and an upper percentile.
+
+        :param lower: the lower percentile in [0,100]
+        :type lower: float
+        :param upper: the upper percentile in [0,100]
+        :type upper: float
+        :param positive: if True the percentiles of the positive values only are estimated
+        :type positive: bool
+
+        :return: the lower and upper percentiles
+        :rtype: tuple of float
+        """
+
+        vmin, vmax = self.quantiles([lower/100.0, upper/100.0], positive)
+
+        return float(vmin), float(vmax)
+
+
+def checkColorScale(colorScale):
+    """Check that a colour scale is known.
+
+    :param colorScale: the colour scale
+    :type colorScale: str
+
+    :raises: :class:`QuantileSketchError`: if the colour scale is unknown
+    """
+
+    if colorScale not in colorScales:
+        raise QuantileSketchError("Unknown colour scale ({colorScale}). Valid colour scales are: {colorScales}".format(colorScale=colorScale, colorScales=", ".join(colorScales)))
+
+
+def colorLimits(sketch, colorScale="percentile", percentiles=(1.0, 99.0)):
+    """Return the colour limits of a colour scale from a sketch.
+
+    :param sketch: the sketch of the values to be displayed
+    :type sketch: :class:`QuantileSketch`
+    :param colorScale: the colour scale. With *minmax* the limits are the extrema, with *percentile* they are the given percentiles and with
+        *log* they are the given percentiles of the positive values.
+    :type colorScale: str
+    :param percentiles: the (lower,upper) percentiles in [0,100]
+    :type percentiles: tuple
+
+    :return: the (vmin,vmax) colour limits, NaN if there is no value to display
+    :rtype: tuple of float
+
+    :raises: :class:`QuantileSketchError`: if the colour scale is unknown
+    """
+
+    checkColorScale(colorScale)
+
+    if colorScale == "minmax":
+        return sketch.min, sketch.max
+
+    return sketch.percentiles(*percentiles, positive=colorScale == "log")
+
+
+def frameSketch(dataset, frame, *key, maxSamples=2**20):
+    """Return the sketch of a frame of a dataset.
+
+    The sketches of the frames of HDF datasets are cached per dataset and key. Large frames are sampled (see :meth:`QuantileSketch.fromArray`)
+    so that the sketch costs about as much as the minimum and the maximum of the frame.
+
+    :param dataset: the dataset the frame has been read from
+    :type dataset: :class:`hdfviewer.utils.DatasetView.DatasetView` or :class:`h5py.Dataset` or :class:`numpy.ndarray`
+    :param frame: the frame
+    :type frame: :class:`numpy.ndarray`
+    :param `*key`: the hashable parameters identifying the frame (e.g. its index and sampling)
+    :type `*key`: tuple
+    :param maxSamples: see :meth:`QuantileSketch.fromArray`
+    :type maxSamples: int or None
+
+    :return: the sketch
+    :rtype: :class:`QuantileSketch`
+    """
+
+    sketch = _cache.get(dataset, "frame", *key)
+    if sketch is None:
+        sketch = QuantileSketch.fromArray(frame, maxSamples=maxSamples)
+        _cache.set(dataset, sketch, "frame", *key)
+
+    return sketch
+
+
+def cachedSketch(dataset):
+    """Return the sketch of a whole dataset if it has already been computed.
+
+    :param dataset: the dataset
+    :type dataset: :class:`hdfviewer.utils.DatasetView.DatasetView` or :class:`h5py.Dataset`
+
+    :return: the sketch or None if it has not been computed yet
+    :rtype: :class:`QuantileSketch` or None
+    """
+
+    return _cache.get(dataset, "dataset")
+
+
+def sketchStreamer(dataset, progress=None, maxWorkers=None):
+    """Return a streamer computing the sketch of a whole dataset block by block.
+
+    Once the streamer has completed, the sketch is cached and can be retrieved with :func:`cachedSketch`.
+
+    :param dataset: the dataset
+    :type dataset: :class:`hdfviewer.utils.DatasetView.DatasetView` or :class:`h5py.Dataset` or :class:`numpy.ndarray`
+    :param progress: see :class:`hdfviewer.utils.ChunkStreamer.ChunkStreamer`
+    :type progress: callable or None
+    :param maxWorkers: see :class:`hdfviewer.utils.ChunkStreamer.ChunkStreamer`
+    :type maxWorkers: int or None
+
+    :return: the streamer
+    :rtype: :class:`hdfviewer.utils.ChunkStreamer.ChunkStreamer`
+    """
+
+    def finalize(sketch):
+        sketch = sketch if sketch is not None else QuantileSketch()
+        _cache.set(dataset, sketch, "dataset")
+        return sketch
+
+    return ChunkStreamer(dataset,
+                         lambda data, selection: QuantileSketch.fromArray(data),
+                         QuantileSketch.merge,
+                         finalize=finalize,
+                         progress=progress,
+                         maxWorkers=maxWorkers)
+
+
+def datasetSketch(dataset, progress=None, maxWorkers=None):
+    """Compute the sketch of a whole dataset without loading it in memory.
+
+    :param dataset: the dataset
+    :type dataset: :class:`hdfviewer.utils.DatasetView.DatasetView` or :class:`h5py.Dataset` or :class:`numpy.ndarray`
+    :param progress: see :class:`hdfviewer.utils.ChunkStreamer.ChunkStreamer`
+    :type progress: callable or None
+    :param maxWorkers: see :class:`hdfviewer.utils.ChunkStreamer.ChunkStreamer`
+    :type maxWorkers: int or None
+
+    :return: the sketch
+    :rtype: :class:`QuantileSketch`
+    """
+
+    sketch = cachedSketch(dataset)
+    if sketch is None:
+        sketch = sketchStreamer(dataset, progress, maxWorkers).run()
+
+    return sketch
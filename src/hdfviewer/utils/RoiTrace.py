@@ -0,0 +1,181 @@
+"""Progressive extraction of the intensity of a region of interest across the frames of 3D datasets.
+"""
+
+import threading
+
+import numpy as np
+
+from hdfviewer.utils.ChunkStreamer import ChunkStreamer
+
+
+class RoiTraceError(Exception):
+    """Error handler for :mod:`RoiTrace` related exceptions.
+    """
+
+    pass
+
+
+class RoiTrace(object):
+    """This class allows to compute the sum or the mean of a rectangular region of interest (ROI) of a 3D dataset as a function of the frame.
+
+    The frames are indexed along the last axis of the dataset. Only the ROI hyperslab is read, block by block and in parallel, the blocks
+    being aligned on the chunks of the dataset (see :class:`hdfviewer.utils.ChunkStreamer.ChunkStreamer`). The trace is filled progressively:
+    while the computation is running, :attr:`trace` returns the frames already completed, the other ones being NaN.
+
+    .. code-block:: python
+       :caption: Example
+
+        roiTrace = RoiTrace(hdf["/data/fake_data3D"], slice(10, 20), slice(30, 50), "mean")
+
+        trace = roiTrace.run()
+
+    :param dataset: the 3D dataset
+    :type dataset: :class:`hdfviewer.utils.DatasetView.DatasetView` or :class:`h5py.Dataset` or :class:`numpy.ndarray`
+    :param rows: the rows of the ROI
+    :type rows: slice
+    :param cols: the columns of the ROI
+    :type cols: slice
+    :param reduction: the reduction applied to the ROI of each frame (*sum* or *mean*)
+    :type reduction: str
+    :param maxWorkers: the number of worker threads
+    :type maxWorkers: int or None
+
+    :raises: :class:`RoiTraceError`: if the reduction is unknown or the ROI is empty
+    """
+
+    def __init__(self, dataset, rows, cols, reduction="sum", maxWorkers=None):
+
+        if reduction not in ("sum", "mean"):
+            raise RoiTraceError("Unknown reduction ({reduction}). Valid reductions are: sum, mean".format(reduction=reduction))
+
+        nRows, nCols, nFrames = dataset.shape
+
+        rows = slice(*rows.indices(nRows)[:2])
+        cols = slice(*cols.indices(nCols)[:2])
+
+        self._roiSize = max(rows.stop - rows.start, 0)*max(cols.stop - cols.start, 0)
+        if self._roiSize == 0:
+            raise RoiTraceError("The ROI is empty")
+
+        self._rows = rows
+
+        self._cols = cols
+
+        self._reduction = reduction
+
+        # The per-frame sums and the number of pixels summed so far
+        self._sums = np.zeros(nFrames, dtype=np.float64)
+        self._counts = np.zeros(nFrames, dtype=np.int64)
+
+        self._lock = threading.Lock()
+
+        self._streamer = ChunkStreamer(dataset, self._process, lambda a, b: None, maxWorkers=maxWorkers, region=(rows, cols, slice(None)))
+
+    @property
+    def cols(self):
+        """Getter for the columns of the ROI.
+
+        :return: the columns
+        :rtype: slice
+        """
+
+        return self._cols
+
+    @property
+    def completed(self):
+        """Getter for the fraction of the ROI hyperslab which has been processed.
+
+        :return: the fraction in [0,1]
+        :rtype: float
+        """
+
+        with self._lock:
+            return float(self._counts.sum())/(self._roiSize*len(self._counts)) if len(self._counts) else 1.0
+
+    @property
+    def reduction(self):
+        """Getter for the reduction applied to the ROI of each frame.
+
+        :return: the reduction (*sum* or *mean*)
+        :rtype: str
+        """
+
+        return self._reduction
+
+    @property
+    def rows(self):
+        """Getter for the rows of the ROI.
+
+        :return: the rows
+        :rtype: slice
+        """
+
+        return self._rows
+
+    @property
+    def streamer(self):
+        """Getter for the streamer reading the ROI hyperslab.
+
+        :return: the streamer
+        :rtype: :class:`hdfviewer.utils.ChunkStreamer.ChunkStreamer`
+        """
+
+        return self._streamer
+
+    @property
+    def trace(self):
+        """Getter for the (possibly partial) trace.
+
+        :return: the sum or the mean of the ROI for each frame, NaN for the frames not completed yet
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        with self._lock:
+            trace = np.where(self._counts == self._roiSize, self._sums, np.nan)
+
+        if self._reduction == "mean":
+            trace /= self._roiSize
+
+        return trace
+
+    def _process(self, data, selection):
+        """Accumulate the per-frame sums of a block of the ROI hyperslab.
+
+        :param data: the block data
+        :type data: :class:`numpy.ndarray`
+        :param selection: the block selection
+        :type selection: tuple of slice
+        """
+
+        sums = data.sum(axis=(0, 1), dtype=np.float64)
+        count = data.shape[0]*data.shape[1]
+
+        with self._lock:
+            self._sums[selection[2]] += sums
+            self._counts[selection[2]] += count
+
+    def cancel(self):
+        """Cancel the computation.
+        """
+
+        self._streamer.cancel()
+
+    def run(self):
+        """Compute the trace.
+
+        :return: the trace or None if the computation has been cancelled
+        :rtype: :class:`numpy.ndarray` or None
+        """
+
+        self._streamer.run()
+
+        return None if self._streamer.cancelled else self.trace
+
+    def start(self, callback=None):
+        """Compute the trace in a background thread.
+
+        :param callback: if not None, the function called with the streamer once it has completed, has been cancelled or has failed
+        :type callback: callable or None
+        """
+
+        self._streamer.start(callback)
@@ -0,0 +1,335 @@
+"""Node-local cache of decoded frames shared by the kernels through shared memory.
+"""
+
+import collections
+import hashlib
+import os
+import struct
+import threading
+
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+import h5py
+
+#: The prefix of the names of the shared memory segments of the cache
+segmentPrefix = "hdfv_"
+
+#: The directory where the shared memory segments are visible as files (Linux only)
+_sharedMemoryDirectory = "/dev/shm"
+
+# The segments start with a header holding a ready flag, so that the frames being written by another kernel are not read
+_header = struct.Struct("<Q")
+
+_headerSize = 64
+
+_ready = 1
+
+
+class SharedFrameCacheError(Exception):
+    """:class:`SharedFrameCache` specific exception"""
+
+    pass
+
+
+def _openSegment(name, size=0):
+    """Create or attach a shared memory segment which is not destroyed when the process exits.
+
+    The segments created or attached through :class:`multiprocessing.shared_memory.SharedMemory` are registered with the resource tracker
+    which unlinks them when the process exits. The segments of the cache must outlive the kernel which wrote them.
+
+    :param name: the name of the segment
+    :type name: str
+    :param size: the size in bytes of the segment to create. If 0, an existing segment is attached.
+    :type size: int
+
+    :return: the segment
+    :rtype: :class:`multiprocessing.shared_memory.SharedMemory`
+
+    :raises: FileNotFoundError: if the segment to attach does not exist
+    :raises: FileExistsError: if the segment to create already exists
+    """
+
+    try:
+        # Python >= 3.13
+        return shared_memory.SharedMemory(name, create=size > 0, size=size, track=False)
+    except TypeError:
+        segment = shared_memory.SharedMemory(name, create=size > 0, size=size)
+        resource_tracker.unregister(segment._name, "shared_memory")
+        return segment
+
+
+def _unlinkSegment(name):
+    """Unlink a shared memory segment.
+
+    The segment is attached with the default tracking so that, before Python 3.13, its registration with the resource tracker matches the
+    unregistration done by :meth:`multiprocessing.shared_memory.SharedMemory.unlink`.
+
+    :param name: the name of the segment
+    :type name: str
+
+    :raises: FileNotFoundError: if the segment does not exist
+    """
+
+    segment = shared_memory.SharedMemory(name)
+    try:
+        segment.unlink()
+    finally:
+        segment.close()
+
+
+def _resultShape(shape, key):
+    """Return the shape of the array resulting from indexing a dataset by integers and slices.
+
+    :param shape: the shape of the dataset
+    :type shape: tuple
+    :param key: the key, one integer or slice per axis
+    :type key: tuple
+
+    :return: the shape of the selection
+    :rtype: tuple
+    """
+
+    return tuple(len(range(*k.indices(n))) for k, n in zip(key, shape) if isinstance(k, slice))
+
+
+class SharedFrameCache(object):
+    """This class implements a node-local cache of the frames and slabs read from HDF datasets, shared by all the kernels of a node.
+
+    The selections are stored in named shared memory segments (see :mod:`multiprocessing.shared_memory`) whose name is derived from the
+    identity of the file (device, inode, size and modification time), the path of the dataset and the selection. A kernel which reads a
+    selection already read by another kernel gets a read-only NumPy view of the segment, without reading nor decoding anything.
+
+    The total size of the segments is bounded: when a segment is added, the least recently used segments of the node are unlinked. The
+    kernels which are still viewing an unlinked segment keep it mapped until they release their views. The segments of the whole node are
+    only visible on Linux: on other platforms, only the segments added by the current kernel are evicted.
+
+    .. code-block:: python
+       :caption: Example
+
+        cache = SharedFrameCache(maxBytes=2**31)
+
+        viewer = MplDataViewer(hdf["/entry/data"], sharedCache=cache)
+
+    :param maxBytes: the maximum total size in bytes of the segments of the node
+    :type maxBytes: int
+    :param minBytes: the minimum size in bytes of the selections to cache. The smaller selections (cross plots, ROI traces...) are read directly.
+    :type minBytes: int
+    :param maxAttached: the maximum number of segments kept attached by the kernel when they are not viewed anymore
+    :type maxAttached: int
+
+    :raises: :class:`SharedFrameCacheError`: if the maximum size is not positive
+    """
+
+    def __init__(self, maxBytes=2**30, minBytes=2**16, maxAttached=64):
+
+        if maxBytes <= 0:
+            raise SharedFrameCacheError("The maximum size of the cache must be positive")
+
+        self._maxBytes = maxBytes
+
+        self._minBytes = minBytes
+
+        self._maxAttached = maxAttached
+
+        # The segments attached by this kernel, least recently used first
+        self._attached = collections.OrderedDict()
+
+        # The segments added by this kernel (for the platforms where the segments of the node can not be listed)
+        self._added = collections.OrderedDict()
+
+        self._lock = threading.Lock()
+
+    def _segmentName(self, dataset, key, field=None):
+        """Return the name of the segment of a selection.
+
+        :param dataset: the dataset
+        :type dataset: :class:`h5py.Dataset`
+        :param key: the key, one integer or slice per axis
+        :type key: tuple
+        :param field: for compound datasets, the field of the selection. If None, the whole elements are selected.
+        :type field: str or None
+
+        :return: the name of the segment or None if the selection can not be shared (in-memory file)
+        :rtype: str or None
+        """
+
+        try:
+            stat = os.stat(dataset.file.filename)
+        except OSError:
+            return None
+
+        key = tuple((k.start, k.stop, k.step) if isinstance(k, slice) else int(k) for k in key)
+
+        identity = repr((stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns, dataset.name, dataset.dtype.str, dataset.shape, key, field))
+
+        # The names of the segments are limited to 31 characters on macOS
+        return segmentPrefix + hashlib.blake2b(identity.encode(), digest_size=12).hexdigest()
+
+    def _view(self, segment, shape, dtype, writeable=False):
+        """Return the array stored in a segment.
+
+        :param segment: the segment
+        :type segment: :class:`multiprocessing.shared_memory.SharedMemory`
+        :param shape: the shape of the array
+        :type shape: tuple
+        :param dtype: the type of the array
+        :type dtype: :class:`numpy.dtype`
+        :param writeable: if False, the array is read-only
+        :type writeable: bool
+
+        :return: the array
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        data = np.ndarray(shape, dtype=dtype, buffer=segment.buf, offset=_headerSize)
+        data.flags.writeable = writeable
+
+        return data
+
+    def _attach(self, name, segment):
+        """Keep a segment attached and release the least recently used segments which are not viewed anymore.
+
+        :param name: the name of the segment
+        :type name: str
+        :param segment: the segment
+        :type segment: :class:`multiprocessing.shared_memory.SharedMemory`
+        """
+
+        with self._lock:
+            self._attached[name] = segment
+            self._attached.move_to_end(name)
+            for oldName in list(self._attached)[:max(0, len(self._attached) - self._maxAttached)]:
+                try:
+                    self._attached[oldName].close()
+                except BufferError:
+                    # The segment is still viewed
+                    continue
+                del self._attached[oldName]
+
+    def _evict(self):
+        """Unlink the least recently used segments of the node until their total size fits in the cache."""
+
+        if os.path.isdir(_sharedMemoryDirectory):
+            segments = []
+            for entry in os.scandir(_sharedMemoryDirectory):
+                if entry.name.startswith(segmentPrefix):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    segments.append((stat.st_mtime_ns, entry.name, stat.st_size))
+            segments.sort()
+        else:
+            with self._lock:
+                segments = [(0, name, size) for name, size in self._added.items()]
+
+        totalBytes = sum(size for _, _, size in segments)
+        for _, name, size in segments:
+            if totalBytes <= self._maxBytes:
+                break
+            try:
+                _unlinkSegment(name)
+            except FileNotFoundError:
+                pass
+            with self._lock:
+                self._added.pop(name, None)
+            totalBytes -= size
+
+    def get(self, dataset, key, read, field=None):
+        """Return a selection of a dataset from the cache, reading and adding it if it is missing.
+
+        :param dataset: the dataset
+        :type dataset: :class:`h5py.Dataset`
+        :param key: the key, one integer or slice per axis
+        :type key: tuple
+        :param read: the callable reading the selection when it is missing
+        :type read: callable
+        :param field: for compound datasets, the field read by *read*. If None, the whole elements are read.
+        :type field: str or None
+
+        :return: the selection. It is a read-only view of the shared memory when the selection is cached.
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        if not isinstance(dataset, h5py.Dataset) or not all(isinstance(k, (slice, int, np.integer)) for k in key):
+            return read()
+
+        shape = _resultShape(dataset.shape, key)
+        dtype = dataset.dtype if field is None else dataset.dtype[field]
+        nBytes = int(np.prod(shape))*dtype.itemsize
+        if nBytes < self._minBytes or _headerSize + nBytes > self._maxBytes:
+            return read()
+
+        name = self._segmentName(dataset, key, field)
+        if name is None:
+            return read()
+
+        with self._lock:
+            segment = self._attached.get(name)
+
+        if segment is None:
+            try:
+                segment = _openSegment(name)
+            except FileNotFoundError:
+                segment = None
+
+        if segment is not None and _header.unpack_from(segment.buf)[0] == _ready:
+            self._attach(name, segment)
+            self._touch(name)
+            return self._view(segment, shape, dtype)
+
+        data = np.asarray(read())
+
+        # The segment exists but is not ready: another kernel is writing it
+        if segment is not None:
+            segment.close()
+            return data
+
+        try:
+            segment = _openSegment(name, _headerSize + nBytes)
+        except FileExistsError:
+            return data
+
+        self._view(segment, shape, dtype, writeable=True)[...] = data
+        _header.pack_into(segment.buf, 0, _ready)
+
+        with self._lock:
+            self._added[name] = _headerSize + nBytes
+
+        self._attach(name, segment)
+        self._evict()
+
+        return self._view(segment, shape, dtype)
+
+    def _touch(self, name):
+        """Mark a segment as recently used.
+
+        :param name: the name of the segment
+        :type name: str
+        """
+
+        try:
+            os.utime(os.path.join(_sharedMemoryDirectory, name))
+        except OSError:
+            pass
+
+    def clear(self):
+        """Unlink all the segments of the cache, including the ones added by the other kernels of the node."""
+
+        maxBytes, self._maxBytes = self._maxBytes, 0
+        try:
+            self._evict()
+        finally:
+            self._maxBytes = maxBytes
+
+    @property
+    def maxBytes(self):
+        """Getter for the maximum total size of the segments of the node.
+
+        :return: the size in bytes
+        :rtype: int
+        """
+
+        return self._maxBytes
@@ -2,22 +2,62 @@
 MatPlotLib viewer for NumPy 1D, 2D and 3D NumPy data.
 """
 
+import importlib
+import warnings
+
 import numpy as np
 
-import warnings
-warnings.filterwarnings("ignore")
+from hdfviewer.utils.DatasetView import DatasetView
+
+# The cross plots of constant rows or columns have identical limits which MatPlotLib expands by itself
+warnings.filterwarnings("ignore",message="Attempting to set identical",category=UserWarning,module="hdfviewer")
 
-from hdfviewer.viewers.MplDataViewer1D import _MplDataViewer1D
-from hdfviewer.viewers.MplDataViewer2D import _MplDataViewer2D
-from hdfviewer.viewers.MplDataViewer3D import _MplDataViewer3D
+# The (module,class) of the dimension specific viewers per rendering backend. The viewers (and MatPlotLib) are only imported when a dataset
+# is first displayed.
+_viewers = {"matplotlib" : {1 : ("MplDataViewer1D","_MplDataViewer1D"), 2 : ("MplDataViewer2D","_MplDataViewer2D"), 3 : ("MplDataViewer3D","_MplDataViewer3D")},
+            "numpy" : {1 : ("MplDataViewer1D","_MplDataViewer1D"), 2 : ("NpDataViewer2D","_NpDataViewer2D"), 3 : ("NpDataViewer3D","_NpDataViewer3D")}}
 
-_viewers = {1 : _MplDataViewer1D, 2 : _MplDataViewer2D, 3 : _MplDataViewer3D}
+# The options of the MatPlotLib viewers which are not supported by the other backends, with the value for which they have no effect
+_unsupportedOptions = {"numpy" : {2 : {"histogram" : False,"maxRedrawRate" : 30,"live" : False,"pollInterval" : 1.0,"profileWidth" : 1,"displayPrecision" : "full"},
+                                  3 : {"histogram" : False,"playbackFps" : 10,"maxRedrawRate" : 30,"live" : False,"pollInterval" : 1.0,"roiReduction" : "sum",
+                                       "profileWidth" : 1,"colorScope" : "frame","displayPrecision" : "full"}}}
 
 class MplDataViewerError(Exception):
     """:class:`MplDataViewer` specific exception"""
 
     pass
 
+def numericFields(dtype):
+    """Return the fields of a compound type which can be displayed by the viewer.
+
+    :param dtype: the type
+    :type dtype: :class:`numpy.dtype`
+
+    :return: the names of the numeric fields. Empty if the type is not compound.
+    :rtype: list[str]
+    """
+
+    if dtype.names is None:
+        return []
+
+    return [name for name in dtype.names if np.issubdtype(dtype[name].base,np.number)]
+
+def _viewerClass(backend,ndim):
+    """Import the dimension specific viewer of a rendering backend.
+
+    :param backend: the rendering backend
+    :type backend: str
+    :param ndim: the dimension of the dataset
+    :type ndim: int
+
+    :return: the viewer class
+    :rtype: type
+    """
+
+    module, name = _viewers[backend][ndim]
+
+    return getattr(importlib.import_module("hdfviewer.viewers." + module),name)
+
 class MplDataViewer(object):
     """This class allows to display 1D,2D or 3D NumPy array in a :class:`matplotlib.figure.Figure`
 
@@ -32,6 +72,9 @@ class MplDataViewer(object):
     - **2D**:
 
       - toggle between cross and integration 1D potting mode. In cross plot mode, the 1D projection views represents resp. the row and column of the matrix image point left-clicked by the user. In integration plot mode, the 1D projection views represents the sum over resp. the row and column of the image. To switch between those two modes, press the **i** key.
+      - toggle the line-profile mode by pressing the **t** key. In line-profile mode, clicking two points on the image displays the profile of the image along the line (bilinearly interpolated and optionally averaged over a width) on top of the image
+      - toggle between a strided preview and the full resolution of the displayed region by pressing the **e** key. Images which do not fit in the memory budget (*memoryBudget* keyword, 256 MiB by default) are read with a stride and flagged as previews
+      - cycle between the min/max, percentile and logarithmic colour scales by pressing the **n** key. The percentile limits (*percentiles* keyword, 1% and 99% by default) are estimated from mergeable quantile sketches of the frames which are cached, so that a few hot pixels do not wash out the image
     - **3D**:
 
       - toggle between cross and integration 1D potting mode. See above.
@@ -41,6 +84,12 @@ class MplDataViewer(object):
       - go to the previous frame by pressing the **up** or the **left** keys or wheeling **up** the mouse down
       - go the +n (n can be > 9) frame by pressing *n* number followed by the **down** or the **right** keys 
       - go the -n (n can be > 9) frame by pressing *n* number followed by the **up** or the **left** keys 
+      - play/pause the frames by pressing the **p** key. Frames are skipped when the display can not keep up with the target frame rate
+      - toggle the line-profile mode by pressing the **t** key. See above. The kymograph of the line (i.e. its profile as a function of the frame) is also displayed below the image
+      - cycle between the frame view and the sum, maximum and mean projections of the frames by pressing the **m** key. The projections are computed in the background block by block and cached
+      - toggle the ROI mode by pressing the **r** key. In ROI mode, dragging a rectangle over the image displays the sum (or the mean) of the region of interest as a function of the frame below the image. Only the region of interest is read, in parallel, and the trace is drawn progressively
+      - toggle between a strided preview and the full resolution of the displayed region by pressing the **e** key. See above
+      - cycle between the colour scales by pressing the **n** key. See above. With the *colorScope="stack"* keyword, the colour limits are computed once from the whole dataset, chunk by chunk in the background
 
     .. code-block:: python
        :caption: Example
@@ -60,30 +109,75 @@ class MplDataViewer(object):
     :param standAlone: if True a cursor will be displayed when hovering over the 2D view of the dataset (only for 2D or 3D datasets)
     :type standAlone: bool
 
+    :param field: for compound datasets, the name of the numeric field to be displayed. Only that field is read from the dataset.
+    :type field: str or None
+
+    :param sharedCache: the node-local cache of frames shared with the other kernels of the node. The frames read by a kernel are then displayed by the other kernels without reading nor decoding them again.
+    :type sharedCache: :class:`hdfviewer.utils.SharedFrameCache.SharedFrameCache` or None
+
+    :param backend: the rendering backend. With *matplotlib*, the dataset is displayed in an interactive MatPlotLib figure. With *numpy*, 2D and 3D datasets are colour-mapped with NumPy and sent to the browser as lightweight images (1D datasets are still displayed with MatPlotLib).
+    :type backend: str
+
+    :param `**kwargs`: the keyword arguments to be passed to the dimension specific viewer (e.g. *histogram* for 2D and 3D datasets, *live* for following a growing dataset or *displayPrecision* for keeping the frames of 2D and 3D datasets at a reduced precision with the *matplotlib* backend)
+    :type `**kwargs`: dict
+
+    :raises: :class:`MplDataViewerError`: if the rendering backend is unknown
     :raises: :class:`MplDataViewerError`: if the (squeezed) dataset has a dimension different from 1, 2 or 3 
+    :raises: :class:`MplDataViewerError`: if the dataset is compound and no valid numeric field is selected
+    :raises: :class:`MplDataViewerError`: if an option of the *matplotlib* backend is enabled with another backend (e.g. *histogram* with *numpy*)
     """
 
-    def __init__(self,dataset,standAlone=True):
+    def __init__(self,dataset,standAlone=True,field=None,backend="matplotlib",sharedCache=None,**kwargs):
+
+        # The options are kept so that a session can be replayed against the same viewer (see hdfviewer.viewers.MplInteractionTrace)
+        self._options = dict(kwargs,standAlone=standAlone,field=field,backend=backend)
+
+        if backend not in _viewers:
+            raise MplDataViewerError("Unknown rendering backend ({backend}). Valid backends are: {backends}".format(backend=backend,backends=", ".join(_viewers)))
+
+        # For compound datasets, only the selected field is read, when the view is indexed (see h5py field selection)
+        if dataset.dtype.names is not None:
+            fields = numericFields(dataset.dtype)
+            if field not in fields:
+                raise MplDataViewerError("Invalid field ({field}) for compound dataset. Valid fields are: {fields}".format(field=field,fields=", ".join(fields)))
+            dtype = dataset.dtype[field]
+        else:
+            field = None
+            dtype = dataset.dtype
 
         # The viewer only supports array with numeric types
-        if not np.issubdtype(dataset.dtype,np.number):
-            raise MplDataViewerError("The dataset type ({dtype}) is not numeric".format(dtype=dataset.dtype))
+        if not np.issubdtype(dtype,np.number):
+            raise MplDataViewerError("The dataset type ({dtype}) is not numeric".format(dtype=dtype))
             
-        # Remove axis with that has dimension 1 (e.g. (20,1,30) --> (20,30))
-        self._dataset = np.squeeze(dataset)
+        # Remove axis with that has dimension 1 (e.g. (20,1,30) --> (20,30)). The view reads the data only when it is indexed.
+        self._dataset = DatasetView(dataset,sharedCache,field)
 
         ndim = self._dataset.ndim
-        if ndim not in _viewers:
+        if ndim not in _viewers[backend]:
             raise MplDataViewerError("The dataset dimension ({ndim:d}) is not supported by the viewer".format(ndim=ndim))
 
-        self._viewer = _viewers[ndim](self._dataset,standAlone=standAlone)
+        unsupported = [option for option, value in _unsupportedOptions.get(backend,{}).get(ndim,{}).items() if kwargs.get(option,value) != value]
+        if unsupported:
+            raise MplDataViewerError("The {backend} backend does not support the options: {options}".format(backend=backend,options=", ".join(unsupported)))
+
+        self._viewer = _viewerClass(backend,ndim)(self._dataset,standAlone=standAlone,**kwargs)
+
+    @property
+    def options(self):
+        """Getter for the options the viewer was created with.
+
+        :return: the keyword arguments of the viewer, except the shared cache
+        :rtype: dict
+        """
+
+        return dict(self._options)
                             
     @property
     def viewer(self):
         """Getter for the dimension specific viewer.
 
         :return: the dimension specific viewer
-        :rtype: :class:`_MplDataViewer1D` or :class:`_MplDataViewer2D` or :class:`_MplDataViewer3D`
+        :rtype: :class:`_MplDataViewer1D` or :class:`_MplDataViewer2D` or :class:`_MplDataViewer3D` or :class:`_NpDataViewer2D` or :class:`_NpDataViewer3D`
         """
         return self._viewer
                    
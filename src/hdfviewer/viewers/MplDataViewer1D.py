@@ -6,6 +6,10 @@ import numpy as np
 
 import matplotlib.pyplot as plt
 
+from hdfviewer.viewers.MplLiveMonitor import _MplLiveMonitor
+
+from hdfviewer.utils.MemoryBudget import previewStride
+
 class _MplDataViewer1D(object):
     """This class allows to display 1D NumPy array in a :class:`matplotlib.figure.Figure`
 
@@ -16,18 +20,34 @@ class _MplDataViewer1D(object):
         The dataset will be squeezed from any dimensions equal to 1
     :type dataset: :class:`numpy.ndarray`
 
+    :param live: if True the dataset is polled for appended data (e.g. a dataset written in SWMR mode) and the plot is extended with the appended values only
+    :type live: bool
+
+    :param pollInterval: the polling interval in seconds in live mode
+    :type pollInterval: float
+
+    :param memoryBudget: the maximum number of bytes read for plotting the dataset. When the dataset is larger, it is plotted with the stride which makes it fit in the budget. If None, :data:`hdfviewer.utils.MemoryBudget.defaultMemoryBudget` is used.
+    :type memoryBudget: int or None
+
     :param `kwargs`: the keyword arguments
     :type `kwargs`: dict
     """
     
-    def __init__(self,dataset,**kwargs):
+    def __init__(self,dataset,live=False,pollInterval=1.0,memoryBudget=None,**kwargs):
                             
+        self._memoryBudget = memoryBudget
+
         self._figure = plt.figure()
 
         self._initLayout()
 
         self.dataset = dataset
 
+        self._liveMonitor = None
+        if live:
+            self._liveMonitor = _MplLiveMonitor(self._figure,self._dataset,self._onDatasetGrown,pollInterval)
+            self._liveMonitor.start()
+
         plt.show(self._figure)
                    
     @property
@@ -58,19 +78,68 @@ class _MplDataViewer1D(object):
                         
         self.update()
         
+    @property
+    def liveMonitor(self):
+        """Getter for the monitor polling the dataset in live mode.
+
+        :return: the live monitor or None if the live mode is not set
+        :rtype: :class:`hdfviewer.viewers.MplLiveMonitor._MplLiveMonitor` or None
+        """
+
+        return self._liveMonitor
+
     def _initLayout(self):
         """Initializes the figure layout.
         """
 
         self._mainAxes = plt.subplot(111)
                             
+        self._line = None
+
+    def _onDatasetGrown(self,previousShape,shape):
+        """Callback called in live mode when the shape of the dataset has changed.
+
+        Only the appended values are read and the plot is extended with them.
+
+        :param previousShape: the former shape of the dataset
+        :type previousShape: tuple
+        :param shape: the new shape of the dataset
+        :type shape: tuple
+        """
+
+        # The dataset has been rewritten or does not fit in the memory budget anymore, everything is read again
+        if shape[0] < previousShape[0] or self._stride > 1 or previewStride(shape,self._dataset.dtype,self._memoryBudget) > 1:
+            self.update()
+            return
+
+        self._data = np.concatenate((self._data,self._dataset[previousShape[0]:shape[0]]))
+
+        self._line.set_data(np.arange(len(self._data)),self._data)
+
+        self._mainAxes.relim()
+        self._mainAxes.autoscale_view()
+
+        self._figure.canvas.draw_idle()
+
     def update(self):
         """Update the figure.
         """
 
-        self._mainAxes.plot(self._dataset[:])
+        # Datasets which do not fit in the memory budget are plotted with a stride
+        self._stride = previewStride(self._dataset.shape,self._dataset.dtype,self._memoryBudget)
+        self._data = self._dataset[::self._stride]
+
+        xValues = np.arange(len(self._data))*self._stride
+        if self._line is None:
+            self._line, = self._mainAxes.plot(xValues,self._data)
+        else:
+            self._line.set_data(xValues,self._data)
+            self._mainAxes.relim()
+            self._mainAxes.autoscale_view()
+
+        self._mainAxes.set_title("preview: 1 value out of {:d}".format(self._stride) if self._stride > 1 else "",color="r")
 
-        plt.draw()
+        self._figure.canvas.draw_idle()
 
 if __name__ == "__main__":
 
@@ -1,12 +1,24 @@
 """MatPlotLib based viewer for 2D NumPy data.
 """
 
+import functools
+
 import numpy as np
 
+import matplotlib.colors as colors
 import matplotlib.gridspec as gridspec
 import matplotlib.pyplot as plt
 import matplotlib.widgets as widgets
 
+from hdfviewer.viewers.MplLiveMonitor import _MplLiveMonitor
+from hdfviewer.viewers.MplRedrawScheduler import _MplRedrawScheduler
+
+from hdfviewer.utils.DisplayPrecision import DisplayPrecisionError, displayFrame, displayPrecisions, displayType
+from hdfviewer.utils.LineProfile import lineProfile
+from hdfviewer.utils.QuantileSketch import QuantileSketch, checkColorScale, colorLimits, colorScales, frameSketch
+from hdfviewer.utils.MemoryBudget import defaultMemoryBudget, estimateBytes, frameSlice, previewSlices, sampledCoordinates, sampledExtent, sampledIndex
+from hdfviewer.viewers.MplHistogram import _MplHistogram
+
 class _MplDataViewer2D(object):
     """This class allows to display 2D NumPy array in a :class:`matplotlib.figure.Figure`
 
@@ -19,6 +31,9 @@ class _MplDataViewer2D(object):
     The figure is interactive with the following interactions:
 
     - toggle between cross and integration 1D potting mode. In cross plot mode, the 1D projection views represents resp. the row and column of the matrix image point left-clicked by the user. In integration plot mode, the 1D projection views represents the sum over resp. the row and column of the image. To switch between those two modes, press the **i** key.
+    - toggle the line-profile mode by pressing the **t** key. In line-profile mode, clicking two points on the image displays the profile of the image along the line on top of the image.
+    - toggle between the preview and the full resolution of the displayed region by pressing the **e** key (see *memoryBudget*).
+    - cycle between the min/max, percentile and logarithmic colour scales by pressing the **n** key (see *colorScale*).
 
     :param dataset: the NumPy array to be displayed
         
@@ -27,11 +42,64 @@ class _MplDataViewer2D(object):
 
     :param standAlone: if True a cursor will be displayed when hovering over the 2D view of the dataset
     :type standAlone: bool
+
+    :param histogram: if True the histogram of the dataset values will be displayed next to the colorbar. Selecting a span over the histogram sets the colour limits of the image, selecting an empty span restores the automatic colour limits.
+    :type histogram: bool
+
+    :param maxRedrawRate: the maximum number of redraws per second when interacting with the figure. The intermediate states of bursts of events (e.g. a fast scroll) are dropped.
+    :type maxRedrawRate: float
+
+    :param live: if True the dataset is polled for appended data (e.g. a dataset written in SWMR mode). When rows are appended, only those rows are read and the image is extended with them.
+    :type live: bool
+
+    :param pollInterval: the polling interval in seconds in live mode
+    :type pollInterval: float
+
+    :param profileWidth: the width in pixels over which the line profiles are averaged
+    :type profileWidth: int
+
+    :param memoryBudget: the maximum number of bytes read for displaying the image. When the image is larger, a strided preview fitting in the budget is displayed instead and the displayed region can be loaded at full resolution. If None, :data:`hdfviewer.utils.MemoryBudget.defaultMemoryBudget` is used.
+    :type memoryBudget: int or None
+
+    :param colorScale: the automatic colour scale of the image. With *minmax* the colour limits are the extrema of the displayed region, with *percentile* they are the *percentiles* of the displayed region (so that a few hot pixels do not wash out the image) and with *log* the colours are logarithmically scaled between the *percentiles* of the positive values. The percentiles are estimated from cached quantile sketches (see :mod:`hdfviewer.utils.QuantileSketch`).
+    :type colorScale: str
+
+    :param percentiles: the (lower,upper) percentiles used as colour limits by the *percentile* and *log* colour scales
+    :type percentiles: tuple
+
+    :param displayPrecision: the precision of the image kept in memory. With *full* it is kept in the type of the dataset. With *float32* or *uint16* a 64 bits image is kept as float32. In all cases the pixel readout is read at full precision from the dataset (see :mod:`hdfviewer.utils.DisplayPrecision`).
+    :type displayPrecision: str
+
+    :raises: :class:`hdfviewer.utils.QuantileSketch.QuantileSketchError`: if the colour scale is unknown
+    :raises: :class:`hdfviewer.utils.DisplayPrecision.DisplayPrecisionError`: if the display precision is unknown
     """
     
-    def __init__(self,dataset,standAlone=True):
+    def __init__(self,dataset,standAlone=True,histogram=False,maxRedrawRate=30,live=False,pollInterval=1.0,profileWidth=1,memoryBudget=None,colorScale="minmax",percentiles=(1.0,99.0),
+                 displayPrecision="full"):
         
+        checkColorScale(colorScale)
+
+        if displayPrecision not in displayPrecisions:
+            raise DisplayPrecisionError("Unknown display precision ({displayPrecision}). Valid display precisions are: {displayPrecisions}".format(displayPrecision=displayPrecision,displayPrecisions=", ".join(displayPrecisions)))
+
         self._standAlone = standAlone
+
+        self._colorScale = colorScale
+
+        self._percentiles = percentiles
+
+        self._displayPrecision = displayPrecision
+
+        self._memoryBudget = memoryBudget
+
+        self._profileWidth = profileWidth
+
+        self._showHistogram = histogram
+
+        self._maxRedrawRate = maxRedrawRate
+
+        # The group of linked viewers the viewer belongs to (see MplViewerGroup)
+        self._linkGroup = None
                     
         self._figure = plt.figure()
 
@@ -45,6 +113,11 @@ class _MplDataViewer2D(object):
 
         self.setXYIntegrationMode(False)
 
+        self._liveMonitor = None
+        if live:
+            self._liveMonitor = _MplLiveMonitor(self._figure,self._dataset,self._onDatasetGrown,pollInterval)
+            self._liveMonitor.start()
+
         plt.show(self._figure)
                    
     @property
@@ -75,29 +148,81 @@ class _MplDataViewer2D(object):
                 
         self._colorbar = None
 
+        self._colorLimits = None
+
         self._selectedRows = slice(0,1,None)
         self._selectedCols = slice(0,1,None)
 
         self._rowSlice = slice(0,self._dataset.shape[0],None)
         self._colSlice = slice(0,self._dataset.shape[1],None)
+
+        # The full resolution region loaded on request, None for the (possibly strided) whole image
+        self._region = None
+
+    @property
+    def schedulers(self):
+        """Getter for the schedulers coalescing the interaction events of the viewer.
+
+        :return: the scheduler of the viewer and the schedulers of its group of linked viewers
+        :rtype: list of :class:`hdfviewer.viewers.MplRedrawScheduler._MplRedrawScheduler`
+        """
+
+        schedulers = [self._redrawScheduler]
+        if self._linkGroup is not None:
+            schedulers.extend(self._linkGroup.schedulers)
+
+        return schedulers
+
+    @property
+    def linkGroup(self):
+        """Getter for the group of linked viewers the viewer belongs to.
+
+        :return: the group or None if the viewer is not linked
+        :rtype: :class:`hdfviewer.viewers.MplViewerGroup.MplViewerGroup` or None
+        """
+
+        return self._linkGroup
+
+    @property
+    def liveMonitor(self):
+        """Getter for the monitor polling the dataset in live mode.
+
+        :return: the live monitor or None if the live mode is not set
+        :rtype: :class:`hdfviewer.viewers.MplLiveMonitor._MplLiveMonitor` or None
+        """
+
+        return self._liveMonitor
         
     def _onChangeAxesLimits(self,event):
         """Callback called when the axis of the matrix view have changed.
 
-        This will update the cross plot according to the reduced row and/or column range.
+        This will request an update of the cross plot according to the reduced row and/or column range.
 
         :param event: the axes whose axis have been changed
         :type event: :class:`matplotlib.axes.SubplotBase`
         """
 
-        self._rowSlice = slice(*sorted([int(v) for v in event.get_ylim()]))
-        self._colSlice = slice(*sorted([int(v) for v in event.get_xlim()]))
-        
-        data = self._dataset[self._rowSlice,self._colSlice]
+        self._redrawScheduler.request("limits",functools.partial(self._setAxesLimits,event.get_ylim(),event.get_xlim()))
+
+        if self._linkGroup is not None:
+            self._linkGroup.onLimits(self,event.get_ylim(),event.get_xlim())
 
-        if self._colorbar:
-            self._colorbar.set_clim(vmin=data.min(),vmax=data.max())
-            self._colorbar.draw_all()
+    def _setAxesLimits(self,ylim,xlim):
+        """Update the colour limits and the cross plot according to the limits of the matrix view.
+
+        :param ylim: the row limits
+        :type ylim: tuple
+        :param xlim: the column limits
+        :type xlim: tuple
+        """
+
+        self._rowSlice = slice(*sorted([int(v) for v in ylim]))
+        self._colSlice = slice(*sorted([int(v) for v in xlim]))
+        
+        # Explicit colour limits prevail over the ones of the displayed region
+        if self._colorbar and self._colorLimits is None:
+            self._applyColorLimits(self._frameSlices(self._rowSlice,self._colSlice))
+            self._updateColorbar()
 
         self._updateCrossPlot()
 
@@ -110,29 +235,81 @@ class _MplDataViewer2D(object):
 
         self._mainAxes.callbacks.connect('ylim_changed', self._onChangeAxesLimits)
 
+        # Bursts of events are coalesced and the figure is redrawn at a capped rate
+        self._redrawScheduler = _MplRedrawScheduler(self._figure,self._maxRedrawRate)
+
     def _initLayout(self):
         """Initializes the figure layout.
         """
 
-        grid = gridspec.GridSpec(3, 3, self._figure, width_ratios=[0.3, 4, 1], height_ratios=[1, 4, 0.3], wspace=0.3)
+        # The histogram is displayed in an additional column on the left of the colorbar
+        offset = 1 if self._showHistogram else 0
+
+        grid = gridspec.GridSpec(3, 3+offset, self._figure, width_ratios=[1.2]*offset + [0.3, 4, 1], height_ratios=[1, 4, 0.3], wspace=0.3)
 
-        self._mainAxes = plt.subplot(grid[1,1])
+        self._mainAxes = plt.subplot(grid[1,1+offset])
         self._mainAxes.set_xlim([0,self._dataset.shape[1]])
         self._mainAxes.set_ylim([0,self._dataset.shape[0]])
         if self._standAlone:
             self._cursor = widgets.Cursor(self._mainAxes,useblit=True)
 
-        self._cbarAxes = plt.subplot(grid[1,0])
-        self._rowSliceAxes = plt.subplot(grid[0,1])
+        # The pixel values of an image kept at a reduced precision or sampled are read at full precision from the dataset
+        self._mainAxes.format_coord = self._formatCoord
+
+        self._cbarAxes = plt.subplot(grid[1,offset])
+        self._rowSliceAxes = plt.subplot(grid[0,1+offset])
         self._rowSliceAxes.xaxis.set_tick_params(bottom=False,labelbottom=False,top=True,labeltop=True)
-        self._colSliceAxes = plt.subplot(grid[1,2])
+        self._colSliceAxes = plt.subplot(grid[1,2+offset])
         self._colSliceAxes.tick_params(axis="x",rotation=270)
         self._colSliceAxes.yaxis.set_tick_params(bottom=False,labelbottom=False,top=True,labeltop=True)
 
         self._image = None
 
+        # Indicates whether the image is a strided preview or a full resolution region
+        self._samplingText = self._mainAxes.text(0.01,0.99,"",transform=self._mainAxes.transAxes,color="r",ha="left",va="top")
+
+        self._histogram = _MplHistogram(plt.subplot(grid[1,0]),self._dataset,self.setColorLimits) if self._showHistogram else None
+
         self._selectedPixel = (0,0)
+
+        # The line profile is defined by two clicked points
+        self._lineProfileMode = False
+        self._profilePoints = []
+        self._profileEndpoints = None
+        self._profileLine = None
         
+    def _onDatasetGrown(self,previousShape,shape):
+        """Callback called in live mode when the shape of the dataset has changed.
+
+        When rows have been appended, only those rows are read otherwise the whole image is read again. If the whole image was displayed,
+        the view is extended to the new shape.
+
+        :param previousShape: the former shape of the dataset
+        :type previousShape: tuple
+        :param shape: the new shape of the dataset
+        :type shape: tuple
+        """
+
+        # The appended rows can only be concatenated to a whole image read at full resolution which still fits in the budget
+        sampling = self._sampling
+        if self._region is None and sampling[0].step == 1 and shape[0] > previousShape[0] and shape[1] == previousShape[1] and \
+           estimateBytes(shape,self._dataset.dtype) <= self._budget:
+            self._frame = np.concatenate((self._frame,displayFrame(self._dataset[previousShape[0]:shape[0],:],self._displayPrecision)))
+            self._sampling = (slice(0,shape[0],1),sampling[1])
+        else:
+            self._frame = self._readFrame()
+
+        self._displayFrame()
+
+        # Follow the growth of the dataset unless the user zoomed in
+        ylim = sorted(self._mainAxes.get_ylim())
+        xlim = sorted(self._mainAxes.get_xlim())
+        if ylim == [0,previousShape[0]] and xlim == [0,previousShape[1]]:
+            self._mainAxes.set_xlim([0,shape[1]])
+            self._mainAxes.set_ylim([0,shape[0]])
+        else:
+            self._updateCrossPlot()
+
     def _onKeyPress(self,event):
         """Callback called when a keyboard key is pressed.
 
@@ -142,6 +319,15 @@ class _MplDataViewer2D(object):
 
         if event.key == "i":
             self.setXYIntegrationMode(not self._xyIntegration)
+        elif event.key == "t":
+            self.setLineProfileMode(not self._lineProfileMode)
+        elif event.key == "n":
+            self.setColorScale(colorScales[(colorScales.index(self._colorScale)+1) % len(colorScales)])
+        elif event.key == "e":
+            if self._region is None:
+                self.setRegion(self._rowSlice,self._colSlice)
+            else:
+                self.setRegion(None,None)
 
         self._updateCrossPlot()
 
@@ -158,8 +344,15 @@ class _MplDataViewer2D(object):
 
         if not event.inaxes or (event.inaxes.axes != self._mainAxes):
             return
+
+        if self._lineProfileMode:
+            self._profilePoints.append((event.ydata,event.xdata))
+            if len(self._profilePoints) == 2:
+                self.setLineProfile(*self._profilePoints)
+                self._profilePoints = []
+            return
         
-        self.selectPixel(int(event.ydata),int(event.xdata))
+        self._redrawScheduler.request("pixel",functools.partial(self.selectPixel,int(event.ydata),int(event.xdata)))
         
     def _updateCrossPlot(self):
         """Update the cross plots.
@@ -173,21 +366,134 @@ class _MplDataViewer2D(object):
             self._selectedRows = slice(row,row+1,None)
             self._selectedCols = slice(col,col+1,None)
 
+        # The displayed and selected regions are converted to the (possibly strided) image kept in memory
+        rowSampling, colSampling = self._sampling
+        frameRows, frameCols = self._frameSlices(self._rowSlice,self._colSlice)
+        selectedRows, selectedCols = self._frameSlices(self._selectedRows,self._selectedCols)
+
         self._rowSliceAxes.clear()        
-        xValues = np.arange(*self._colSlice.indices(self._colSlice.stop))
-        yValues = np.sum(self._dataset[self._selectedRows,self._colSlice],axis=0)
-        self._rowSliceAxes.plot(xValues,yValues)
-        self._rowSliceAxes.set_xlim(min(xValues),max(xValues))
-        self._rowSliceAxes.set_ylim(min(yValues),max(yValues))
+        if self._lineProfileMode and self._profileEndpoints is not None:
+            # The line profile is displayed instead of the row cross plot
+            start, end = [((row - rowSampling.start)/rowSampling.step,(col - colSampling.start)/colSampling.step) for row, col in self._profileEndpoints]
+            distances, profile = lineProfile(self._frame,start,end,width=self._profileWidth)
+            distances = distances*rowSampling.step
+            self._rowSliceAxes.plot(distances,profile,color="r")
+            self._rowSliceAxes.set_xlim(distances[0],distances[-1])
+        else:
+            xValues = sampledCoordinates(frameCols,colSampling)
+            yValues = np.sum(self._frame[selectedRows,frameCols],axis=0)
+            self._rowSliceAxes.plot(xValues,yValues)
+            self._rowSliceAxes.set_xlim(min(xValues),max(xValues))
+            self._rowSliceAxes.set_ylim(min(yValues),max(yValues))
                 
         self._colSliceAxes.clear()                
-        xValues = np.arange(*self._rowSlice.indices(self._rowSlice.stop))
-        yValues = np.sum(self._dataset[self._rowSlice,self._selectedCols],axis=1)
+        xValues = sampledCoordinates(frameRows,rowSampling)
+        yValues = np.sum(self._frame[frameRows,selectedCols],axis=1)
         self._colSliceAxes.plot(yValues,xValues)
         self._colSliceAxes.set_xlim(min(yValues),max(yValues))
         self._colSliceAxes.set_ylim(min(xValues),max(xValues))
 
-        plt.draw()
+        self._figure.canvas.draw_idle()
+
+    def _applyColorLimits(self,frameRegion=None):
+        """Set the colour limits of the image.
+
+        Explicit colour limits prevail over the automatic ones of the colour scale. Limits which are not valid for the colour scale (e.g. no positive
+        value for the logarithmic one) are ignored.
+
+        :param frameRegion: the rows and columns slices of the image kept in memory over which the automatic colour limits are computed. If None, the whole image is used.
+        :type frameRegion: tuple of slice or None
+        """
+
+        if self._colorLimits is not None:
+            vmin, vmax = self._colorLimits
+        elif self._colorScale == "minmax":
+            data = self._frame[frameRegion] if frameRegion is not None else self._frame
+            vmin, vmax = np.nanmin(data), np.nanmax(data)
+        else:
+            # The sketch of the whole image is cached, the one of a zoomed region is computed on the fly
+            if frameRegion is None or self._frame[frameRegion].shape == self._frame.shape:
+                sketch = frameSketch(self._dataset,self._frame,tuple((s.start,s.stop,s.step) for s in self._sampling))
+            else:
+                sketch = QuantileSketch.fromArray(self._frame[frameRegion],maxSamples=2**20)
+            vmin, vmax = colorLimits(sketch,self._colorScale,self._percentiles)
+
+        if not np.isfinite([vmin,vmax]).all() or (self._colorScale == "log" and not 0 < vmin < vmax):
+            return
+
+        self._image.set_clim(vmin=vmin,vmax=vmax)
+
+    def _colorNorm(self):
+        """Return the normalization of the image for the current colour scale.
+
+        :return: the normalization
+        :rtype: :class:`matplotlib.colors.Normalize`
+        """
+
+        return colors.LogNorm() if self._colorScale == "log" else colors.Normalize()
+
+    def _frameSlices(self,rows,cols):
+        """Convert full resolution rows and columns into slices of the image kept in memory.
+
+        :param rows: the full resolution rows
+        :type rows: slice
+        :param cols: the full resolution columns
+        :type cols: slice
+
+        :return: the rows and columns slices of the image kept in memory
+        :rtype: tuple of slice
+        """
+
+        return tuple(frameSlice(s,sampling,n) for s, sampling, n in zip((rows,cols),self._sampling,self._frame.shape))
+
+    def _formatCoord(self,x,y):
+        """Format the coordinates and the value of the pixel under the mouse.
+
+        The value is taken from the image kept in memory when it holds the pixel at full precision. Otherwise, i.e. when the image is kept at a
+        reduced precision or when the pixel has not been read (strided preview, region), the single value is read from the dataset.
+
+        :param x: the x coordinate
+        :type x: float
+        :param y: the y coordinate
+        :type y: float
+
+        :return: the formatted coordinates and value
+        :rtype: str
+        """
+
+        row, col = int(round(y)), int(round(x))
+        if not (0 <= row < self._dataset.shape[0] and 0 <= col < self._dataset.shape[1]):
+            return "x=%d y=%d" % (col,row)
+
+        value = None
+        if displayType(self._dataset.dtype,self._displayPrecision) is None:
+            index = tuple(sampledIndex(i,sampling,n) for i, sampling, n in zip((row,col),self._sampling,self._frame.shape))
+            if None not in index:
+                value = self._frame[index]
+
+        if value is None:
+            value = self._dataset[row,col]
+
+        return "x=%d y=%d value=%s" % (col,row,value)
+
+    @property
+    def _budget(self):
+        """Getter for the memory budget of the image.
+
+        :return: the maximum number of bytes read for displaying the image
+        :rtype: int
+        """
+
+        return defaultMemoryBudget if self._memoryBudget is None else self._memoryBudget
+
+    def _updateColorbar(self):
+        """Update the colorbar and the histogram according to the colour limits of the image.
+        """
+
+        self._colorbar.update_normal(self._image)
+
+        if self._histogram is not None:
+            self._histogram.setLimits(*self._image.get_clim())
 
     def selectPixel(self,row,col):
         """Select a pixel on the image.
@@ -203,7 +509,140 @@ class _MplDataViewer2D(object):
         self._selectedPixel = (row,col)
 
         self._updateCrossPlot()
+
+        if self._linkGroup is not None:
+            self._linkGroup.onPixel(self,row,col)
+
+    def setLimits(self,ylim,xlim):
+        """Set the limits of the image (i.e. zoom).
+
+        :param ylim: the row limits
+        :type ylim: tuple
+        :param xlim: the column limits
+        :type xlim: tuple
+        """
+
+        self._mainAxes.set_xlim(xlim)
+        self._mainAxes.set_ylim(ylim)
                             
+    def setColorLimits(self,vmin,vmax):
+        """Set the colour limits of the image.
+
+        The colour limits are kept when the displayed region (or frame) changes.
+
+        :param vmin: the lower colour limit. If None, the automatic colour limits are restored.
+        :type vmin: float or None
+        :param vmax: the upper colour limit. If None, the automatic colour limits are restored.
+        :type vmax: float or None
+        """
+
+        if vmin is None or vmax is None:
+            self._colorLimits = None
+        else:
+            self._colorLimits = (vmin,vmax)
+
+        self._applyColorLimits(self._frameSlices(self._rowSlice,self._colSlice))
+
+        self._updateColorbar()
+
+        self._figure.canvas.draw_idle()
+
+    def setColorScale(self,colorScale,percentiles=None):
+        """Set the automatic colour scale of the image.
+
+        :param colorScale: the colour scale (*minmax*, *percentile* or *log*, see :class:`_MplDataViewer2D`)
+        :type colorScale: str
+        :param percentiles: the (lower,upper) percentiles used as colour limits. If None, the current percentiles are used.
+        :type percentiles: tuple or None
+
+        :raises: :class:`hdfviewer.utils.QuantileSketch.QuantileSketchError`: if the colour scale is unknown
+        """
+
+        checkColorScale(colorScale)
+
+        self._colorScale = colorScale
+
+        if percentiles is not None:
+            self._percentiles = percentiles
+
+        self._image.set_norm(self._colorNorm())
+
+        self._applyColorLimits(self._frameSlices(self._rowSlice,self._colSlice))
+
+        self._updateColorbar()
+
+        self._figure.canvas.toolbar.set_message("{} colour scale".format(self._colorScale))
+
+        self._figure.canvas.draw_idle()
+
+    def setLineProfile(self,start,end,width=None):
+        """Set the line along which the profile of the image is computed.
+
+        The profile is interpolated bilinearly from the image kept in memory.
+
+        :param start: the (row,column) start point of the line
+        :type start: tuple
+        :param end: the (row,column) end point of the line
+        :type end: tuple
+        :param width: the width in pixels over which the profile is averaged. If None, the current width is used.
+        :type width: int or None
+        """
+
+        if width is not None:
+            self._profileWidth = width
+
+        # Setting a line profile activates the line-profile mode
+        self._lineProfileMode = True
+        self._profileEndpoints = (tuple(start),tuple(end))
+
+        if self._profileLine is not None:
+            self._profileLine.remove()
+        self._profileLine, = self._mainAxes.plot([start[1],end[1]],[start[0],end[0]],color="r")
+
+        self._updateCrossPlot()
+
+    def setLineProfileMode(self,lineProfileMode):
+        """Switch between the pixel selection mode and the line-profile mode.
+
+        :param lineProfileMode: if True, clicking two points on the image sets the line profile otherwise clicking on the image selects a pixel
+        :type lineProfileMode: bool
+        """
+
+        self._lineProfileMode = lineProfileMode
+        self._profilePoints = []
+
+        if self._profileLine is not None:
+            self._profileLine.set_visible(self._lineProfileMode)
+
+        self._figure.canvas.toolbar.set_message("Line-profile mode activated" if self._lineProfileMode else "Line-profile mode deactivated")
+
+        self._updateCrossPlot()
+
+    def setRegion(self,rows,cols):
+        """Load a region of the image at full resolution.
+
+        :param rows: the rows of the region. If None, the whole image is displayed again (strided if it does not fit in the memory budget).
+        :type rows: slice or None
+        :param cols: the columns of the region. If None, the whole image is displayed again (strided if it does not fit in the memory budget).
+        :type cols: slice or None
+        """
+
+        if rows is None or cols is None:
+            self._region = None
+            self._figure.canvas.toolbar.set_message("Whole image displayed")
+        else:
+            region = (slice(*rows.indices(self._dataset.shape[0])[:2],1),slice(*cols.indices(self._dataset.shape[1])[:2],1))
+            nBytes = estimateBytes([max(0,s.stop - s.start) for s in region],self._dataset.dtype)
+            if nBytes > self._budget:
+                self._figure.canvas.toolbar.set_message("The region ({:d} bytes) does not fit in the memory budget ({:d} bytes), zoom in further".format(nBytes,self._budget))
+                return
+            self._region = region
+            self._figure.canvas.toolbar.set_message("Full resolution region loaded")
+
+        self.update()
+
+        self._updateCrossPlot()
+
     def setXYIntegrationMode(self,xyIntegration):
         """Switch between slice plot mode and integration mode.
 
@@ -219,21 +658,62 @@ class _MplDataViewer2D(object):
 
         self._updateCrossPlot()
 
-    def update(self):
-        """Update the figure.
+    def _displayFrame(self):
+        """Display the image kept in memory.
         """
 
         # Remove the current image if any
         if self._image:
             self._image.remove()
 
-        self._image = self._mainAxes.imshow(self._dataset[:,:],aspect="auto",origin="lower")
+        # The image is placed at its full resolution coordinates whatever its sampling
+        self._image = self._mainAxes.imshow(self._frame,aspect="auto",origin="lower",extent=sampledExtent(self._frame.shape,self._sampling),norm=self._colorNorm())
+        # The value of the image is replaced by the full precision one (see _formatCoord)
+        self._image.get_cursor_data = lambda event: None
+
+        stride = self._sampling[0].step
+        if self._region is not None:
+            self._samplingText.set_text("full resolution region (press e for the whole image)")
+        elif stride > 1:
+            self._samplingText.set_text("preview: 1 pixel out of {:d} (press e to load the displayed region)".format(stride))
+        else:
+            self._samplingText.set_text("")
+
+        self._applyColorLimits()
 
         if self._colorbar is None:
             self._colorbar = self._figure.colorbar(self._image, cax=self._cbarAxes)
             self._colorbar.ax.yaxis.set_ticks_position('left')
 
-        plt.draw()
+        self._updateColorbar()
+
+        self._figure.canvas.draw_idle()
+
+    def update(self):
+        """Update the figure.
+        """
+
+        # The image is read once and kept in memory for the interactions
+        self._frame = self._readFrame()
+
+        self._displayFrame()
+
+    def _readFrame(self):
+        """Read the image to be kept in memory.
+
+        The image is read at full resolution if it fits in the memory budget otherwise it is read with the stride which makes it fit.
+        A region loaded with :meth:`setRegion` is always read at full resolution.
+
+        :return: the image, at the display precision
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        if self._region is not None:
+            self._sampling = self._region
+        else:
+            self._sampling = previewSlices((slice(0,self._dataset.shape[0]),slice(0,self._dataset.shape[1])),self._dataset.dtype,self._memoryBudget)
+
+        return displayFrame(self._dataset[self._sampling],self._displayPrecision)
 
 if __name__ == "__main__":
 
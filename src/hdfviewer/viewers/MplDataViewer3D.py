@@ -1,12 +1,29 @@
 """MatPlotLib based viewer for 2D NumPy data.
 """
 
+import functools
+import time
+
 import numpy as np
 
+import matplotlib.colors as colors
 import matplotlib.gridspec as gridspec
+import matplotlib.patches as patches
 import matplotlib.pyplot as plt
 import matplotlib.widgets as widgets
 
+from hdfviewer.viewers.MplLiveMonitor import _MplLiveMonitor
+from hdfviewer.viewers.MplRedrawScheduler import _MplRedrawScheduler
+
+from hdfviewer.utils.DisplayPrecision import DisplayPrecisionError, displayFrame, displayPrecisions, displayType, reduceFrame, restoreFrame
+from hdfviewer.utils.FramePrefetcher import FramePrefetcher
+from hdfviewer.utils.FrameProjection import FrameProjectionError, cachedProjection, projections, projectionStreamer
+from hdfviewer.utils.LineProfile import Kymograph, lineProfile
+from hdfviewer.utils.QuantileSketch import QuantileSketch, QuantileSketchError, cachedSketch, checkColorScale, colorLimits, colorScales, frameSketch, sketchStreamer
+from hdfviewer.utils.MemoryBudget import defaultMemoryBudget, estimateBytes, frameSlice, previewSlices, sampledCoordinates, sampledExtent, sampledIndex
+from hdfviewer.utils.RoiTrace import RoiTrace
+from hdfviewer.viewers.MplHistogram import _MplHistogram
+
 class _MplDataViewer3D(object):
     """This class allows to display 3D NumPy array in a :class:`matplotlib.figure.Figure`
 
@@ -26,6 +43,12 @@ class _MplDataViewer3D(object):
     - go to the previous frame by pressing the **up** or the **left** keys or wheeling **up** the mouse down
     - go the +n (n can be > 9) frame by pressing *n* number followed by the **down** or the **right** keys 
     - go the -n (n can be > 9) frame by pressing *n* number followed by the **up** or the **left** keys 
+    - play/pause the frames by pressing the **p** key
+    - cycle between the frame view and the sum, maximum and mean projections of the frames by pressing the **m** key
+    - toggle the line-profile mode by pressing the **t** key. In line-profile mode, clicking two points on the image displays the profile of the frame along the line on top of the image and the kymograph of the line (i.e. its profile as a function of the frame) below the image
+    - toggle the ROI mode by pressing the **r** key. In ROI mode, dragging a rectangle over the image displays the sum (or the mean) of the region of interest as a function of the frame below the image
+    - toggle between the preview and the full resolution of the displayed region by pressing the **e** key (see *memoryBudget*)
+    - cycle between the min/max, percentile and logarithmic colour scales by pressing the **n** key (see *colorScale*)
 
     :param dataset: the NumPy array to be displayed
         
@@ -34,12 +57,109 @@ class _MplDataViewer3D(object):
 
     :param standAlone: if True a cursor will be displayed when hovering over the 2D view of the dataset
     :type standAlone: bool
+
+    :param histogram: if True the histogram of the dataset values will be displayed next to the colorbar. Selecting a span over the histogram sets the colour limits of the image, selecting an empty span restores the automatic colour limits.
+    :type histogram: bool
+
+    :param maxRedrawRate: the maximum number of redraws per second when interacting with the figure. The intermediate states of bursts of events (e.g. a fast scroll) are dropped.
+    :type maxRedrawRate: float
+
+    :param playbackFps: the target frame rate (in frames per second) when playing the frames
+    :type playbackFps: float
+
+    :param live: if True the dataset is polled for appended frames (e.g. a dataset written in SWMR mode). The frame range is extended without reading the appended frames. If the last frame was displayed, the new last frame is displayed.
+    :type live: bool
+
+    :param pollInterval: the polling interval in seconds in live mode
+    :type pollInterval: float
+
+    :param roiReduction: the reduction applied to the region of interest of each frame (*sum* or *mean*)
+    :type roiReduction: str
+
+    :param profileWidth: the width in pixels over which the line profiles are averaged
+    :type profileWidth: int
+
+    :param memoryBudget: the maximum number of bytes read for displaying a frame. When a frame is larger, a strided preview fitting in the budget is displayed instead and the displayed region can be loaded at full resolution. If None, :data:`hdfviewer.utils.MemoryBudget.defaultMemoryBudget` is used.
+    :type memoryBudget: int or None
+
+    :param colorScale: the automatic colour scale of the frames. With *minmax* the colour limits are the extrema, with *percentile* they are the *percentiles* (so that a few hot pixels do not wash out the frames) and with *log* the colours are logarithmically scaled between the *percentiles* of the positive values. The percentiles are estimated from cached quantile sketches (see :mod:`hdfviewer.utils.QuantileSketch`).
+    :type colorScale: str
+
+    :param percentiles: the (lower,upper) percentiles used as colour limits by the *percentile* and *log* colour scales
+    :type percentiles: tuple
+
+    :param colorScope: the values the automatic colour limits are computed from. With *frame* they are computed from the displayed region of the displayed frame. With *stack* they are computed once from the whole dataset, chunk by chunk in the background, so that the colours do not change from one frame to another.
+    :type colorScope: str
+
+    :param displayPrecision: the precision of the frames kept in memory. With *full* they are kept in the type of the dataset. With *float32* the 64 bits frames and the projections are kept as float32. With *uint16* the prefetched frames of more than 16 bits are moreover quantized with a scale and an offset. In all cases the pixel readout of the frames is read at full precision from the dataset (see :mod:`hdfviewer.utils.DisplayPrecision`).
+    :type displayPrecision: str
+
+    :raises: :class:`hdfviewer.utils.QuantileSketch.QuantileSketchError`: if the colour scale or the colour scope is unknown
+    :raises: :class:`hdfviewer.utils.DisplayPrecision.DisplayPrecisionError`: if the display precision is unknown
     """
     
-    def __init__(self,dataset,standAlone=True):
+    def __init__(self,dataset,standAlone=True,histogram=False,playbackFps=10,maxRedrawRate=30,live=False,pollInterval=1.0,roiReduction="sum",profileWidth=1,memoryBudget=None,
+                 colorScale="minmax",percentiles=(1.0,99.0),colorScope="frame",displayPrecision="full"):
         
+        checkColorScale(colorScale)
+
+        if colorScope not in ("frame","stack"):
+            raise QuantileSketchError("Unknown colour scope ({colorScope}). Valid colour scopes are: frame, stack".format(colorScope=colorScope))
+
+        if displayPrecision not in displayPrecisions:
+            raise DisplayPrecisionError("Unknown display precision ({displayPrecision}). Valid display precisions are: {displayPrecisions}".format(displayPrecision=displayPrecision,displayPrecisions=", ".join(displayPrecisions)))
+
         self._standAlone = standAlone
 
+        self._colorScale = colorScale
+
+        self._percentiles = percentiles
+
+        self._colorScope = colorScope
+
+        self._displayPrecision = displayPrecision
+
+        self._stackSketch = None
+
+        self._sketchStreamer = None
+
+        self._sketchTimer = None
+
+        self._memoryBudget = memoryBudget
+
+        self._showHistogram = histogram
+
+        self._maxRedrawRate = maxRedrawRate
+
+        self._playbackFps = playbackFps
+
+        self._playbackTimer = None
+
+        self._prefetcher = None
+
+        self._roiReduction = roiReduction
+
+        self._roiTrace = None
+
+        self._roiTimer = None
+
+        self._projection = None
+
+        self._projectionStreamer = None
+
+        self._projectionTimer = None
+
+        self._projections = None
+
+        self._profileWidth = profileWidth
+
+        self._kymograph = None
+
+        self._kymographTimer = None
+
+        # The group of linked viewers the viewer belongs to (see MplViewerGroup)
+        self._linkGroup = None
+
         self.dataset = dataset
                     
         self._figure = plt.figure()
@@ -54,6 +174,11 @@ class _MplDataViewer3D(object):
 
         self.setXYIntegrationMode(False)
 
+        self._liveMonitor = None
+        if live:
+            self._liveMonitor = _MplLiveMonitor(self._figure,self._dataset,self._onDatasetGrown,pollInterval)
+            self._liveMonitor.start()
+
         plt.show(self._figure)
                    
     @property
@@ -86,30 +211,113 @@ class _MplDataViewer3D(object):
         
         self._colorbar = None
 
+        self._colorLimits = None
+
         self._selectedRows = slice(0,1,None)
         self._selectedCols = slice(0,1,None)
         self._selectedFrame = 0
+        self._requestedFrame = 0
 
         self._rowSlice = slice(0,self._dataset.shape[0],None)
         self._colSlice = slice(0,self._dataset.shape[1],None)
 
+        # The full resolution region loaded on request, None for the (possibly strided) whole frames
+        self._region = None
+
+    @property
+    def schedulers(self):
+        """Getter for the schedulers coalescing the interaction events of the viewer.
+
+        :return: the scheduler of the viewer and the schedulers of its group of linked viewers
+        :rtype: list of :class:`hdfviewer.viewers.MplRedrawScheduler._MplRedrawScheduler`
+        """
+
+        schedulers = [self._redrawScheduler]
+        if self._linkGroup is not None:
+            schedulers.extend(self._linkGroup.schedulers)
+
+        return schedulers
+
+    @property
+    def linkGroup(self):
+        """Getter for the group of linked viewers the viewer belongs to.
+
+        :return: the group or None if the viewer is not linked
+        :rtype: :class:`hdfviewer.viewers.MplViewerGroup.MplViewerGroup` or None
+        """
+
+        return self._linkGroup
+
+    @property
+    def liveMonitor(self):
+        """Getter for the monitor polling the dataset in live mode.
+
+        :return: the live monitor or None if the live mode is not set
+        :rtype: :class:`hdfviewer.viewers.MplLiveMonitor._MplLiveMonitor` or None
+        """
+
+        return self._liveMonitor
+
+    @property
+    def playing(self):
+        """Getter for the playback state.
+
+        :return: True if the frames are being played
+        :rtype: bool
+        """
+
+        return self._playbackTimer is not None
+
+    @property
+    def projection(self):
+        """Getter for the projection displayed instead of the selected frame.
+
+        :return: the projection (*sum*, *max* or *mean*) or None if the selected frame is displayed
+        :rtype: str or None
+        """
+
+        return self._projection
+
+    @property
+    def roiTrace(self):
+        """Getter for the trace of the current region of interest.
+
+        :return: the trace or None if no region of interest has been selected
+        :rtype: :class:`hdfviewer.utils.RoiTrace.RoiTrace` or None
+        """
+
+        return self._roiTrace
+
     def _onChangeAxesLimits(self,event):
         """Callback called when the axis of the matrix view have changed.
 
-        This will update the cross plot according to the reduced row and/or column range.
+        This will request an update of the cross plot according to the reduced row and/or column range.
 
         :param event: the axes whose axis have been changed
         :type event: :class:`matplotlib.axes.SubplotBase`
         """
 
-        self._rowSlice = slice(*sorted([int(v) for v in event.get_ylim()]))
-        self._colSlice = slice(*sorted([int(v) for v in event.get_xlim()]))
-        
-        data = self._dataset[self._rowSlice,self._colSlice]
+        self._redrawScheduler.request("limits",functools.partial(self._setAxesLimits,event.get_ylim(),event.get_xlim()))
 
-        if self._colorbar:
-            self._colorbar.set_clim(vmin=data.min(),vmax=data.max())
-            self._colorbar.draw_all()
+        if self._linkGroup is not None:
+            self._linkGroup.onLimits(self,event.get_ylim(),event.get_xlim())
+
+    def _setAxesLimits(self,ylim,xlim):
+        """Update the colour limits and the cross plot according to the limits of the matrix view.
+
+        :param ylim: the row limits
+        :type ylim: tuple
+        :param xlim: the column limits
+        :type xlim: tuple
+        """
+
+        self._rowSlice = slice(*sorted([int(v) for v in ylim]))
+        self._colSlice = slice(*sorted([int(v) for v in xlim]))
+        
+        # Explicit colour limits prevail over the ones of the displayed region
+        if self._colorbar and self._colorLimits is None:
+            self._applyColorLimits(self._frameSlices(self._rowSlice,self._colSlice))
+            self._updateColorbar()
 
         self._updateCrossPlot()
 
@@ -124,33 +332,98 @@ class _MplDataViewer3D(object):
 
         self._mainAxes.callbacks.connect('ylim_changed', self._onChangeAxesLimits)
 
+        # Bursts of events are coalesced and the figure is redrawn at a capped rate
+        self._redrawScheduler = _MplRedrawScheduler(self._figure,self._maxRedrawRate)
+
     def _initLayout(self):
         """Initializes the figure layout.
         """
 
-        grid = gridspec.GridSpec(3, 3, self._figure, width_ratios=[0.3, 4, 1], height_ratios=[1, 4, 0.3], wspace=0.3)
+        # The histogram is displayed in an additional column on the left of the colorbar
+        offset = 1 if self._showHistogram else 0
 
-        self._mainAxes = plt.subplot(grid[1,1])
+        grid = gridspec.GridSpec(3, 3+offset, self._figure, width_ratios=[1.2]*offset + [0.3, 4, 1], height_ratios=[1, 4, 0.3], wspace=0.3)
+        self._grid = grid
+        self._offset = offset
+
+        self._mainAxes = plt.subplot(grid[1,1+offset])
         self._mainAxes.set_xlim([0,self._dataset.shape[1]])
         self._mainAxes.set_ylim([0,self._dataset.shape[0]])
         if self._standAlone:
             self._cursor = widgets.Cursor(self._mainAxes,useblit=True)
 
-        self._cbarAxes = plt.subplot(grid[1,0])
-        self._rowSliceAxes = plt.subplot(grid[0,1])
+        # The pixel values of the frames kept at a reduced precision or sampled are read at full precision from the dataset
+        self._mainAxes.format_coord = self._formatCoord
+
+        self._cbarAxes = plt.subplot(grid[1,offset])
+        self._rowSliceAxes = plt.subplot(grid[0,1+offset])
         self._rowSliceAxes.xaxis.set_tick_params(bottom=False,labelbottom=False,top=True,labeltop=True)
-        self._colSliceAxes = plt.subplot(grid[1,2])
+        self._colSliceAxes = plt.subplot(grid[1,2+offset])
         self._colSliceAxes.tick_params(axis="x",rotation=270)
         self._colSliceAxes.yaxis.set_tick_params(bottom=False,labelbottom=False,top=True,labeltop=True)
 
         self._image = None
 
+        # Indicates whether the frame is a strided preview or a full resolution region
+        self._samplingText = self._mainAxes.text(0.01,0.99,"",transform=self._mainAxes.transAxes,color="r",ha="left",va="top")
+
+        self._histogram = _MplHistogram(plt.subplot(grid[1,0]),self._dataset,self.setColorLimits) if self._showHistogram else None
+
+        # The ROI trace is displayed below the image once a region of interest has been selected
+        self._roiMode = False
+        self._roiSelector = widgets.RectangleSelector(self._mainAxes,self._onSelectRoi,useblit=True,button=[1])
+        self._roiSelector.set_active(False)
+        self._roiPatch = None
+        self._traceAxes = None
+
+        # The line profile is defined by two clicked points
+        self._lineProfileMode = False
+        self._profilePoints = []
+        self._profileEndpoints = None
+        self._profileLine = None
+
         self._numericKeysBuffer = ""
 
         self._frameStep = 1
 
         self._selectedPixel = (0,0)
         
+    def _onDatasetGrown(self,previousShape,shape):
+        """Callback called in live mode when the shape of the dataset has changed.
+
+        When only frames have been appended, nothing is read unless the last frame was displayed in which case the new last frame is
+        displayed. Otherwise the displayed frame is read again and, if the whole frame was displayed, the view is extended to the new shape.
+
+        :param previousShape: the former shape of the dataset
+        :type previousShape: tuple
+        :param shape: the new shape of the dataset
+        :type shape: tuple
+        """
+
+        # The projections and the colour limits of the dataset are outdated and computed again if displayed
+        self._projections = None
+        self._stackSketch = None
+        if self._projection is not None:
+            self.setProjection(self._projection)
+            return
+
+        if shape[:2] != previousShape[:2]:
+            ylim = sorted(self._mainAxes.get_ylim())
+            xlim = sorted(self._mainAxes.get_xlim())
+
+            self.setSelectedFrame(self._selectedFrame)
+
+            # Follow the growth of the frames unless the user zoomed in
+            if ylim == [0,previousShape[0]] and xlim == [0,previousShape[1]]:
+                self._mainAxes.set_xlim([0,shape[1]])
+                self._mainAxes.set_ylim([0,shape[0]])
+            else:
+                self._updateCrossPlot()
+        elif not self.playing and self._selectedFrame == previousShape[2] - 1:
+            self._requestFrame(shape[2] - 1)
+
+        self._figure.canvas.toolbar.set_message("selected frame: %d (%d frames available)" % (self._requestedFrame,shape[2]))
+
     def _onKeyPress(self,event):
         """Callback called when a keyboard key is pressed.
 
@@ -158,21 +431,169 @@ class _MplDataViewer3D(object):
         :type event: :class:`matplotlib.backend_bases.KeyEvent`
         """
 
+        frame = None
+
         keyToSign = {"+" : 1, "right" : 1, "up" : 1, "-" : -1, "left" : -1, "down" : -1}
         if event.key in keyToSign:
-            self.setSelectedFrame(self._selectedFrame+keyToSign[event.key]*self._frameStep)
+            frame = self._requestedFrame+keyToSign[event.key]*self._frameStep
             self._numericKeysBuffer = ""
         elif event.key == "pageup":
-            self.setSelectedFrame(0)
+            frame = 0
         elif event.key == "pagedown":
-            self.setSelectedFrame(self._dataset.shape[2]-1)
+            frame = self._dataset.shape[2]-1
         elif event.key.isnumeric():
             self._numericKeysBuffer = self._numericKeysBuffer + event.key
             self._frameStep = int(self._numericKeysBuffer)
         elif event.key == "i":
             self.setXYIntegrationMode(not self._xyIntegration)
+        elif event.key == "p":
+            if self.playing:
+                self.pause()
+            else:
+                self.play()
+        elif event.key == "r":
+            self.setRoiMode(not self._roiMode)
+        elif event.key == "t":
+            self.setLineProfileMode(not self._lineProfileMode)
+        elif event.key == "m":
+            cycle = (None,) + projections
+            self.setProjection(cycle[(cycle.index(self._projection)+1) % len(cycle)])
+        elif event.key == "n":
+            self.setColorScale(colorScales[(colorScales.index(self._colorScale)+1) % len(colorScales)])
+        elif event.key == "e":
+            if self._region is None:
+                self.setRegion(self._rowSlice,self._colSlice)
+            else:
+                self.setRegion(None,None)
+
+        if frame is not None:
+            self._requestFrame(frame)
+        else:
+            self._updateCrossPlot()
 
-        self._updateCrossPlot()
+    def _onKymographTimer(self):
+        """Callback called periodically while the kymograph is being computed.
+
+        The frames already completed are drawn, the timer being stopped once the computation is over.
+        """
+
+        kymograph = self._kymograph.kymograph
+
+        self._kymographImage.set_data(kymograph)
+        if np.isfinite(kymograph).any():
+            self._kymographImage.set_clim(np.nanmin(kymograph),np.nanmax(kymograph))
+
+        if not self._kymograph.running:
+            self._kymographTimer.stop()
+            self._kymographTimer = None
+            if self._kymograph.error is not None:
+                self._figure.canvas.toolbar.set_message("Error when computing the kymograph: %s" % self._kymograph.error)
+
+        self._figure.canvas.draw_idle()
+
+    def _onPlaybackTimer(self):
+        """Callback called periodically when the frames are being played.
+
+        The frame to display is computed from the time elapsed since the playback started. Hence, when the rendering is slower than the
+        target frame rate, the frames which are late are skipped instead of being queued.
+        """
+
+        nFrames = self._dataset.shape[2]
+
+        startTime, startFrame = self._playbackStart
+        elapsed = time.perf_counter() - startTime
+        frame = min(startFrame + int(elapsed*self._playbackFps),nFrames-1)
+
+        if frame != self._selectedFrame:
+            self._droppedFrames += max(frame - self._selectedFrame - 1,0)
+            self._renderedFrames += 1
+
+            # Read the next frames in the background while the current one is rendered. The window starts at the displayed frame so that its
+            # pending read is used instead of being cancelled.
+            self._prefetcher.prefetch(range(frame,min(frame+1+self._prefetchDepth,nFrames)))
+
+            self.setSelectedFrame(frame)
+            self._updateCrossPlot()
+
+        if frame == nFrames - 1:
+            self.pause()
+        elif elapsed > 0:
+            self._figure.canvas.toolbar.set_message("playing frame %d: %.1f fps (target %.1f fps, %d frames dropped)" % (frame,self._renderedFrames/elapsed,self._playbackFps,self._droppedFrames))
+
+    def _onProjectionTimer(self):
+        """Callback called periodically while the projections are being computed.
+
+        The progress is reported in the toolbar and the projection is displayed once computed.
+        """
+
+        streamer = self._projectionStreamer
+
+        if streamer.running:
+            self._figure.canvas.toolbar.set_message("computing the projections: %d/%d blocks" % (self._projectionProgress,streamer.nBlocks))
+            return
+
+        self._projectionTimer.stop()
+        self._projectionTimer = None
+        self._projectionStreamer = None
+
+        if streamer.error is not None:
+            self._figure.canvas.toolbar.set_message("Error when computing the projections: %s" % streamer.error)
+        elif not streamer.cancelled:
+            self._projections = streamer.result
+            if self._projection is None:
+                return
+            self.update()
+            self._updateCrossPlot()
+            self._figure.canvas.toolbar.set_message("%s projection" % self._projection)
+
+    def _onRoiTimer(self):
+        """Callback called periodically while the trace of the region of interest is being computed.
+
+        The frames already completed are drawn, the timer being stopped once the computation is over.
+        """
+
+        roiTrace = self._roiTrace
+
+        self._traceLine.set_data(np.arange(len(roiTrace.trace)),roiTrace.trace)
+        self._traceAxes.relim()
+        self._traceAxes.autoscale_view()
+
+        streamer = roiTrace.streamer
+        if not streamer.running:
+            self._roiTimer.stop()
+            self._roiTimer = None
+            if streamer.error is not None:
+                self._figure.canvas.toolbar.set_message("Error when computing the ROI trace: %s" % streamer.error)
+            elif not streamer.cancelled:
+                self._figure.canvas.toolbar.set_message("ROI trace computed")
+        else:
+            self._figure.canvas.toolbar.set_message("computing the ROI trace: %d%%" % int(100*roiTrace.completed))
+
+        self._figure.canvas.draw_idle()
+
+    def _onSketchTimer(self):
+        """Callback called periodically while the sketch of the whole dataset is being computed.
+
+        The colour limits are updated once the sketch is computed.
+        """
+
+        streamer = self._sketchStreamer
+
+        if streamer.running:
+            return
+
+        self._sketchTimer.stop()
+        self._sketchTimer = None
+        self._sketchStreamer = None
+
+        if streamer.error is not None:
+            self._figure.canvas.toolbar.set_message("Error when computing the colour limits of the dataset: %s" % streamer.error)
+        elif not streamer.cancelled:
+            self._stackSketch = streamer.result
+            if self._colorLimits is None:
+                self._applyColorLimits()
+                self._updateColorbar()
+                self._figure.canvas.draw_idle()
 
     def _onScrollFrame(self,event):
         """Callback called when the mouse wheel is rolled.
@@ -184,8 +605,7 @@ class _MplDataViewer3D(object):
         """
 
         incr = event.step if event.button == "up" else -event.step
-        self.setSelectedFrame(self._selectedFrame+incr)
-        self._updateCrossPlot()
+        self._requestFrame(self._requestedFrame+incr)
 
     def _onSelectPixel(self,event):
         """Callback called when a mouse buttton is clicked.
@@ -200,9 +620,96 @@ class _MplDataViewer3D(object):
 
         if not event.inaxes or (event.inaxes.axes != self._mainAxes):
             return
+
+        # In ROI mode, the clicks are used for dragging the region of interest
+        if self._roiMode:
+            return
+
+        if self._lineProfileMode:
+            self._profilePoints.append((event.ydata,event.xdata))
+            if len(self._profilePoints) == 2:
+                self.setLineProfile(*self._profilePoints)
+                self._profilePoints = []
+            return
         
-        self.selectPixel(int(event.ydata),int(event.xdata))
+        self._redrawScheduler.request("pixel",functools.partial(self.selectPixel,int(event.ydata),int(event.xdata)))
         
+    def _onSelectRoi(self,eclick,erelease):
+        """Callback called when a rectangle has been dragged over the image in ROI mode.
+
+        :param eclick: the mouse press event
+        :type eclick: :class:`matplotlib.backend_bases.MouseEvent`
+        :param erelease: the mouse release event
+        :type erelease: :class:`matplotlib.backend_bases.MouseEvent`
+        """
+
+        rows = sorted([int(round(eclick.ydata)),int(round(erelease.ydata))])
+        cols = sorted([int(round(eclick.xdata)),int(round(erelease.xdata))])
+
+        if rows[0] == rows[1] or cols[0] == cols[1]:
+            return
+
+        self.setRoi(slice(*rows),slice(*cols))
+
+    def _initTraceAxes(self):
+        """Make room below the image for the axes of the ROI trace.
+        """
+
+        self._grid.set_height_ratios([1, 4, 1.5])
+        for axes in self._figure.axes:
+            spec = axes.get_subplotspec()
+            if spec is not None:
+                axes.set_position(spec.get_position(self._figure))
+
+        self._traceAxes = self._figure.add_subplot(self._grid[2,1+self._offset])
+
+    def _resetTraceAxes(self):
+        """Clear the axes below the image shared by the ROI trace and the kymograph.
+        """
+
+        if self._traceAxes is None:
+            self._initTraceAxes()
+
+        # Only one of the ROI trace and the kymograph is displayed at a time
+        for computation in (self._roiTrace,self._kymograph):
+            if computation is not None:
+                computation.cancel()
+
+        for overlay in (self._roiPatch,self._profileLine):
+            if overlay is not None:
+                overlay.remove()
+        self._roiPatch = None
+        self._profileLine = None
+
+        self._traceAxes.clear()
+        self._traceFrame = self._traceAxes.axvline(self._selectedFrame,color="r")
+        self._traceAxes.set_xlim(0,max(1,self._dataset.shape[2]-1))
+
+    def _requestFrame(self,frame):
+        """Request the display of a frame.
+
+        The requests are coalesced, only the last requested frame being read and displayed.
+
+        :param frame: the frame to be displayed
+        :type frame: int
+        """
+
+        self._requestedFrame = min(max(frame,0),self._dataset.shape[2]-1)
+
+        # Navigating through the frames leaves the projection view
+        self._projection = None
+
+        # The frames of linked viewers are read and displayed together
+        if self._linkGroup is not None:
+            self._linkGroup.requestFrame(self,self._requestedFrame)
+            return
+
+        def applyFrame():
+            self.setSelectedFrame(self._requestedFrame)
+            self._updateCrossPlot()
+
+        self._redrawScheduler.request("frame",applyFrame)
+
     def _updateCrossPlot(self):
         """Update the cross plots.
         """
@@ -215,21 +722,234 @@ class _MplDataViewer3D(object):
             self._selectedRows = slice(row,row+1,None)
             self._selectedCols = slice(col,col+1,None)
 
+        # The displayed and selected regions are converted to the (possibly strided) frame kept in memory
+        rowSampling, colSampling = self._sampling
+        frameRows, frameCols = self._frameSlices(self._rowSlice,self._colSlice)
+        selectedRows, selectedCols = self._frameSlices(self._selectedRows,self._selectedCols)
+
         self._rowSliceAxes.clear()        
-        xValues = np.arange(*self._colSlice.indices(self._colSlice.stop))
-        yValues = np.sum(self._dataset[self._selectedRows,self._colSlice,self._selectedFrame],axis=0)
-        self._rowSliceAxes.plot(xValues,yValues)
-        self._rowSliceAxes.set_xlim(min(xValues),max(xValues))
-        self._rowSliceAxes.set_ylim(min(yValues),max(yValues))
+        if self._lineProfileMode and self._profileEndpoints is not None:
+            # The line profile is displayed instead of the row cross plot
+            start, end = [((row - rowSampling.start)/rowSampling.step,(col - colSampling.start)/colSampling.step) for row, col in self._profileEndpoints]
+            distances, profile = lineProfile(self._frame,start,end,width=self._profileWidth)
+            distances = distances*rowSampling.step
+            self._rowSliceAxes.plot(distances,profile,color="r")
+            self._rowSliceAxes.set_xlim(distances[0],distances[-1])
+        else:
+            xValues = sampledCoordinates(frameCols,colSampling)
+            yValues = np.sum(self._frame[selectedRows,frameCols],axis=0)
+            self._rowSliceAxes.plot(xValues,yValues)
+            self._rowSliceAxes.set_xlim(min(xValues),max(xValues))
+            self._rowSliceAxes.set_ylim(min(yValues),max(yValues))
                 
         self._colSliceAxes.clear()                
-        xValues = np.arange(*self._rowSlice.indices(self._rowSlice.stop))
-        yValues = np.sum(self._dataset[self._rowSlice,self._selectedCols,self._selectedFrame],axis=1)
+        xValues = sampledCoordinates(frameRows,rowSampling)
+        yValues = np.sum(self._frame[frameRows,selectedCols],axis=1)
         self._colSliceAxes.plot(yValues,xValues)
         self._colSliceAxes.set_xlim(min(yValues),max(yValues))
         self._colSliceAxes.set_ylim(min(xValues),max(xValues))
 
-        plt.draw()
+        self._figure.canvas.draw_idle()
+
+    def _applyColorLimits(self,frameRegion=None):
+        """Set the colour limits of the image.
+
+        Explicit colour limits prevail over the automatic ones of the colour scale. Limits which are not valid for the colour scale (e.g. no positive
+        value for the logarithmic one) are ignored. In *stack* colour scope, the frame limits are used until the sketch of the dataset is computed.
+
+        :param frameRegion: the rows and columns slices of the frame kept in memory over which the automatic colour limits are computed. If None, the whole frame is used.
+        :type frameRegion: tuple of slice or None
+        """
+
+        if self._colorLimits is not None:
+            vmin, vmax = self._colorLimits
+        elif self._colorScope == "stack" and self._projection is None and self._stackSketch is not None:
+            vmin, vmax = colorLimits(self._stackSketch,self._colorScale,self._percentiles)
+        elif self._colorScale == "minmax":
+            data = self._frame[frameRegion] if frameRegion is not None else self._frame
+            vmin, vmax = np.nanmin(data), np.nanmax(data)
+        else:
+            # The sketch of the whole frame is cached, the one of a zoomed region is computed on the fly
+            if frameRegion is None or self._frame[frameRegion].shape == self._frame.shape:
+                frame = self._projection if self._projection is not None else self._selectedFrame
+                sketch = frameSketch(self._dataset,self._frame,frame,tuple((s.start,s.stop,s.step) for s in self._sampling))
+            else:
+                sketch = QuantileSketch.fromArray(self._frame[frameRegion],maxSamples=2**20)
+            vmin, vmax = colorLimits(sketch,self._colorScale,self._percentiles)
+
+        if not np.isfinite([vmin,vmax]).all() or (self._colorScale == "log" and not 0 < vmin < vmax):
+            return
+
+        self._image.set_clim(vmin=vmin,vmax=vmax)
+
+    def _colorNorm(self):
+        """Return the normalization of the image for the current colour scale.
+
+        :return: the normalization
+        :rtype: :class:`matplotlib.colors.Normalize`
+        """
+
+        return colors.LogNorm() if self._colorScale == "log" else colors.Normalize()
+
+    def _requestStackSketch(self):
+        """Start computing the sketch of the whole dataset in the background if it is not available yet.
+        """
+
+        # The sketches of HDF datasets are cached across viewers
+        if self._stackSketch is None:
+            self._stackSketch = cachedSketch(self._dataset)
+
+        if self._stackSketch is not None or self._sketchStreamer is not None:
+            return
+
+        self._sketchStreamer = sketchStreamer(self._dataset)
+        self._sketchStreamer.start()
+        self._sketchTimer = self._figure.canvas.new_timer(interval=200)
+        self._sketchTimer.add_callback(self._onSketchTimer)
+        self._sketchTimer.start()
+
+    def _frameSampling(self):
+        """Return the sampling with which the frames are read.
+
+        The frames are read at full resolution if they fit in the memory budget otherwise they are read with the stride which makes them fit.
+        A region loaded with :meth:`setRegion` is always read at full resolution.
+
+        :return: the (rows,columns) slices, possibly strided
+        :rtype: tuple of slice
+        """
+
+        if self._region is not None:
+            return self._region
+
+        return previewSlices((slice(0,self._dataset.shape[0]),slice(0,self._dataset.shape[1])),self._dataset.dtype,self._memoryBudget)
+
+    def _frameSlices(self,rows,cols):
+        """Convert full resolution rows and columns into slices of the frame kept in memory.
+
+        :param rows: the full resolution rows
+        :type rows: slice
+        :param cols: the full resolution columns
+        :type cols: slice
+
+        :return: the rows and columns slices of the frame kept in memory
+        :rtype: tuple of slice
+        """
+
+        return tuple(frameSlice(s,sampling,n) for s, sampling, n in zip((rows,cols),self._sampling,self._frame.shape))
+
+    @property
+    def _projectionType(self):
+        """Getter for the type of the sums and maxima of the projections.
+
+        :return: the type
+        :rtype: :class:`numpy.dtype`
+        """
+
+        return np.dtype(np.float64 if self._displayPrecision == "full" else np.float32)
+
+    def _formatCoord(self,x,y):
+        """Format the coordinates and the value of the pixel under the mouse.
+
+        The value of a frame is taken from the frame kept in memory when it holds the pixel at full precision. Otherwise, i.e. when the frame
+        is kept at a reduced precision or when the pixel has not been read (strided preview, region), the single value is read from the
+        dataset. The value of a projection is the one of the displayed projection.
+
+        :param x: the x coordinate
+        :type x: float
+        :param y: the y coordinate
+        :type y: float
+
+        :return: the formatted coordinates and value
+        :rtype: str
+        """
+
+        row, col = int(round(y)), int(round(x))
+        if not (0 <= row < self._dataset.shape[0] and 0 <= col < self._dataset.shape[1]):
+            return "x=%d y=%d" % (col,row)
+
+        if self._projection is not None and self._projections is not None:
+            return "x=%d y=%d value=%s" % (col,row,self._frame[row,col])
+
+        value = None
+        if displayType(self._dataset.dtype,self._displayPrecision) is None:
+            index = tuple(sampledIndex(i,sampling,n) for i, sampling, n in zip((row,col),self._sampling,self._frame.shape))
+            if None not in index:
+                value = self._frame[index]
+
+        if value is None:
+            value = self._dataset[row,col,self._selectedFrame]
+
+        return "x=%d y=%d value=%s" % (col,row,value)
+
+    @property
+    def _budget(self):
+        """Getter for the memory budget of a frame.
+
+        :return: the maximum number of bytes read for displaying a frame
+        :rtype: int
+        """
+
+        return defaultMemoryBudget if self._memoryBudget is None else self._memoryBudget
+
+    def _updateColorbar(self):
+        """Update the colorbar and the histogram according to the colour limits of the image.
+        """
+
+        self._colorbar.update_normal(self._image)
+
+        if self._histogram is not None:
+            self._histogram.setLimits(*self._image.get_clim())
+
+    def pause(self):
+        """Stop playing the frames.
+        """
+
+        if self._playbackTimer is None:
+            return
+
+        self._playbackTimer.stop()
+        self._playbackTimer = None
+
+        self._prefetcher.shutdown()
+        self._prefetcher = None
+
+        elapsed = time.perf_counter() - self._playbackStart[0]
+        self._achievedFps = self._renderedFrames/elapsed if elapsed > 0 else 0.0
+
+        self._figure.canvas.toolbar.set_message("selected frame: %d (played at %.1f fps, %d frames dropped)" % (self._selectedFrame,self._achievedFps,self._droppedFrames))
+
+    def play(self,fps=None):
+        """Play the frames from the selected one at a target frame rate.
+
+        The next frames are read ahead of the displayed one and frames are skipped when the rendering can not keep up with the target frame rate.
+        The achieved frame rate is reported in the toolbar.
+
+        :param fps: the target frame rate (in frames per second). If None, the current target frame rate is used.
+        :type fps: float or None
+        """
+
+        if fps is not None:
+            self._playbackFps = fps
+
+        self.pause()
+
+        self._projection = None
+
+        # Restart from the beginning when the last frame is reached
+        if self._selectedFrame == self._dataset.shape[2] - 1:
+            self.setSelectedFrame(0)
+
+        self._prefetchDepth = max(2,int(self._playbackFps))
+        self._prefetcher = FramePrefetcher(self._dataset,region=self._frameSampling(),convert=functools.partial(reduceFrame,precision=self._displayPrecision))
+        self._prefetcher.prefetch(range(self._selectedFrame+1,min(self._selectedFrame+1+self._prefetchDepth,self._dataset.shape[2])))
+
+        self._renderedFrames = 0
+        self._droppedFrames = 0
+        self._playbackStart = (time.perf_counter(),self._selectedFrame)
+
+        self._playbackTimer = self._figure.canvas.new_timer(interval=max(1,int(1000.0/self._playbackFps)))
+        self._playbackTimer.add_callback(self._onPlaybackTimer)
+        self._playbackTimer.start()
 
     def selectPixel(self,row,col):
         """Select a pixel on the image.
@@ -245,19 +965,298 @@ class _MplDataViewer3D(object):
         self._selectedPixel = (row,col)
 
         self._updateCrossPlot()
-                            
-    def setSelectedFrame(self,selectedFrame):
+
+        if self._linkGroup is not None:
+            self._linkGroup.onPixel(self,row,col)
+
+    def setLimits(self,ylim,xlim):
+        """Set the limits of the image (i.e. zoom).
+
+        :param ylim: the row limits
+        :type ylim: tuple
+        :param xlim: the column limits
+        :type xlim: tuple
+        """
+
+        self._mainAxes.set_xlim(xlim)
+        self._mainAxes.set_ylim(ylim)
+
+    def _applyLinkedFrame(self,frame,data=None):
+        """Display a frame requested by the group of linked viewers.
+
+        :param frame: the frame to be displayed
+        :type frame: int
+        :param data: the frame read by the group with the sampling of :meth:`_frameSampling`. If None, the frame is read by the viewer.
+        :type data: :class:`numpy.ndarray` or None
+        """
+
+        self._projection = None
+
+        self.setSelectedFrame(frame,data)
+
+        self._updateCrossPlot()
+
+    def setSelectedFrame(self,selectedFrame,data=None):
         """Set the frame to be displayed.
 
         :param selectedFrame: the new frame to be displayed
         :type selectedFrame: int
+        :param data: the frame already read with the sampling of :meth:`_frameSampling` (e.g. by a group of linked viewers). If None, the frame is read.
+        :type data: :class:`numpy.ndarray` or None
         """
         
         self._selectedFrame = min(max(selectedFrame,0),self._dataset.shape[2]-1)
+        self._requestedFrame = self._selectedFrame
 
         self._figure.canvas.toolbar.set_message("selected frame: %d" % self._selectedFrame)
 
+        if self._traceAxes is not None:
+            self._traceFrame.set_xdata([self._selectedFrame,self._selectedFrame])
+
+        self.update(data)
+
+        if self._linkGroup is not None:
+            self._linkGroup.onFrame(self,self._selectedFrame)
+
+    def setColorScale(self,colorScale,percentiles=None,colorScope=None):
+        """Set the automatic colour scale of the frames.
+
+        :param colorScale: the colour scale (*minmax*, *percentile* or *log*, see :class:`_MplDataViewer3D`)
+        :type colorScale: str
+        :param percentiles: the (lower,upper) percentiles used as colour limits. If None, the current percentiles are used.
+        :type percentiles: tuple or None
+        :param colorScope: the colour scope (*frame* or *stack*, see :class:`_MplDataViewer3D`). If None, the current colour scope is used.
+        :type colorScope: str or None
+
+        :raises: :class:`hdfviewer.utils.QuantileSketch.QuantileSketchError`: if the colour scale or the colour scope is unknown
+        """
+
+        checkColorScale(colorScale)
+
+        if colorScope not in (None,"frame","stack"):
+            raise QuantileSketchError("Unknown colour scope ({colorScope}). Valid colour scopes are: frame, stack".format(colorScope=colorScope))
+
+        self._colorScale = colorScale
+
+        if percentiles is not None:
+            self._percentiles = percentiles
+
+        if colorScope is not None:
+            self._colorScope = colorScope
+
+        if self._colorScope == "stack":
+            self._requestStackSketch()
+
+        self._image.set_norm(self._colorNorm())
+
+        self._applyColorLimits(self._frameSlices(self._rowSlice,self._colSlice))
+
+        self._updateColorbar()
+
+        self._figure.canvas.toolbar.set_message("{} colour scale".format(self._colorScale))
+
+        self._figure.canvas.draw_idle()
+
+    def setLineProfile(self,start,end,width=None,frames=None):
+        """Set the line along which the profile of the displayed frame and the kymograph are computed.
+
+        The profile is interpolated bilinearly from the displayed frame. The kymograph is computed in the background from the bounding box of
+        the line only and is drawn progressively.
+
+        :param start: the (row,column) start point of the line
+        :type start: tuple
+        :param end: the (row,column) end point of the line
+        :type end: tuple
+        :param width: the width in pixels over which the profiles are averaged. If None, the current width is used.
+        :type width: int or None
+        :param frames: the frames of the kymograph. If None, all the frames are used.
+        :type frames: slice or None
+        """
+
+        if width is not None:
+            self._profileWidth = width
+
+        # Setting a line profile activates the line-profile mode
+        self._lineProfileMode = True
+        self._profileEndpoints = (tuple(start),tuple(end))
+
+        self._resetTraceAxes()
+
+        self._profileLine, = self._mainAxes.plot([start[1],end[1]],[start[0],end[0]],color="r")
+
+        self._kymograph = Kymograph(self._dataset,start,end,self._profileWidth,frames)
+        distances = self._kymograph.distances
+        kymographFrames = self._kymograph.frames
+        self._kymographImage = self._traceAxes.imshow(self._kymograph.kymograph,aspect="auto",origin="lower",
+                                                      extent=(kymographFrames.start-0.5,kymographFrames.start+len(kymographFrames)*kymographFrames.step-0.5,distances[0],distances[-1]))
+        self._traceAxes.set_ylabel("distance")
+        self._traceFrame.set_zorder(3)
+
+        self._kymograph.start()
+
+        if self._kymographTimer is None:
+            self._kymographTimer = self._figure.canvas.new_timer(interval=200)
+            self._kymographTimer.add_callback(self._onKymographTimer)
+            self._kymographTimer.start()
+
+        self._updateCrossPlot()
+
+    def setLineProfileMode(self,lineProfileMode):
+        """Switch between the pixel selection mode and the line-profile mode.
+
+        :param lineProfileMode: if True, clicking two points on the image sets the line profile otherwise clicking on the image selects a pixel
+        :type lineProfileMode: bool
+        """
+
+        self._lineProfileMode = lineProfileMode
+        self._profilePoints = []
+
+        if self._profileLine is not None:
+            self._profileLine.set_visible(self._lineProfileMode)
+
+        self._figure.canvas.toolbar.set_message("Line-profile mode activated" if self._lineProfileMode else "Line-profile mode deactivated")
+
+        self._updateCrossPlot()
+
+    def setProjection(self,projection):
+        """Display a projection of the frames instead of the selected frame.
+
+        The sum, maximum and mean projections are computed together in the background block by block (see
+        :func:`hdfviewer.utils.FrameProjection.projectionStreamer`) and are cached, so that switching between them is immediate. The selected
+        frame is displayed until the projections are computed.
+
+        :param projection: the projection (*sum*, *max* or *mean*). If None, the selected frame is displayed.
+        :type projection: str or None
+
+        :raises: :class:`hdfviewer.utils.FrameProjection.FrameProjectionError`: if the projection is unknown
+        """
+
+        if projection is not None and projection not in projections:
+            raise FrameProjectionError("Unknown projection ({projection}). Valid projections are: {projections}".format(projection=projection,projections=", ".join(projections)))
+
+        self._projection = projection
+
+        # The projections of HDF datasets are cached across viewers
+        if self._projections is None:
+            self._projections = cachedProjection(self._dataset,self._projectionType)
+
+        if self._projection is not None and self._projections is None:
+            if self._projectionStreamer is None:
+                self._projectionProgress = 0
+                self._projectionStreamer = projectionStreamer(self._dataset,progress=lambda nProcessed, nBlocks: setattr(self,"_projectionProgress",nProcessed),dtype=self._projectionType)
+                self._projectionStreamer.start()
+                self._projectionTimer = self._figure.canvas.new_timer(interval=200)
+                self._projectionTimer.add_callback(self._onProjectionTimer)
+                self._projectionTimer.start()
+            self._figure.canvas.toolbar.set_message("computing the projections ...")
+            return
+
         self.update()
+        self._updateCrossPlot()
+
+        self._figure.canvas.toolbar.set_message("%s projection" % self._projection if self._projection is not None else "selected frame: %d" % self._selectedFrame)
+
+    def setRoi(self,rows,cols,reduction=None):
+        """Set the region of interest whose trace (i.e. its sum or mean as a function of the frame) is displayed.
+
+        The trace is computed in the background from the ROI hyperslab only and is drawn progressively.
+
+        :param rows: the rows of the region of interest
+        :type rows: slice
+        :param cols: the columns of the region of interest
+        :type cols: slice
+        :param reduction: the reduction applied to the region of interest of each frame (*sum* or *mean*). If None, the current reduction is used.
+        :type reduction: str or None
+        """
+
+        if reduction is not None:
+            self._roiReduction = reduction
+
+        self._resetTraceAxes()
+
+        self._roiTrace = RoiTrace(self._dataset,rows,cols,self._roiReduction)
+
+        rows, cols = self._roiTrace.rows, self._roiTrace.cols
+        self._roiPatch = patches.Rectangle((cols.start,rows.start),cols.stop-cols.start,rows.stop-rows.start,fill=False,edgecolor="r")
+        self._mainAxes.add_patch(self._roiPatch)
+
+        self._traceLine, = self._traceAxes.plot([],[])
+        self._traceAxes.set_ylabel("ROI %s" % self._roiReduction)
+
+        self._roiTrace.start()
+
+        if self._roiTimer is None:
+            self._roiTimer = self._figure.canvas.new_timer(interval=200)
+            self._roiTimer.add_callback(self._onRoiTimer)
+            self._roiTimer.start()
+
+    def setRegion(self,rows,cols):
+        """Load a region of the frames at full resolution.
+
+        :param rows: the rows of the region. If None, the whole frames are displayed again (strided if they do not fit in the memory budget).
+        :type rows: slice or None
+        :param cols: the columns of the region. If None, the whole frames are displayed again (strided if they do not fit in the memory budget).
+        :type cols: slice or None
+        """
+
+        if rows is None or cols is None:
+            self._region = None
+            message = "Whole frames displayed"
+        else:
+            region = (slice(*rows.indices(self._dataset.shape[0])[:2],1),slice(*cols.indices(self._dataset.shape[1])[:2],1))
+            nBytes = estimateBytes([max(0,s.stop - s.start) for s in region],self._dataset.dtype)
+            if nBytes > self._budget:
+                self._figure.canvas.toolbar.set_message("The region ({:d} bytes) does not fit in the memory budget ({:d} bytes), zoom in further".format(nBytes,self._budget))
+                return
+            self._region = region
+            message = "Full resolution region loaded"
+
+        # The frames being played are read with the new sampling
+        if self._prefetcher is not None:
+            self._prefetcher.shutdown()
+            self._prefetcher = FramePrefetcher(self._dataset,region=self._frameSampling(),convert=functools.partial(reduceFrame,precision=self._displayPrecision))
+
+        self.update()
+        self._updateCrossPlot()
+
+        self._figure.canvas.toolbar.set_message(message)
+
+    def setRoiMode(self,roiMode):
+        """Switch between the pixel selection mode and the ROI selection mode.
+
+        :param roiMode: if True, dragging a rectangle over the image selects a region of interest otherwise clicking on the image selects a pixel
+        :type roiMode: bool
+        """
+
+        self._roiMode = roiMode
+
+        self._roiSelector.set_active(self._roiMode)
+        if self._standAlone:
+            self._cursor.set_active(not self._roiMode and not self._xyIntegration)
+
+        self._figure.canvas.toolbar.set_message("ROI mode activated" if self._roiMode else "ROI mode deactivated")
+
+    def setColorLimits(self,vmin,vmax):
+        """Set the colour limits of the image.
+
+        The colour limits are kept when the displayed region (or frame) changes.
+
+        :param vmin: the lower colour limit. If None, the automatic colour limits are restored.
+        :type vmin: float or None
+        :param vmax: the upper colour limit. If None, the automatic colour limits are restored.
+        :type vmax: float or None
+        """
+
+        if vmin is None or vmax is None:
+            self._colorLimits = None
+        else:
+            self._colorLimits = (vmin,vmax)
+
+        self._applyColorLimits(self._frameSlices(self._rowSlice,self._colSlice))
+
+        self._updateColorbar()
+
+        self._figure.canvas.draw_idle()
 
     def setXYIntegrationMode(self,xyIntegration):
         """Switch between slice plot mode and integration mode.
@@ -274,21 +1273,56 @@ class _MplDataViewer3D(object):
 
         self._updateCrossPlot()
 
-    def update(self):
+    def update(self,data=None):
         """Update the figure.
+
+        :param data: the selected frame already read with the sampling of :meth:`_frameSampling`. If None, the frame is read.
+        :type data: :class:`numpy.ndarray` or None
         """
 
         # Remove the current image if any
         if self._image:
             self._image.remove()
 
-        self._image = self._mainAxes.imshow(self._dataset[:,:,self._selectedFrame],aspect="auto",origin="lower")
+        # The frame is read once and kept in memory for the interactions
+        if self._projection is not None and self._projections is not None:
+            self._frame = self._projections.projection(self._projection)
+            self._sampling = tuple(slice(0,n,1) for n in self._frame.shape)
+        elif data is not None:
+            self._sampling = self._frameSampling()
+            self._frame = displayFrame(data,self._displayPrecision)
+        elif self._prefetcher is not None:
+            self._frame = displayFrame(restoreFrame(self._prefetcher.get(self._selectedFrame)),self._displayPrecision)
+            self._sampling = self._prefetcher.region
+        else:
+            self._sampling = self._frameSampling()
+            self._frame = displayFrame(self._dataset[self._sampling + (self._selectedFrame,)],self._displayPrecision)
+
+        # The frame is placed at its full resolution coordinates whatever its sampling
+        self._image = self._mainAxes.imshow(self._frame,aspect="auto",origin="lower",extent=sampledExtent(self._frame.shape,self._sampling),norm=self._colorNorm())
+        # The value of the image is replaced by the full precision one (see _formatCoord)
+        self._image.get_cursor_data = lambda event: None
+
+        stride = self._sampling[0].step
+        if self._region is not None and self._projection is None:
+            self._samplingText.set_text("full resolution region (press e for the whole frames)")
+        elif stride > 1:
+            self._samplingText.set_text("preview: 1 pixel out of {:d} (press e to load the displayed region)".format(stride))
+        else:
+            self._samplingText.set_text("")
+
+        if self._colorScope == "stack":
+            self._requestStackSketch()
+
+        self._applyColorLimits()
 
         if self._colorbar is None:
             self._colorbar = self._figure.colorbar(self._image, cax=self._cbarAxes)
             self._colorbar.ax.yaxis.set_ticks_position('left')
+
+        self._updateColorbar()
                 
-        plt.draw()
+        self._figure.canvas.draw_idle()
 
 if __name__ == "__main__":
 
@@ -0,0 +1,226 @@
+"""MatPlotLib based histogram of the values of a NumPy data to be displayed next to a colorbar.
+"""
+
+import matplotlib.widgets as widgets
+
+from hdfviewer.utils.DatasetHistogram import DatasetHistogramError, cachedHistogram, histogramEdges, histogramStreamer
+from hdfviewer.utils.DatasetStatistics import cachedStatistics, statisticsStreamer
+
+class _MplHistogram(object):
+    """This class allows to display the histogram of the values of a dataset in a :class:`matplotlib.axes.Axes`
+
+    The histogram is computed in the background by streaming over the dataset, first for the range of its values (see
+    :func:`hdfviewer.utils.DatasetStatistics.statisticsStreamer`) then for the bin counts (see
+    :func:`hdfviewer.utils.DatasetHistogram.histogramStreamer`), the progress being reported in the toolbar. The histogram is drawn
+    vertically once computed so that it can be put next to the colorbar of an image. The current colour limits are drawn as horizontal lines and
+    dragging a vertical span over the histogram selects new colour limits.
+
+    :param axes: the axes in which the histogram will be drawn
+    :type axes: :class:`matplotlib.axes.Axes`
+
+    :param dataset: the dataset
+    :type dataset: :class:`h5py.Dataset` or :class:`numpy.ndarray`
+
+    :param onSelectLimits: the callable called with the new colour limits when a span is selected over the histogram. It is called with (None, None) when the span is empty.
+    :type onSelectLimits: callable
+
+    :param bins: the number of bins
+    :type bins: int
+
+    :param log: if True the bins are logarithmically spaced otherwise they are evenly spaced
+    :type log: bool
+    """
+
+    def __init__(self,axes,dataset,onSelectLimits,bins=256,log=False):
+
+        self._axes = axes
+
+        self._dataset = dataset
+
+        self._onSelectLimits = onSelectLimits
+
+        self._bins = bins
+
+        self._log = log
+
+        self._lowerLimit = None
+
+        self._upperLimit = None
+
+        # The colour limits set before the histogram is drawn
+        self._limits = None
+
+        # The statistics of the dataset giving the range of the bins
+        self._statistics = None
+
+        self._edges = None
+
+        self._streamer = None
+
+        self._timer = None
+
+        self._progress = 0
+
+        self._selector = widgets.SpanSelector(self._axes,self._onSelect,"vertical",useblit=True)
+
+        # The histograms of HDF datasets are cached across viewers
+        histogram = cachedHistogram(dataset,bins,log)
+        if histogram is not None:
+            self._draw(*histogram)
+            return
+
+        self._axes.set_xticks([])
+        self._axes.set_yticks([])
+
+        self._streamer = self._nextStreamer()
+        if self._streamer is None:
+            return
+
+        self._timer = self._axes.figure.canvas.new_timer(interval=200)
+        self._timer.add_callback(self._onTimer)
+        self._timer.start()
+
+    def _onProgress(self,nProcessed,nBlocks):
+        """Callback called by the streamers each time a block has been processed.
+
+        :param nProcessed: the number of processed blocks
+        :type nProcessed: int
+        :param nBlocks: the number of blocks
+        :type nBlocks: int
+        """
+
+        self._progress = nProcessed
+
+    def _nextStreamer(self):
+        """Start the next pass over the dataset.
+
+        The range of the values is computed first unless the statistics of the dataset are already cached, then the bin counts.
+
+        :return: the started streamer or None if the histogram can not be computed
+        :rtype: :class:`hdfviewer.utils.ChunkStreamer.ChunkStreamer` or None
+        """
+
+        self._progress = 0
+
+        if self._statistics is None:
+            self._statistics = cachedStatistics(self._dataset)
+
+        if self._statistics is None:
+            streamer = statisticsStreamer(self._dataset,progress=self._onProgress)
+        else:
+            try:
+                self._edges = histogramEdges(self._dataset,self._bins,self._log,statistics=self._statistics)
+            except DatasetHistogramError as e:
+                self._setMessage("No histogram: %s" % e)
+                return None
+            streamer = histogramStreamer(self._dataset,self._edges,progress=self._onProgress,log=self._log)
+
+        streamer.start()
+
+        return streamer
+
+    def _onTimer(self):
+        """Callback called periodically while the histogram is being computed.
+
+        The progress is reported in the toolbar and the histogram is drawn once computed.
+        """
+
+        streamer = self._streamer
+
+        if streamer.running:
+            self._setMessage("computing the histogram: %d/%d blocks" % (self._progress,streamer.nBlocks))
+            return
+
+        if streamer.error is not None or streamer.cancelled:
+            self._stop()
+            if streamer.error is not None:
+                self._setMessage("Error when computing the histogram: %s" % streamer.error)
+            return
+
+        # The range of the values has been computed
+        if self._statistics is None:
+            self._statistics = streamer.result
+            self._streamer = self._nextStreamer()
+            if self._streamer is None:
+                self._stop()
+            return
+
+        self._stop()
+
+        self._draw(streamer.result,self._edges)
+
+        self._setMessage("histogram computed")
+
+        self._axes.figure.canvas.draw_idle()
+
+    def _setMessage(self,message):
+        """Display a message in the toolbar of the figure.
+
+        :param message: the message
+        :type message: str
+        """
+
+        toolbar = self._axes.figure.canvas.toolbar
+        if toolbar is not None:
+            toolbar.set_message(message)
+
+    def _stop(self):
+        """Stop the timer following the computation of the histogram.
+        """
+
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+
+    def _draw(self,counts,edges):
+        """Draw the histogram.
+
+        :param counts: the histogram counts
+        :type counts: :class:`numpy.ndarray`
+        :param edges: the bin edges
+        :type edges: :class:`numpy.ndarray`
+        """
+
+        self._axes.stairs(counts,edges,orientation="horizontal",fill=True)
+        self._axes.set_xscale("log")
+        if self._log:
+            self._axes.set_yscale("log")
+        self._axes.set_ylim(edges[0],edges[-1])
+        # The bins grow toward the colorbar
+        self._axes.invert_xaxis()
+        self._axes.tick_params(axis="x",rotation=270)
+
+        vmin, vmax = self._limits if self._limits is not None else (edges[0],edges[-1])
+        self._lowerLimit = self._axes.axhline(vmin,color="r")
+        self._upperLimit = self._axes.axhline(vmax,color="r")
+
+    def _onSelect(self,vmin,vmax):
+        """Callback called when a span has been selected over the histogram.
+
+        :param vmin: the lower bound of the span
+        :type vmin: float
+        :param vmax: the upper bound of the span
+        :type vmax: float
+        """
+
+        if vmax > vmin:
+            self._onSelectLimits(vmin,vmax)
+        else:
+            self._onSelectLimits(None,None)
+
+    def setLimits(self,vmin,vmax):
+        """Set the colour limits drawn over the histogram.
+
+        :param vmin: the lower colour limit
+        :type vmin: float
+        :param vmax: the upper colour limit
+        :type vmax: float
+        """
+
+        self._limits = (vmin,vmax)
+
+        if self._lowerLimit is None:
+            return
+
+        self._lowerLimit.set_ydata([vmin,vmin])
+        self._upperLimit.set_ydata([vmax,vmax])
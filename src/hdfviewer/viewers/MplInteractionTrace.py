@@ -0,0 +1,447 @@
+"""Record and replay of the interaction events of the MatPlotLib viewers.
+
+The module is also a headless MatPlotLib backend (see :data:`headlessBackend`) on which the traces are replayed.
+"""
+
+import json
+import time
+
+import numpy as np
+
+import matplotlib.pyplot as plt
+from matplotlib.backend_bases import FigureManagerBase, KeyEvent, MouseEvent, NavigationToolbar2
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+#: The name of the headless backend on which the traces are replayed
+headlessBackend = "module://hdfviewer.viewers.MplInteractionTrace"
+
+#: The recorded canvas events
+recordedEvents = ("scroll_event", "button_press_event", "key_press_event")
+
+class MplInteractionTraceError(Exception):
+    """:class:`MplInteractionTrace` specific exception"""
+
+    pass
+
+class _HeadlessManager(FigureManagerBase):
+    """The figure manager of the headless backend.
+
+    Contrary to the Agg one, it provides a toolbar whose messages are dropped, as the viewers report their state in the toolbar.
+    """
+
+    def __init__(self,canvas,num):
+
+        super().__init__(canvas,num)
+
+        self.toolbar = NavigationToolbar2(canvas)
+
+    @classmethod
+    def pyplot_show(cls,*args,**kwargs):
+
+        pass
+
+class _HeadlessCanvas(FigureCanvasAgg):
+    """The figure canvas of the headless backend: the Agg canvas with the headless figure manager.
+    """
+
+    manager_class = _HeadlessManager
+
+# The canvas looked up by pyplot when the module is used as a backend
+FigureCanvas = _HeadlessCanvas
+
+class InteractionTrace(object):
+    """This class implements a timestamped trace of the interaction events received by a viewer.
+
+    Each event is stored as a dictionary holding its name (one of :data:`recordedEvents` or *limits* for a change of the axes limits), its
+    time in seconds since the start of the recording, the index of the axes it occurred in within the figure and the attributes used by the
+    viewers (key, button, step, data and pixel coordinates, axes limits). The events recorded live also hold the time spent by the viewer
+    in handling them.
+
+    :param events: the events
+    :type events: list of dict
+    :param metadata: the description of the recorded session (e.g. the shape and the type of the dataset)
+    :type metadata: dict
+    """
+
+    def __init__(self,events=None,metadata=None):
+
+        self.events = events if events is not None else []
+
+        self.metadata = metadata if metadata is not None else {}
+
+    def __len__(self):
+
+        return len(self.events)
+
+    @classmethod
+    def load(cls,filename):
+        """Load a trace from a JSON file.
+
+        :param filename: the name of the file
+        :type filename: str
+
+        :return: the trace
+        :rtype: :class:`InteractionTrace`
+
+        :raises: :class:`MplInteractionTraceError`: if the file is not a trace
+        """
+
+        with open(filename,"r") as f:
+            content = json.load(f)
+
+        if not isinstance(content,dict) or "events" not in content:
+            raise MplInteractionTraceError("The file {!r} is not an interaction trace".format(filename))
+
+        return cls(content["events"],content.get("metadata",{}))
+
+    def save(self,filename):
+        """Save the trace to a JSON file.
+
+        :param filename: the name of the file
+        :type filename: str
+        """
+
+        with open(filename,"w") as f:
+            json.dump({"metadata" : self.metadata, "events" : self.events},f,indent=1)
+
+class MplInteractionRecorder(object):
+    """This class allows to record the interaction events received by a MatPlotLib viewer.
+
+    The recorder intercepts the scroll, click and key events dispatched by the canvas of the viewer (i.e. the events handled by
+    *_onScrollFrame*, *_onSelectPixel* and *_onKeyPress*) and the changes of the limits of the main axes made by panning and zooming. The
+    changes of limits made by the viewer itself while handling an event are not recorded as they are replayed with the event.
+
+    .. code-block:: python
+       :caption: Example
+
+        viewer = MplDataViewer(hdf["/entry/data"])
+
+        recorder = MplInteractionRecorder(viewer)
+        # ... interact with the viewer ...
+        recorder.stop().save("session.json")
+
+    :param viewer: the viewer
+    :type viewer: :class:`hdfviewer.viewers.MplDataViewer.MplDataViewer`
+    :param start: if True the recording starts immediately
+    :type start: bool
+    :param options: the keyword arguments the viewer was created with, saved in the metadata of the trace so that the trace is replayed against
+        the same viewer (see :func:`replayTrace`). If None, the options of the viewer are used (see
+        :attr:`hdfviewer.viewers.MplDataViewer.MplDataViewer.options`). The options which can not be saved in JSON are dropped.
+    :type options: dict or None
+    """
+
+    def __init__(self,viewer,start=True,options=None):
+
+        if options is None:
+            options = getattr(viewer,"options",{})
+
+        self._viewer = getattr(viewer,"viewer",viewer)
+
+        self._figure = self._viewer.figure
+
+        self._mainAxes = getattr(self._viewer,"_mainAxes",None)
+
+        dataset = self._viewer.dataset
+
+        self._trace = InteractionTrace(metadata={"shape" : list(dataset.shape),
+                                                 "dtype" : np.dtype(dataset.dtype).str,
+                                                 "viewer" : type(self._viewer).__name__,
+                                                 "options" : _jsonOptions(options)})
+
+        self._start = None
+
+        # True while the canvas dispatches a recorded event
+        self._dispatching = False
+
+        self._limitsId = None
+
+        if start:
+            self.start()
+
+    @property
+    def recording(self):
+        """Getter for the recording state.
+
+        :return: True if the events are being recorded
+        :rtype: bool
+        """
+
+        return self._start is not None
+
+    @property
+    def trace(self):
+        """Getter for the recorded trace.
+
+        :return: the trace
+        :rtype: :class:`InteractionTrace`
+        """
+
+        return self._trace
+
+    def _axesIndex(self,axes):
+        """Return the index of an axes within the figure.
+
+        :param axes: the axes
+        :type axes: :class:`matplotlib.axes.Axes` or None
+
+        :return: the index or None if the event did not occur in an axes
+        :rtype: int or None
+        """
+
+        if axes is None or axes not in self._figure.axes:
+            return None
+
+        return self._figure.axes.index(axes)
+
+    def _process(self,name,*args,**kwargs):
+        """Dispatch a canvas event, recording it beforehand if it is handled by the viewer.
+
+        :param name: the name of the event
+        :type name: str
+        """
+
+        registry = self._figure.canvas.callbacks
+
+        if name not in recordedEvents or not args:
+            return type(registry).process(registry,name,*args,**kwargs)
+
+        event = args[0]
+
+        record = {"name" : name,
+                  "t" : time.perf_counter() - self._start,
+                  "axes" : self._axesIndex(event.inaxes),
+                  "x" : event.x,
+                  "y" : event.y,
+                  "xdata" : event.xdata,
+                  "ydata" : event.ydata}
+
+        if isinstance(event,KeyEvent):
+            record["key"] = event.key
+        else:
+            record["button"] = event.button if isinstance(event.button,str) else (None if event.button is None else int(event.button))
+            record["step"] = event.step
+
+        self._dispatching = True
+        start = time.perf_counter()
+        try:
+            return type(registry).process(registry,name,*args,**kwargs)
+        finally:
+            record["latency"] = time.perf_counter() - start
+            self._dispatching = False
+            self._trace.events.append(record)
+
+    def _onChangeAxesLimits(self,axes):
+        """Record a change of the limits of the main axes which is not made while handling an event.
+
+        :param axes: the axes
+        :type axes: :class:`matplotlib.axes.Axes`
+        """
+
+        if self._dispatching:
+            return
+
+        self._trace.events.append({"name" : "limits",
+                                   "t" : time.perf_counter() - self._start,
+                                   "axes" : self._axesIndex(axes),
+                                   "xlim" : [float(v) for v in axes.get_xlim()],
+                                   "ylim" : [float(v) for v in axes.get_ylim()]})
+
+    def start(self):
+        """Start or resume the recording.
+        """
+
+        if self.recording:
+            return
+
+        self._start = time.perf_counter() - (self._trace.events[-1]["t"] if self._trace.events else 0.0)
+
+        self._figure.canvas.callbacks.process = self._process
+
+        if self._mainAxes is not None:
+            self._limitsId = self._mainAxes.callbacks.connect("ylim_changed",self._onChangeAxesLimits)
+
+    def stop(self):
+        """Stop the recording.
+
+        :return: the recorded trace
+        :rtype: :class:`InteractionTrace`
+        """
+
+        if not self.recording:
+            return self._trace
+
+        del self._figure.canvas.callbacks.process
+
+        if self._limitsId is not None:
+            self._mainAxes.callbacks.disconnect(self._limitsId)
+            self._limitsId = None
+
+        self._start = None
+
+        return self._trace
+
+def _jsonOptions(options):
+    """Return the options of a viewer which can be saved in JSON.
+
+    :param options: the keyword arguments of the viewer
+    :type options: dict
+
+    :return: the options whose values can be saved in JSON
+    :rtype: dict
+    """
+
+    saved = {}
+    for name, value in options.items():
+        try:
+            json.dumps(value)
+        except TypeError:
+            continue
+        saved[name] = value
+
+    return saved
+
+def _schedulers(viewer):
+    """Return the redraw schedulers of a viewer.
+
+    :param viewer: the dimension specific viewer
+
+    :return: the schedulers of the viewer and of its group of linked viewers, empty for the viewers which do not coalesce their events
+    :rtype: list of :class:`hdfviewer.viewers.MplRedrawScheduler._MplRedrawScheduler`
+    """
+
+    return getattr(viewer,"schedulers",[])
+
+def _replayEvent(figure,record):
+    """Dispatch a recorded event to the canvas of a figure.
+
+    The mouse events are placed at the pixel of their data coordinates in the figure so that the figure does not need to have the size of
+    the recorded one.
+
+    :param figure: the figure
+    :type figure: :class:`matplotlib.figure.Figure`
+    :param record: the recorded event
+    :type record: dict
+    """
+
+    axes = figure.axes[record["axes"]] if record.get("axes") is not None and record["axes"] < len(figure.axes) else None
+
+    if record["name"] == "limits":
+        if axes is not None:
+            axes.set_xlim(record["xlim"])
+            axes.set_ylim(record["ylim"])
+        return
+
+    x, y = record.get("x"), record.get("y")
+    if axes is not None and record.get("xdata") is not None and record.get("ydata") is not None:
+        x, y = axes.transData.transform((record["xdata"],record["ydata"]))
+
+    canvas = figure.canvas
+
+    if record["name"] == "key_press_event":
+        event = KeyEvent(record["name"],canvas,record.get("key"),x,y)
+    else:
+        event = MouseEvent(record["name"],canvas,x,y,button=record.get("button"),step=record.get("step",0))
+
+    canvas.callbacks.process(record["name"],event)
+
+def replayTrace(trace,dataset,realTime=False,**kwargs):
+    """Replay a trace against a viewer of a dataset displayed on the headless backend and measure the latency of each event.
+
+    The viewer is created with the options of the recorded viewer saved in the trace, updated with the given keyword arguments, so that its
+    figure has the same axes. Pyplot is switched to the headless backend (see :data:`headlessBackend`) which closes the other figures: the traces are meant to be
+    replayed in a batch process (see the *replay_trace* script).
+
+    By default, the events are replayed one after the other and the pending redraws of the viewer are applied after each event, so that
+    the latency of an event includes its redraw. With *realTime*, the events are replayed at their recorded times: the bursts of events are
+    coalesced by the viewer like in the recorded session and the redraws applied when the timer of the viewer would have fired are reported
+    as *flush* events.
+
+    :param trace: the trace
+    :type trace: :class:`InteractionTrace`
+    :param dataset: the dataset
+    :type dataset: :class:`h5py.Dataset` or :class:`numpy.ndarray`
+    :param realTime: if True the events are replayed at their recorded times
+    :type realTime: bool
+    :param kwargs: the keyword arguments of the viewer overriding the recorded ones (see :class:`hdfviewer.viewers.MplDataViewer.MplDataViewer`)
+
+    :return: the replayed events as dictionaries holding their name, their time and their latency in seconds
+    :rtype: list of dict
+
+    :raises: :class:`MplInteractionTraceError`: if the dataset does not have the shape of the recorded one
+    """
+
+    from hdfviewer.viewers.MplDataViewer import MplDataViewer
+
+    shape = trace.metadata.get("shape")
+    # The viewers display the datasets without their dimensions equal to 1
+    if shape is not None and list(shape) != [n for n in dataset.shape if n != 1]:
+        raise MplInteractionTraceError("The dataset shape {} does not match the recorded one {}".format(tuple(dataset.shape),tuple(shape)))
+
+    if plt.get_backend() != headlessBackend:
+        plt.switch_backend(headlessBackend)
+
+    options = dict(trace.metadata.get("options",{}))
+    options.update(kwargs)
+
+    viewer = MplDataViewer(dataset,**options).viewer
+
+    figure = viewer.figure
+    figure.canvas.draw()
+
+    def flush(t):
+        for scheduler in _schedulers(viewer):
+            if not scheduler.pending:
+                continue
+            start = time.perf_counter()
+            scheduler.flush()
+            replayed.append({"name" : "flush", "t" : t, "latency" : time.perf_counter() - start})
+
+    replayed = []
+
+    origin = time.perf_counter()
+    for record in trace.events:
+        if realTime:
+            # The timers of the headless backend do not fire: the pending redraws are applied when they are due
+            while True:
+                now = time.perf_counter() - origin
+                due = [scheduler.nextDue() - origin for scheduler in _schedulers(viewer) if scheduler.pending]
+                wakeUp = min(due + [record["t"]])
+                if wakeUp > now:
+                    time.sleep(wakeUp - now)
+                if due and min(due) <= record["t"]:
+                    flush(time.perf_counter() - origin)
+                    continue
+                break
+
+        start = time.perf_counter()
+        _replayEvent(figure,record)
+        if not realTime:
+            for scheduler in _schedulers(viewer):
+                scheduler.flush()
+        replayed.append({"name" : record["name"], "t" : start - origin, "latency" : time.perf_counter() - start})
+
+    flush(time.perf_counter() - origin)
+
+    plt.close(figure)
+
+    return replayed
+
+def latencySummary(replayed):
+    """Summarize the latencies of replayed events per event name.
+
+    :param replayed: the replayed events (see :func:`replayTrace`)
+    :type replayed: list of dict
+
+    :return: the number of events and the mean, median, 95th percentile and maximum latencies in seconds per event name
+    :rtype: dict
+    """
+
+    latencies = {}
+    for event in replayed:
+        latencies.setdefault(event["name"],[]).append(event["latency"])
+
+    return {name : {"count" : len(values),
+                    "mean" : float(np.mean(values)),
+                    "median" : float(np.median(values)),
+                    "p95" : float(np.percentile(values,95)),
+                    "max" : float(np.max(values))} for name, values in latencies.items()}
@@ -0,0 +1,84 @@
+"""Polling of a growing dataset displayed in a MatPlotLib figure.
+"""
+
+import matplotlib.pyplot as plt
+
+class _MplLiveMonitor(object):
+    """This class allows to follow a dataset which grows while being displayed (e.g. a dataset written in SWMR mode during an acquisition).
+
+    The dataset is polled periodically from the figure timer, so that the figure is only updated from the thread of its event loop. At each
+    poll, the metadata of the dataset are refreshed (see :meth:`hdfviewer.utils.DatasetView.DatasetView.refresh`) and, when its shape has
+    changed, *onGrow* is called with the former and the new shapes. It is up to the viewer to read only the appended data.
+
+    The polling stops by itself once the figure has been closed.
+
+    :param figure: the figure in which the dataset is displayed
+    :type figure: :class:`matplotlib.figure.Figure`
+    :param dataset: the dataset
+    :type dataset: :class:`hdfviewer.utils.DatasetView.DatasetView`
+    :param onGrow: the callable called with the former and the new shapes of the dataset when its shape has changed
+    :type onGrow: callable
+    :param interval: the polling interval in seconds
+    :type interval: float
+    """
+
+    def __init__(self,figure,dataset,onGrow,interval=1.0):
+
+        self._figure = figure
+
+        self._dataset = dataset
+
+        self._onGrow = onGrow
+
+        self._shape = dataset.shape
+
+        self._timer = self._figure.canvas.new_timer(interval=max(1,int(1000*interval)))
+        self._timer.add_callback(self.poll)
+
+        self._running = False
+
+    @property
+    def running(self):
+        """Getter for the polling state.
+
+        :return: True if the dataset is being polled
+        :rtype: bool
+        """
+
+        return self._running
+
+    def poll(self):
+        """Refresh the dataset and notify its growth if any.
+        """
+
+        if not plt.fignum_exists(self._figure.number):
+            self.stop()
+            return
+
+        shape = self._dataset.refresh()
+        if shape == self._shape:
+            return
+
+        previousShape, self._shape = self._shape, shape
+
+        self._onGrow(previousShape,shape)
+
+    def start(self):
+        """Start polling the dataset.
+        """
+
+        if self._running:
+            return
+
+        self._running = True
+        self._timer.start()
+
+    def stop(self):
+        """Stop polling the dataset.
+        """
+
+        if not self._running:
+            return
+
+        self._running = False
+        self._timer.stop()
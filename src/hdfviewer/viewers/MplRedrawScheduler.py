@@ -0,0 +1,104 @@
+"""Coalescing of the interaction events of a MatPlotLib figure.
+"""
+
+import collections
+import time
+
+from hdfviewer.utils.IOAccounting import ioAccounting
+
+class _MplRedrawScheduler(object):
+    """This class allows to coalesce the interaction events of a :class:`matplotlib.figure.Figure` and to redraw it at a capped rate.
+
+    Instead of updating the figure for each event, the event callbacks request a state change (e.g. a new frame, new axes limits or a new
+    selected pixel) under a name. Only the latest request per name is kept, the intermediate ones being dropped. The pending requests are
+    applied at most *maxRate* times per second after which the figure is redrawn once using :meth:`matplotlib.backend_bases.FigureCanvasBase.draw_idle`.
+
+    An isolated event is applied immediately while a burst of events (e.g. a fast scroll) is applied when the figure timer fires.
+
+    :param figure: the figure
+    :type figure: :class:`matplotlib.figure.Figure`
+    :param maxRate: the maximum number of redraws per second
+    :type maxRate: float
+    :param others: the other figures redrawn together with the figure (e.g. the figures of a group of linked viewers)
+    :type others: list of :class:`matplotlib.figure.Figure` or None
+    """
+
+    def __init__(self,figure,maxRate=30,others=None):
+
+        self._canvas = figure.canvas
+
+        self._canvases = [self._canvas] + [other.canvas for other in (others or [])]
+
+        self._interval = 1.0/maxRate
+
+        self._pending = collections.OrderedDict()
+
+        self._lastFlush = -float("inf")
+
+        self._timer = self._canvas.new_timer(interval=max(1,int(1000*self._interval)))
+        self._timer.single_shot = True
+        self._timer.add_callback(self.flush)
+
+        self._timerStarted = False
+
+    @property
+    def pending(self):
+        """Getter for the names of the pending requests.
+
+        :return: the names of the pending requests
+        :rtype: list[str]
+        """
+
+        return list(self._pending)
+
+    def nextDue(self):
+        """Return the time at which the pending requests are due, i.e. the time at which the timer of the figure applies them.
+
+        :return: the time in seconds (see :func:`time.perf_counter`) or None if there is no pending request
+        :rtype: float or None
+        """
+
+        if not self._pending:
+            return None
+
+        return self._lastFlush + self._interval
+
+    def flush(self):
+        """Apply the pending requests and redraw the figure.
+        """
+
+        self._timerStarted = False
+
+        pending = self._pending
+        self._pending = collections.OrderedDict()
+
+        self._lastFlush = time.perf_counter()
+
+        if not pending:
+            return
+
+        # The reads made by a state change are accounted to it (see hdfviewer.utils.IOAccounting)
+        for name, callback in pending.items():
+            with ioAccounting.interaction(name):
+                callback()
+
+        for canvas in self._canvases:
+            canvas.draw_idle()
+
+    def request(self,name,callback):
+        """Request a state change.
+
+        :param name: the name of the state (e.g. "frame"). A pending request with the same name is replaced.
+        :type name: str
+        :param callback: the callable applying the state change
+        :type callback: callable
+        """
+
+        self._pending.pop(name,None)
+        self._pending[name] = callback
+
+        if time.perf_counter() - self._lastFlush >= self._interval:
+            self.flush()
+        elif not self._timerStarted:
+            self._timerStarted = True
+            self._timer.start()
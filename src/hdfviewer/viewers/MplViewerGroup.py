@@ -0,0 +1,265 @@
+"""Group of linked MatPlotLib viewers sharing the displayed frame, the zoom and the selected pixel.
+"""
+
+import concurrent.futures
+import functools
+
+from hdfviewer.viewers.MplDataViewer2D import _MplDataViewer2D
+from hdfviewer.viewers.MplDataViewer3D import _MplDataViewer3D
+from hdfviewer.viewers.MplRedrawScheduler import _MplRedrawScheduler
+
+class MplViewerGroupError(Exception):
+    """:class:`MplViewerGroup` specific exception"""
+
+    pass
+
+class MplViewerGroup(object):
+    """This class allows to link several viewers so that they display the same frame, with the same zoom and the same selected pixel.
+
+    Scrolling, zooming or selecting a pixel in one viewer applies the same change to the other viewers of the group. The 2D viewers only
+    follow the zoom and the selected pixel.
+
+    The frame changes of all the viewers go through one scheduler (see :class:`hdfviewer.viewers.MplRedrawScheduler._MplRedrawScheduler`):
+    each step of a scroll is one request, only the latest being applied, after which all the figures are redrawn in a single pass. The frames
+    of the 3D viewers are read concurrently in one batch. The viewers whose datasets share the same shape, chunk layout and sampling read the
+    same chunks positions, so that their reads are issued together and the viewers of the same dataset share a single read.
+
+    .. code-block:: python
+       :caption: Example
+
+        raw = MplDataViewer(hdf["/entry/raw"])
+        corrected = MplDataViewer(hdf["/entry/corrected"])
+
+        group = MplViewerGroup([raw,corrected])
+
+    :param viewers: the viewers to link
+    :type viewers: list of :class:`hdfviewer.viewers.MplDataViewer.MplDataViewer`
+    :param syncFrame: if True the displayed frame is synchronized
+    :type syncFrame: bool
+    :param syncLimits: if True the zoom is synchronized
+    :type syncLimits: bool
+    :param syncPixel: if True the selected pixel is synchronized
+    :type syncPixel: bool
+    :param maxRedrawRate: the maximum number of redraws per second of the group
+    :type maxRedrawRate: float
+
+    :raises: :class:`MplViewerGroupError`: if a viewer is not a 2D or 3D MatPlotLib viewer or already belongs to a group
+    """
+
+    def __init__(self,viewers,syncFrame=True,syncLimits=True,syncPixel=True,maxRedrawRate=30):
+
+        viewers = [getattr(viewer,"viewer",viewer) for viewer in viewers]
+        if not viewers:
+            raise MplViewerGroupError("A group needs at least one viewer")
+
+        for viewer in viewers:
+            if not isinstance(viewer,(_MplDataViewer2D,_MplDataViewer3D)):
+                raise MplViewerGroupError("Only the 2D and 3D MatPlotLib viewers can be linked (got {})".format(type(viewer).__name__))
+            if viewer.linkGroup is not None:
+                raise MplViewerGroupError("The viewer already belongs to a group")
+
+        self._viewers = viewers
+
+        self._syncFrame = syncFrame
+
+        self._syncLimits = syncLimits
+
+        self._syncPixel = syncPixel
+
+        # Guard against the changes applied by the group being propagated back to the group
+        self._syncing = False
+
+        self._scheduler = _MplRedrawScheduler(viewers[0].figure,maxRedrawRate,others=[viewer.figure for viewer in viewers[1:]])
+
+        self._executor = None
+
+        for viewer in viewers:
+            viewer._linkGroup = self
+
+    @property
+    def viewers(self):
+        """Getter for the linked viewers.
+
+        :return: the dimension specific viewers
+        :rtype: list
+        """
+
+        return list(self._viewers)
+
+    @property
+    def schedulers(self):
+        """Getter for the schedulers coalescing the frame changes of the group.
+
+        :return: the schedulers
+        :rtype: list of :class:`hdfviewer.viewers.MplRedrawScheduler._MplRedrawScheduler`
+        """
+
+        return [self._scheduler]
+
+    def _frameViewers(self):
+        """Return the viewers following the displayed frame.
+
+        :return: the 3D viewers
+        :rtype: list of :class:`hdfviewer.viewers.MplDataViewer3D._MplDataViewer3D`
+        """
+
+        return [viewer for viewer in self._viewers if isinstance(viewer,_MplDataViewer3D)]
+
+    def _readFrames(self,viewers,frame):
+        """Read a frame of several viewers in one batch.
+
+        The viewers are grouped by dataset layout (shape, chunks and sampling). The viewers of the same dataset share one read and the
+        reads of all the groups are run concurrently.
+
+        :param viewers: the viewers
+        :type viewers: list of :class:`hdfviewer.viewers.MplDataViewer3D._MplDataViewer3D`
+        :param frame: the frame
+        :type frame: int
+
+        :return: the frame read per viewer, None for the viewers which read their frames by themselves (e.g. while playing)
+        :rtype: dict
+        """
+
+        reads = {}
+        for viewer in viewers:
+            # A playing viewer gets its frames from its prefetcher
+            if viewer._prefetcher is not None:
+                continue
+            dataset = viewer.dataset
+            sampling = viewer._frameSampling()
+            layout = (dataset.shape,getattr(dataset,"chunks",None),tuple((s.start,s.stop,s.step) for s in sampling))
+            source = getattr(dataset,"source",dataset)
+            key = (layout,id(source),getattr(dataset,"field",None))
+            index = sampling + (min(max(frame,0),dataset.shape[2]-1),)
+            reads.setdefault(key,(dataset,index,[]))[2].append(viewer)
+
+        if not reads:
+            return {}
+
+        # The reads of the datasets sharing a layout are submitted next to each other
+        batches = sorted(reads.items(),key=lambda item: repr(item[0][0]))
+
+        if len(batches) == 1:
+            (dataset,index,readers), = [batch for _, batch in batches]
+            data = dataset[index]
+            return {viewer : data for viewer in readers}
+
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(self._viewers))
+
+        futures = [(self._executor.submit(dataset.__getitem__,index),readers) for _, (dataset,index,readers) in batches]
+
+        frames = {}
+        for future, readers in futures:
+            data = future.result()
+            for viewer in readers:
+                frames[viewer] = data
+
+        return frames
+
+    def _applyFrame(self,frame,source=None):
+        """Read and display a frame in all the viewers.
+
+        :param frame: the frame
+        :type frame: int
+        :param source: the viewer already displaying the frame, None if all the viewers must display it
+        """
+
+        viewers = [viewer for viewer in self._frameViewers() if viewer is not source]
+
+        frames = self._readFrames(viewers,frame)
+
+        self._syncing = True
+        try:
+            for viewer in viewers:
+                viewer._applyLinkedFrame(frame,frames.get(viewer))
+        finally:
+            self._syncing = False
+
+    def requestFrame(self,source,frame):
+        """Request the display of a frame by all the viewers.
+
+        The requests are coalesced, only the last requested frame being read and displayed.
+
+        :param source: the viewer the frame is requested from
+        :type source: :class:`hdfviewer.viewers.MplDataViewer3D._MplDataViewer3D`
+        :param frame: the frame
+        :type frame: int
+        """
+
+        if not self._syncFrame:
+            self._scheduler.request("frame%d" % id(source),functools.partial(source._applyLinkedFrame,frame))
+            return
+
+        self._scheduler.request("frame",functools.partial(self._applyFrame,frame))
+
+    def onFrame(self,source,frame):
+        """Propagate the frame displayed by a viewer to the other viewers.
+
+        :param source: the viewer
+        :type source: :class:`hdfviewer.viewers.MplDataViewer3D._MplDataViewer3D`
+        :param frame: the displayed frame
+        :type frame: int
+        """
+
+        if self._syncing or not self._syncFrame:
+            return
+
+        self._applyFrame(frame,source)
+
+    def onLimits(self,source,ylim,xlim):
+        """Propagate the zoom of a viewer to the other viewers.
+
+        :param source: the viewer
+        :param ylim: the row limits
+        :type ylim: tuple
+        :param xlim: the column limits
+        :type xlim: tuple
+        """
+
+        if self._syncing or not self._syncLimits:
+            return
+
+        self._syncing = True
+        try:
+            for viewer in self._viewers:
+                if viewer is not source:
+                    viewer.setLimits(ylim,xlim)
+        finally:
+            self._syncing = False
+
+    def onPixel(self,source,row,col):
+        """Propagate the pixel selected in a viewer to the other viewers.
+
+        The pixel is not selected in the viewers whose datasets do not contain it.
+
+        :param source: the viewer
+        :param row: the pixel row
+        :type row: int
+        :param col: the pixel column
+        :type col: int
+        """
+
+        if self._syncing or not self._syncPixel:
+            return
+
+        self._syncing = True
+        try:
+            for viewer in self._viewers:
+                if viewer is not source and row < viewer.dataset.shape[0] and col < viewer.dataset.shape[1]:
+                    viewer.selectPixel(row,col)
+        finally:
+            self._syncing = False
+
+    def unlink(self):
+        """Unlink the viewers of the group.
+        """
+
+        for viewer in self._viewers:
+            viewer._linkGroup = None
+
+        self._viewers = []
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -0,0 +1,224 @@
+"""Lightweight NumPy based viewer for 2D NumPy data.
+"""
+
+import time
+
+import ipywidgets as widgets
+
+from IPython.display import display
+
+from hdfviewer.viewers.NpImageRenderer import _NpImageRenderer
+
+from hdfviewer.utils.MemoryBudget import previewSlices
+from hdfviewer.utils.QuantileSketch import checkColorScale, colorLimits, frameSketch
+
+class _NpDataViewer2D(object):
+    """This class allows to display 2D NumPy array as a colour-mapped image in an `ipywidgets.Image <https://ipywidgets.readthedocs.io/en/stable/examples/Widget%20List.html#Image>`_
+
+    Contrary to :class:`hdfviewer.viewers.MplDataViewer2D._MplDataViewer2D`, no MatPlotLib figure is involved: the image is colour-mapped with a NumPy
+    lookup table, downsampled to the display size and only the resulting PNG image is sent to the browser (see :class:`hdfviewer.viewers.NpImageRenderer._NpImageRenderer`).
+    The rendering time and the size of the sent image are displayed below the image.
+
+    :param dataset: the NumPy array to be displayed
+    :type dataset: :class:`numpy.ndarray`
+
+    :param standAlone: unused, for compatibility with the MatPlotLib viewers
+    :type standAlone: bool
+
+    :param colormap: the name of the MatPlotLib colormap
+    :type colormap: str
+
+    :param displaySize: the maximum (rows,columns) size of the displayed image
+    :type displaySize: tuple
+
+    :param memoryBudget: the maximum number of bytes read for displaying the region. A larger region is read with the stride which makes it fit in the budget. If None, :data:`hdfviewer.utils.MemoryBudget.defaultMemoryBudget` is used.
+    :type memoryBudget: int or None
+
+    :param colorScale: the automatic colour scale (*minmax*, *percentile* or *log*, see :class:`hdfviewer.viewers.MplDataViewer2D._MplDataViewer2D`)
+    :type colorScale: str
+
+    :param percentiles: the (lower,upper) percentiles used as colour limits by the *percentile* and *log* colour scales
+    :type percentiles: tuple
+
+    :param `kwargs`: the keyword arguments specific to the MatPlotLib viewers, ignored. :class:`hdfviewer.viewers.MplDataViewer.MplDataViewer` rejects the ones which would have an effect.
+    :type `kwargs`: dict
+
+    :raises: :class:`hdfviewer.utils.QuantileSketch.QuantileSketchError`: if the colour scale is unknown
+    """
+
+    def __init__(self,dataset,standAlone=True,colormap="viridis",displaySize=(512,512),memoryBudget=None,colorScale="minmax",percentiles=(1.0,99.0),**kwargs):
+
+        checkColorScale(colorScale)
+
+        self._memoryBudget = memoryBudget
+
+        self._colorScale = colorScale
+
+        self._percentiles = percentiles
+
+        self._renderer = _NpImageRenderer(colormap,displaySize)
+
+        self._image = widgets.Image(format="png")
+
+        self._info = widgets.Label()
+
+        self._initLayout()
+
+        self.dataset = dataset
+
+        display(self._widget)
+
+    @property
+    def dataset(self):
+        """Getter/setter for the dataset to be displayed.
+
+        :getter: returns the dataset to be displayed
+        :setter: sets the dataset to be displayed
+        :type: :class:`numpy.ndarray`
+        """
+
+        return self._dataset
+
+    @dataset.setter
+    def dataset(self,dataset):
+
+        self._dataset = dataset
+
+        self._colorLimits = (None,None)
+
+        self._rowSlice = slice(0,self._dataset.shape[0],None)
+        self._colSlice = slice(0,self._dataset.shape[1],None)
+
+        self.update()
+
+    @property
+    def figure(self):
+        """Getter for the figure to be displayed.
+
+        :return: None as no MatPlotLib figure is involved
+        :rtype: None
+        """
+
+        return None
+
+    @property
+    def widget(self):
+        """Getter for the widget displaying the dataset.
+
+        :return: the widget
+        :rtype: `ipywidgets.VBox <https://ipywidgets.readthedocs.io/en/stable/examples/Widget%20List.html#VBox>`_
+        """
+
+        return self._widget
+
+    def _initLayout(self):
+        """Initializes the widget layout.
+        """
+
+        self._widget = widgets.VBox([self._image,self._info])
+
+    def _readFrame(self):
+        """Read the displayed region of the dataset.
+
+        :return: the displayed region
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        return self._dataset[self._sampledRegion()]
+
+    def _sampledRegion(self):
+        """Return the slices with which the displayed region is read.
+
+        The region is strided when it does not fit in the memory budget.
+
+        :return: the (rows,columns) slices
+        :rtype: tuple of slice
+        """
+
+        region = tuple(slice(*s.indices(n)[:2]) for s, n in zip((self._rowSlice,self._colSlice),self._dataset.shape))
+
+        self._sampling = previewSlices(region,self._dataset.dtype,self._memoryBudget)
+
+        return self._sampling
+
+    def setColorLimits(self,vmin,vmax):
+        """Set the colour limits of the image.
+
+        :param vmin: the lower colour limit. If None, the minimum of the displayed region is used.
+        :type vmin: float or None
+        :param vmax: the upper colour limit. If None, the maximum of the displayed region is used.
+        :type vmax: float or None
+        """
+
+        self._colorLimits = (vmin,vmax)
+
+        self.update()
+
+    def _frameKey(self):
+        """Return the key identifying the displayed region in the cache of the frame sketches.
+
+        :return: the key
+        :rtype: tuple
+        """
+
+        return (tuple((s.start,s.stop,s.step) for s in self._sampling),)
+
+    def setColorScale(self,colorScale,percentiles=None):
+        """Set the automatic colour scale of the image.
+
+        :param colorScale: the colour scale (*minmax*, *percentile* or *log*)
+        :type colorScale: str
+        :param percentiles: the (lower,upper) percentiles used as colour limits. If None, the current percentiles are used.
+        :type percentiles: tuple or None
+
+        :raises: :class:`hdfviewer.utils.QuantileSketch.QuantileSketchError`: if the colour scale is unknown
+        """
+
+        checkColorScale(colorScale)
+
+        self._colorScale = colorScale
+
+        if percentiles is not None:
+            self._percentiles = percentiles
+
+        self.update()
+
+    def setRegion(self,rowSlice,colSlice):
+        """Set the region of the dataset to be displayed.
+
+        Only that region is read (strided if it does not fit in the memory budget) and rendered.
+
+        :param rowSlice: the rows of the region
+        :type rowSlice: slice
+        :param colSlice: the columns of the region
+        :type colSlice: slice
+        """
+
+        self._rowSlice = rowSlice
+        self._colSlice = colSlice
+
+        self.update()
+
+    def update(self):
+        """Update the image.
+        """
+
+        frame = self._readFrame()
+
+        start = time.perf_counter()
+
+        # The percentile colour limits are estimated from the cached sketch of the displayed region
+        vmin, vmax = self._colorLimits
+        if self._colorScale != "minmax" and (vmin is None or vmax is None):
+            lower, upper = colorLimits(frameSketch(self._dataset,frame,*self._frameKey()),self._colorScale,self._percentiles)
+            vmin = lower if vmin is None else vmin
+            vmax = upper if vmax is None else vmax
+
+        self._image.value = self._renderer.render(frame,vmin,vmax,log=self._colorScale == "log")
+        elapsed = time.perf_counter() - start
+
+        self._info.value = "{0} region rendered in {1:.1f} ms ({2:d} bytes sent)".format(frame.shape,1000.0*elapsed,len(self._image.value))
+
+        stride = self._sampling[0].step
+        if stride > 1:
+            self._info.value += ", preview: 1 pixel out of {:d} (select a smaller region for the full resolution)".format(stride)
@@ -0,0 +1,70 @@
+"""Lightweight NumPy based viewer for 3D NumPy data.
+"""
+
+import ipywidgets as widgets
+
+from hdfviewer.viewers.NpDataViewer2D import _NpDataViewer2D
+
+class _NpDataViewer3D(_NpDataViewer2D):
+    """This class allows to display 3D NumPy array frame by frame as a colour-mapped image in an `ipywidgets.Image <https://ipywidgets.readthedocs.io/en/stable/examples/Widget%20List.html#Image>`_
+
+    The frames are indexed along the last axis of the dataset and are selected through a slider which can also play them.
+    See :class:`hdfviewer.viewers.NpDataViewer2D._NpDataViewer2D` for the rendering.
+
+    :param dataset: the NumPy array to be displayed
+    :type dataset: :class:`numpy.ndarray`
+
+    :param `**kwargs`: the keyword arguments to be passed to :class:`hdfviewer.viewers.NpDataViewer2D._NpDataViewer2D`
+    :type `**kwargs`: dict
+    """
+
+    def __init__(self,dataset,**kwargs):
+
+        self._selectedFrame = 0
+
+        self._frameSlider = widgets.IntSlider(value=0,min=0,max=max(0,dataset.shape[2]-1),description="frame")
+        self._frameSlider.observe(lambda change: self.setSelectedFrame(change["new"]),names="value")
+
+        self._play = widgets.Play(value=0,min=0,max=max(0,dataset.shape[2]-1),interval=100)
+        widgets.jslink((self._play,"value"),(self._frameSlider,"value"))
+
+        _NpDataViewer2D.__init__(self,dataset,**kwargs)
+
+    def _initLayout(self):
+        """Initializes the widget layout.
+        """
+
+        self._widget = widgets.VBox([self._image,widgets.HBox([self._play,self._frameSlider]),self._info])
+
+    def _readFrame(self):
+        """Read the displayed region of the selected frame.
+
+        :return: the displayed region
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        return self._dataset[self._sampledRegion() + (self._selectedFrame,)]
+
+    def _frameKey(self):
+        """Return the key identifying the displayed region of the selected frame in the cache of the frame sketches.
+
+        :return: the key
+        :rtype: tuple
+        """
+
+        return (self._selectedFrame,) + _NpDataViewer2D._frameKey(self)
+
+    def setSelectedFrame(self,selectedFrame):
+        """Set the frame to be displayed.
+
+        :param selectedFrame: the new frame to be displayed
+        :type selectedFrame: int
+        """
+
+        self._selectedFrame = min(max(selectedFrame,0),self._dataset.shape[2]-1)
+
+        # The slider callback will update the image
+        if self._frameSlider.value != self._selectedFrame:
+            self._frameSlider.value = self._selectedFrame
+        else:
+            self.update()
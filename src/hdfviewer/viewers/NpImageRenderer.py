@@ -0,0 +1,151 @@
+"""Lightweight NumPy based rendering of 2D NumPy data to colour-mapped PNG images.
+"""
+
+import struct
+import zlib
+
+import numpy as np
+
+def colormapLUT(name="viridis",nColors=256):
+    """Build the lookup table of a MatPlotLib colormap.
+
+    :param name: the name of the colormap
+    :type name: str
+    :param nColors: the number of colours of the lookup table
+    :type nColors: int
+
+    :return: the lookup table as a (nColors,3) array of RGB values
+    :rtype: :class:`numpy.ndarray`
+    """
+
+    # Only the colormaps registry is needed, not the whole plotting machinery
+    import matplotlib
+
+    colormap = matplotlib.colormaps[name].resampled(nColors)
+
+    return (colormap(np.arange(nColors))[:,:3]*255).round().astype(np.uint8)
+
+def downsample(frame,shape):
+    """Downsample a 2D array by averaging blocks of pixels so that it fits in a given shape.
+
+    :param frame: the 2D array
+    :type frame: :class:`numpy.ndarray`
+    :param shape: the maximum shape of the downsampled array
+    :type shape: tuple
+
+    :return: the downsampled array
+    :rtype: :class:`numpy.ndarray`
+    """
+
+    rowFactor = max(1,-(-frame.shape[0]//shape[0]))
+    colFactor = max(1,-(-frame.shape[1]//shape[1]))
+    if rowFactor == 1 and colFactor == 1:
+        return frame
+
+    nRows = frame.shape[0]//rowFactor
+    nCols = frame.shape[1]//colFactor
+    blocks = frame[:nRows*rowFactor,:nCols*colFactor].reshape(nRows,rowFactor,nCols,colFactor)
+
+    return blocks.mean(axis=(1,3),dtype=np.float32)
+
+def encodePNG(rgb):
+    """Encode an RGB image in PNG format.
+
+    The image is compressed with the fastest zlib level as it is meant to be sent once to the browser.
+
+    :param rgb: the (rows,columns,3) RGB image
+    :type rgb: :class:`numpy.ndarray` of uint8
+
+    :return: the PNG image
+    :rtype: bytes
+    """
+
+    def chunk(tag,data):
+        return struct.pack(">I",len(data)) + tag + data + struct.pack(">I",zlib.crc32(tag + data) & 0xffffffff)
+
+    nRows, nCols = rgb.shape[:2]
+
+    # Each row is prefixed by its filter type (0: no filter)
+    raw = np.zeros((nRows,1 + 3*nCols),dtype=np.uint8)
+    raw[:,1:] = rgb.reshape(nRows,3*nCols)
+
+    header = struct.pack(">IIBBBBB",nCols,nRows,8,2,0,0,0)
+
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR",header) + chunk(b"IDAT",zlib.compress(raw.tobytes(),1)) + chunk(b"IEND",b"")
+
+class _NpImageRenderer(object):
+    """This class allows to render 2D NumPy arrays to colour-mapped PNG images using NumPy only.
+
+    The rendering consists in:
+
+    1. downsampling the array to the display size
+    2. normalizing the array to colour indexes in [0,255]
+    3. mapping the colour indexes to RGB values using a lookup table
+    4. encoding the RGB image in PNG format
+
+    :param colormap: the name of the MatPlotLib colormap
+    :type colormap: str
+    :param displaySize: the maximum (rows,columns) size of the rendered image
+    :type displaySize: tuple
+    """
+
+    def __init__(self,colormap="viridis",displaySize=(512,512)):
+
+        self._lut = colormapLUT(colormap)
+
+        self._displaySize = displaySize
+
+    @property
+    def displaySize(self):
+        """Getter for the maximum (rows,columns) size of the rendered image.
+
+        :return: the display size
+        :rtype: tuple
+        """
+
+        return self._displaySize
+
+    def render(self,frame,vmin=None,vmax=None,log=False):
+        """Render a 2D array.
+
+        The first row of the array is rendered at the bottom of the image.
+
+        :param frame: the 2D array
+        :type frame: :class:`numpy.ndarray`
+        :param vmin: the value mapped to the first colour. If None, the minimum of the array is used.
+        :type vmin: float or None
+        :param vmax: the value mapped to the last colour. If None, the maximum of the array is used.
+        :type vmax: float or None
+        :param log: if True the colours are logarithmically scaled, the non-positive values being mapped to the first colour
+        :type log: bool
+
+        :return: the PNG image
+        :rtype: bytes
+        """
+
+        frame = downsample(np.asarray(frame),self._displaySize).astype(np.float32,copy=False)
+
+        if log:
+            with np.errstate(divide="ignore",invalid="ignore"):
+                frame = np.log10(frame)
+                vmin = np.log10(vmin) if vmin is not None and vmin > 0 else None
+                vmax = np.log10(vmax) if vmax is not None and vmax > 0 else None
+
+        finite = np.isfinite(frame)
+        if vmin is None or vmax is None:
+            values = frame[finite] if not finite.all() else frame
+            vmin = values.min() if vmin is None and values.size else vmin
+            vmax = values.max() if vmax is None and values.size else vmax
+        vmin = 0.0 if vmin is None else float(vmin)
+        vmax = vmin + 1.0 if vmax is None or vmax <= vmin else float(vmax)
+
+        scale = np.float32((len(self._lut) - 1)/(vmax - vmin))
+        indexes = np.subtract(frame,np.float32(vmin))
+        np.multiply(indexes,scale,out=indexes)
+        np.clip(indexes,0,len(self._lut) - 1,out=indexes)
+        indexes[~finite] = 0
+        indexes = indexes.astype(np.uint8)
+
+        rgb = np.take(self._lut,indexes[::-1],axis=0)
+
+        return encodePNG(rgb)
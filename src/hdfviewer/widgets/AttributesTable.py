@@ -0,0 +1,126 @@
+import html
+
+import numpy as np
+
+import h5py
+
+import ipywidgets as widgets
+
+
+def attributePreview(hdfObject, name, maxBytes=65536, maxChars=256, threshold=20):
+    """Return a size-limited preview of an attribute of a HDF object.
+
+    The size of the attribute is checked before reading it: the attributes larger than *maxBytes* are not read, only their shape and
+    type being reported. The storage of variable-length values (e.g. strings) only holds references to the values, whose sizes are only known
+    once read: the arrays of variable-length values having more than *threshold* items are not read either. The arrays are summarized with
+    their first and last items and the strings are truncated.
+
+    :param hdfObject: the HDF object (group or dataset) holding the attribute
+    :type hdfObject: :class:`h5py.Group` or :class:`h5py.Dataset`
+    :param name: the name of the attribute
+    :type name: str
+    :param maxBytes: the maximum storage size of the attributes to be read
+    :type maxBytes: int
+    :param maxChars: the maximum number of characters of the preview
+    :type maxChars: int
+    :param threshold: the number of items of an array above which the array is summarized (or not read for variable-length values)
+    :type threshold: int
+
+    :return: the preview
+    :rtype: str
+    """
+
+    attribute = h5py.h5a.open(hdfObject.id, name.encode())
+
+    # The attributes with a null dataspace have no shape and no storage
+    if attribute.shape is None:
+        count, size = 0, 0
+    else:
+        count = int(np.prod(attribute.shape))
+        size = max(attribute.get_storage_size(), count*attribute.dtype.itemsize)
+
+    if size > maxBytes:
+        return "<{dtype} array of shape {shape} ({size:d} bytes), not displayed>".format(dtype=attribute.dtype, shape=attribute.shape, size=size)
+
+    if attribute.dtype.hasobject and count > threshold:
+        return "<variable-length array of shape {shape} ({count:d} items), not displayed>".format(shape=attribute.shape, count=count)
+
+    value = hdfObject.attrs[name]
+
+    if isinstance(value, bytes):
+        value = value.decode(errors="replace")
+
+    if isinstance(value, np.ndarray):
+        preview = np.array2string(value, threshold=threshold, edgeitems=3)
+    else:
+        preview = str(value)
+
+    if len(preview) > maxChars:
+        preview = preview[:maxChars] + "..."
+
+    return preview
+
+
+class AttributesTable(widgets.HTML):
+    """This class allows to display the attributes of a HDF object as a single table in the context of **Jupyter Lab**
+
+    The attributes are neither read nor formatted when the table is created but only when :meth:`render` is called (e.g. when the
+    section of the table is expanded). Their values are displayed as size-limited previews (see :func:`attributePreview`).
+
+    :param hdfObject: the HDF object (group or dataset) whose attributes will be displayed
+    :type hdfObject: :class:`h5py.Group` or :class:`h5py.Dataset`
+
+    :param maxBytes: the maximum storage size of the attributes to be read
+    :type maxBytes: int
+
+    :param maxChars: the maximum number of characters of the previews
+    :type maxChars: int
+
+    :param `**kwargs`: the keyword arguments to be passed to the parent class
+    :type `**kwargs`: dict
+    """
+
+    def __init__(self, hdfObject, maxBytes=65536, maxChars=256, **kwargs):
+
+        widgets.HTML.__init__(self, **kwargs)
+
+        self._hdfObject = hdfObject
+
+        self._maxBytes = maxBytes
+
+        self._maxChars = maxChars
+
+        self._rendered = False
+
+    def __len__(self):
+
+        return len(self._hdfObject.attrs)
+
+    @property
+    def rendered(self):
+        """Getter for the rendering state of the table.
+
+        :return: True if the attributes have been read and formatted
+        :rtype: bool
+        """
+
+        return self._rendered
+
+    def render(self):
+        """Read and format the attributes.
+
+        The attributes are only read the first time this method is called.
+        """
+
+        if self._rendered:
+            return
+
+        rows = []
+        for name in self._hdfObject.attrs:
+            preview = attributePreview(self._hdfObject, name, self._maxBytes, self._maxChars)
+            rows.append("<tr><td><b>{name}</b></td><td style='text-align:left'><pre style='margin:0'>{value}</pre></td></tr>".format(
+                name=html.escape(name), value=html.escape(preview)))
+
+        self.value = "<table>{rows}</table>".format(rows="".join(rows))
+
+        self._rendered = True
@@ -0,0 +1,174 @@
+import threading
+
+import ipywidgets as widgets
+
+from IPython.display import display
+
+from hdfviewer.utils.DatasetComparison import DatasetDiff, DifferenceDataset, compareFiles
+from hdfviewer.viewers.MplDataViewer import MplDataViewer, MplDataViewerError
+from hdfviewer.widgets.HDFViewer import HDFViewerError, _openHDFFile
+from hdfviewer.widgets.MplOutput import MplOutput
+
+
+def HDFComparisonWidget(firstFilename, secondFilename, rtol=1e-05, atol=1e-08):
+    """Helper function that displays a :class:`HDFComparison` widget from two files.
+
+    The files can be *true* HDF files or json files in which a HDF has been dumped into.
+
+    :param firstFilename: the path to the first file
+    :type firstFilename: str
+    :param secondFilename: the path to the second file
+    :type secondFilename: str
+    :param rtol: the relative tolerance of the element-wise comparison
+    :type rtol: float
+    :param atol: the absolute tolerance of the element-wise comparison
+    :type atol: float
+    """
+
+    hdfs = []
+    for filename in (firstFilename, secondFilename):
+        hdf = _openHDFFile(filename)
+        if hdf is None:
+            raise HDFViewerError(
+                "An error occured when reading {!r} file".format(filename))
+        hdfs.append(hdf)
+
+    return HDFComparison(hdfs[0], hdfs[1], rtol, atol)
+
+
+class HDFComparison(widgets.VBox):
+    """This class allows to compare the datasets of two HDF files in the context of **Jupyter Lab**
+
+    The datasets are matched by path and compared chunk by chunk in a thread pool, through checksums first and element-wise with a
+    tolerance only where the checksums differ (see :func:`hdfviewer.utils.DatasetComparison.compareFiles`). The comparison runs in the
+    background and results in a per-dataset summary. The difference between two numeric datasets of the same shape can then be displayed
+    in a :class:`hdfviewer.viewers.MplDataViewer.MplDataViewer`, the difference being computed only for the displayed frames.
+
+    :param first: the first file
+    :type first: :class:`h5py.File`
+    :param second: the second file
+    :type second: :class:`h5py.File`
+    :param rtol: the relative tolerance of the element-wise comparison
+    :type rtol: float
+    :param atol: the absolute tolerance of the element-wise comparison
+    :type atol: float
+
+    :param `**kwargs`: the keyword arguments to be passed to the parent class
+    :type `**kwargs`: dict
+    """
+
+    def __init__(self, first, second, rtol=1e-05, atol=1e-08, **kwargs):
+
+        widgets.VBox.__init__(self, **kwargs)
+
+        self._first = first
+
+        self._second = second
+
+        self._rtol = rtol
+
+        self._atol = atol
+
+        self._diffs = []
+
+        self._compare = widgets.Button(description="compare", tooltip="compare the datasets of {!r} and {!r}".format(first.filename, second.filename))
+        self._compare.on_click(self._onCompare)
+
+        self._progress = widgets.IntProgress(value=0, min=0, max=1, layout=widgets.Layout(visibility="hidden"))
+
+        self._summary = widgets.HTML()
+
+        self._datasetSelector = widgets.Dropdown(options=[], value=None, description="difference", disabled=True)
+        self._datasetSelector.observe(self._onSelectDataset, names="value")
+
+        self._output = MplOutput()
+
+        self.children = [widgets.HBox([self._compare, self._progress]), self._summary, self._datasetSelector, self._output]
+
+    @property
+    def diffs(self):
+        """Getter for the summaries of the last comparison.
+
+        :return: the summaries of the comparison of each dataset
+        :rtype: list[:class:`hdfviewer.utils.DatasetComparison.DatasetDiff`]
+        """
+
+        return self._diffs
+
+    def _compareFiles(self):
+        """Compare the files and display the summary.
+
+        This is run in a background thread.
+        """
+
+        try:
+            self._diffs = compareFiles(self._first, self._second, self._rtol, self._atol, progress=self._onProgress)
+        except Exception as e:
+            self._summary.value = "<i>Error when comparing the files: %s</i>" % e
+        else:
+            header = "<tr><th>dataset</th><th>status</th><th>different elements</th><th>different blocks</th><th>max. abs. difference</th></tr>"
+            self._summary.value = "<table>%s%s</table>" % (header, "".join(diff.toHTML() for diff in self._diffs))
+
+            # Only the numeric datasets which differ can be displayed as a difference
+            paths = []
+            for diff in self._diffs:
+                if diff.status in (DatasetDiff.DIFFERENT, DatasetDiff.WITHIN_TOLERANCE):
+                    try:
+                        DifferenceDataset(self._first[diff.path], self._second[diff.path])
+                    except Exception:
+                        continue
+                    paths.append(diff.path)
+            self._datasetSelector.options = paths
+            self._datasetSelector.value = None
+            self._datasetSelector.disabled = not paths
+
+        self._compare.disabled = False
+        self._progress.layout.visibility = "hidden"
+
+    def _onCompare(self, button):
+        """A callable that is called when the compare button is clicked.
+
+        :param button: the compare button
+        :type button: `ipywidgets.Button <https://ipywidgets.readthedocs.io/en/stable/examples/Widget%20List.html#Button>`_
+        """
+
+        self._compare.disabled = True
+        self._progress.value = 0
+        self._progress.layout.visibility = "visible"
+        self._summary.value = "<i>Comparing the files ...</i>"
+
+        threading.Thread(target=self._compareFiles, daemon=True).start()
+
+    def _onProgress(self, nCompared, nDatasets):
+        """A callable that is called each time a dataset has been compared.
+
+        :param nCompared: the number of compared datasets
+        :type nCompared: int
+        :param nDatasets: the total number of datasets
+        :type nDatasets: int
+        """
+
+        self._progress.max = max(1, nDatasets)
+        self._progress.value = nCompared
+
+    def _onSelectDataset(self, change):
+        """A callable that is called when a dataset is selected for displaying its difference.
+
+        :param change: the state of the traits holder
+        :type change: dict
+        """
+
+        path = change["new"]
+
+        self._output.clear_output(wait=False)
+
+        if path is None:
+            return
+
+        with self._output:
+            try:
+                viewer = MplDataViewer(DifferenceDataset(self._first[path], self._second[path]), standAlone=False)
+            except MplDataViewerError as e:
+                display(widgets.Label(value=str(e)))
+            else:
+                self._output.figure = viewer.viewer.figure
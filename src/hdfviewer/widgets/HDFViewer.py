@@ -1,22 +1,28 @@
 import binascii
+import functools
+import html
 import io
 import json
 import os
-import webbrowser
+import posixpath
 
 import numpy as np
 
 import h5py
 
-import matplotlib.pyplot as plt
-
 import ipywidgets as widgets
 
-from IPython.core.display import display
+from IPython.display import display
 
 from hdfviewer import __version__
-from hdfviewer.viewers.MplDataViewer import MplDataViewer, MplDataViewerError
+from hdfviewer.utils.DatasetAccess import fileChunkCacheBytes, fileChunkCacheSlots
+from hdfviewer.utils.FileHandlePool import FileHandlePoolError, defaultPool
+from hdfviewer.utils.IOAccounting import compressionRatio, datasetFilters, frameReadCost, ioAccounting
+from hdfviewer.viewers.MplDataViewer import MplDataViewer, MplDataViewerError, numericFields
+from hdfviewer.widgets.AttributesTable import AttributesTable
 from hdfviewer.widgets.MplOutput import MplOutput
+from hdfviewer.widgets.PagedAccordion import PagedAccordion
+from hdfviewer.widgets.StatisticsPanel import StatisticsPanel
 
 
 class HDFViewerError(Exception):
@@ -26,13 +32,40 @@ class HDFViewerError(Exception):
     pass
 
 
-def _openHDFFile(filename):
+def _frameCostTable(dataset):
+    """Build the HTML table of the estimated cost of reading one frame of a dataset along each of its axes.
+
+    :param dataset: the dataset
+    :type dataset: :class:`h5py.Dataset`
+
+    :return: the table or an empty string if the dataset has less than 2 non-trivial axes
+    :rtype: str
+    """
+
+    axes = [axis for axis, n in enumerate(dataset.shape) if n != 1]
+    if len(axes) < 2:
+        return ""
+
+    unit = "chunks" if dataset.chunks is not None else "contiguous runs"
+
+    rows = ["<tr><th>frame along axis</th><th>frame size</th><th>%s read</th><th>bytes read</th><th>read amplification</th></tr>" % unit]
+    for axis in axes:
+        cost = frameReadCost(dataset, axis)
+        rows.append("<tr><td>%d</td><td>%.3g MiB</td><td>%d</td><td>%.3g MiB</td><td>%.1f</td></tr>" % (
+            axis, cost["frameBytes"]/2**20, cost["chunks"], cost["bytesRead"]/2**20, cost["amplification"]))
+
+    return "<table>%s</table>" % "".join(rows)
+
+
+def _openHDFFile(filename, swmr=False):
     """Open a HDF file.
 
     The file can be a *true* HDF file or a json file in which a HDF has been dumped into.
 
     :param hdfSource: the path to the file storing the HDF contents
     :type hdfSource: str
+    :param swmr: if True a *true* HDF file is opened in SWMR (single writer multiple readers) read mode so that the data appended by a writer can be read
+    :type swmr: bool
 
     The file can be a path to a *true* HDF file or to a file in which the HDF contents has been dumped into.
     :raises: :class:`TypeError` if the input is not a str
@@ -48,7 +81,8 @@ def _openHDFFile(filename):
 
     # First try to open the file as a HDF5 file
     try:
-        hdf = h5py.File(filename, "r")
+        # The chunk cache is large enough to keep the chunks crossed by the frames of most datasets
+        hdf = h5py.File(filename, "r", swmr=swmr, rdcc_nbytes=fileChunkCacheBytes, rdcc_nslots=fileChunkCacheSlots)
     # Any exception should be caught at this level
     except:
         # Try to open it as a json dumped HDF file
@@ -67,7 +101,7 @@ def _openHDFFile(filename):
         return hdf
 
 
-def HDFViewerWidget(filename, startingPath=None):
+def HDFViewerWidget(filename, startingPath=None, live=False, sharedCache=None, filePool=None):
     """Helper function that displays a :class:`HDFViewer` widget from a file.
 
     The file can be a *true* HDF file or a json file in which a HDF has been dumped into.
@@ -78,6 +112,12 @@ def HDFViewerWidget(filename, startingPath=None):
 
         If not set, the starting path will be the root of the HDF data
     :type startPath: str or None
+    :param live: if True the file is opened in SWMR read mode and the displayed datasets are followed while they grow (see :class:`HDFViewer`)
+    :type live: bool
+    :param sharedCache: the node-local cache of frames shared with the other kernels of the node (see :class:`HDFViewer`)
+    :type sharedCache: :class:`hdfviewer.utils.SharedFrameCache.SharedFrameCache` or None
+    :param filePool: the pool of the files targeted by the external links (see :class:`HDFViewer`)
+    :type filePool: :class:`hdfviewer.utils.FileHandlePool.FileHandlePool` or None
     """
 
     vbox = widgets.VBox()
@@ -87,12 +127,12 @@ def HDFViewerWidget(filename, startingPath=None):
 
     button.on_click(lambda event: HDFViewer.info())
 
-    hdf = _openHDFFile(filename)
+    hdf = _openHDFFile(filename, swmr=live)
     if hdf is None:
         raise HDFViewerError(
             "An error occured when reading {!r} file".format(filename))
 
-    vbox.children = [button, HDFViewer(hdf, startingPath)]
+    vbox.children = [button, HDFViewer(hdf, startingPath, live=live, sharedCache=sharedCache, filePool=filePool)]
 
     return vbox
 
@@ -114,69 +154,414 @@ class HDFViewer(widgets.Accordion):
 
         If not set, the starting path will be the root of the HDF data
     :type startPath: str or None
+    :param pageSize: the maximum number of groups or datasets displayed at once in the groups and datasets accordions. Larger groups are displayed page by page.
+    :type pageSize: int
+    :param live: if True the displayed datasets are polled for appended data (the file should be opened in SWMR read mode). Only the appended data are read and the plots of 1D datasets and the frame range of 3D datasets are extended incrementally.
+    :type live: bool
+    :param sharedCache: the node-local cache of frames shared with the other kernels of the node. The frames displayed by a kernel are then displayed by the other kernels of the node without reading nor decoding them again.
+    :type sharedCache: :class:`hdfviewer.utils.SharedFrameCache.SharedFrameCache` or None
+    :param filePool: the pool of the files targeted by the external links and of the source files of the virtual datasets. The links are listed without being followed and are only resolved, with the timeout of the pool, when expanded. If None, the pool shared by the viewers is used.
+    :type filePool: :class:`hdfviewer.utils.FileHandlePool.FileHandlePool` or None
     """
 
-    def __init__(self, hdf, startPath=None):
+    def __init__(self, hdf, startPath=None, pageSize=50, live=False, sharedCache=None, filePool=None):
 
         widgets.Accordion.__init__(self)
 
         self._hdf = hdf
 
+        self._pageSize = pageSize
+
+        self._live = live
+
+        self._sharedCache = sharedCache
+
+        self._filePool = filePool if filePool is not None else defaultPool()
+
+        self._viewerOptions = {}
+
+        # The datasets targeted by the resolved links, per link path
+        self._linkTargets = {}
+
         if startPath is None:
             self._startPath = "/"
-            self.children = [HDFViewer(self._hdf, self._startPath)]
+            self.children = [HDFViewer(self._hdf, self._startPath, self._pageSize, self._live, self._sharedCache, self._filePool)]
             self.set_title(0, self._startPath)
         else:
             self._startPath = startPath
 
-            attributesAccordion = widgets.Accordion()
-            for idx, (key, value) in enumerate(self._hdf[self._startPath].attrs.items()):
-                attributesAccordion.children = list(
-                    attributesAccordion.children) + [widgets.HTML(str(value))]
-                attributesAccordion.set_title(idx, key)
-
-            # Setup the groups and datasets accordion
-            groupsAccordion = widgets.Accordion()
-            datasetsAccordion = widgets.Accordion()
-            for value in list(self._hdf[self._startPath].values()):
-                if isinstance(value, h5py.Group):
-                    groupsAccordion.children = list(
-                        groupsAccordion.children) + [HDFViewer(hdf, value.name)]
-                    groupsAccordion.set_title(
-                        len(groupsAccordion.children)-1, value.name)
-                elif isinstance(value, h5py.Dataset):
-                    datasetInfo = []
-                    shape = value.shape
-                    # Set some informations about the current hdf value
-                    datasetInfo.append("<i>Dimension: %s</i>" % str(shape))
-                    datasetInfo.append("<i>Reduced dimension: %s</i>" %
-                                       str(tuple([s for s in shape if s != 1])))
-                    datasetInfo.append("<i>Type: %s</i>" % value.dtype.name)
-                    for item in self._hdf[self._startPath].attrs.items():
-                        datasetInfo.append("<i>%s: %s</i>" % item)
-                    datasetInfo = "<br>".join(datasetInfo)
-                    vbox = widgets.VBox()
-                    vbox.children = [widgets.HTML(datasetInfo), MplOutput()]
-                    datasetsAccordion.children = list(
-                        datasetsAccordion.children) + [vbox]
-                    datasetsAccordion.set_title(
-                        len(datasetsAccordion.children)-1, value.name)
-                    datasetsAccordion.observe(
-                        self._onSelectDataset, names="selected_index")
+            group = self._hdf[self._startPath]
+
+            # The attributes are only read when their section is expanded
+            attributesTable = AttributesTable(group)
+
+            # Sort the members by type without opening them. The external links are not followed: their target files may be missing or
+            # stored on slow filesystems. They are listed with the dangling soft links and only resolved when expanded.
+            groups = []
+            datasets = []
+            links = []
+            groupId = group.id
+            groupName = group.name
+            for name in group:
+                path = posixpath.join(groupName, name)
+                linkType = groupId.links.get_info(name.encode()).type
+                if linkType == h5py.h5l.TYPE_EXTERNAL or (linkType == h5py.h5l.TYPE_SOFT and group.get(name) is None):
+                    links.append((path, functools.partial(self._buildLinkWidget, path)))
+                    continue
+                objectType = h5py.h5o.get_info(groupId, name.encode()).type
+                if objectType == h5py.h5o.TYPE_GROUP:
+                    groups.append((path, widgets.VBox))
+                elif objectType == h5py.h5o.TYPE_DATASET:
+                    datasets.append((path, functools.partial(self._buildDatasetWidget, path)))
+
+            # Setup the groups and datasets accordions. Their children are built page by page, the subgroups being only built when selected
+            groupsAccordion = PagedAccordion(groups, self._pageSize)
+            groupsAccordion.accordion.observe(self._onSelectGroup, names="selected_index")
+
+            datasetsAccordion = PagedAccordion(datasets, self._pageSize)
+            datasetsAccordion.accordion.observe(self._onSelectDataset, names="selected_index")
+
+            linksAccordion = PagedAccordion(links, self._pageSize)
+            linksAccordion.accordion.observe(self._onSelectLink, names="selected_index")
 
             # Display only the accordions which have children
-            nestedAccordions = [("attributes", attributesAccordion),
-                                ("groups", groupsAccordion), ("datasets", datasetsAccordion)]
-            for title, acc in nestedAccordions:
-                if not acc.children:
-                    continue
-                acc.selected_index = None
-                self.children = list(self.children) + [acc]
-                self.set_title(len(self.children)-1, title)
+            nestedAccordions = [("attributes", attributesTable, len(attributesTable)),
+                                ("groups", groupsAccordion, len(groupsAccordion)),
+                                ("datasets", datasetsAccordion, len(datasetsAccordion)),
+                                ("links", linksAccordion, len(linksAccordion))]
+            nestedAccordions = [(title, acc) for title, acc, count in nestedAccordions if count > 0]
+            with self.hold_sync():
+                self.children = [acc for _, acc in nestedAccordions]
+                for idx, (title, _) in enumerate(nestedAccordions):
+                    self.set_title(idx, title)
 
         # By default, the accordion is closed at start-up
         self.selected_index = None
 
+        self.observe(self._onSelectSection, names="selected_index")
+
+    def _dataset(self, path):
+        """Return a displayed dataset.
+
+        :param path: the path to the dataset or to the link targeting it
+        :type path: str
+
+        :return: the dataset
+        :rtype: :class:`h5py.Dataset`
+        """
+
+        dataset = self._linkTargets.get(path)
+        if dataset is None:
+            dataset = self._hdf[path]
+
+        return dataset
+
+    def _buildLinkWidget(self, path):
+        """Build the widget displaying a link which is not followed when listing its group (external link or dangling soft link).
+
+        The link target is only described: the link is resolved when it is selected (see :meth:`_onSelectLink`).
+
+        :param path: the path to the link
+        :type path: str
+
+        :return: the widget made of the description of the link
+        :rtype: `ipywidgets.VBox <https://ipywidgets.readthedocs.io/en/stable/examples/Widget%20List.html#VBox>`_
+        """
+
+        link = self._hdf.get(path, getlink=True)
+        if isinstance(link, h5py.ExternalLink):
+            description = "<i>External link to %s:%s</i>" % (html.escape(link.filename), html.escape(link.path))
+        else:
+            description = "<i>Soft link to %s (dangling)</i>" % html.escape(link.path)
+
+        vbox = widgets.VBox()
+        vbox.children = [widgets.HTML(description)]
+
+        return vbox
+
+    def _buildDatasetWidget(self, path):
+        """Build the widget displaying a given dataset.
+
+        :param path: the path to the dataset
+        :type path: str
+
+        :return: the widget made of the informations about the dataset and of the output where the dataset will be plotted
+        :rtype: `ipywidgets.VBox <https://ipywidgets.readthedocs.io/en/stable/examples/Widget%20List.html#VBox>`_
+        """
+
+        value = self._dataset(path)
+
+        datasetInfo = []
+        shape = value.shape
+        # Set some informations about the current hdf value
+        datasetInfo.append("<i>Dimension: %s</i>" % str(shape))
+        datasetInfo.append("<i>Reduced dimension: %s</i>" %
+                           str(tuple([s for s in shape if s != 1])))
+        datasetInfo.append("<i>Type: %s</i>" % value.dtype.name)
+        if value.dtype.names is not None:
+            datasetInfo.append("<i>Fields: %s</i>" % ", ".join(
+                ["%s (%s)" % (name, value.dtype[name].name) for name in value.dtype.names]))
+        # The storage layout tells why the frames along an axis are slow to read. The layout of the sources of a virtual dataset is only known
+        # once their files are opened.
+        if value.is_virtual:
+            datasetInfo.append("<i>Layout: virtual (%d sources, resolved on demand)</i>" % len(value.virtual_sources()))
+        else:
+            datasetInfo.append("<i>Chunks: %s</i>" % (str(value.chunks) if value.chunks is not None else "none (contiguous)"))
+            filters = datasetFilters(value)
+            if filters:
+                datasetInfo.append("<i>Filters: %s (compression ratio %.2f)</i>" % (", ".join(filters), 1.0/compressionRatio(value)))
+            else:
+                datasetInfo.append("<i>Filters: none</i>")
+        datasetInfo = "<br>".join(datasetInfo)
+        if not value.is_virtual:
+            datasetInfo += _frameCostTable(value)
+
+        output = MplOutput()
+
+        children = [widgets.HTML(datasetInfo)]
+
+        # The attributes of the dataset are only read when their section is expanded
+        attributesTable = AttributesTable(value)
+        if len(attributesTable) > 0:
+            attributesAccordion = widgets.Accordion(children=[attributesTable])
+            attributesAccordion.set_title(0, "attributes")
+            attributesAccordion.selected_index = None
+            attributesAccordion.observe(self._onSelectSection, names="selected_index")
+            children.append(attributesAccordion)
+
+        # The reads measured while browsing the dataset are compared with the estimates of the information above
+        reads = widgets.HTML()
+        showReads = widgets.Button(description="I/O statistics", tooltip="show the reads of the dataset measured so far")
+        showReads.on_click(functools.partial(self._onShowReads, value, reads))
+        children.extend([showReads, reads])
+
+        # The source files of virtual datasets are checked on demand
+        if value.is_virtual:
+            sources = widgets.HTML()
+            checkSources = widgets.Button(description="check sources", tooltip="check that the source files can be read")
+            checkSources.on_click(functools.partial(self._onCheckSources, value, sources))
+            children.extend([checkSources, sources])
+
+        # The statistics of numeric datasets are computed on demand
+        if np.issubdtype(value.dtype, np.number):
+            children.append(StatisticsPanel(value))
+
+        # For compound datasets, the field to be plotted is selected among the numeric ones
+        fields = numericFields(value.dtype)
+        if fields:
+            self._viewerOptions.setdefault(path, {})["field"] = fields[0]
+            fieldSelector = widgets.Dropdown(options=fields, value=fields[0], description="field")
+            fieldSelector.observe(functools.partial(self._onChangeViewerOption, path, output, "field"), names="value")
+            children.append(fieldSelector)
+
+        # For image datasets, the rendering backend can be selected and the histogram of the values can be displayed next to the colorbar
+        if len([s for s in shape if s != 1]) in (2, 3):
+            histogram = widgets.Checkbox(value=False, description="histogram", indent=False)
+            histogram.observe(functools.partial(self._onChangeViewerOption, path, output, "histogram"), names="value")
+            backend = widgets.Dropdown(options=["matplotlib", "numpy"], value="matplotlib", description="backend")
+            backend.observe(functools.partial(self._onChangeBackend, path, output, histogram), names="value")
+            children.extend([backend, histogram])
+
+        children.append(output)
+
+        vbox = widgets.VBox()
+        vbox.children = children
+
+        return vbox
+
+    def _displayDataset(self, path, output):
+        """Display a dataset in a given output widget.
+
+        :param path: the path to the dataset
+        :type path: str
+        :param output: the output widget where the dataset will be plotted
+        :type output: :class:`hdfviewer.widgets.MplOutput.MplOutput`
+        """
+
+        output.clear_output(wait=False)
+
+        with output:
+            try:
+                self._viewer = MplDataViewer(self._dataset(path), standAlone=False, live=self._live, sharedCache=self._sharedCache, **self._viewerOptions.get(path, {}))
+            except MplDataViewerError as e:
+                label = widgets.Label(value=str(e))
+                display(label)
+            else:
+                # Bind the DataViewer figure to the MplOutput widget for allowing a "clean" output clearing (i.e. release the figure from plt)
+                output.figure = self._viewer.viewer.figure
+
+    def _onChangeViewerOption(self, path, output, option, change):
+        """A callable that is called when an option of the viewer of a dataset is changed (e.g. the field of a compound dataset)
+
+        The dataset is displayed again with the new option.
+
+        :param path: the path to the dataset
+        :type path: str
+        :param output: the output widget where the dataset is plotted
+        :type output: :class:`hdfviewer.widgets.MplOutput.MplOutput`
+        :param option: the name of the option (i.e. a keyword argument of :class:`hdfviewer.viewers.MplDataViewer.MplDataViewer`)
+        :type option: str
+        :param change: the state of the traits holder
+        :type change: dict
+        """
+
+        self._viewerOptions.setdefault(path, {})[option] = change["new"]
+
+        self._displayDataset(path, output)
+
+    def _onChangeBackend(self, path, output, histogram, change):
+        """A callable that is called when the rendering backend of a dataset is changed
+
+        The histogram is only available with the *matplotlib* backend: its checkbox is disabled with the other backends.
+
+        :param path: the path to the dataset
+        :type path: str
+        :param output: the output widget where the dataset is plotted
+        :type output: :class:`hdfviewer.widgets.MplOutput.MplOutput`
+        :param histogram: the histogram checkbox
+        :type histogram: :class:`ipywidgets.Checkbox`
+        :param change: the state of the traits holder
+        :type change: dict
+        """
+
+        self._viewerOptions.setdefault(path, {})["backend"] = change["new"]
+
+        histogram.disabled = change["new"] != "matplotlib"
+
+        # Unchecking the histogram displays the dataset again (see _onChangeViewerOption)
+        if histogram.disabled and histogram.value:
+            histogram.value = False
+        else:
+            self._displayDataset(path, output)
+
+    def _onSelectGroup(self, change):
+        """A callable that is called when a new group is selected
+
+        The viewer of the group is built the first time the group is selected.
+
+        :param change: the state of the traits holder
+        :type change: dict
+        """
+
+        idx = change["new"]
+
+        # If the accordions is closed does nothing
+        if idx is None:
+            return
+
+        accordion = change["owner"]
+
+        vbox = accordion.children[idx]
+        if not vbox.children:
+            vbox.children = [HDFViewer(self._hdf, accordion.get_title(idx), self._pageSize, self._live, self._sharedCache, self._filePool)]
+
+    def _onSelectLink(self, change):
+        """A callable that is called when a new link is selected
+
+        The external links are resolved through the file pool the first time they are selected, a failed resolution being tried again on the
+        next selection. A group target is displayed by a nested viewer and a dataset target is displayed as the datasets of the group.
+
+        :param change: the state of the traits holder
+        :type change: dict
+        """
+
+        idx = change["new"]
+
+        # If the accordions is closed does nothing
+        if idx is None:
+            return
+
+        accordion = change["owner"]
+
+        path = accordion.get_title(idx)
+
+        vbox = accordion.children[idx]
+
+        description = vbox.children[0]
+
+        if len(vbox.children) > 1 and not isinstance(vbox.children[-1], widgets.Label):
+            # The target dataset is displayed again
+            if path in self._linkTargets:
+                self._displayDataset(path, vbox.children[-1].children[-1])
+            return
+
+        link = self._hdf.get(path, getlink=True)
+        if not isinstance(link, h5py.ExternalLink):
+            return
+
+        parentPath, name = posixpath.split(path)
+        try:
+            target = self._filePool.resolveExternalLink(self._hdf[parentPath], name)
+        except FileHandlePoolError as e:
+            vbox.children = [description, widgets.Label(value=str(e))]
+            return
+
+        if isinstance(target, h5py.Group):
+            vbox.children = [description, HDFViewer(target.file, target.name, self._pageSize, self._live, self._sharedCache, self._filePool)]
+        else:
+            self._linkTargets[path] = target
+            datasetWidget = self._buildDatasetWidget(path)
+            vbox.children = [description, datasetWidget]
+            self._displayDataset(path, datasetWidget.children[-1])
+
+    def _onShowReads(self, dataset, reads, button):
+        """A callable that is called when the reads of a dataset are shown.
+
+        The statistics of the reads of the dataset are shown with the statistics of the reads of all the datasets per interaction (see
+        :mod:`hdfviewer.utils.IOAccounting`).
+
+        :param dataset: the dataset
+        :type dataset: :class:`h5py.Dataset`
+        :param reads: the widget where the statistics are shown
+        :type reads: `ipywidgets.HTML <https://ipywidgets.readthedocs.io/en/stable/examples/Widget%20List.html#HTML>`_
+        :param button: the clicked button
+        :type button: `ipywidgets.Button <https://ipywidgets.readthedocs.io/en/stable/examples/Widget%20List.html#Button>`_
+        """
+
+        rows = ["<tr><th>interaction (all datasets)</th><th>reads</th><th>bytes read</th><th>chunks decompressed</th><th>read time</th></tr>"]
+        for name, statistics in sorted(ioAccounting.interactions.items()):
+            rows.append("<tr><td>%s</td><td>%d</td><td>%.3g MiB</td><td>%d</td><td>%.3f s</td></tr>" % (
+                html.escape(name), statistics.reads, statistics.bytesRead/2**20, statistics.chunksDecompressed, statistics.seconds))
+
+        reads.value = ioAccounting.datasetStatistics(dataset).toHTML() + "<table>%s</table>" % "".join(rows)
+
+    def _onCheckSources(self, dataset, sources, button):
+        """A callable that is called when the source files of a virtual dataset are checked.
+
+        :param dataset: the virtual dataset
+        :type dataset: :class:`h5py.Dataset`
+        :param sources: the widget where the sources are listed
+        :type sources: `ipywidgets.HTML <https://ipywidgets.readthedocs.io/en/stable/examples/Widget%20List.html#HTML>`_
+        :param button: the clicked button
+        :type button: `ipywidgets.Button <https://ipywidgets.readthedocs.io/en/stable/examples/Widget%20List.html#Button>`_
+        """
+
+        rows = ["<tr><th>source dataset</th><th>source file</th><th>status</th></tr>"]
+        for datasetName, filename, reason in self._filePool.virtualSources(dataset):
+            rows.append("<tr><td>%s</td><td>%s</td><td>%s</td></tr>" % (
+                html.escape(datasetName), html.escape(filename), html.escape(reason) if reason is not None else "readable"))
+
+        sources.value = "<table>%s</table>" % "".join(rows)
+
+    def _onSelectSection(self, change):
+        """A callable that is called when a section (attributes, groups, datasets or the attributes of a dataset) is selected
+
+        The attributes are read and formatted the first time their section is selected.
+
+        :param change: the state of the traits holder
+        :type change: dict
+        """
+
+        idx = change["new"]
+
+        # If the accordions is closed does nothing
+        if idx is None:
+            return
+
+        section = change["owner"].children[idx]
+        if isinstance(section, AttributesTable):
+            section.render()
+
     def _onSelectDataset(self, change):
         """A callable that is called when a new dataset is selected
 
@@ -198,18 +583,7 @@ class HDFViewer(widgets.Accordion):
 
         vbox = accordion.children[idx]
 
-        output = vbox.children[1]
-        output.clear_output(wait=False)
-
-        with output:
-            try:
-                self._viewer = MplDataViewer(self._hdf[path], standAlone=False)
-            except MplDataViewerError as e:
-                label = widgets.Label(value=str(e))
-                display(label)
-            else:
-                # Bind the DataViewer figure to the MplOutput widget for allowing a "clean" output clearing (i.e. release the figure from plt)
-                output.figure = self._viewer.viewer.figure
+        self._displayDataset(path, vbox.children[-1])
 
     @staticmethod
     def info(version=None):
@@ -221,6 +595,8 @@ class HDFViewer(widgets.Accordion):
         :type release: str
         """
 
+        import webbrowser
+
         version = version if version else __version__
 
         # This will open the package documentation stored on readthedocs
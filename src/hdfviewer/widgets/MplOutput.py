@@ -1,5 +1,3 @@
-import matplotlib.pyplot as plt
-
 from ipywidgets import widgets
 
 class MplOutput(widgets.Output):
@@ -47,5 +45,7 @@ class MplOutput(widgets.Output):
         widgets.Output.clear_output(self,**kwargs)
         
         if self._figure:
+            # pyplot is necessarily imported when a figure has been displayed
+            import matplotlib.pyplot as plt
             plt.close(self._figure)
-            del self._figure
+            self._figure = None
@@ -0,0 +1,112 @@
+import ipywidgets as widgets
+
+
+class PagedAccordion(widgets.VBox):
+    """This class allows to display a large number of items in an accordion in the context of **Jupyter Lab**
+
+    Rather than creating one accordion child per item, the items are split into pages and only the children of the current
+    page are built. The children of a page are created in one batch, i.e. the accordion contents are synchronized once per
+    page and not once per item. When there is more than one page, a navigation bar is displayed on top of the accordion.
+
+    :param items: the items to display. Each item is a (title, factory) tuple where factory is a callable with no argument building the corresponding accordion child.
+    :type items: list[tuple]
+
+    :param pageSize: the maximum number of items per page
+    :type pageSize: int
+
+    :param `**kwargs`: the keyword arguments to be passed to the parent class
+    :type `**kwargs`: dict
+    """
+
+    def __init__(self, items, pageSize=50, **kwargs):
+
+        widgets.VBox.__init__(self, **kwargs)
+
+        self._items = list(items)
+
+        self._pageSize = max(1, int(pageSize))
+
+        self._accordion = widgets.Accordion()
+
+        self._page = None
+
+        children = []
+        if self.nPages > 1:
+            self._previous = widgets.Button(description="previous", layout=widgets.Layout(width="auto"))
+            self._previous.on_click(lambda button: self.setPage(self._page-1))
+            self._next = widgets.Button(description="next", layout=widgets.Layout(width="auto"))
+            self._next.on_click(lambda button: self.setPage(self._page+1))
+            self._pageSelector = widgets.BoundedIntText(value=1, min=1, max=self.nPages, layout=widgets.Layout(width="80px"))
+            self._pageSelector.observe(lambda change: self.setPage(change["new"]-1), names="value")
+            self._pageLabel = widgets.Label()
+            children.append(widgets.HBox([self._previous, self._pageSelector, self._next, self._pageLabel]))
+
+        children.append(self._accordion)
+        self.children = children
+
+        self.setPage(0)
+
+    def __len__(self):
+
+        return len(self._items)
+
+    @property
+    def accordion(self):
+        """Getter for the accordion displaying the items of the current page.
+
+        :return: the accordion
+        :rtype: `ipywidgets.Accordion <https://ipywidgets.readthedocs.io/en/stable/examples/Widget%20List.html#Accordion>`_
+        """
+
+        return self._accordion
+
+    @property
+    def nPages(self):
+        """Getter for the number of pages.
+
+        :return: the number of pages
+        :rtype: int
+        """
+
+        return max(1, (len(self._items) + self._pageSize - 1)//self._pageSize)
+
+    @property
+    def page(self):
+        """Getter for the index of the current page.
+
+        :return: the index of the current page
+        :rtype: int
+        """
+
+        return self._page
+
+    def setPage(self, page):
+        """Display a given page.
+
+        The accordion children of the page are built and sent to the frontend in one go.
+
+        :param page: the index of the page (starting from 0)
+        :type page: int
+        """
+
+        page = min(max(page, 0), self.nPages-1)
+        if page == self._page:
+            return
+
+        self._page = page
+
+        first = page*self._pageSize
+        last = min(first + self._pageSize, len(self._items))
+        titles = [title for title, _ in self._items[first:last]]
+
+        with self._accordion.hold_sync():
+            self._accordion.selected_index = None
+            self._accordion.children = [factory() for _, factory in self._items[first:last]]
+            for idx, title in enumerate(titles):
+                self._accordion.set_title(idx, title)
+
+        if self.nPages > 1:
+            self._pageSelector.value = page + 1
+            self._previous.disabled = page == 0
+            self._next.disabled = page == self.nPages - 1
+            self._pageLabel.value = "items {0}-{1} of {2}".format(first+1, last, len(self._items))
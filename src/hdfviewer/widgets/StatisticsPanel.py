@@ -0,0 +1,106 @@
+import ipywidgets as widgets
+
+from hdfviewer.utils.DatasetStatistics import cachedStatistics, statisticsStreamer
+
+
+class StatisticsPanel(widgets.VBox):
+    """This class allows to compute on demand the statistics of a dataset in the context of **Jupyter Lab**
+
+    The statistics (minimum, maximum, mean, standard deviation, NaN count and non-zero fraction) are computed in the background block by block
+    (see :func:`hdfviewer.utils.DatasetStatistics.statisticsStreamer`) so that datasets larger than the memory can be inspected. The computation
+    progress is displayed and the computation can be cancelled. Once computed, the statistics are cached and displayed immediately.
+
+    :param dataset: the dataset
+    :type dataset: :class:`h5py.Dataset`
+
+    :param `**kwargs`: the keyword arguments to be passed to the parent class
+    :type `**kwargs`: dict
+    """
+
+    def __init__(self, dataset, **kwargs):
+
+        widgets.VBox.__init__(self, **kwargs)
+
+        self._dataset = dataset
+
+        self._streamer = None
+
+        self._compute = widgets.Button(description="statistics", tooltip="compute the statistics of the dataset")
+        self._compute.on_click(self._onCompute)
+
+        self._cancel = widgets.Button(description="cancel", disabled=True)
+        self._cancel.on_click(self._onCancel)
+
+        self._progress = widgets.IntProgress(value=0, min=0, max=1, layout=widgets.Layout(visibility="hidden"))
+
+        self._statistics = widgets.HTML()
+
+        self.children = [widgets.HBox([self._compute, self._cancel, self._progress]), self._statistics]
+
+        statistics = cachedStatistics(self._dataset)
+        if statistics is not None:
+            self._statistics.value = statistics.toHTML()
+
+    def _onCancel(self, button):
+        """A callable that is called when the cancel button is clicked.
+
+        :param button: the cancel button
+        :type button: `ipywidgets.Button <https://ipywidgets.readthedocs.io/en/stable/examples/Widget%20List.html#Button>`_
+        """
+
+        if self._streamer is not None:
+            self._streamer.cancel()
+
+    def _onCompute(self, button):
+        """A callable that is called when the statistics button is clicked.
+
+        :param button: the statistics button
+        :type button: `ipywidgets.Button <https://ipywidgets.readthedocs.io/en/stable/examples/Widget%20List.html#Button>`_
+        """
+
+        statistics = cachedStatistics(self._dataset)
+        if statistics is not None:
+            self._statistics.value = statistics.toHTML()
+            return
+
+        self._streamer = statisticsStreamer(self._dataset, progress=self._onProgress)
+
+        self._compute.disabled = True
+        self._cancel.disabled = False
+        self._progress.value = 0
+        self._progress.max = max(1, self._streamer.nBlocks)
+        self._progress.layout.visibility = "visible"
+        self._statistics.value = "<i>Computing statistics ...</i>"
+
+        self._streamer.start(self._onDone)
+
+    def _onDone(self, streamer):
+        """A callable that is called when the statistics computation is over.
+
+        :param streamer: the streamer computing the statistics
+        :type streamer: :class:`hdfviewer.utils.ChunkStreamer.ChunkStreamer`
+        """
+
+        if streamer.error is not None:
+            self._statistics.value = "<i>Error when computing statistics: %s</i>" % streamer.error
+        elif streamer.cancelled:
+            self._statistics.value = "<i>Statistics computation cancelled</i>"
+        else:
+            self._statistics.value = streamer.result.toHTML()
+
+        self._compute.disabled = False
+        self._cancel.disabled = True
+        self._progress.layout.visibility = "hidden"
+
+        self._streamer = None
+
+    def _onProgress(self, nProcessed, nBlocks):
+        """A callable that is called each time a block of the dataset has been processed.
+
+        :param nProcessed: the number of processed blocks
+        :type nProcessed: int
+        :param nBlocks: the total number of blocks
+        :type nBlocks: int
+        """
+
+        self._progress.value = nProcessed
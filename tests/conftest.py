@@ -0,0 +1,23 @@
+import os
+import sys
+
+# The tests are run against the sources of the package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+import pytest
+
+
+@pytest.fixture
+def headless():
+    """Display the figures on the headless backend of the viewers (see hdfviewer.viewers.MplInteractionTrace.headlessBackend)."""
+
+    import matplotlib.pyplot as plt
+
+    from hdfviewer.viewers.MplInteractionTrace import headlessBackend
+
+    if plt.get_backend() != headlessBackend:
+        plt.switch_backend(headlessBackend)
+
+    yield plt
+
+    plt.close("all")
@@ -0,0 +1,57 @@
+import h5py
+
+import numpy as np
+
+import pytest
+
+from hdfviewer.widgets.AttributesTable import AttributesTable, attributePreview
+
+
+@pytest.fixture
+def dataset(tmp_path):
+
+    # The attributes larger than 64 kB need the dense attribute storage of the latest file format
+    with h5py.File(tmp_path / "data.h5", "w", libver="latest") as hdf:
+        dataset = hdf.create_dataset("data", data=np.zeros(3))
+        dataset.attrs["units"] = "mm"
+        dataset.attrs["bytes"] = np.bytes_(b"raw \xff")
+        dataset.attrs["scalar"] = 2.5
+        dataset.attrs["array"] = np.arange(100)
+        dataset.attrs["large"] = np.zeros(100000)
+        dataset.attrs["long"] = "x"*1000
+        dataset.attrs["strings"] = np.array(["a", "b"], dtype=h5py.string_dtype())
+        dataset.attrs["manyStrings"] = np.array(["s"]*50, dtype=h5py.string_dtype())
+        dataset.attrs.create("empty", h5py.Empty("f8"))
+
+    with h5py.File(tmp_path / "data.h5", "r") as hdf:
+        yield hdf["data"]
+
+
+def test_attributePreview(dataset):
+
+    assert attributePreview(dataset, "units") == "mm"
+    assert attributePreview(dataset, "bytes") == "raw �"
+    assert attributePreview(dataset, "scalar") == "2.5"
+    assert attributePreview(dataset, "array") == np.array2string(np.arange(100), threshold=20, edgeitems=3)
+    assert attributePreview(dataset, "strings") == "['a' 'b']"
+
+    # The large attributes are not read
+    assert attributePreview(dataset, "large") == "<float64 array of shape (100000,) (800000 bytes), not displayed>"
+    assert attributePreview(dataset, "manyStrings") == "<variable-length array of shape (50,) (50 items), not displayed>"
+
+    assert attributePreview(dataset, "long", maxChars=10) == "x"*10 + "..."
+    assert "Empty" in attributePreview(dataset, "empty")
+
+
+def test_render(dataset):
+
+    table = AttributesTable(dataset, maxBytes=1024)
+
+    assert len(table) == len(dataset.attrs)
+    assert not table.rendered and table.value == ""
+
+    table.render()
+
+    assert table.rendered
+    assert table.value.count("<tr>") == len(dataset.attrs)
+    assert "(800000 bytes), not displayed" in table.value
@@ -0,0 +1,125 @@
+import h5py
+
+import numpy as np
+
+import pytest
+
+from hdfviewer.utils.DatasetComparison import DatasetDiff, compareDatasets, compareFiles
+
+
+def test_fromArrays_identical():
+
+    data = np.arange(12.0).reshape(3, 4)
+
+    diff = DatasetDiff.fromArrays(data, data.copy(), (slice(0, 3), slice(0, 4)))
+
+    assert diff.size == 12
+    assert diff.nDifferentBlocks == diff.nDifferentElements == 0
+    assert diff.maxAbsDifference is None
+
+
+def test_fromArrays_different():
+
+    first = np.arange(12.0).reshape(3, 4)
+    second = first.copy()
+    second[1, 2] += 1e-9
+    second[2, 3] = -5.0
+    second[0, 0] = np.nan
+    first[0, 1] = second[0, 1] = np.nan
+
+    selection = (slice(0, 3), slice(0, 4))
+    diff = DatasetDiff.fromArrays(first, second, selection)
+
+    assert diff.nDifferentElements == np.count_nonzero(~np.isclose(first, second, equal_nan=True))
+    assert diff.maxAbsDifference == pytest.approx(np.nanmax(np.abs(first - second)))
+    assert diff.differentBlocks == [selection]
+
+
+def test_fromArrays_mixed_types():
+
+    first = np.array([0, 255, 7], dtype=np.uint8)
+    second = np.array([0, -1, 7], dtype=np.int16)
+
+    diff = DatasetDiff.fromArrays(first, second, (slice(0, 3),))
+
+    # The difference is not computed in the wrapping unsigned type
+    assert diff.nDifferentElements == 1
+    assert diff.maxAbsDifference == 256.0
+
+
+def test_fromArrays_non_numeric():
+
+    first = np.array([b"a", b"b", b"c"])
+    second = np.array([b"a", b"x", b"y"])
+
+    diff = DatasetDiff.fromArrays(first, second, (slice(0, 3),))
+
+    assert diff.nDifferentElements == 2
+    assert diff.maxAbsDifference is None
+
+
+def test_compareDatasets():
+
+    rng = np.random.default_rng(0)
+    first = rng.random((64, 64))
+
+    assert compareDatasets(first, first.copy()).status == DatasetDiff.IDENTICAL
+    assert compareDatasets(first, first + 1e-12).status == DatasetDiff.WITHIN_TOLERANCE
+    assert compareDatasets(first, first[:32]).status == DatasetDiff.SHAPE_MISMATCH
+    assert compareDatasets(first, first.astype("S8")).status == DatasetDiff.TYPE_MISMATCH
+
+    second = first.copy()
+    second[5:9, 40] = 2.0
+    diff = compareDatasets(first, second, maxWorkers=2)
+
+    assert diff.status == DatasetDiff.DIFFERENT
+    assert diff.size == first.size
+    assert diff.nDifferentElements == np.count_nonzero(~np.isclose(first, second))
+    assert diff.maxAbsDifference == pytest.approx(np.abs(first - second).max())
+
+
+def test_compareFiles(tmp_path):
+
+    rng = np.random.default_rng(1)
+    data = rng.integers(0, 100, size=(100, 30)).astype(np.int32)
+
+    with h5py.File(tmp_path / "first.h5", "w") as hdf:
+        hdf.create_dataset("same", data=data, chunks=(10, 30))
+        hdf.create_dataset("group/changed", data=data, chunks=(10, 30), compression="gzip")
+        hdf.create_dataset("first", data=data)
+
+    changed = data.copy()
+    changed[55, 3] += 1
+
+    with h5py.File(tmp_path / "second.h5", "w") as hdf:
+        hdf.create_dataset("same", data=data)
+        hdf.create_dataset("group/changed", data=changed, chunks=(10, 30))
+        hdf.create_dataset("second", data=data)
+
+    with h5py.File(tmp_path / "first.h5", "r") as first, h5py.File(tmp_path / "second.h5", "r") as second:
+        diffs = {diff.path.strip("/"): diff for diff in compareFiles(first, second)}
+
+    assert diffs["same"].status == DatasetDiff.IDENTICAL
+    assert diffs["group/changed"].status == DatasetDiff.DIFFERENT
+    assert diffs["group/changed"].nDifferentElements == 1
+    assert diffs["group/changed"].nDifferentBlocks == 1
+    assert diffs["first"].status == DatasetDiff.ONLY_IN_FIRST
+    assert diffs["second"].status == DatasetDiff.ONLY_IN_SECOND
+
+
+def test_compareFiles_null_dataspace(tmp_path):
+
+    data = np.arange(20.0)
+
+    for name, value in (("first.h5", 1.0), ("second.h5", 2.0)):
+        with h5py.File(tmp_path / name, "w") as hdf:
+            hdf.create_dataset("empty", data=h5py.Empty("f8"))
+            hdf.create_dataset("emptyOrNot", data=h5py.Empty("f8") if value == 1.0 else data)
+            hdf.create_dataset("data", data=data*value)
+
+    with h5py.File(tmp_path / "first.h5", "r") as first, h5py.File(tmp_path / "second.h5", "r") as second:
+        diffs = {diff.path.strip("/"): diff for diff in compareFiles(first, second)}
+
+    assert diffs["empty"].status == DatasetDiff.IDENTICAL
+    assert diffs["emptyOrNot"].status == DatasetDiff.SHAPE_MISMATCH
+    assert diffs["data"].status == DatasetDiff.DIFFERENT
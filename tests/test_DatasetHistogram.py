@@ -0,0 +1,68 @@
+import h5py
+
+import numpy as np
+
+import pytest
+
+from hdfviewer.utils.DatasetHistogram import DatasetHistogramError, cachedHistogram, datasetHistogram, histogramEdges
+
+
+@pytest.fixture
+def dataset(tmp_path):
+
+    rng = np.random.default_rng(0)
+    data = rng.lognormal(0.0, 2.0, size=(50, 40, 6))
+    data[0, 0, :] = (np.nan, np.inf, -np.inf, 0.0, -1.0, -2.0)
+
+    with h5py.File(tmp_path / "data.h5", "w") as hdf:
+        hdf.create_dataset("data", data=data, chunks=(16, 16, 3), compression="gzip")
+
+    with h5py.File(tmp_path / "data.h5", "r") as hdf:
+        yield hdf["data"]
+
+
+# The mean and the variance of the infinite values are not defined
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+def test_datasetHistogram(dataset):
+
+    data = dataset[()]
+    finite = data[np.isfinite(data)]
+
+    assert cachedHistogram(dataset, 64) is None
+
+    counts, edges = datasetHistogram(dataset, 64, maxWorkers=3)
+
+    expected, expectedEdges = np.histogram(finite, bins=64)
+    assert np.allclose(edges, expectedEdges)
+    assert np.array_equal(counts, expected)
+
+    cached = cachedHistogram(dataset, 64)
+    assert cached is not None and cached[0] is counts
+
+
+# The mean and the variance of the infinite values are not defined
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+def test_datasetHistogram_log(dataset):
+
+    data = dataset[()]
+    finite = data[np.isfinite(data)]
+
+    counts, edges = datasetHistogram(dataset, 32, log=True)
+
+    positive = finite[finite > 0]
+    assert edges[0] == positive.min() and edges[-1] == pytest.approx(positive.max())
+    assert np.allclose(np.diff(np.log(edges)), np.log(edges[1]/edges[0]))
+    assert np.array_equal(counts, np.histogram(finite, bins=edges)[0])
+    assert counts.sum() == positive.size
+
+
+def test_histogramEdges_errors():
+
+    with pytest.raises(DatasetHistogramError):
+        histogramEdges(np.full(10, np.nan))
+
+    with pytest.raises(DatasetHistogramError):
+        histogramEdges(-np.ones(10), log=True)
+
+    # A constant dataset has a non-empty range
+    assert np.array_equal(histogramEdges(np.ones(10), bins=2), [0.5, 1.0, 1.5])
@@ -0,0 +1,95 @@
+import functools
+
+import numpy as np
+
+import pytest
+
+from hdfviewer.utils.DatasetStatistics import StatisticsAccumulator
+
+
+def _merged(blocks):
+
+    return functools.reduce(lambda a, b: a.merge(b), [StatisticsAccumulator.fromArray(block) for block in blocks], StatisticsAccumulator())
+
+
+@pytest.mark.parametrize("dtype", [np.uint8, np.int16, np.float32, np.float64])
+def test_merge(dtype):
+
+    rng = np.random.default_rng(0)
+    data = (rng.normal(50.0, 20.0, size=(37, 41))).clip(0, 255).astype(dtype)
+    data[3, :7] = 0
+
+    # Uneven blocks, including an empty one
+    blocks = [data[:10], data[10:10], data[10:11], data[11:]]
+
+    accumulator = _merged(blocks)
+
+    reference = data.astype(np.float64)
+    assert accumulator.size == accumulator.count == data.size
+    assert accumulator.nanCount == 0
+    assert accumulator.nonZeroCount == np.count_nonzero(data)
+    assert accumulator.min == data.min() and accumulator.max == data.max()
+    assert accumulator.minPositive == data[data > 0].min()
+    assert accumulator.mean == pytest.approx(reference.mean())
+    assert accumulator.std == pytest.approx(reference.std())
+
+
+def test_merge_order():
+
+    rng = np.random.default_rng(1)
+    blocks = [rng.normal(float(i), 1.0 + i, size=100 + 17*i) for i in range(6)]
+
+    forward = _merged(blocks)
+    backward = _merged(blocks[::-1])
+
+    reference = np.concatenate(blocks)
+    for accumulator in (forward, backward):
+        assert accumulator.mean == pytest.approx(reference.mean())
+        assert accumulator.std == pytest.approx(reference.std())
+
+
+def test_merge_nan():
+
+    data = np.array([[1.0, np.nan, -2.0], [np.nan, np.nan, 4.0]])
+
+    accumulator = _merged([data[0], data[1]])
+
+    assert accumulator.size == 6
+    assert accumulator.count == 3
+    assert accumulator.nanCount == 3
+    assert accumulator.min == -2.0 and accumulator.max == 4.0
+    assert accumulator.minPositive == 1.0
+    assert accumulator.mean == pytest.approx(np.nanmean(data))
+    assert accumulator.std == pytest.approx(np.nanstd(data))
+
+
+def test_merge_complex():
+
+    rng = np.random.default_rng(2)
+    data = rng.normal(size=200) + 1j*rng.normal(size=200)
+
+    accumulator = _merged([data[:50], data[50:]])
+
+    assert accumulator.mean == pytest.approx(data.mean())
+    assert accumulator.std == pytest.approx(data.std())
+
+
+def test_empty():
+
+    accumulator = _merged([np.full(4, np.nan)])
+
+    assert accumulator.count == 0
+    assert np.isnan(accumulator.std)
+    assert np.isnan(accumulator.nonZeroFraction)
+
+
+# The mean and the variance of the infinite values are not defined
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+def test_merge_infinite():
+
+    data = np.array([[1.0, np.inf, -2.0], [np.nan, -np.inf, 4.0]])
+
+    accumulator = _merged([data[0], data[1]])
+
+    assert accumulator.min == -np.inf and accumulator.max == np.inf
+    assert accumulator.finiteMin == -2.0 and accumulator.finiteMax == 4.0
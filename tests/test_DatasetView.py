@@ -0,0 +1,70 @@
+import h5py
+
+import numpy as np
+
+import pytest
+
+from hdfviewer.utils.DatasetView import DatasetView
+
+
+@pytest.fixture
+def hdf(tmp_path):
+
+    rng = np.random.default_rng(0)
+    records = np.zeros((1, 20, 1, 30), dtype=[("a", np.float64), ("b", np.int16), ("c", "S4")])
+    records["a"] = rng.random(records.shape)
+    records["b"] = rng.integers(-100, 100, records.shape)
+
+    with h5py.File(tmp_path / "data.h5", "w") as hdf:
+        hdf.create_dataset("records", data=records, chunks=(1, 5, 1, 10), compression="gzip")
+        hdf.create_dataset("data", data=rng.random((1, 16, 12, 1, 5)))
+        hdf.create_dataset("chunked", data=rng.random((16, 12, 5)), chunks=(8, 6, 1), compression="gzip")
+
+    with h5py.File(tmp_path / "data.h5", "r") as hdf:
+        yield hdf
+
+
+@pytest.mark.parametrize("name", ["data", "chunked"])
+@pytest.mark.parametrize("key", [(Ellipsis,), (slice(None), slice(None), 2), (3, slice(2, 9, 3)), (slice(None, None, 5), Ellipsis, 4), (-1,)])
+def test_getitem(hdf, name, key):
+
+    dataset = hdf[name]
+    data = np.squeeze(dataset[()])
+
+    view = DatasetView(dataset)
+
+    assert view.shape == data.shape
+    assert view.ndim == data.ndim
+    assert np.array_equal(view[key], data[key])
+
+
+def test_getitem_errors(hdf):
+
+    with pytest.raises(IndexError):
+        DatasetView(hdf["data"])[0, 0, 0, 0]
+
+
+@pytest.mark.parametrize("field", ["a", "b"])
+def test_field(hdf, field):
+
+    dataset = hdf["records"]
+    data = np.squeeze(dataset.fields(field)[()])
+
+    view = DatasetView(dataset, field=field)
+
+    assert view.field == field
+    assert view.dtype == dataset.dtype[field]
+    assert view.shape == (20, 30)
+    assert np.array_equal(view[2:11, ::4], data[2:11, ::4])
+    assert np.array_equal(np.asarray(view), data)
+
+
+def test_field_array():
+
+    records = np.zeros((4, 5), dtype=[("x", np.float32), ("y", np.uint8)])
+    records["y"] = np.arange(20).reshape(4, 5)
+
+    view = DatasetView(records, field="y")
+
+    assert view.dtype == np.uint8
+    assert np.array_equal(view[1:3, :], records["y"][1:3, :])
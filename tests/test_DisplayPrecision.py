@@ -0,0 +1,69 @@
+import numpy as np
+
+import pytest
+
+from hdfviewer.utils.DisplayPrecision import DisplayPrecisionError, QuantizedFrame, displayFrame, displayType, reduceFrame, restoreFrame
+
+
+def test_QuantizedFrame():
+
+    rng = np.random.default_rng(0)
+    data = rng.normal(100.0, 30.0, size=(50, 60))
+    data[0, :3] = (np.nan, np.inf, -np.inf)
+
+    frame = QuantizedFrame.fromArray(data)
+
+    assert frame.data.dtype == np.uint16
+    assert frame.nbytes == data.size*2
+
+    restored = frame.toArray()
+    finite = np.isfinite(data)
+    # The finite values are restored within half the scale (up to the float32 rounding)
+    tolerance = 0.5*frame.scale + np.abs(data[finite]).max()*np.finfo(np.float32).eps*4
+    assert np.all(np.abs(restored[finite] - data[finite]) <= tolerance)
+    assert np.isnan(restored[0, 0])
+    # The infinite values are clipped to the extrema of the finite ones
+    assert restored[0, 1] == pytest.approx(data[finite].max(), abs=tolerance)
+    assert restored[0, 2] == pytest.approx(data[finite].min(), abs=tolerance)
+
+
+@pytest.mark.parametrize("data", [np.full((4, 4), 7.0), np.full((4, 4), np.nan)])
+def test_QuantizedFrame_constant(data):
+
+    assert np.array_equal(QuantizedFrame.fromArray(data).toArray(), data.astype(np.float32), equal_nan=True)
+
+
+@pytest.mark.parametrize("dtype, precision, expected", [(np.float64, "full", None),
+                                                        (np.float64, "float32", np.float32),
+                                                        (np.float64, "uint16", np.uint16),
+                                                        (np.int32, "float32", None),
+                                                        (np.int32, "uint16", np.uint16),
+                                                        (np.uint16, "uint16", None),
+                                                        (np.int8, "float32", None)])
+def test_reduceFrame(dtype, precision, expected):
+
+    data = np.arange(100).reshape(10, 10).astype(dtype)
+
+    assert displayType(dtype, precision) == (None if expected is None else np.dtype(expected))
+
+    reduced = reduceFrame(data, precision)
+    if expected is None:
+        assert reduced is data
+    elif expected == np.uint16:
+        assert isinstance(reduced, QuantizedFrame)
+    else:
+        assert reduced.dtype == expected
+
+    assert np.allclose(restoreFrame(reduced), data, atol=0.5*getattr(reduced, "scale", 0.0))
+
+
+def test_displayFrame():
+
+    data = np.linspace(0.0, 1.0, 64).reshape(8, 8)
+
+    # The displayed frames are never quantized
+    assert displayFrame(data, "uint16").dtype == np.float32
+    assert displayFrame(data, "full") is data
+
+    with pytest.raises(DisplayPrecisionError):
+        reduceFrame(data, "float16")
@@ -0,0 +1,90 @@
+import os
+import threading
+
+import h5py
+
+import numpy as np
+
+import pytest
+
+import hdfviewer.utils.FileHandlePool as FileHandlePoolModule
+from hdfviewer.utils.FileHandlePool import FileHandlePool, FileHandlePoolError, linkTargetFilename
+
+
+@pytest.fixture
+def files(tmp_path):
+
+    with h5py.File(tmp_path / "target.h5", "w") as hdf:
+        hdf.create_dataset("entry/data", data=np.arange(12).reshape(3, 4))
+
+    os.mkdir(tmp_path / "links")
+    with h5py.File(tmp_path / "links" / "main.h5", "w") as hdf:
+        hdf["relative"] = h5py.ExternalLink("../target.h5", "/entry/data")
+        hdf["absolute"] = h5py.ExternalLink(str(tmp_path / "target.h5"), "/entry")
+        hdf["missingFile"] = h5py.ExternalLink("missing.h5", "/entry/data")
+        hdf["missingObject"] = h5py.ExternalLink("../target.h5", "/entry/missing")
+        hdf["self"] = h5py.ExternalLink(".", "/local")
+        hdf.create_dataset("local", data=np.ones(3))
+        hdf["soft"] = h5py.SoftLink("/local")
+
+    pool = FileHandlePool(timeout=2.0)
+
+    with h5py.File(tmp_path / "links" / "main.h5", "r") as hdf:
+        yield hdf, pool
+        pool.close()
+
+
+def test_linkTargetFilename(files):
+
+    hdf, _ = files
+    directory = os.path.dirname(os.path.abspath(hdf.filename))
+
+    assert linkTargetFilename(hdf, ".") == [hdf.filename]
+    assert linkTargetFilename(hdf, "/data/file.h5") == ["/data/file.h5"]
+    assert linkTargetFilename(hdf, "file.h5") == [os.path.join(directory, "file.h5"), os.path.abspath("file.h5")]
+
+
+def test_resolveExternalLink(files):
+
+    hdf, pool = files
+
+    data = pool.resolveExternalLink(hdf, "relative")
+    assert np.array_equal(data[()], np.arange(12).reshape(3, 4))
+    assert isinstance(pool.resolveExternalLink(hdf, "absolute"), h5py.Group)
+    assert np.array_equal(pool.resolveExternalLink(hdf, "self")[()], np.ones(3))
+
+    # The target file is kept open
+    assert pool.open(data.file.filename) is pool.open(data.file.filename)
+    assert pool.open(data.file.filename).id == data.file.id
+
+
+@pytest.mark.parametrize("name", ["missingFile", "missingObject", "soft", "local"])
+def test_resolveExternalLink_errors(files, name):
+
+    hdf, pool = files
+
+    with pytest.raises(FileHandlePoolError):
+        pool.resolveExternalLink(hdf, name)
+
+
+def test_check(files, tmp_path):
+
+    _, pool = files
+
+    assert pool.check(str(tmp_path / "target.h5")) is None
+    assert pool.check(str(tmp_path / "missing.h5")) is not None
+
+
+def test_check_timeout(monkeypatch, tmp_path):
+
+    release = threading.Event()
+    monkeypatch.setattr(FileHandlePoolModule, "_checkFile", lambda filename: release.wait(10))
+
+    pool = FileHandlePool(timeout=0.05)
+
+    # A stalled filesystem makes the check time out instead of blocking
+    assert "0.05 s" in pool.check(str(tmp_path / "stalled.h5"))
+    with pytest.raises(FileHandlePoolError):
+        pool.open(str(tmp_path / "stalled.h5"))
+
+    release.set()
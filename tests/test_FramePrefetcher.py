@@ -0,0 +1,76 @@
+import collections
+import threading
+
+import numpy as np
+
+from hdfviewer.utils.FramePrefetcher import FramePrefetcher
+
+
+class _CountingDataset(object):
+    """A 3D array counting the reads of each frame.
+    """
+
+    def __init__(self, data):
+
+        self._data = data
+
+        self._lock = threading.Lock()
+
+        self.reads = collections.Counter()
+
+    def __getitem__(self, key):
+
+        with self._lock:
+            self.reads[key[-1]] += 1
+
+        return self._data[key]
+
+    @property
+    def shape(self):
+
+        return self._data.shape
+
+
+def _dataset():
+
+    return _CountingDataset(np.arange(6*7*20, dtype=np.float64).reshape(6, 7, 20))
+
+
+def test_get():
+
+    dataset = _dataset()
+    prefetcher = FramePrefetcher(dataset, region=(slice(1, 5), slice(0, 7, 2)), convert=np.float32)
+
+    prefetcher.prefetch(range(3, 6))
+
+    for frame in range(3, 6):
+        data = prefetcher.get(frame)
+        assert data.dtype == np.float32
+        assert np.array_equal(data, dataset._data[1:5, 0:7:2, frame])
+
+    # A frame outside of the window is read synchronously
+    assert np.array_equal(prefetcher.get(10), dataset._data[1:5, 0:7:2, 10])
+
+    prefetcher.shutdown()
+
+
+def test_window():
+
+    dataset = _dataset()
+    prefetcher = FramePrefetcher(dataset)
+
+    prefetcher.prefetch(range(0, 4))
+    for frame in range(0, 4):
+        prefetcher.get(frame)
+    assert all(dataset.reads[frame] == 1 for frame in range(0, 4))
+
+    # The frames kept in the window are not read again, the ones out of the window are dropped
+    prefetcher.prefetch(range(2, 6))
+    for frame in range(2, 6):
+        assert np.array_equal(prefetcher.get(frame), dataset._data[:, :, frame])
+    assert [dataset.reads[frame] for frame in range(0, 6)] == [1]*6
+
+    prefetcher.get(0)
+    assert dataset.reads[0] == 2
+
+    prefetcher.shutdown()
@@ -0,0 +1,70 @@
+import h5py
+
+import numpy as np
+
+import pytest
+
+from hdfviewer.utils.FrameProjection import FrameProjectionError, ProjectionAccumulator, cachedProjection, frameProjection, projectionStreamer
+
+
+@pytest.fixture
+def data():
+
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(30, 20, 13))
+    data[4, 5, :] = np.nan
+    data[6, 7, 3] = np.nan
+
+    return data
+
+
+@pytest.mark.filterwarnings("ignore:All-NaN slice encountered")
+@pytest.mark.parametrize("chunks", [(30, 20, 13), (7, 6, 5)])
+def test_frameProjection(tmp_path, data, chunks):
+
+    with h5py.File(tmp_path / "data.h5", "w") as hdf:
+        hdf.create_dataset("data", data=data, chunks=chunks)
+
+    with h5py.File(tmp_path / "data.h5", "r") as hdf:
+        dataset = hdf["data"]
+        projections = {name: frameProjection(dataset, name, maxWorkers=3) for name in ("sum", "max", "mean")}
+
+    # The sums and means propagate NaN while the maxima ignore it
+    assert np.allclose(projections["sum"], data.sum(axis=2), equal_nan=True)
+    assert np.allclose(projections["mean"], data.mean(axis=2), equal_nan=True)
+    assert np.allclose(projections["max"], np.nanmax(data, axis=2), equal_nan=True)
+
+
+def test_float32(data):
+
+    accumulator = projectionStreamer(data, dtype=np.float32).run()
+
+    assert accumulator.sum.dtype == np.float32
+    assert np.allclose(accumulator.projection("mean"), data.mean(axis=2), equal_nan=True, atol=1e-6)
+    assert cachedProjection(data, np.float32) is None
+
+
+def test_cachedProjection(tmp_path, data):
+
+    with h5py.File(tmp_path / "data.h5", "w") as hdf:
+        hdf.create_dataset("data", data=data, chunks=(10, 10, 13))
+
+    with h5py.File(tmp_path / "data.h5", "r") as hdf:
+        assert cachedProjection(hdf["data"]) is None
+        accumulator = projectionStreamer(hdf["data"]).run()
+        assert cachedProjection(hdf["data"]) is accumulator
+
+
+def test_merge_regions(data):
+
+    shape = data.shape[:2]
+    blocks = [(slice(0, 10), slice(0, 20), slice(None)), (slice(10, 30), slice(0, 8), slice(None)), (slice(10, 30), slice(8, 20), slice(None))]
+
+    accumulator = ProjectionAccumulator.fromArray(data[blocks[0]], blocks[0], shape)
+    for block in blocks[1:]:
+        accumulator = accumulator.merge(ProjectionAccumulator.fromArray(data[block], block, shape))
+
+    assert np.allclose(accumulator.projection("sum"), data.sum(axis=2), equal_nan=True)
+
+    with pytest.raises(FrameProjectionError):
+        accumulator.projection("median")
@@ -0,0 +1,75 @@
+import re
+
+import h5py
+
+import numpy as np
+
+import pytest
+
+from hdfviewer.utils.HDFReport import HDFReportError, writeReport
+
+
+@pytest.fixture
+def filename(tmp_path):
+
+    filename = str(tmp_path / "data.h5")
+
+    with h5py.File(filename, "w") as hdf:
+        hdf.attrs["title"] = "report test"
+        group = hdf.create_group("entry")
+        group.attrs["units"] = "mm"
+        group.create_dataset("image", data=np.arange(40*30, dtype=np.float64).reshape(40, 30), chunks=(10, 10), compression="gzip")
+        group.create_dataset("stack", data=np.ones((16, 12, 5), dtype=np.uint16))
+        group.create_dataset("line", data=np.linspace(0.0, 1.0, 1000))
+        group.create_dataset("scalar", data="hello")
+        group.create_dataset("empty", data=h5py.Empty("f8"))
+        group.create_dataset("noElement", shape=(0, 3), dtype=np.int32)
+        group.create_dataset("records", data=np.zeros(4, dtype=[("a", np.int32), ("b", np.float64)]))
+        hdf["hard"] = group["image"]
+        hdf["soft"] = h5py.SoftLink("/entry/image")
+        hdf["external"] = h5py.ExternalLink("missing.h5", "/data")
+
+    return filename
+
+
+def _sections(report):
+
+    return dict(re.findall(r"<section class='dataset' id='([^']*)'>(.*?)</section>", report))
+
+
+@pytest.mark.parametrize("maxWorkers", [0, 2])
+def test_writeReport(tmp_path, filename, maxWorkers):
+
+    output = str(tmp_path / "report.html")
+    progress = []
+
+    nDatasets = writeReport(filename, output, maxWorkers=maxWorkers, memoryBudget=1024, progress=lambda n, total: progress.append((n, total)))
+
+    with open(output) as f:
+        report = f.read()
+
+    sections = _sections(report)
+
+    # The links are listed without being followed and the hard links are described once
+    assert nDatasets == 7
+    assert sorted(sections) == ["/entry/empty", "/entry/image", "/entry/line", "/entry/noElement", "/entry/records", "/entry/scalar", "/entry/stack"]
+    assert progress == [(n, 7) for n in range(1, 8)]
+    assert "(soft link)" in report and "(external link)" in report and "(hard link)" in report
+    assert "report test" in report and "mm" in report
+
+    assert "Error" not in report
+    assert "<img" in sections["/entry/image"] and "<img" in sections["/entry/stack"]
+    assert "<svg" in sections["/entry/line"]
+    assert "hello" in sections["/entry/scalar"]
+    assert "Dimension: None" in sections["/entry/empty"]
+    assert "Filters: gzip" in sections["/entry/image"]
+
+    # The statistics are computed block by block within the memory budget
+    assert "Mean: %s" % np.arange(40*30, dtype=np.float64).mean() in sections["/entry/image"]
+    assert "Maximum: %s" % (40*30 - 1.0) in sections["/entry/image"]
+
+
+def test_writeReport_missing_file(tmp_path):
+
+    with pytest.raises(HDFReportError):
+        writeReport(str(tmp_path / "missing.h5"), str(tmp_path / "report.html"))
@@ -0,0 +1,107 @@
+import itertools
+
+import h5py
+
+import numpy as np
+
+import pytest
+
+from hdfviewer.utils.IOAccounting import IOAccounting, chunksTouched, compressionRatio, datasetFilters, frameReadCost
+
+
+def _chunksTouched(shape, chunks, key):
+    """Count the chunks holding at least one selected element, element by element.
+    """
+
+    selected = np.zeros(shape, dtype=bool)
+    selected[key] = True
+
+    return sum(1 for index in itertools.product(*[range(-(-n//c)) for n, c in zip(shape, chunks)])
+               if selected[tuple(slice(i*c, (i + 1)*c) for i, c in zip(index, chunks))].any())
+
+
+@pytest.mark.parametrize("key", [(slice(None), slice(None), 0),
+                                 (slice(3, 17), 5, slice(2, 19, 3)),
+                                 (slice(None, None, 9), slice(1, None, 5), slice(None, None, 4)),
+                                 (slice(None, None, -3), slice(None), 7),
+                                 (slice(5, 5), slice(None), 0)])
+def test_chunksTouched(key):
+
+    shape, chunks = (20, 30, 25), (8, 6, 5)
+
+    assert chunksTouched(shape, chunks, key) == _chunksTouched(shape, chunks, key)
+
+
+def test_chunksTouched_fancy():
+
+    assert chunksTouched((4, 4), (2, 2), ([0, 1], slice(None))) is None
+
+
+@pytest.fixture
+def hdf(tmp_path):
+
+    data = np.zeros((64, 32, 10), dtype=np.float32)
+    data[:, :, 5] = 1.0
+
+    with h5py.File(tmp_path / "data.h5", "w") as hdf:
+        hdf.create_dataset("contiguous", data=data)
+        hdf.create_dataset("chunked", data=data, chunks=(16, 32, 4))
+        hdf.create_dataset("compressed", data=data, chunks=(16, 32, 4), compression="gzip", shuffle=True)
+
+    with h5py.File(tmp_path / "data.h5", "r") as hdf:
+        yield hdf
+
+
+def test_frameReadCost(hdf):
+
+    cost = frameReadCost(hdf["contiguous"], 2)
+    assert cost == {"frameBytes": 64*32*4, "chunks": 64*32, "bytesRead": 64*32*4, "amplification": 1.0}
+
+    cost = frameReadCost(hdf["chunked"], 2)
+    assert cost["frameBytes"] == 64*32*4
+    assert cost["chunks"] == 4
+    assert cost["bytesRead"] == 4*16*32*4*4
+    assert cost["amplification"] == 4.0
+
+    # A frame along the first axis crosses a single row of chunks
+    cost = frameReadCost(hdf["chunked"], 0)
+    assert cost["chunks"] == 3
+    assert cost["amplification"] == pytest.approx(3*16*32*4/(32*10))
+
+
+def test_compressionRatio(hdf):
+
+    dataset = hdf["compressed"]
+
+    assert datasetFilters(dataset) == ["shuffle", "gzip"]
+    assert datasetFilters(hdf["chunked"]) == []
+    assert compressionRatio(hdf["chunked"]) == 1.0
+    assert compressionRatio(dataset) == pytest.approx(dataset.id.get_storage_size()/(dataset.size*4))
+    assert compressionRatio(dataset) < 0.5
+
+    cost = frameReadCost(dataset, 2)
+    assert cost["bytesRead"] == int(4*16*32*4*4*compressionRatio(dataset))
+
+
+def test_record(hdf):
+
+    accounting = IOAccounting()
+
+    dataset = hdf["chunked"]
+    key = (slice(None), slice(None), 5)
+
+    with accounting.interaction("frame"):
+        accounting.record(dataset, key, dataset[key], 0.5)
+    accounting.record(dataset, key, dataset[key], 0.25, lastRead=(4, 2, 1000))
+    accounting.record(np.zeros(3), (slice(None),), np.zeros(3), 1.0)
+
+    statistics = accounting.datasetStatistics(dataset)
+    assert statistics.reads == 2
+    assert statistics.bytesSelected == 2*64*32*4
+    assert statistics.chunksTouched == 8
+    assert statistics.chunksDecompressed == 2
+    assert statistics.bytesRead == 4*16*32*4*4 + 1000
+    assert statistics.seconds == 0.75
+
+    assert accounting.interactionStatistics("frame").reads == 1
+    assert set(accounting.interactions) == {"frame", "background"}
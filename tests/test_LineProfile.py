@@ -0,0 +1,66 @@
+import threading
+
+import numpy as np
+
+import pytest
+
+from hdfviewer.utils.LineProfile import Kymograph, lineProfile
+
+
+def test_lineProfile_axis_aligned():
+
+    frame = np.arange(20*30, dtype=np.float64).reshape(20, 30)
+
+    distances, profile = lineProfile(frame, (5, 2), (5, 12))
+
+    # The sampling points fall on the pixels of the row
+    assert distances[0] == 0.0 and distances[-1] == 10.0
+    assert np.allclose(profile, np.interp(2 + distances, np.arange(30), frame[5]))
+
+
+def test_lineProfile_linear_frame():
+
+    rows, cols = np.mgrid[0:40, 0:40]
+    frame = 2.0*rows + 3.0*cols
+
+    distances, profile = lineProfile(frame, (3.5, 4.0), (30.0, 25.5), width=3)
+
+    # The bilinear interpolation of a linear frame is exact, as is the average over the width of the line
+    t = distances/distances[-1]
+    expected = 2.0*(3.5 + t*(30.0 - 3.5)) + 3.0*(4.0 + t*(25.5 - 4.0))
+    assert np.allclose(profile, expected)
+
+
+@pytest.mark.parametrize("start, end, width", [((2, 3), (30, 40), 1), ((10.5, 0), (10.5, 47), 3), ((-5, -5), (20, 60), 1), ((31, 5), (0, 20), 5)])
+@pytest.mark.parametrize("frames", [None, slice(2, 15, 3)])
+def test_kymograph(start, end, width, frames):
+
+    rng = np.random.default_rng(0)
+    data = rng.random((32, 48, 17))
+
+    # Small blocks so that the frames are read over several blocks
+    kymograph = Kymograph(data, start, end, width, frames, targetBytes=4096)
+
+    result = kymograph.run()
+
+    frameIndexes = range(*(frames or slice(None)).indices(data.shape[2]))
+    assert list(kymograph.frames) == list(frameIndexes)
+    assert result.shape == (len(kymograph.distances), len(frameIndexes))
+
+    for column, frame in enumerate(frameIndexes):
+        distances, profile = lineProfile(data[:, :, frame], start, end, width)
+        assert np.allclose(kymograph.distances, distances)
+        assert np.allclose(result[:, column], profile, equal_nan=True)
+
+
+def test_kymograph_background():
+
+    data = np.arange(8*8*6, dtype=np.float64).reshape(8, 8, 6)
+
+    done = threading.Event()
+    kymograph = Kymograph(data, (1, 1), (6, 6))
+    kymograph.start(lambda k: done.set())
+
+    assert done.wait(10)
+    assert kymograph.error is None
+    assert np.allclose(kymograph.kymograph, np.stack([lineProfile(data[:, :, f], (1, 1), (6, 6))[1] for f in range(6)], axis=1))
@@ -0,0 +1,71 @@
+import numpy as np
+
+import pytest
+
+from hdfviewer.utils.MemoryBudget import estimateBytes, frameSlice, previewSlices, previewStride, sampledCoordinates, sampledIndex
+
+
+@pytest.mark.parametrize("shape, dtype, memoryBudget", [((100, 100), np.uint8, 10**6),
+                                                        ((1000, 1000), np.float64, 10**6),
+                                                        ((4097, 3), np.int16, 1000),
+                                                        ((50, 60, 70), np.float32, 12345),
+                                                        ((10**6,), np.uint8, 1)])
+def test_previewStride(shape, dtype, memoryBudget):
+
+    stride = previewStride(shape, dtype, memoryBudget)
+
+    # The strided selection fits in the budget and is the least sampled one to do so
+    preview = np.empty(shape, dtype=np.bool_)[tuple(slice(None, None, stride) for _ in shape)]
+    assert estimateBytes(preview.shape, dtype) <= memoryBudget
+    if stride > 1:
+        coarser = np.empty(shape, dtype=np.bool_)[tuple(slice(None, None, stride - 1) for _ in shape)]
+        assert estimateBytes(coarser.shape, dtype) > memoryBudget
+
+
+def test_previewStride_fits():
+
+    assert previewStride((100, 100), np.float64, 80000) == 1
+    assert previewStride((), np.float64, 0) == 1
+
+
+def test_previewSlices():
+
+    region = (slice(10, 1010), slice(0, 500))
+
+    slices = previewSlices(region, np.float64, 10**5)
+
+    assert [(s.start, s.stop) for s in slices] == [(10, 1010), (0, 500)]
+    assert slices[0].step == slices[1].step == previewStride((1000, 500), np.float64, 10**5)
+
+
+@pytest.mark.parametrize("sampling", [slice(0, 1000, 1), slice(0, 1000, 7), slice(13, 990, 4)])
+@pytest.mark.parametrize("region", [slice(0, 1000), slice(100, 200), slice(101, 102), slice(0, 1), slice(985, 1000)])
+def test_frameSlice(sampling, region):
+
+    coordinates = np.arange(1000)[sampling]
+
+    sampledSlice = frameSlice(region, sampling, len(coordinates))
+
+    selected = coordinates[sampledSlice]
+    assert np.array_equal(sampledCoordinates(sampledSlice, sampling), selected)
+    assert selected.size >= 1
+
+    # All the sampled coordinates inside the region are selected
+    inside = coordinates[(coordinates >= region.start) & (coordinates < region.stop)]
+    assert set(inside) <= set(selected)
+
+    # The selection does not go beyond the neighbouring samples of the region
+    step = sampling.step
+    assert selected[0] <= max(region.start, coordinates[0])
+    assert selected[-1] < region.stop + step or selected.size == 1
+
+
+@pytest.mark.parametrize("sampling", [slice(0, 100, 1), slice(0, 100, 7), slice(13, 90, 4)])
+def test_sampledIndex(sampling):
+
+    coordinates = np.arange(100)[sampling]
+
+    for index in range(100):
+        sampledIndexes = np.flatnonzero(coordinates == index)
+        expected = int(sampledIndexes[0]) if sampledIndexes.size else None
+        assert sampledIndex(index, sampling, len(coordinates)) == expected
@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+import pytest
+
+from hdfviewer.viewers.MplDataViewer import MplDataViewerError, _viewerClass, numericFields
+
+srcDirectory = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src")
+
+# The dependencies which should only be imported when a dataset is displayed (see scripts/benchmark_import)
+heavyDependencies = ["matplotlib", "matplotlib.pyplot", "webbrowser", "hdfviewer.viewers.MplDataViewer2D", "hdfviewer.viewers.MplDataViewer3D"]
+
+
+def importedDependencies(module):
+
+    code = "import sys\nimport {}\nprint(','.join(m for m in {!r} if m in sys.modules))".format(module, heavyDependencies)
+    env = dict(os.environ, PYTHONPATH=srcDirectory)
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env).stdout.strip()
+
+    return output.split(",") if output else []
+
+
+@pytest.mark.parametrize("module", ["hdfviewer", "hdfviewer.utils.DatasetView", "hdfviewer.viewers.MplDataViewer"])
+def test_import_lazy(module):
+
+    assert importedDependencies(module) == []
+
+
+@pytest.mark.parametrize("backend,ndim,name", [("matplotlib", 2, "_MplDataViewer2D"),
+                                               ("matplotlib", 3, "_MplDataViewer3D"),
+                                               ("numpy", 2, "_NpDataViewer2D"),
+                                               ("numpy", 3, "_NpDataViewer3D")])
+def test_viewerClass(backend, ndim, name):
+
+    assert _viewerClass(backend, ndim).__name__ == name
+
+
+def test_numericFields():
+
+    dtype = np.dtype([("a", np.float32), ("b", "S4"), ("c", np.int16, (3,))])
+
+    assert numericFields(dtype) == ["a", "c"]
+    assert numericFields(np.dtype(np.float64)) == []
+
+
+@pytest.mark.parametrize("shape,options", [((4, 4), {"histogram": True}),
+                                           ((4, 4), {"displayPrecision": "float16"}),
+                                           ((3, 4, 4), {"playbackFps": 25}),
+                                           ((3, 4, 4), {"colorScope": "dataset"})])
+def test_unsupported_options(shape, options):
+
+    from hdfviewer.viewers.MplDataViewer import MplDataViewer
+
+    with pytest.raises(MplDataViewerError):
+        MplDataViewer(np.zeros(shape), backend="numpy", **options)
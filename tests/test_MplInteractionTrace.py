@@ -0,0 +1,75 @@
+import json
+
+import numpy as np
+
+import pytest
+
+from hdfviewer.viewers.MplInteractionTrace import InteractionTrace, MplInteractionTraceError, latencySummary, replayTrace
+
+
+@pytest.fixture
+def trace():
+
+    events = [{"name": "scroll_event", "t": 0.01*i, "axes": None, "x": 100, "y": 100, "xdata": None, "ydata": None, "button": "up", "step": 1}
+              for i in range(5)]
+    events.append({"name": "key_press_event", "t": 0.06, "axes": None, "x": 1, "y": 1, "xdata": None, "ydata": None, "key": "right"})
+
+    return InteractionTrace(events, {"shape": [20, 16, 8], "options": {"standAlone": True, "field": None, "backend": "matplotlib", "histogram": True}})
+
+
+def test_save_load(tmp_path, trace):
+
+    filename = str(tmp_path / "trace.json")
+
+    trace.save(filename)
+    loaded = InteractionTrace.load(filename)
+
+    assert len(loaded) == len(trace)
+    assert loaded.events == trace.events
+    assert loaded.metadata == trace.metadata
+
+
+def test_load_invalid(tmp_path):
+
+    filename = str(tmp_path / "trace.json")
+    with open(filename, "w") as f:
+        json.dump([1, 2, 3], f)
+
+    with pytest.raises(MplInteractionTraceError):
+        InteractionTrace.load(filename)
+
+
+def test_latencySummary():
+
+    latencies = [0.01, 0.02, 0.03, 0.04, 0.5]
+    replayed = [{"name": "scroll_event", "t": 0.0, "latency": latency} for latency in latencies] + [{"name": "flush", "t": 1.0, "latency": 0.2}]
+
+    summary = latencySummary(replayed)
+
+    assert summary["flush"] == {"count": 1, "mean": 0.2, "median": 0.2, "p95": 0.2, "max": 0.2}
+    assert summary["scroll_event"]["count"] == 5
+    assert summary["scroll_event"]["mean"] == pytest.approx(np.mean(latencies))
+    assert summary["scroll_event"]["median"] == pytest.approx(0.03)
+    assert summary["scroll_event"]["p95"] == pytest.approx(np.percentile(latencies, 95))
+    assert summary["scroll_event"]["max"] == 0.5
+
+
+@pytest.mark.parametrize("realTime", [False, True])
+def test_replayTrace(trace, realTime):
+
+    data = np.random.default_rng(0).random((20, 1, 16, 8))
+
+    replayed = replayTrace(trace, data, realTime=realTime, histogram=False)
+
+    names = [event["name"] for event in replayed if event["name"] != "flush"]
+    assert names == [event["name"] for event in trace.events]
+    assert all(event["latency"] >= 0.0 for event in replayed)
+    if realTime:
+        times = [event["t"] for event in replayed if event["name"] != "flush"]
+        assert all(t >= event["t"] for t, event in zip(times, trace.events))
+
+
+def test_replayTrace_shape(trace):
+
+    with pytest.raises(MplInteractionTraceError):
+        replayTrace(trace, np.zeros((20, 16)))
@@ -0,0 +1,79 @@
+import h5py
+
+import numpy as np
+
+import pytest
+
+from hdfviewer.utils.DatasetView import DatasetView
+from hdfviewer.viewers.MplDataViewer import MplDataViewer
+from hdfviewer.viewers.MplLiveMonitor import _MplLiveMonitor
+
+
+@pytest.fixture
+def swmrFile(tmp_path):
+
+    filename = str(tmp_path / "live.h5")
+
+    writer = h5py.File(filename, "w", libver="latest")
+    writer.create_dataset("x", data=np.arange(10.0), maxshape=(None,), chunks=(10,))
+    writer.create_dataset("stack", data=np.random.default_rng(0).random((8, 6, 3)), maxshape=(8, 6, None), chunks=(8, 6, 1))
+    writer.swmr_mode = True
+
+    reader = h5py.File(filename, "r", swmr=True)
+
+    yield writer, reader
+
+    reader.close()
+    writer.close()
+
+
+def test_poll(headless, swmrFile):
+
+    writer, reader = swmrFile
+
+    shapes = []
+    monitor = _MplLiveMonitor(headless.figure(), DatasetView(reader["x"]), lambda previous, shape: shapes.append((previous, shape)))
+    monitor.start()
+    assert monitor.running
+
+    monitor.poll()
+    assert shapes == []
+
+    writer["x"].resize((15,))
+    writer["x"][10:] = np.arange(10.0, 15.0)
+    writer["x"].flush()
+
+    monitor.poll()
+    monitor.poll()
+    assert shapes == [((10,), (15,))]
+
+
+def test_poll_closed(headless, swmrFile):
+
+    _, reader = swmrFile
+
+    figure = headless.figure()
+    monitor = _MplLiveMonitor(figure, DatasetView(reader["x"]), lambda previous, shape: None)
+    monitor.start()
+
+    headless.close(figure)
+    monitor.poll()
+
+    assert not monitor.running
+
+
+def test_viewer_appended_frames(headless, swmrFile):
+
+    writer, reader = swmrFile
+
+    viewer = MplDataViewer(reader["stack"], live=True).viewer
+    assert viewer.liveMonitor.running
+
+    writer["stack"].resize((8, 6, 5))
+    writer["stack"][:, :, 3:] = 7.0
+    writer["stack"].flush()
+
+    viewer.liveMonitor.poll()
+    viewer.setSelectedFrame(4)
+
+    assert np.all(viewer._frame == 7.0)
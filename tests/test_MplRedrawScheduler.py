@@ -0,0 +1,57 @@
+import time
+
+import pytest
+
+from hdfviewer.utils.IOAccounting import ioAccounting
+from hdfviewer.viewers.MplRedrawScheduler import _MplRedrawScheduler
+
+
+@pytest.fixture
+def figure(headless):
+
+    return headless.figure()
+
+
+def test_request_isolated(figure):
+
+    scheduler = _MplRedrawScheduler(figure, maxRate=30)
+    applied = []
+
+    scheduler.request("frame", lambda: applied.append(1))
+
+    assert applied == [1]
+    assert scheduler.pending == []
+    assert scheduler.nextDue() is None
+
+
+def test_request_burst(figure):
+
+    scheduler = _MplRedrawScheduler(figure, maxRate=0.1)
+    applied = []
+
+    scheduler.request("frame", lambda: applied.append(("frame", 0)))
+    for frame in range(1, 10):
+        scheduler.request("frame", lambda frame=frame: applied.append(("frame", frame)))
+    scheduler.request("limits", lambda: applied.append(("limits", None)))
+
+    # Only the latest request per name is kept until the figure timer fires
+    assert applied == [("frame", 0)]
+    assert scheduler.pending == ["frame", "limits"]
+    assert scheduler.nextDue() > time.perf_counter()
+
+    scheduler.flush()
+
+    assert applied == [("frame", 0), ("frame", 9), ("limits", None)]
+    assert scheduler.pending == []
+
+
+def test_flush_interaction(figure):
+
+    scheduler = _MplRedrawScheduler(figure, maxRate=0.1)
+    scheduler.flush()
+
+    interactions = []
+    scheduler.request("frame", lambda: interactions.append(getattr(ioAccounting._local, "interaction", None)))
+    scheduler.flush()
+
+    assert interactions == ["frame"]
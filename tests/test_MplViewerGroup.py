@@ -0,0 +1,84 @@
+import h5py
+
+import numpy as np
+
+import pytest
+
+from hdfviewer.viewers.MplDataViewer import MplDataViewer
+from hdfviewer.viewers.MplViewerGroup import MplViewerGroup, MplViewerGroupError
+
+
+@pytest.fixture
+def viewers(headless, tmp_path):
+
+    rng = np.random.default_rng(0)
+
+    with h5py.File(str(tmp_path / "group.h5"), "w") as f:
+        raw = f.create_dataset("raw", data=rng.random((32, 24, 10)), chunks=(32, 24, 1))
+        corrected = f.create_dataset("corrected", data=rng.random((32, 24, 10)), chunks=(32, 24, 1))
+
+        yield [MplDataViewer(raw).viewer, MplDataViewer(corrected).viewer, MplDataViewer(rng.random((32, 24))).viewer]
+
+
+def test_group_invalid(viewers):
+
+    with pytest.raises(MplViewerGroupError):
+        MplViewerGroup([])
+
+    MplViewerGroup(viewers)
+    with pytest.raises(MplViewerGroupError):
+        MplViewerGroup(viewers[:1])
+
+
+def test_sync_frame(viewers):
+
+    raw, corrected, _ = viewers
+    group = MplViewerGroup(viewers)
+
+    raw._requestFrame(5)
+    raw._requestFrame(7)
+    group._scheduler.flush()
+
+    assert raw._selectedFrame == corrected._selectedFrame == 7
+    np.testing.assert_array_equal(corrected._frame, corrected._dataset[:, :, 7])
+
+    corrected.setSelectedFrame(3)
+
+    assert raw._selectedFrame == 3
+    np.testing.assert_array_equal(raw._frame, raw._dataset[:, :, 3])
+
+
+def test_sync_limits_pixel(viewers):
+
+    raw, corrected, image = viewers
+    MplViewerGroup(viewers)
+
+    raw._mainAxes.set_xlim(5, 20)
+    raw._mainAxes.set_ylim(3, 30)
+
+    assert corrected._mainAxes.get_xlim() == pytest.approx((5, 20))
+    assert image._mainAxes.get_ylim() == pytest.approx((3, 30))
+
+    image.selectPixel(10, 11)
+
+    assert raw._selectedPixel == corrected._selectedPixel == image._selectedPixel
+
+
+def test_unlink(viewers):
+
+    raw, corrected, _ = viewers
+    group = MplViewerGroup(viewers)
+    group.unlink()
+
+    raw._requestFrame(4)
+    raw._redrawScheduler.flush()
+
+    assert raw._selectedFrame == 4
+    assert corrected._selectedFrame == 0
+
+    group = MplViewerGroup(viewers, syncFrame=False)
+    raw._requestFrame(6)
+    group._scheduler.flush()
+
+    assert raw._selectedFrame == 6
+    assert corrected._selectedFrame == 0
@@ -0,0 +1,83 @@
+import struct
+import zlib
+
+import numpy as np
+
+import pytest
+
+from hdfviewer.viewers.NpImageRenderer import _NpImageRenderer, colormapLUT, downsample, encodePNG
+
+
+def _decodePNG(png):
+    """Decode the unfiltered RGB PNG images written by encodePNG.
+    """
+
+    assert png[:8] == b"\x89PNG\r\n\x1a\n"
+
+    chunks = {}
+    offset = 8
+    while offset < len(png):
+        length, = struct.unpack(">I", png[offset:offset+4])
+        tag, data = png[offset+4:offset+8], png[offset+8:offset+8+length]
+        assert struct.unpack(">I", png[offset+8+length:offset+12+length])[0] == zlib.crc32(tag + data) & 0xffffffff
+        chunks[tag] = data
+        offset += 12 + length
+
+    nCols, nRows = struct.unpack(">II", chunks[b"IHDR"][:8])
+    raw = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), dtype=np.uint8).reshape(nRows, 1 + 3*nCols)
+
+    return raw[:, 1:].reshape(nRows, nCols, 3)
+
+
+def test_encodePNG():
+
+    rgb = np.random.default_rng(0).integers(0, 256, size=(7, 5, 3)).astype(np.uint8)
+
+    assert np.array_equal(_decodePNG(encodePNG(rgb)), rgb)
+
+
+@pytest.mark.parametrize("shape, maxShape", [((100, 60), (50, 30)), ((101, 61), (50, 30)), ((10, 10), (20, 20)), ((64, 64), (64, 16))])
+def test_downsample(shape, maxShape):
+
+    frame = np.arange(np.prod(shape), dtype=np.float64).reshape(shape)
+
+    downsampled = downsample(frame, maxShape)
+
+    assert downsampled.shape[0] <= maxShape[0] and downsampled.shape[1] <= maxShape[1]
+    rowFactor, colFactor = -(-shape[0]//maxShape[0]), -(-shape[1]//maxShape[1])
+    expected = frame[:downsampled.shape[0]*rowFactor:rowFactor, :downsampled.shape[1]*colFactor:colFactor]
+    # The mean of a block of a linear ramp is the value at its centre
+    expected = expected + (rowFactor - 1)/2*shape[1] + (colFactor - 1)/2
+    assert np.allclose(downsampled, expected)
+
+
+def test_render():
+
+    lut = colormapLUT("gray", 256)
+    renderer = _NpImageRenderer("gray", (512, 512))
+
+    frame = np.tile(np.arange(256, dtype=np.float64), (4, 1))
+    frame[1, 0] = np.nan
+
+    rgb = _decodePNG(renderer.render(frame))
+
+    # The first row of the frame is at the bottom of the image and the non-finite values get the first colour
+    assert rgb.shape == (4, 256, 3)
+    assert np.array_equal(rgb[-1], lut[np.arange(256)])
+    assert np.array_equal(rgb[-2, 0], lut[0])
+
+    # The values out of the colour limits are clipped
+    rgb = _decodePNG(renderer.render(frame, vmin=100.0, vmax=200.0))
+    assert np.array_equal(rgb[-1, 50], lut[0]) and np.array_equal(rgb[-1, 250], lut[-1])
+
+
+def test_render_log():
+
+    renderer = _NpImageRenderer("viridis", (16, 16))
+    lut = colormapLUT("viridis", 256)
+
+    frame = np.array([[0.0, 1.0, 10.0, 100.0]])
+
+    rgb = _decodePNG(renderer.render(frame, log=True))
+
+    assert np.array_equal(rgb[0], lut[[0, 0, 127, 255]])
@@ -0,0 +1,54 @@
+import ipywidgets as widgets
+
+import pytest
+
+from hdfviewer.widgets.PagedAccordion import PagedAccordion
+
+
+def pagedAccordion(nItems, pageSize, built):
+
+    def factory(idx):
+        built.append(idx)
+        return widgets.Label(str(idx))
+
+    return PagedAccordion([("item {}".format(idx), lambda idx=idx: factory(idx)) for idx in range(nItems)], pageSize=pageSize)
+
+
+def test_single_page():
+
+    built = []
+    accordion = pagedAccordion(5, 10, built)
+
+    assert len(accordion) == 5
+    assert accordion.nPages == 1
+    assert accordion.children == (accordion.accordion,)
+    assert built == list(range(5))
+
+
+@pytest.mark.parametrize("nItems,pageSize,nPages", [(0, 10, 1), (10, 10, 1), (11, 10, 2), (1000, 50, 20)])
+def test_nPages(nItems, pageSize, nPages):
+
+    assert pagedAccordion(nItems, pageSize, []).nPages == nPages
+
+
+def test_setPage():
+
+    built = []
+    accordion = pagedAccordion(25, 10, built)
+
+    # Only the children of the displayed page are built
+    assert accordion.page == 0
+    assert built == list(range(10))
+
+    accordion.setPage(2)
+
+    assert accordion.page == 2
+    assert built[10:] == list(range(20, 25))
+    assert [child.value for child in accordion.accordion.children] == [str(idx) for idx in range(20, 25)]
+    assert [accordion.accordion.get_title(idx) for idx in range(5)] == ["item {}".format(idx) for idx in range(20, 25)]
+
+    # The pages out of range are clamped and the current page is not rebuilt
+    accordion.setPage(10)
+
+    assert accordion.page == 2
+    assert len(built) == 15
@@ -0,0 +1,69 @@
+import h5py
+
+import numpy as np
+
+import pytest
+
+from hdfviewer.utils.ParallelChunkReader import ParallelChunkReader, ParallelChunkReaderError, filterPipeline
+
+
+@pytest.fixture(params=[{}, {"compression": "gzip"}, {"compression": "gzip", "shuffle": True, "fletcher32": True}])
+def dataset(request, tmp_path):
+
+    rng = np.random.default_rng(0)
+    data = rng.integers(0, 1000, size=(40, 50, 12)).astype(np.uint16)
+
+    with h5py.File(tmp_path / "data.h5", "w") as hdf:
+        hdf.create_dataset("data", data=data, chunks=(16, 16, 5), **request.param)
+
+    with h5py.File(tmp_path / "data.h5", "r") as hdf:
+        yield hdf["data"]
+
+
+@pytest.mark.parametrize("key", [(slice(None), slice(None), 3),
+                                 (slice(5, 37), slice(2, 49, 3), slice(None)),
+                                 (0, slice(None), slice(4, 11)),
+                                 (-1, -1, -1),
+                                 (slice(10, 10), slice(None), 0),
+                                 (slice(None, None, 7), slice(1, None, 16), slice(2, 9, 2))])
+@pytest.mark.parametrize("cacheBytes", [0, 2**20])
+def test_getitem(dataset, key, cacheBytes):
+
+    reader = ParallelChunkReader(dataset, cacheBytes)
+
+    expected = dataset[key]
+    data = reader[key]
+
+    assert data.dtype == expected.dtype
+    assert np.array_equal(data, expected)
+    # The cached chunks give the same result
+    assert np.array_equal(reader[key], expected)
+
+
+def test_getitem_fancy_indexing(dataset):
+
+    reader = ParallelChunkReader(dataset)
+
+    assert np.array_equal(reader[[1, 4], :, 0], dataset[[1, 4], :, 0])
+    assert reader.lastRead is None
+
+
+def test_getitem_out_of_range(dataset):
+
+    reader = ParallelChunkReader(dataset)
+
+    with pytest.raises(IndexError):
+        reader[40, 0, 0]
+
+
+def test_unsupported_datasets(tmp_path):
+
+    with h5py.File(tmp_path / "data.h5", "w") as hdf:
+        contiguous = hdf.create_dataset("contiguous", data=np.zeros((4, 4)))
+        strings = hdf.create_dataset("strings", data=np.array([b"a", b"b"]), chunks=(1,), compression="gzip")
+
+        assert filterPipeline(contiguous) is None
+        assert filterPipeline(strings) is None
+
+        with pytest.raises(ParallelChunkReaderError):
+            ParallelChunkReader(contiguous)
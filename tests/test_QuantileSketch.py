@@ -0,0 +1,80 @@
+import numpy as np
+
+import pytest
+
+from hdfviewer.utils.QuantileSketch import QuantileSketch, QuantileSketchError, checkColorScale, colorLimits, colorScales
+
+
+def _assertQuantiles(sketch, data, qs):
+
+    expected = np.quantile(data.astype(np.float64), qs, method="lower")
+    estimated = sketch.quantiles(qs)
+
+    # The relative error is bounded by 2**-(precision+1)
+    tolerance = 2.0**-(sketch.precision + 1)
+    assert np.all(np.abs(estimated - expected) <= tolerance*np.abs(expected) + 1e-12)
+
+
+@pytest.mark.parametrize("dtype, low, high", [(np.int8, -100, 100), (np.int16, -20000, 20000), (np.uint8, 0, 255), (np.uint16, 0, 60000)])
+def test_fromArray_small_integers(dtype, low, high):
+
+    rng = np.random.default_rng(0)
+    data = rng.integers(low, high, size=(64, 64), endpoint=True).astype(dtype)
+
+    sketch = QuantileSketch.fromArray(data)
+
+    assert sketch.count == data.size
+    assert sketch.min == data.min()
+    assert sketch.max == data.max()
+    _assertQuantiles(sketch, data, [0.0, 0.01, 0.25, 0.5, 0.75, 0.99, 1.0])
+
+
+def test_fromArray_signed_extrema():
+
+    data = np.array([-128, 127, -128, 0], dtype=np.int8)
+
+    sketch = QuantileSketch.fromArray(data)
+
+    assert sketch.percentiles(0.0, 100.0) == (-128.0, 127.0)
+
+
+def test_fromArray_floats():
+
+    rng = np.random.default_rng(1)
+    data = rng.normal(0.0, 100.0, size=10000)
+    data[:10] = np.nan
+
+    sketch = QuantileSketch.fromArray(data)
+
+    assert sketch.count == 9990
+    _assertQuantiles(sketch, data[np.isfinite(data)], [0.0, 0.05, 0.5, 0.95, 1.0])
+
+
+def test_merge():
+
+    rng = np.random.default_rng(2)
+    first = rng.exponential(10.0, size=5000)
+    second = -rng.exponential(3.0, size=3000)
+
+    merged = QuantileSketch.fromArray(first).merge(QuantileSketch.fromArray(second))
+
+    assert merged.count == 8000
+    _assertQuantiles(merged, np.concatenate((first, second)), [0.0, 0.1, 0.5, 0.9, 1.0])
+
+
+def test_merge_precision():
+
+    with pytest.raises(QuantileSketchError):
+        QuantileSketch(4).merge(QuantileSketch(6))
+
+
+def test_checkColorScale():
+
+    for colorScale in colorScales:
+        checkColorScale(colorScale)
+
+    with pytest.raises(QuantileSketchError):
+        checkColorScale("linear")
+
+    with pytest.raises(QuantileSketchError):
+        colorLimits(QuantileSketch.fromArray(np.arange(10.0)), "linear")
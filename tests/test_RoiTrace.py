@@ -0,0 +1,49 @@
+import h5py
+
+import numpy as np
+
+import pytest
+
+from hdfviewer.utils.RoiTrace import RoiTrace, RoiTraceError
+
+
+@pytest.mark.parametrize("reduction", ["sum", "mean"])
+@pytest.mark.parametrize("rows, cols", [(slice(None), slice(None)), (slice(3, 17), slice(5, 29)), (slice(-4, None), slice(0, 1))])
+def test_run(tmp_path, reduction, rows, cols):
+
+    rng = np.random.default_rng(0)
+    data = rng.integers(0, 1000, size=(20, 30, 25)).astype(np.uint16)
+
+    with h5py.File(tmp_path / "data.h5", "w") as hdf:
+        hdf.create_dataset("data", data=data, chunks=(8, 8, 4), compression="gzip")
+
+    with h5py.File(tmp_path / "data.h5", "r") as hdf:
+        trace = RoiTrace(hdf["data"], rows, cols, reduction, maxWorkers=3).run()
+
+    roi = data[rows, cols, :].astype(np.float64)
+    expected = roi.sum(axis=(0, 1)) if reduction == "sum" else roi.mean(axis=(0, 1))
+    assert np.allclose(trace, expected)
+
+
+def test_completed():
+
+    data = np.ones((6, 6, 5))
+
+    roiTrace = RoiTrace(data, slice(1, 3), slice(2, 4))
+
+    assert roiTrace.completed == 0.0
+    assert np.all(np.isnan(roiTrace.trace))
+
+    assert np.array_equal(roiTrace.run(), np.full(5, 4.0))
+    assert roiTrace.completed == 1.0
+
+
+def test_errors():
+
+    data = np.zeros((4, 4, 3))
+
+    with pytest.raises(RoiTraceError):
+        RoiTrace(data, slice(None), slice(None), "median")
+
+    with pytest.raises(RoiTraceError):
+        RoiTrace(data, slice(2, 2), slice(None))
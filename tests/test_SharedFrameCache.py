@@ -0,0 +1,121 @@
+import h5py
+
+import numpy as np
+
+import pytest
+
+from hdfviewer.utils.SharedFrameCache import SharedFrameCache, SharedFrameCacheError
+
+
+class _CountingRead(object):
+    """A reader of a selection counting its calls.
+    """
+
+    def __init__(self, dataset, key, field=None):
+
+        self._dataset = dataset
+
+        self._key = key
+
+        self._field = field
+
+        self.calls = 0
+
+    def __call__(self):
+
+        self.calls += 1
+
+        dataset = self._dataset if self._field is None else self._dataset.fields(self._field)
+
+        return dataset[self._key]
+
+
+@pytest.fixture
+def hdf(tmp_path):
+
+    rng = np.random.default_rng(0)
+    data = rng.random((64, 64, 8))
+    records = np.zeros((64, 64), dtype=[("a", np.float64), ("b", np.int32)])
+    records["a"] = data[:, :, 0]
+    records["b"] = np.arange(64*64).reshape(64, 64)
+
+    with h5py.File(tmp_path / "data.h5", "w") as hdf:
+        hdf.create_dataset("data", data=data, chunks=(16, 16, 8), compression="gzip")
+        hdf.create_dataset("records", data=records)
+
+    with h5py.File(tmp_path / "data.h5", "r") as hdf:
+        yield hdf
+
+
+@pytest.fixture
+def caches():
+
+    # Two caches stand for two kernels of the node
+    caches = (SharedFrameCache(minBytes=1024), SharedFrameCache(minBytes=1024))
+
+    yield caches
+
+    caches[0].clear()
+
+
+def test_get(hdf, caches):
+
+    dataset = hdf["data"]
+    key = (slice(0, 64), slice(0, 64), 3)
+
+    first = _CountingRead(dataset, key)
+    data = caches[0].get(dataset, key, first)
+
+    second = _CountingRead(dataset, key)
+    shared = caches[1].get(dataset, key, second)
+
+    assert first.calls == 1 and second.calls == 0
+    assert np.array_equal(data, dataset[key])
+    assert np.array_equal(shared, dataset[key])
+    assert not shared.flags.writeable
+
+
+def test_get_fields(hdf, caches):
+
+    dataset = hdf["records"]
+    key = (slice(0, 64), slice(0, 64))
+
+    for field in ("a", "b"):
+        read = _CountingRead(dataset, key, field)
+        assert np.array_equal(caches[0].get(dataset, key, read, field), dataset.fields(field)[key])
+        assert read.calls == 1
+
+
+def test_get_not_cached(hdf, caches):
+
+    dataset = hdf["data"]
+
+    # The small selections and the fancy selections are read directly
+    for key in ((0, slice(0, 64), 3), ([1, 2], slice(0, 64), 3)):
+        for cache in caches:
+            read = _CountingRead(dataset, key)
+            assert np.array_equal(cache.get(dataset, key, read), dataset[key])
+            assert read.calls == 1
+
+    # As are the NumPy arrays
+    data = dataset[...]
+    assert caches[0].get(data, (slice(None), slice(None), 0), lambda: data[:, :, 0]).flags.writeable
+
+
+def test_clear(hdf, caches):
+
+    dataset = hdf["data"]
+    key = (slice(0, 64), slice(0, 64), 5)
+
+    caches[0].get(dataset, key, _CountingRead(dataset, key))
+    caches[0].clear()
+
+    read = _CountingRead(dataset, key)
+    caches[1].get(dataset, key, read)
+    assert read.calls == 1
+
+
+def test_maxBytes():
+
+    with pytest.raises(SharedFrameCacheError):
+        SharedFrameCache(maxBytes=0)